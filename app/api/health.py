@@ -1,8 +1,24 @@
 from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+
+from app.core.metrics import snapshot_metrics
+from app.services.common.drain import drain_report
+from app.services.common.warmup import readiness_report
 
 router = APIRouter()
 
 
-@router.get("/health", tags=["health"])  # simple readiness endpoint
+@router.get("/health", tags=["health"])  # simple liveness endpoint
 def health() -> dict:
     return {"status": "ok"}
+
+
+@router.get("/ready", tags=["health"])  # readiness: 503 until warmed up and again once draining
+def ready() -> JSONResponse:
+    report = drain_report() or readiness_report()
+    return JSONResponse(content=report, status_code=200 if report["status"] == "ready" else 503)
+
+
+@router.get("/metrics", tags=["health"])  # in-process histograms and counters as JSON
+def metrics() -> dict:
+    return snapshot_metrics()
@@ -8,6 +8,7 @@ section to keep the generated OpenAPI docs concise.
 
 import hashlib
 import json
+import logging
 import time
 
 from fastapi import APIRouter, status, Request, HTTPException
@@ -22,10 +23,36 @@ from app.services.tiktok.download import TikTokDownloadService
 from specify_src.services.browser_mode_service import BrowserModeService
 
 
+logger = logging.getLogger(__name__)
 router = APIRouter()
-# Keep the conventional name so tests can patch it
-tiktok_service = TiktokService()
-tiktok_download_service = TikTokDownloadService()
+# Keep the conventional names so tests can patch them; the services are built
+# on first request rather than when the API is imported
+tiktok_service = None
+tiktok_download_service = None
+
+
+def _get_tiktok_service():
+    global tiktok_service
+    if tiktok_service is None:
+        tiktok_service = TiktokService()
+    return tiktok_service
+
+
+async def close_tiktok_sessions() -> None:
+    """Close the live sessions of the TikTok service, if one was built (application shutdown)."""
+    if tiktok_service is None:
+        return
+    try:
+        await tiktok_service.cleanup_all_sessions()
+    except Exception as exc:  # pragma: no cover - best-effort shutdown
+        logger.warning("Failed to close TikTok sessions at shutdown: %s", exc)
+
+
+def _get_tiktok_download_service():
+    global tiktok_download_service
+    if tiktok_download_service is None:
+        tiktok_download_service = TikTokDownloadService()
+    return tiktok_download_service
 
 
 @router.post("/tiktok/session", response_model=TikTokSessionResponse, tags=["Tiktok"])
@@ -52,7 +79,7 @@ async def create_tiktok_session_endpoint(request: Request):
         # Fallback: treat as empty request
         req_obj = TikTokSessionRequest()
 
-    result = await tiktok_service.create_session(req_obj, immediate_cleanup=False)
+    result = await _get_tiktok_service().create_session(req_obj, immediate_cleanup=False)
 
     if result.status == "success":
         return JSONResponse(content=result.model_dump(exclude_none=True), status_code=status.HTTP_200_OK)
@@ -203,7 +230,7 @@ async def tiktok_search_endpoint(payload: TikTokSearchRequest):
 @router.post("/tiktok/download", response_model=TikTokDownloadResponse, tags=["Tiktok"])
 async def tiktok_download_endpoint(payload: TikTokDownloadRequest):
     """Handle the TikTok video download workflow by delegating to the download service."""
-    result = await tiktok_download_service.download_video(payload)
+    result = await _get_tiktok_download_service().download_video(payload)
 
     if result.status == "success":
         return result
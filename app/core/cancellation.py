@@ -0,0 +1,103 @@
+"""Request-scoped cancellation token carried in a context variable.
+
+Browser work runs synchronously on worker threads, so cancelling the asyncio
+task of a request does not stop it: a client that timed out and hung up would
+keep a browser scrolling or retrying for minutes. The HTTP layer instead
+attaches a :class:`CancellationToken` to every request and cancels it when the
+client disconnects (or the request is cancelled at shutdown). Long-running
+code checks it at loop boundaries with :func:`check_cancelled` and waits with
+:func:`cancellable_sleep`.
+
+:class:`RequestCancelled` derives from ``BaseException``, like
+``asyncio.CancelledError``, so that it passes through the ``except Exception``
+of retry loops and of Scrapling's page-action wrapper: the fetch unwinds, its
+browser and page close, and profile cleanups run on the way out.
+
+Like the request context, the token follows the current asyncio task and is
+copied by ``asyncio.to_thread`` and Starlette's threadpool; code handing work
+to plain threads must pass ``contextvars.copy_context()`` along.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+
+class RequestCancelled(BaseException):
+    """Raised inside work whose request was cancelled (client gone, shutdown)."""
+
+
+class CancellationToken:
+    """One-shot, thread-safe cancellation flag."""
+
+    def __init__(self) -> None:
+        self._event = threading.Event()
+        self.reason: Optional[str] = None
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def cancel(self, reason: str = "cancelled") -> None:
+        """Cancel the token; the first reason is kept."""
+        if not self._event.is_set():
+            self.reason = reason
+            self._event.set()
+
+    def raise_if_cancelled(self) -> None:
+        if self._event.is_set():
+            raise RequestCancelled(self.reason)
+
+    def sleep(self, seconds: float) -> None:
+        """Sleep up to ``seconds``, raising :class:`RequestCancelled` as soon as the token is cancelled."""
+        if self._event.wait(max(0.0, seconds)):
+            raise RequestCancelled(self.reason)
+
+
+_current: ContextVar[Optional[CancellationToken]] = ContextVar("cancellation_token", default=None)
+
+
+def current_cancellation() -> Optional[CancellationToken]:
+    """Return the token of the current request, or None outside of a request."""
+    return _current.get()
+
+
+@contextmanager
+def cancellation_scope(token: Optional[CancellationToken] = None) -> Iterator[CancellationToken]:
+    """Make ``token`` (default: a new one) the current token until the block exits."""
+    token = token or CancellationToken()
+    reset = _current.set(token)
+    try:
+        yield token
+    finally:
+        _current.reset(reset)
+
+
+def check_cancelled() -> None:
+    """Raise :class:`RequestCancelled` when the current request was cancelled."""
+    token = _current.get()
+    if token is not None:
+        token.raise_if_cancelled()
+
+
+def cancellable_sleep(seconds: float) -> None:
+    """``time.sleep`` that wakes up and raises once the current request is cancelled."""
+    token = _current.get()
+    if token is None:
+        time.sleep(seconds)
+    else:
+        token.sleep(seconds)
+
+
+__all__ = [
+    "CancellationToken",
+    "RequestCancelled",
+    "cancellable_sleep",
+    "cancellation_scope",
+    "check_cancelled",
+    "current_cancellation",
+]
@@ -39,6 +39,62 @@ try:
         camoufox_user_data_dir: Optional[str] = Field(default=None)
         # Chromium user data directory (master/clone profile structure)
         chromium_user_data_dir: Optional[str] = Field(default="data/chromium_profiles")
+        # How read-only Chromium flows carry the session: "clone" copies the profile,
+        # "storage_state" seeds an ephemeral context from cached cookies/localStorage
+        chromium_user_data_mode: str = Field(default="clone")
+        storage_state_refresh_seconds: int = Field(default=30)
+        # Optional tmpfs/RAM-disk root for read-mode profile clones (e.g. /dev/shm/scrapling)
+        user_data_clone_root: Optional[str] = Field(default=None)
+        user_data_clone_root_max_bytes: int = Field(default=536_870_912)
+        # Number of master profiles per engine (1 = single master); extra slots live under <user_data_dir>/pool
+        profile_pool_size: int = Field(default=1)
+        profile_pool_unhealthy_cooldown_seconds: int = Field(default=600)
+        # Master-profile compaction (expired cookies, VACUUM, caches); 0 disables the job
+        profile_compaction_interval_seconds: int = Field(default=86400)
+        profile_compaction_lock_timeout_seconds: int = Field(default=5)
+        # Pre-generated fingerprints per engine (0 disables); persisted as <dir>/<engine>.json
+        fingerprint_pool_size: int = Field(default=0)
+        fingerprint_pool_dir: Optional[str] = Field(default="data/fingerprints")
+        # Seconds a Camoufox GeoIP resolution is reused per proxy/direct egress (0 = resolve every launch)
+        geoip_cache_ttl_seconds: int = Field(default=3600)
+        # Shared on-disk cache for static sub-resources of Playwright contexts (unset = disabled)
+        subresource_cache_dir: Optional[str] = Field(default=None)
+        subresource_cache_max_bytes: int = Field(default=1_073_741_824)
+        # Browser process watchdog (Linux /proc); interval 0 disables it, limits of 0 are off
+        browser_watchdog_interval_seconds: int = Field(default=30)
+        browser_max_rss_bytes: int = Field(default=0)
+        browser_max_age_seconds: int = Field(default=0)
+        browser_max_pages: int = Field(default=0)
+        # Memory-aware admission for browser launches; thresholds of 0 are off
+        memory_min_available_bytes: int = Field(default=0)
+        memory_max_psi_some_avg10: float = Field(default=0.0)
+        memory_max_browser_rss_bytes: int = Field(default=0)
+        memory_launch_reservation_bytes: int = Field(default=0)
+        memory_admission_timeout_seconds: int = Field(default=30)
+        # Pool of Xvfb displays leased to headful browsers (0 = use $DISPLAY / camoufox_virtual_display)
+        xvfb_pool_size: int = Field(default=0)
+        xvfb_base_display: int = Field(default=99)
+        xvfb_screen: str = Field(default="1920x1080x24")
+        xvfb_lease_timeout_seconds: int = Field(default=60)
+        # Keep Chromium running between TikTok download fetches; idle sessions close after this (0 = off)
+        chromium_keepalive_idle_seconds: int = Field(default=0)
+        # Out-of-process Chromium fleet shared via <dir>/endpoints.json (unset = launch in-process)
+        browser_fleet_dir: Optional[str] = Field(default=None)
+        browser_fleet_size: int = Field(default=0)
+        browser_fleet_headless: bool = Field(default=True)
+        browser_fleet_chromium_executable: Optional[str] = Field(default=None)
+        # Run crawls in worker processes (0 = in-process, -1 = size to CPUs and memory)
+        crawl_process_workers: int = Field(default=0)
+        crawl_process_worker_memory_bytes: int = Field(default=1_073_741_824)
+        # Crawl results at least this large return from workers via shared memory (0 = always pickled)
+        crawl_process_shm_threshold_bytes: int = Field(default=65_536)
+        # Comma-separated warm-up steps run after startup before /ready reports ready ("all" = every step)
+        warmup_components: str = Field(default="")
+        warmup_step_timeout_seconds: float = Field(default=120.0)
+        # Shutdown drain: seconds in-flight requests get after SIGTERM before they are cancelled,
+        # then seconds cancelled jobs get to unwind before their profiles are force-released
+        drain_timeout_seconds: float = Field(default=30.0)
+        drain_cancel_grace_seconds: float = Field(default=5.0)
         # Camoufox stealth extras (optional, no API changes)
         camoufox_locale: Optional[str] = Field(default=None)  # e.g., "en-US,en;q=0.9"
         camoufox_window: Optional[str] = Field(default="1280x720")  # e.g., "1366x768"
@@ -56,6 +112,9 @@ try:
         camoufox_runtime_effective_user_data_dir: Optional[str] = Field(
             default=None, exclude=True, repr=False
         )
+        camoufox_runtime_profile_dir: Optional[str] = Field(
+            default=None, exclude=True, repr=False
+        )
         # Runtime-only Chromium toggles managed by services (never persisted)
         chromium_runtime_user_data_mode: Optional[str] = Field(
             default=None, exclude=True, repr=False
@@ -144,6 +203,48 @@ except Exception:
         camoufox_user_data_dir: Optional[str] = None
         # Chromium user data directory (master/clone profile structure)
         chromium_user_data_dir: Optional[str] = "data/chromium_profiles"
+        # "clone" (profile copy) or "storage_state" (cached cookies/localStorage)
+        chromium_user_data_mode: str = "clone"
+        storage_state_refresh_seconds: int = 30
+        # Optional tmpfs/RAM-disk root for read-mode profile clones
+        user_data_clone_root: Optional[str] = None
+        user_data_clone_root_max_bytes: int = 536_870_912
+        # Number of master profiles per engine (1 = single master)
+        profile_pool_size: int = 1
+        profile_pool_unhealthy_cooldown_seconds: int = 600
+        # Master-profile compaction job (0 disables)
+        profile_compaction_interval_seconds: int = 86400
+        profile_compaction_lock_timeout_seconds: int = 5
+        fingerprint_pool_size: int = 0
+        fingerprint_pool_dir: Optional[str] = "data/fingerprints"
+        geoip_cache_ttl_seconds: int = 3600
+        subresource_cache_dir: Optional[str] = None
+        subresource_cache_max_bytes: int = 1_073_741_824
+        browser_watchdog_interval_seconds: int = 30
+        browser_max_rss_bytes: int = 0
+        browser_max_age_seconds: int = 0
+        browser_max_pages: int = 0
+        memory_min_available_bytes: int = 0
+        memory_max_psi_some_avg10: float = 0.0
+        memory_max_browser_rss_bytes: int = 0
+        memory_launch_reservation_bytes: int = 0
+        memory_admission_timeout_seconds: int = 30
+        xvfb_pool_size: int = 0
+        xvfb_base_display: int = 99
+        xvfb_screen: str = "1920x1080x24"
+        xvfb_lease_timeout_seconds: int = 60
+        chromium_keepalive_idle_seconds: int = 0
+        browser_fleet_dir: Optional[str] = None
+        browser_fleet_size: int = 0
+        browser_fleet_headless: bool = True
+        browser_fleet_chromium_executable: Optional[str] = None
+        crawl_process_workers: int = 0
+        crawl_process_worker_memory_bytes: int = 1_073_741_824
+        crawl_process_shm_threshold_bytes: int = 65_536
+        warmup_components: str = ""
+        warmup_step_timeout_seconds: float = 120.0
+        drain_timeout_seconds: float = 30.0
+        drain_cancel_grace_seconds: float = 5.0
         # Camoufox stealth extras
         camoufox_locale: Optional[str] = None
         camoufox_window: Optional[str] = "1280x720"
@@ -154,6 +255,7 @@ except Exception:
         camoufox_runtime_force_mute_audio: bool = False
         camoufox_runtime_user_data_mode: Optional[str] = None
         camoufox_runtime_effective_user_data_dir: Optional[str] = None
+        camoufox_runtime_profile_dir: Optional[str] = None
         # Runtime-only Chromium toggles managed by services (never persisted)
         chromium_runtime_user_data_mode: Optional[str] = None
         chromium_runtime_effective_user_data_dir: Optional[str] = None
@@ -221,6 +323,44 @@ except Exception:
                 and os.getenv("CHROMIUM_USER_DATA_DIR").strip()
                 else "data/chromium_profiles"
             ),
+            chromium_user_data_mode=os.getenv("CHROMIUM_USER_DATA_MODE", "clone"),
+            storage_state_refresh_seconds=int(os.getenv("STORAGE_STATE_REFRESH_SECONDS", "30")),
+            user_data_clone_root=os.getenv("USER_DATA_CLONE_ROOT") or None,
+            user_data_clone_root_max_bytes=int(os.getenv("USER_DATA_CLONE_ROOT_MAX_BYTES", "536870912")),
+            profile_pool_size=int(os.getenv("PROFILE_POOL_SIZE", "1")),
+            profile_pool_unhealthy_cooldown_seconds=int(os.getenv("PROFILE_POOL_UNHEALTHY_COOLDOWN_SECONDS", "600")),
+            profile_compaction_interval_seconds=int(os.getenv("PROFILE_COMPACTION_INTERVAL_SECONDS", "86400")),
+            profile_compaction_lock_timeout_seconds=int(os.getenv("PROFILE_COMPACTION_LOCK_TIMEOUT_SECONDS", "5")),
+            fingerprint_pool_size=int(os.getenv("FINGERPRINT_POOL_SIZE", "0")),
+            fingerprint_pool_dir=os.getenv("FINGERPRINT_POOL_DIR", "data/fingerprints"),
+            geoip_cache_ttl_seconds=int(os.getenv("GEOIP_CACHE_TTL_SECONDS", "3600")),
+            subresource_cache_dir=os.getenv("SUBRESOURCE_CACHE_DIR") or None,
+            subresource_cache_max_bytes=int(os.getenv("SUBRESOURCE_CACHE_MAX_BYTES", "1073741824")),
+            browser_watchdog_interval_seconds=int(os.getenv("BROWSER_WATCHDOG_INTERVAL_SECONDS", "30")),
+            browser_max_rss_bytes=int(os.getenv("BROWSER_MAX_RSS_BYTES", "0")),
+            browser_max_age_seconds=int(os.getenv("BROWSER_MAX_AGE_SECONDS", "0")),
+            browser_max_pages=int(os.getenv("BROWSER_MAX_PAGES", "0")),
+            memory_min_available_bytes=int(os.getenv("MEMORY_MIN_AVAILABLE_BYTES", "0")),
+            memory_max_psi_some_avg10=float(os.getenv("MEMORY_MAX_PSI_SOME_AVG10", "0")),
+            memory_max_browser_rss_bytes=int(os.getenv("MEMORY_MAX_BROWSER_RSS_BYTES", "0")),
+            memory_launch_reservation_bytes=int(os.getenv("MEMORY_LAUNCH_RESERVATION_BYTES", "0")),
+            memory_admission_timeout_seconds=int(os.getenv("MEMORY_ADMISSION_TIMEOUT_SECONDS", "30")),
+            xvfb_pool_size=int(os.getenv("XVFB_POOL_SIZE", "0")),
+            xvfb_base_display=int(os.getenv("XVFB_BASE_DISPLAY", "99")),
+            xvfb_screen=os.getenv("XVFB_SCREEN", "1920x1080x24"),
+            xvfb_lease_timeout_seconds=int(os.getenv("XVFB_LEASE_TIMEOUT_SECONDS", "60")),
+            chromium_keepalive_idle_seconds=int(os.getenv("CHROMIUM_KEEPALIVE_IDLE_SECONDS", "0")),
+            browser_fleet_dir=os.getenv("BROWSER_FLEET_DIR") or None,
+            browser_fleet_size=int(os.getenv("BROWSER_FLEET_SIZE", "0")),
+            browser_fleet_headless=os.getenv("BROWSER_FLEET_HEADLESS", "true").lower() in {"1", "true", "yes"},
+            browser_fleet_chromium_executable=os.getenv("BROWSER_FLEET_CHROMIUM_EXECUTABLE") or None,
+            crawl_process_workers=int(os.getenv("CRAWL_PROCESS_WORKERS", "0")),
+            crawl_process_worker_memory_bytes=int(os.getenv("CRAWL_PROCESS_WORKER_MEMORY_BYTES", "1073741824")),
+            crawl_process_shm_threshold_bytes=int(os.getenv("CRAWL_PROCESS_SHM_THRESHOLD_BYTES", "65536")),
+            warmup_components=os.getenv("WARMUP_COMPONENTS", ""),
+            warmup_step_timeout_seconds=float(os.getenv("WARMUP_STEP_TIMEOUT_SECONDS", "120")),
+            drain_timeout_seconds=float(os.getenv("DRAIN_TIMEOUT_SECONDS", "30")),
+            drain_cancel_grace_seconds=float(os.getenv("DRAIN_CANCEL_GRACE_SECONDS", "5")),
             camoufox_locale=os.getenv("CAMOUFOX_LOCALE"),
             camoufox_window=os.getenv("CAMOUFOX_WINDOW"),
             camoufox_disable_coop=os.getenv("CAMOUFOX_DISABLE_COOP", "false").lower() in {"1", "true", "yes"},
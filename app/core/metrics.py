@@ -0,0 +1,184 @@
+"""Minimal in-process metrics registry.
+
+Histograms use cumulative buckets (Prometheus style) and are exported as plain
+JSON through ``GET /metrics``; there is no external metrics dependency.
+"""
+
+from __future__ import annotations
+
+import bisect
+import threading
+from typing import Dict, List, Optional, Sequence
+
+# Seconds; covers sub-millisecond uncontended locks up to multi-second waits
+DEFAULT_BUCKETS: Sequence[float] = (0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+class Histogram:
+    """Thread-safe histogram with fixed upper-bound buckets."""
+
+    def __init__(self, name: str, description: str = "", buckets: Optional[Sequence[float]] = None) -> None:
+        self.name = name
+        self.description = description
+        self.buckets: List[float] = sorted(buckets or DEFAULT_BUCKETS)
+        self._lock = threading.Lock()
+        self._counts = [0] * (len(self.buckets) + 1)  # last slot is +Inf
+        self._sum = 0.0
+        self._count = 0
+
+    def observe(self, value: float) -> None:
+        """Record a single observation."""
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+            self._count += 1
+
+    def reset(self) -> None:
+        """Drop every recorded observation."""
+        with self._lock:
+            self._counts = [0] * (len(self.buckets) + 1)
+            self._sum = 0.0
+            self._count = 0
+
+    def snapshot(self) -> Dict[str, object]:
+        """Return count, sum and cumulative bucket counts."""
+        with self._lock:
+            counts = list(self._counts)
+            total, count = self._sum, self._count
+        cumulative: Dict[str, int] = {}
+        running = 0
+        for bound, bucket_count in zip(self.buckets, counts):
+            running += bucket_count
+            cumulative[str(bound)] = running
+        cumulative["+Inf"] = count
+        return {
+            "type": "histogram",
+            "description": self.description,
+            "count": count,
+            "sum": total,
+            "buckets": cumulative,
+        }
+
+
+class Counter:
+    """Thread-safe monotonically increasing counter."""
+
+    def __init__(self, name: str, description: str = "") -> None:
+        self.name = name
+        self.description = description
+        self._lock = threading.Lock()
+        self._value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        """Increase the counter by ``amount``."""
+        with self._lock:
+            self._value += amount
+
+    @property
+    def value(self) -> float:
+        return self._value
+
+    def reset(self) -> None:
+        """Reset the counter to zero."""
+        with self._lock:
+            self._value = 0.0
+
+    def snapshot(self) -> Dict[str, object]:
+        """Return the current value."""
+        return {"type": "counter", "description": self.description, "value": self._value}
+
+
+class Gauge:
+    """Thread-safe value that can go up and down."""
+
+    def __init__(self, name: str, description: str = "") -> None:
+        self.name = name
+        self.description = description
+        self._lock = threading.Lock()
+        self._value = 0.0
+
+    def set(self, value: float) -> None:
+        """Set the gauge to ``value``."""
+        with self._lock:
+            self._value = float(value)
+
+    @property
+    def value(self) -> float:
+        return self._value
+
+    def reset(self) -> None:
+        """Reset the gauge to zero."""
+        self.set(0.0)
+
+    def snapshot(self) -> Dict[str, object]:
+        """Return the current value."""
+        return {"type": "gauge", "description": self.description, "value": self._value}
+
+
+_registry: Dict[str, object] = {}
+_registry_lock = threading.Lock()
+
+
+def get_histogram(name: str, description: str = "", buckets: Optional[Sequence[float]] = None) -> Histogram:
+    """Return the process-wide histogram called ``name``, creating it on first use."""
+    with _registry_lock:
+        metric = _registry.get(name)
+        if metric is None:
+            metric = Histogram(name, description, buckets)
+            _registry[name] = metric
+        if not isinstance(metric, Histogram):
+            raise TypeError(f"metric {name!r} is already registered as {type(metric).__name__}")
+        return metric
+
+
+def get_counter(name: str, description: str = "") -> Counter:
+    """Return the process-wide counter called ``name``, creating it on first use."""
+    with _registry_lock:
+        metric = _registry.get(name)
+        if metric is None:
+            metric = Counter(name, description)
+            _registry[name] = metric
+        if not isinstance(metric, Counter):
+            raise TypeError(f"metric {name!r} is already registered as {type(metric).__name__}")
+        return metric
+
+
+def get_gauge(name: str, description: str = "") -> Gauge:
+    """Return the process-wide gauge called ``name``, creating it on first use."""
+    with _registry_lock:
+        metric = _registry.get(name)
+        if metric is None:
+            metric = Gauge(name, description)
+            _registry[name] = metric
+        if not isinstance(metric, Gauge):
+            raise TypeError(f"metric {name!r} is already registered as {type(metric).__name__}")
+        return metric
+
+
+def snapshot_metrics() -> Dict[str, Dict[str, object]]:
+    """Return a JSON-serializable view of every registered metric."""
+    with _registry_lock:
+        metrics = dict(_registry)
+    return {name: metric.snapshot() for name, metric in sorted(metrics.items())}
+
+
+def reset_metrics() -> None:
+    """Zero every registered metric (for tests)."""
+    with _registry_lock:
+        metrics = list(_registry.values())
+    for metric in metrics:
+        metric.reset()
+
+
+__all__ = [
+    "Counter",
+    "DEFAULT_BUCKETS",
+    "Gauge",
+    "Histogram",
+    "get_counter",
+    "get_gauge",
+    "get_histogram",
+    "reset_metrics",
+    "snapshot_metrics",
+]
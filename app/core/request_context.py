@@ -0,0 +1,72 @@
+"""Request-scoped runtime toggles carried in a context variable.
+
+Services used to flip ``camoufox_runtime_*`` / ``chromium_runtime_*`` fields on
+the cached ``Settings`` object for the duration of a browser session, which
+leaked between concurrent requests. They now enter :func:`request_context`
+instead; readers such as ``CamoufoxArgsBuilder`` resolve the values with
+:func:`runtime_setting`.
+
+Context variables follow the current asyncio task and are copied by
+``asyncio.to_thread`` and Starlette's threadpool. Code handing work to plain
+threads or ``run_in_executor`` must pass ``contextvars.copy_context()`` along.
+"""
+
+from __future__ import annotations
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, fields, replace
+from typing import Any, Iterator, Optional
+
+
+@dataclass(frozen=True)
+class RequestContext:
+    """Runtime overrides for the current request; None means "not set"."""
+
+    camoufox_runtime_force_mute_audio: Optional[bool] = None
+    camoufox_runtime_user_data_mode: Optional[str] = None
+    camoufox_runtime_effective_user_data_dir: Optional[str] = None
+    camoufox_runtime_profile_dir: Optional[str] = None
+    chromium_runtime_user_data_mode: Optional[str] = None
+    chromium_runtime_effective_user_data_dir: Optional[str] = None
+
+
+_FIELDS = frozenset(field.name for field in fields(RequestContext))
+_current: ContextVar[RequestContext] = ContextVar("request_context", default=RequestContext())
+
+
+def current_request_context() -> RequestContext:
+    return _current.get()
+
+
+@contextmanager
+def request_context(**overrides: Any) -> Iterator[RequestContext]:
+    """Layer ``overrides`` over the current context until the block exits."""
+    unknown = set(overrides) - _FIELDS
+    if unknown:
+        raise TypeError(f"Unknown request context field(s): {', '.join(sorted(unknown))}")
+    token = _current.set(replace(_current.get(), **overrides))
+    try:
+        yield _current.get()
+    finally:
+        _current.reset(token)
+
+
+def runtime_setting(settings: Any, name: str, default: Any = None) -> Any:
+    """Return ``name`` from the request context, falling back to ``settings``.
+
+    The fallback keeps callers that still configure a dedicated settings object
+    (tests, scripts) working.
+    """
+    value = getattr(_current.get(), name, None)
+    if value is not None:
+        return value
+    return getattr(settings, name, default)
+
+
+__all__ = [
+    "RequestContext",
+    "current_request_context",
+    "request_context",
+    "runtime_setting",
+]
@@ -1,4 +1,5 @@
 import asyncio
+import json
 import logging
 
 # Set Windows event loop policy at the very beginning to prevent Playwright subprocess issues
@@ -16,17 +17,61 @@ from fastapi.exceptions import RequestValidationError
 from fastapi.responses import JSONResponse, RedirectResponse
 from app.api import router as api_router
 from app.api import health
+from app.api.tiktok import close_tiktok_sessions
 from app.core.config import get_settings
 from app.core.logging import setup_logger
+from app.core.metrics import snapshot_metrics
+from app.middleware.client_disconnect import ClientDisconnectMiddleware
+from app.services.browser.fetchers.chromium_sessions import close_chromium_sessions
+from app.services.common.browser.display_pool import start_display_pool, stop_display_pool
+from app.services.common.browser.fingerprint_pool import start_fingerprint_pools, stop_fingerprint_pools
+from app.services.common.browser.maintenance import ProfileCompactionScheduler
+from app.services.common.browser.profile_releases import release_pending
+from app.services.common.browser.watchdog import BrowserWatchdogScheduler
+from app.services.common.drain import (
+    DrainMiddleware,
+    reset_drain,
+    start_drain_controller,
+    wait_for_profile_releases,
+)
+from app.services.common.warmup import start_warmup, stop_warmup
+from app.services.crawler.executors.process_executor import shutdown_crawl_process_pool
+
+logger = logging.getLogger(__name__)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Initialize logging
     setup_logger()
-    # Startup tasks (future: warm-ups, health checks, etc.)
+    # Startup tasks
+    drain = start_drain_controller(get_settings())
+    compaction = ProfileCompactionScheduler(get_settings())
+    compaction.start()
+    start_fingerprint_pools(get_settings())
+    watchdog = BrowserWatchdogScheduler(get_settings())
+    watchdog.start()
+    start_display_pool(get_settings())
+    # Prime browsers, pools and caches in the background; /ready answers 503 until done
+    start_warmup(get_settings())
     yield
-    # Shutdown tasks (future: cleanup, metrics flush, etc.)
+    # Shutdown: stop admission and let in-flight requests finish (cancelled at the deadline)
+    await drain.drain()
+    # Live TikTok sessions close their browsers before their clones, leases and locks are released
+    await close_tiktok_sessions()
+    await stop_warmup()
+    await compaction.stop()
+    await watchdog.stop()
+    # Flushes the persisted fingerprints
+    stop_fingerprint_pools()
+    # Closing the browsers unblocks jobs of cancelled requests so they release their profiles
+    close_chromium_sessions()
+    shutdown_crawl_process_pool()
+    await wait_for_profile_releases(drain.cancel_grace_seconds)
+    release_pending()
+    stop_display_pool()
+    logger.info("Metrics at shutdown: %s", json.dumps(snapshot_metrics(), default=str))
+    reset_drain()
 
 
 def create_app() -> FastAPI:
@@ -86,6 +131,11 @@ def create_app() -> FastAPI:
                     err["ctx"] = str(ctx)
             details.append(err)
         return JSONResponse(status_code=422, content={"detail": details})
+
+    # Cancels the request's browser work when its client hangs up
+    app.add_middleware(ClientDisconnectMiddleware)
+    # Outermost: answers 503 once draining and for requests cancelled at the drain deadline
+    app.add_middleware(DrainMiddleware)
     return app
 
 
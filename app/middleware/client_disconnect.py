@@ -0,0 +1,92 @@
+"""Cancel a request's browser work when its HTTP client disconnects.
+
+The request body is read up front (the API takes small JSON bodies) and
+replayed to the application, which frees the ASGI ``receive`` channel for a
+watcher that waits for ``http.disconnect``. When the client goes away before
+the response has started, the request's :class:`CancellationToken` is
+cancelled and the browser work checking it unwinds, closing its page and
+releasing its profile. A disconnect once the response has started is not a
+cancellation: the work is done, and a client that read a complete
+``Content-Length`` body may hang up before the final ASGI body message. A
+request cancelled at shutdown cancels its token too.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import List
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.cancellation import CancellationToken, RequestCancelled, cancellation_scope
+from app.core.metrics import get_counter
+
+logger = logging.getLogger(__name__)
+
+
+class ClientDisconnectMiddleware:
+    """Attach a cancellation token to each HTTP request and cancel it on client disconnect."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+        self._cancelled = get_counter(
+            "client_disconnect_cancellations_total", "Requests whose client disconnected before the response"
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        token = CancellationToken()
+        body: List[Message] = []
+        while True:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                return
+            body.append(message)
+            if not message.get("more_body", False):
+                break
+
+        disconnected = asyncio.Event()
+        response_started = False
+
+        async def watch_disconnect() -> None:
+            message = await receive()
+            while message["type"] != "http.disconnect":  # pragma: no cover - body was fully read
+                message = await receive()
+            # The server also reports a disconnect once the response has been sent
+            if not response_started:
+                token.cancel("client disconnected")
+                self._cancelled.inc()
+                logger.info("Client disconnected from %s; cancelling its browser work", scope.get("path"))
+            disconnected.set()
+
+        async def replay_receive() -> Message:
+            if body:
+                return body.pop(0)
+            await disconnected.wait()
+            return {"type": "http.disconnect"}
+
+        async def tracking_send(message: Message) -> None:
+            nonlocal response_started
+            response_started = response_started or message["type"] == "http.response.start"
+            await send(message)
+
+        watcher = asyncio.create_task(watch_disconnect())
+        try:
+            with cancellation_scope(token):
+                await self.app(scope, replay_receive, tracking_send)
+        except RequestCancelled:
+            if not token.cancelled:
+                raise
+            logger.debug("Request to %s cancelled: %s", scope.get("path"), token.reason)
+        except asyncio.CancelledError:
+            token.cancel("request cancelled")
+            raise
+        finally:
+            watcher.cancel()
+
+
+__all__ = ["ClientDisconnectMiddleware"]
@@ -22,6 +22,11 @@ class BrowseRequest(BaseModel):
         BrowserEngine.CAMOUFOX,
         description="Browser engine to use (defaults to camoufox)"
     )
+    profile: Optional[int] = Field(
+        None,
+        ge=0,
+        description="Profile pool slot to populate (defaults to the least-recently-used slot)"
+    )
 
 
 class BrowseResponse(BaseModel):
@@ -1,6 +1,7 @@
 import random
 import time
 
+from app.core.cancellation import check_cancelled
 from app.core.logging import get_logger
 from app.core.config import get_settings
 
@@ -10,6 +11,7 @@ logger = get_logger(__name__)
 def human_pause(min_s: float, max_s: float):
     delay = random.uniform(min_s, max_s)
     logger.debug(f"Human pause: chosen delay {delay:.2f}s")
+    check_cancelled()
     time.sleep(delay)
 
 
@@ -150,4 +152,5 @@ def scroll_noise(page, cycles_range=(1, 3), dy_range=(120, 480)):
         except Exception as e:
             logger.debug(f"Scroll noise: page.mouse.wheel not available ({type(e).__name__}); skipping rest")
             break
+        check_cancelled()
         time.sleep(random.uniform(0.08, 0.18))
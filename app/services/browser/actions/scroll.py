@@ -1,6 +1,7 @@
 from time import time, sleep
 from typing import Any, Optional
 
+from app.core.cancellation import check_cancelled
 from app.services.browser.actions.base import BasePageAction
 
 
@@ -31,6 +32,7 @@ class ScrollDownAction(BasePageAction):
 
         start = time()
         while time() - start < self.duration_s:
+            check_cancelled()
             if not self._scroll_once(page, self.step_px):
                 break
             if self.interval_s:
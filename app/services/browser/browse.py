@@ -1,5 +1,8 @@
 import importlib
 import logging
+from contextlib import contextmanager
+from typing import Optional
+
 import app.core.config as app_config
 from app.schemas.crawl import CrawlRequest
 from app.schemas.browse import BrowseRequest, BrowseResponse, BrowserEngine
@@ -7,6 +10,7 @@ from app.services.common.engine import CrawlerEngine
 from app.services.browser.actions.wait_for_close import WaitForUserCloseAction
 from app.services.common.browser import user_data as user_data_mod
 from app.services.common.browser import user_data_chromium
+from app.services.common.browser.profile_pool import profile_pool_from_settings
 from app.services.browser.executors.browse_executor import BrowseExecutor
 from app.services.browser.executors.chromium_browse_executor import ChromiumBrowseExecutor
 from app.services.browser.utils.error_advice import (
@@ -88,9 +92,10 @@ class BrowseCrawler:
             crawl_request = self._convert_browse_to_crawl_request(request)
 
             # Handle user data context for Camoufox only
+            profile_index = getattr(request, "profile", None)
             if request.engine == BrowserEngine.CAMOUFOX:
-                return self._run_camoufox_session(crawl_request)
-            return self._run_chromium_session(crawl_request)
+                return self._run_camoufox_session(crawl_request, profile_index)
+            return self._run_chromium_session(crawl_request, profile_index)
 
         except ImportError as e:
             advice = chromium_dependency_missing_advice(e)
@@ -112,14 +117,15 @@ class BrowseCrawler:
                 message=f"Error: {str(e)}",
             )
 
-    def _run_camoufox_session(self, crawl_request: CrawlRequest) -> BrowseResponse:
+    def _run_camoufox_session(self, crawl_request: CrawlRequest, profile_index: Optional[int] = None) -> BrowseResponse:
         """Run a Camoufox browse session with user data context."""
         settings = app_config.get_settings()
-        user_data_dir = getattr(
+        base_dir = getattr(
             settings, 'camoufox_user_data_dir', 'data/camoufox_profiles'
         ) or 'data/camoufox_profiles'
 
-        with CamoufoxRuntimeContext(settings, user_data_dir, user_data_context_fn=user_data_context):
+        with self._lease_profile(settings, base_dir, profile_index) as user_data_dir, \
+                CamoufoxRuntimeContext(settings, user_data_dir, user_data_context_fn=user_data_context):
             # Update crawl request with user-data enablement
             crawl_request.force_user_data = True
 
@@ -138,15 +144,35 @@ class BrowseCrawler:
                 message="Browser session completed successfully",
             )
 
-    def _run_chromium_session(self, crawl_request: CrawlRequest) -> BrowseResponse:
+    def _run_chromium_session(self, crawl_request: CrawlRequest, profile_index: Optional[int] = None) -> BrowseResponse:
         """Run a Chromium browse session with user data context."""
         settings = app_config.get_settings()
 
         # Get user data directory for Chromium
-        user_data_dir = getattr(
+        base_dir = getattr(
             settings, 'chromium_user_data_dir', 'data/chromium_profiles'
         )
 
+        with self._lease_profile(settings, base_dir, profile_index) as user_data_dir:
+            return self._run_chromium_profile_session(crawl_request, settings, user_data_dir)
+
+    @staticmethod
+    @contextmanager
+    def _lease_profile(settings, base_dir: Optional[str], profile_index: Optional[int]):
+        """Lease a profile slot for a write session; single-profile setups use ``base_dir`` as-is."""
+        if not base_dir:
+            yield base_dir
+            return
+        pool = profile_pool_from_settings(settings, base_dir)
+        if pool.size <= 1 and not profile_index:
+            yield base_dir
+            return
+        with pool.lease(index=profile_index) as lease:
+            logger.info(f"Browse session using profile slot {lease.index}")
+            yield lease.base_dir
+
+    def _run_chromium_profile_session(self, crawl_request: CrawlRequest, settings, user_data_dir: Optional[str]) -> BrowseResponse:
+        """Run a Chromium browse session against ``user_data_dir``."""
         manager_cls = _resolve_chromium_manager_cls()
         user_data_manager = manager_cls(user_data_dir)
         self.user_data_manager = user_data_manager  # Store for error handling
@@ -6,28 +6,47 @@ import asyncio
 from typing import Optional
 
 import app.core.config as app_config
+from app.core.request_context import runtime_setting
 from app.schemas.crawl import CrawlRequest, CrawlResponse
 from app.services.common.interfaces import IExecutor, PageAction
 from app.services.browser.options.resolver import OptionsResolver
 
 logger = logging.getLogger(__name__)
 
-# Try to import fetchers for Chromium support
-try:
-    from scrapling.fetchers import DynamicFetcher
-    DYNAMIC_FETCHER_AVAILABLE = True
-except ImportError:
-    DynamicFetcher = None
-    DYNAMIC_FETCHER_AVAILABLE = False
-    logger.warning("DynamicFetcher not available for Chromium support")
+# Chromium fetchers are imported on first use so that importing the browse API
+# does not load scrapling and Playwright. ``None`` availability means "not probed yet".
+DynamicFetcher = None
+DYNAMIC_FETCHER_AVAILABLE: Optional[bool] = None
+PersistentChromiumFetcher = None
+PERSISTENT_CHROMIUM_AVAILABLE: Optional[bool] = None
 
-try:
-    from app.services.browser.fetchers.persistent_chromium import PersistentChromiumFetcher
-    PERSISTENT_CHROMIUM_AVAILABLE = True
-except ImportError:
-    PersistentChromiumFetcher = None
-    PERSISTENT_CHROMIUM_AVAILABLE = False
-    logger.warning("PersistentChromiumFetcher not available")
+
+def _load_fetchers() -> None:
+    """Import the Chromium fetchers once, recording which ones are available."""
+    global DynamicFetcher, DYNAMIC_FETCHER_AVAILABLE
+    global PersistentChromiumFetcher, PERSISTENT_CHROMIUM_AVAILABLE
+
+    if DYNAMIC_FETCHER_AVAILABLE is None:
+        try:
+            from scrapling.fetchers import DynamicFetcher as dynamic_fetcher
+            DynamicFetcher = dynamic_fetcher
+            DYNAMIC_FETCHER_AVAILABLE = True
+        except ImportError:
+            DynamicFetcher = None
+            DYNAMIC_FETCHER_AVAILABLE = False
+            logger.warning("DynamicFetcher not available for Chromium support")
+
+    if PERSISTENT_CHROMIUM_AVAILABLE is None:
+        try:
+            from app.services.browser.fetchers.persistent_chromium import (
+                PersistentChromiumFetcher as persistent_fetcher,
+            )
+            PersistentChromiumFetcher = persistent_fetcher
+            PERSISTENT_CHROMIUM_AVAILABLE = True
+        except ImportError:
+            PersistentChromiumFetcher = None
+            PERSISTENT_CHROMIUM_AVAILABLE = False
+            logger.warning("PersistentChromiumFetcher not available")
 
 
 class ChromiumBrowseExecutor(IExecutor):
@@ -38,6 +57,7 @@ class ChromiumBrowseExecutor(IExecutor):
     """
 
     def __init__(self, options_resolver: Optional[OptionsResolver] = None):
+        _load_fetchers()
         if not DYNAMIC_FETCHER_AVAILABLE and not PERSISTENT_CHROMIUM_AVAILABLE:
             raise ImportError("Either DynamicFetcher or PersistentChromiumFetcher is required for Chromium support")
 
@@ -212,8 +232,8 @@ class ChromiumBrowseExecutor(IExecutor):
         if not request.force_headful:
             browser_args.append("--headless")
 
-        # Resolve user_data_dir to absolute path if provided via runtime settings
-        user_data_dir = getattr(settings, 'chromium_runtime_effective_user_data_dir', None)
+        # Resolve user_data_dir to absolute path if provided via the request context
+        user_data_dir = runtime_setting(settings, 'chromium_runtime_effective_user_data_dir')
         if user_data_dir:
             user_data_dir = os.path.abspath(user_data_dir)
             logger.debug(f"Using Chromium user data directory (absolute): {user_data_dir}")
@@ -237,6 +257,8 @@ class ChromiumBrowseExecutor(IExecutor):
         # Inject browser args only when using PersistentChromiumFetcher (i.e., user_data_dir present)
         if user_data_dir:
             fetch_kwargs["browser_args"] = browser_args
+            # Keep localStorage origins next to the master for storage_state-mode readers
+            fetch_kwargs["storage_state_path"] = os.path.join(user_data_dir, "storage_state.json")
 
         # Conditionally pass user_data_dir based on DynamicFetcher.fetch signature
         # and ensure additional_args["user_data_dir"] is set if supported.
@@ -0,0 +1,319 @@
+"""Long-lived Chromium sessions shared by keep-alive fetches.
+
+Launching Chromium (driver process, browser, profile load) dominates the cost
+of a short fetch. A :class:`ChromiumSession` keeps one Playwright driver and
+either a browser or a persistent context running and executes fetches on it,
+so repeated fetches only pay for a new page (or context).
+
+Playwright's sync API is bound to the thread that started it, so every session
+owns a worker thread and runs submitted jobs there, one at a time. Sessions are
+keyed by their launch options; a session that stayed idle for
+``chromium_keepalive_idle_seconds`` closes its browser and ends its thread.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import json
+import logging
+import os
+import queue
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from app.core.metrics import get_counter, get_gauge
+from app.services.common.browser.browser_fleet import connect_or_launch_chromium
+from app.services.common.browser.display_pool import lease_display
+
+logger = logging.getLogger(__name__)
+
+# Playwright is imported on first use so that importing this module (the
+# application lifespan does) stays cheap; None marks it unavailable.
+_UNRESOLVED: Any = object()
+sync_playwright: Any = _UNRESOLVED
+
+
+def _resolve_sync_playwright() -> Optional[Callable[[], Any]]:
+    global sync_playwright
+    if sync_playwright is _UNRESOLVED:
+        try:
+            from playwright.sync_api import sync_playwright as playwright_factory
+        except ImportError:  # pragma: no cover - playwright is a hard dependency in production
+            playwright_factory = None
+        sync_playwright = playwright_factory
+    return sync_playwright
+
+
+# Seconds close_chromium_sessions waits for each worker to shut its browser
+_CLOSE_TIMEOUT_SECONDS = 10.0
+
+
+class ChromiumSessionClosed(RuntimeError):
+    """Raised for jobs that were still queued when their session shut down."""
+
+
+class _Job:
+    def __init__(self, fn: Callable[[Any, bool], Any]) -> None:
+        self.fn = fn
+        # Run in the submitter's context so the job sees its request's cancellation token
+        self.context = contextvars.copy_context()
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+    def execute(self, target: Any, first_use: bool) -> None:
+        try:
+            self.result = self.context.run(self.fn, target, first_use)
+        except BaseException as exc:
+            self.error = exc
+
+    def complete(self) -> None:
+        self.done.set()
+
+    def fail(self, error: BaseException) -> None:
+        self.error = error
+        self.done.set()
+
+    def wait(self) -> Any:
+        self.done.wait()
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+class ChromiumSession:
+    """A Playwright driver and browser (or persistent context) owned by one worker thread."""
+
+    def __init__(
+        self,
+        pool: "ChromiumSessionPool",
+        key: Hashable,
+        *,
+        user_data_dir: Optional[str],
+        launch_options: Dict[str, Any],
+    ) -> None:
+        self.pool = pool
+        self.key = key
+        self.user_data_dir = user_data_dir
+        self.launch_options = dict(launch_options)
+        self.closed = False
+        self._jobs: "queue.Queue[Optional[_Job]]" = queue.Queue()
+        self._disconnected = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="chromium-session", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def submit(self, job: _Job) -> None:
+        self._jobs.put(job)
+
+    def stop(self) -> None:
+        """Ask the worker to close the browser once queued jobs finished."""
+        self._jobs.put(None)
+
+    def join(self, timeout: Optional[float] = None) -> None:
+        if self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+
+    def _run(self) -> None:
+        try:
+            headful = self.launch_options.get("headless") is False
+            with lease_display(headful=headful) as display, self.pool.driver_factory() as playwright:
+                options = dict(self.launch_options)
+                if display:
+                    options["env"] = {**os.environ, "DISPLAY": display}
+                if self.user_data_dir:
+                    target = playwright.chromium.launch_persistent_context(
+                        user_data_dir=self.user_data_dir, **options
+                    )
+                else:
+                    target = connect_or_launch_chromium(playwright, **options)
+                event = "close" if self.user_data_dir else "disconnected"
+                try:
+                    target.on(event, lambda *_args: self._disconnected.set())
+                except Exception:
+                    pass
+                self.pool._launches.inc()
+                logger.debug(f"Started keep-alive Chromium session ({len(self.pool)} running)")
+                try:
+                    self._serve(target)
+                finally:
+                    try:
+                        target.close()
+                    except Exception as exc:
+                        logger.debug(f"Error closing keep-alive Chromium session: {exc}")
+        except BaseException as exc:
+            logger.warning(f"Keep-alive Chromium session failed: {exc}")
+            self._finish(exc)
+            return
+        self._finish(ChromiumSessionClosed("Chromium session closed"))
+
+    def _serve(self, target: Any) -> None:
+        first_use = True
+        while True:
+            try:
+                job = self._jobs.get(timeout=self.pool.idle_seconds)
+            except queue.Empty:
+                if self.pool._retire_if_idle(self):
+                    return
+                continue
+            if job is None:
+                return
+            if not first_use:
+                self.pool._reuses.inc()
+            job.execute(target, first_use)
+            first_use = False
+            lost = self._disconnected.is_set()
+            if lost:
+                # Unregister before waking the caller so its next fetch launches a new session
+                logger.warning("Keep-alive Chromium session lost its browser; relaunching on next fetch")
+                self.pool._forget(self)
+            job.complete()
+            if lost:
+                return
+
+    def _finish(self, error: BaseException) -> None:
+        """Unregister and fail whatever is still queued so callers can retry on a new session."""
+        self.pool._forget(self)
+        while True:
+            try:
+                job = self._jobs.get_nowait()
+            except queue.Empty:
+                break
+            if job is not None:
+                job.fail(error)
+
+
+def session_key(user_data_dir: Optional[str], launch_options: Dict[str, Any]) -> Tuple[Optional[str], str]:
+    """Sessions are shared by fetches with the same profile and launch options."""
+    return user_data_dir, json.dumps(launch_options, sort_keys=True, default=str)
+
+
+class ChromiumSessionPool:
+    """Registry of running sessions keyed by profile and launch options."""
+
+    def __init__(self, idle_seconds: float, driver_factory: Optional[Callable[[], Any]] = None) -> None:
+        self.idle_seconds = max(0.1, float(idle_seconds))
+        self.driver_factory = driver_factory or _resolve_sync_playwright()
+        self._lock = threading.Lock()
+        self._sessions: Dict[Hashable, ChromiumSession] = {}
+        self._launches = get_counter("chromium_session_launches_total", "Keep-alive Chromium sessions launched")
+        self._reuses = get_counter("chromium_session_reuses_total", "Fetches served by an already running session")
+        self._gauge = get_gauge("chromium_sessions", "Running keep-alive Chromium sessions")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._sessions)
+
+    def run(
+        self,
+        fn: Callable[[Any, bool], Any],
+        *,
+        user_data_dir: Optional[str] = None,
+        launch_options: Optional[Dict[str, Any]] = None,
+    ) -> Any:
+        """Run ``fn(target, first_use)`` on the matching session and return its result.
+
+        ``target`` is the persistent ``BrowserContext`` when ``user_data_dir`` is
+        given and the ``Browser`` otherwise; ``first_use`` is True for the first
+        job of a freshly launched session.
+        """
+        launch_options = dict(launch_options or {})
+        key = session_key(user_data_dir, launch_options)
+        job = _Job(fn)
+        with self._lock:
+            session = self._sessions.get(key)
+            if session is None:
+                session = ChromiumSession(self, key, user_data_dir=user_data_dir, launch_options=launch_options)
+                self._sessions[key] = session
+                session.start()
+                self._gauge.set(len(self._sessions))
+            session.submit(job)
+        return job.wait()
+
+    def close(self, user_data_dir: Optional[str] = None, timeout: float = _CLOSE_TIMEOUT_SECONDS) -> None:
+        """Close every session, or only those on ``user_data_dir``."""
+        with self._lock:
+            sessions = [
+                session
+                for session in self._sessions.values()
+                if user_data_dir is None or session.user_data_dir == user_data_dir
+            ]
+            for session in sessions:
+                self._sessions.pop(session.key, None)
+                session.closed = True
+            self._gauge.set(len(self._sessions))
+        for session in sessions:
+            session.stop()
+        for session in sessions:
+            session.join(timeout)
+
+    def _retire_if_idle(self, session: ChromiumSession) -> bool:
+        """Unregister ``session`` unless a job slipped in; jobs are only queued under the lock."""
+        with self._lock:
+            if not session._jobs.empty():
+                return False
+            self._unregister_locked(session)
+            return True
+
+    def _forget(self, session: ChromiumSession) -> None:
+        with self._lock:
+            self._unregister_locked(session)
+
+    def _unregister_locked(self, session: ChromiumSession) -> None:
+        if self._sessions.get(session.key) is session:
+            del self._sessions[session.key]
+        session.closed = True
+        self._gauge.set(len(self._sessions))
+
+
+_pool: Optional[ChromiumSessionPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_chromium_session_pool(settings=None) -> Optional[ChromiumSessionPool]:
+    """Return the process-wide pool, or None when keep-alive sessions are disabled."""
+    global _pool
+    if settings is None:
+        from app.core.config import get_settings
+
+        settings = get_settings()
+    idle_seconds = getattr(settings, "chromium_keepalive_idle_seconds", 0)
+    if isinstance(idle_seconds, bool) or not isinstance(idle_seconds, (int, float)) or idle_seconds <= 0:
+        return None
+    if _resolve_sync_playwright() is None:
+        return None
+    with _pool_lock:
+        if _pool is None:
+            _pool = ChromiumSessionPool(idle_seconds)
+        else:
+            _pool.idle_seconds = max(0.1, float(idle_seconds))
+        return _pool
+
+
+def close_chromium_sessions() -> None:
+    """Close every keep-alive session (application shutdown)."""
+    with _pool_lock:
+        pool = _pool
+    if pool is not None:
+        pool.close()
+
+
+def reset_chromium_sessions() -> None:
+    """Close and forget the process-wide pool (for tests)."""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.close(timeout=1.0)
+
+
+__all__ = [
+    "ChromiumSession",
+    "ChromiumSessionClosed",
+    "ChromiumSessionPool",
+    "close_chromium_sessions",
+    "get_chromium_session_pool",
+    "reset_chromium_sessions",
+    "session_key",
+]
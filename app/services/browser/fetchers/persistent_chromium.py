@@ -6,10 +6,16 @@ to ensure Chromium profiles are properly saved and maintained, unlike DynamicFet
 which uses ephemeral contexts.
 """
 
+import json
 import logging
 import os
 from typing import Any, Callable, Dict, Optional, Union
 
+from app.services.browser.fetchers.chromium_sessions import ChromiumSessionClosed, get_chromium_session_pool
+from app.services.common.browser.browser_fleet import connect_or_launch_chromium
+from app.services.common.browser.display_pool import lease_display
+from app.services.common.browser.subresource_cache import get_subresource_cache
+
 logger = logging.getLogger(__name__)
 
 try:
@@ -51,17 +57,30 @@ class PersistentChromiumFetcher:
     across sessions.
     """
 
-    def __init__(self, user_data_dir: Optional[str] = None):
+    def __init__(
+        self,
+        user_data_dir: Optional[str] = None,
+        storage_state: Optional[Dict[str, Any]] = None,
+        keep_alive: bool = False,
+    ):
         """
         Initialize the fetcher with optional user data directory.
 
         Args:
             user_data_dir: Directory to store Chromium profile data
+            storage_state: Playwright storage_state seeding ephemeral contexts
+                (ignored when ``user_data_dir`` is set)
+            keep_alive: Run fetches on a shared long-lived browser (see
+                ``chromium_keepalive_idle_seconds``) instead of launching one per fetch.
+                Only for callers that do not rely on the context closing after the
+                fetch, and whose ``user_data_dir`` outlives the fetch.
         """
         if not PLAYWRIGHT_AVAILABLE:
             raise ImportError("Playwright is required for persistent Chromium support")
 
         self.user_data_dir = os.path.abspath(user_data_dir) if user_data_dir else None
+        self.storage_state = storage_state
+        self.keep_alive = keep_alive
         self.playwright: Optional[Playwright] = None
         self.context: Optional[BrowserContext] = None
 
@@ -79,6 +98,7 @@ class PersistentChromiumFetcher:
         extra_headers: Optional[Dict[str, str]] = None,
         useragent: Optional[str] = None,
         wait: Union[int, float] = 0,
+        storage_state_path: Optional[str] = None,
         **kwargs
     ) -> PageResult:
         """
@@ -94,22 +114,40 @@ class PersistentChromiumFetcher:
             extra_headers: Extra HTTP headers
             useragent: Custom user agent string
             wait: Time to wait after page load in milliseconds
+            storage_state_path: Where to save the context's storage_state once the page action finished
             **kwargs: Additional arguments ignored for compatibility
 
         Returns:
             PageResult object with page content
         """
+        if self.keep_alive:
+            session_pool = get_chromium_session_pool()
+            if session_pool is not None:
+                return self._fetch_with_session(
+                    session_pool,
+                    url,
+                    launch_options={"headless": headless, "args": list(browser_args or [])},
+                    page_options=dict(
+                        page_action=page_action, timeout=timeout, network_idle=network_idle, wait=wait
+                    ),
+                    extra_headers=extra_headers,
+                    useragent=useragent,
+                    storage_state_path=storage_state_path,
+                )
+
         if self.user_data_dir:
             logger.debug(f"Using persistent Chromium context: {self.user_data_dir}")
         else:
             logger.debug("Using ephemeral Chromium context")
 
         try:
-            with sync_playwright() as p:
+            with lease_display(headful=not headless) as display, sync_playwright() as p:
                 self.playwright = p
 
                 # Prepare browser arguments
                 args = browser_args or []
+                # Headful browsers draw into a pooled virtual display when one is configured
+                launch_env = {"env": {**os.environ, "DISPLAY": display}} if display else {}
 
                 if self.user_data_dir:
                     # Use persistent context for profile persistence
@@ -117,6 +155,7 @@ class PersistentChromiumFetcher:
                         "user_data_dir": self.user_data_dir,
                         "headless": headless,
                         "args": args,
+                        **launch_env,
                     }
 
                     # Add extra headers if provided
@@ -130,43 +169,37 @@ class PersistentChromiumFetcher:
                     self.context = p.chromium.launch_persistent_context(**context_options)
                     logger.debug("Launched persistent Chromium context")
                 else:
-                    # Use regular launch for temporary sessions
-                    browser = p.chromium.launch(headless=headless, args=args)
+                    # Temporary sessions attach to the browser fleet when one runs, else launch
+                    browser = connect_or_launch_chromium(p, headless=headless, args=args, **launch_env)
                     context_options = {}
 
                     if extra_headers:
                         context_options["extra_http_headers"] = extra_headers
                     if useragent:
                         context_options["user_agent"] = useragent
+                    if self.storage_state:
+                        context_options["storage_state"] = self.storage_state
 
                     self.context = browser.new_context(**context_options)
-                    logger.debug("Launched ephemeral Chromium context")
+                    seeded = " seeded from storage_state" if self.storage_state else ""
+                    logger.debug(f"Launched ephemeral Chromium context{seeded}")
+
+                self._install_subresource_cache()
 
                 # Create and navigate to page
                 page = self.context.new_page()
+                if storage_state_path:
+                    # Interactive sessions usually end with the user closing the page;
+                    # capture localStorage while the context is still alive
+                    page.on("close", lambda _page: self._save_storage_state(storage_state_path))
 
                 try:
-                    # Navigate to URL with timeout
-                    page.goto(url, timeout=timeout)
-
-                    # Wait for network idle if requested
-                    if network_idle:
-                        page.wait_for_load_state("networkidle", timeout=timeout)
+                    html_content = self._load_page(
+                        page, url, page_action=page_action, timeout=timeout, network_idle=network_idle, wait=wait
+                    )
 
-                    # Wait additional time if specified
-                    if wait > 0:
-                        page.wait_for_timeout(wait)
-
-                    # Execute page action if provided
-                    if page_action:
-                        try:
-                            result = page_action(page)
-                            logger.debug(f"Page action executed successfully: {result}")
-                        except Exception as e:
-                            logger.warning(f"Page action failed: {e}")
-
-                    # Get page content
-                    html_content = page.content()
+                    if storage_state_path:
+                        self._save_storage_state(storage_state_path)
 
                     # Return result object
                     return PageResult(page=page, html_content=html_content)
@@ -183,6 +216,121 @@ class PersistentChromiumFetcher:
             logger.error(f"Persistent Chromium fetch failed: {e}")
             raise
 
+    @staticmethod
+    def _load_page(
+        page: Page,
+        url: str,
+        *,
+        page_action: Optional[Callable[[Page], Any]],
+        timeout: int,
+        network_idle: bool,
+        wait: Union[int, float],
+    ) -> str:
+        """Navigate ``page``, run the page action and return the resulting HTML."""
+        # Navigate to URL with timeout
+        page.goto(url, timeout=timeout)
+
+        # Wait for network idle if requested
+        if network_idle:
+            page.wait_for_load_state("networkidle", timeout=timeout)
+
+        # Wait additional time if specified
+        if wait > 0:
+            page.wait_for_timeout(wait)
+
+        # Execute page action if provided
+        if page_action:
+            try:
+                result = page_action(page)
+                logger.debug(f"Page action executed successfully: {result}")
+            except Exception as e:
+                logger.warning(f"Page action failed: {e}")
+
+        return page.content()
+
+    def _fetch_with_session(
+        self,
+        session_pool,
+        url: str,
+        *,
+        launch_options: Dict[str, Any],
+        page_options: Dict[str, Any],
+        extra_headers: Optional[Dict[str, str]],
+        useragent: Optional[str],
+        storage_state_path: Optional[str],
+    ) -> PageResult:
+        """Fetch on a long-lived session: a new page (persistent) or context (ephemeral) per call."""
+        if self.user_data_dir:
+            # Persistent contexts fix headers and user agent at launch
+            if extra_headers:
+                launch_options["extra_http_headers"] = extra_headers
+            if useragent:
+                launch_options["user_agent"] = useragent
+        context_options: Dict[str, Any] = {}
+        if not self.user_data_dir:
+            if extra_headers:
+                context_options["extra_http_headers"] = extra_headers
+            if useragent:
+                context_options["user_agent"] = useragent
+            if self.storage_state:
+                context_options["storage_state"] = self.storage_state
+
+        def run(target: Any, first_use: bool) -> PageResult:
+            context = target if self.user_data_dir else target.new_context(**context_options)
+            try:
+                if first_use or not self.user_data_dir:
+                    self._install_subresource_cache(context)
+                page = context.new_page()
+                try:
+                    html_content = self._load_page(page, url, **page_options)
+                    final_url = page.url
+                    if storage_state_path:
+                        self._save_storage_state(storage_state_path, context)
+                finally:
+                    try:
+                        page.close()
+                    except Exception:
+                        pass
+            finally:
+                if not self.user_data_dir:
+                    context.close()
+            # The page lives on the session's thread; hand back a detached result
+            result = PageResult(page=None, html_content=html_content)
+            result.url = final_url
+            return result
+
+        try:
+            try:
+                return session_pool.run(run, user_data_dir=self.user_data_dir, launch_options=launch_options)
+            except ChromiumSessionClosed:
+                # The browser went away under a queued fetch; one retry relaunches it
+                return session_pool.run(run, user_data_dir=self.user_data_dir, launch_options=launch_options)
+        except Exception as e:
+            logger.error(f"Keep-alive Chromium fetch failed: {e}")
+            raise
+
+    def _install_subresource_cache(self, context: Optional[BrowserContext] = None) -> None:
+        """Serve static sub-resources from the shared on-disk cache when it is configured."""
+        try:
+            cache = get_subresource_cache()
+            if cache is not None:
+                cache.install(context or self.context)
+                logger.debug(f"Serving static sub-resources from shared cache at {cache.root}")
+        except Exception as e:
+            logger.debug(f"Shared sub-resource cache unavailable: {e}")
+
+    def _save_storage_state(self, path: str, context: Optional[BrowserContext] = None) -> None:
+        """Best-effort atomic dump of the live context's storage_state to ``path``."""
+        try:
+            state = (context or self.context).storage_state()
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as handle:
+                json.dump(state, handle)
+            os.replace(tmp_path, path)
+            logger.debug(f"Saved Chromium storage_state to {path}")
+        except Exception as e:
+            logger.debug(f"Could not save Chromium storage_state to {path}: {e}")
+
     def close(self):
         """Close the browser context and cleanup resources."""
         if self.context:
@@ -6,6 +6,8 @@ import os
 from dataclasses import dataclass
 from typing import Literal, Optional
 
+from app.core.request_context import runtime_setting
+
 
 LogLevel = Literal["warning", "error"]
 
@@ -58,7 +60,7 @@ class ChromiumErrorAdvisor:
 
         if any(keyword in message for keyword in ("corrupt", "corrupted", "database is corrupted")):
             profile_path = (
-                getattr(self._settings, "chromium_runtime_effective_user_data_dir", None)
+                runtime_setting(self._settings, "chromium_runtime_effective_user_data_dir")
                 or os.path.abspath(self._user_data_dir)
             )
             error_msg = (
@@ -92,7 +94,7 @@ class ChromiumErrorAdvisor:
     def handle_known_exception(self, error: Exception) -> ErrorAdvice:
         if isinstance(error, PermissionError):
             target_dir = (
-                getattr(self._settings, "chromium_runtime_effective_user_data_dir", None)
+                runtime_setting(self._settings, "chromium_runtime_effective_user_data_dir")
                 or os.path.abspath(self._user_data_dir)
             )
             message = (
@@ -161,7 +163,7 @@ class ChromiumErrorAdvisor:
 
         if isinstance(error, OSError):
             target_dir = (
-                getattr(self._settings, "chromium_runtime_effective_user_data_dir", None)
+                runtime_setting(self._settings, "chromium_runtime_effective_user_data_dir")
                 or os.path.abspath(self._user_data_dir)
             )
             message = (
@@ -1,4 +1,8 @@
-"""Context managers encapsulating runtime flag management for browse sessions."""
+"""Context managers encapsulating runtime flag management for browse sessions.
+
+The flags live in the request context (:mod:`app.core.request_context`), not on
+the shared settings object, so concurrent sessions do not see each other's.
+"""
 
 from __future__ import annotations
 
@@ -6,6 +10,8 @@ import os
 from contextlib import contextmanager
 from typing import Callable, ContextManager, Optional, Tuple
 
+from app.core.request_context import request_context
+
 
 CleanupFn = Optional[Callable[[], None]]
 UserDataContextFn = Callable[[str, str], ContextManager[Tuple[str | None, CleanupFn]]]
@@ -20,42 +26,33 @@ def CamoufoxRuntimeContext(
 ):
     """Manage Camoufox runtime flags for user-data write sessions."""
 
-    previous_mute = bool(getattr(settings, "camoufox_runtime_force_mute_audio", False))
-    previous_mode = getattr(settings, "camoufox_runtime_user_data_mode", None)
-    previous_effective = getattr(settings, "camoufox_runtime_effective_user_data_dir", None)
-
     cleanup: CleanupFn = None
-    settings.camoufox_runtime_force_mute_audio = True
-
     try:
-        with user_data_context_fn(user_data_dir, "write") as (effective_dir, cleanup):
-            settings.camoufox_runtime_user_data_mode = "write"
-            settings.camoufox_runtime_effective_user_data_dir = effective_dir
-            yield effective_dir, cleanup
+        with request_context(camoufox_runtime_force_mute_audio=True):
+            with user_data_context_fn(user_data_dir, "write") as (effective_dir, cleanup):
+                with request_context(
+                    camoufox_runtime_user_data_mode="write",
+                    camoufox_runtime_effective_user_data_dir=effective_dir,
+                ):
+                    yield effective_dir, cleanup
     finally:
-        settings.camoufox_runtime_user_data_mode = previous_mode
-        settings.camoufox_runtime_effective_user_data_dir = previous_effective
         if callable(cleanup):
             cleanup()
-        settings.camoufox_runtime_force_mute_audio = previous_mute
 
 
 @contextmanager
 def ChromiumRuntimeContext(settings, manager, *, mode: str = "write"):
     """Manage Chromium runtime flags while a user-data context is active."""
 
-    previous_mode = getattr(settings, "chromium_runtime_user_data_mode", None)
-    previous_effective = getattr(settings, "chromium_runtime_effective_user_data_dir", None)
-
     cleanup: CleanupFn = None
     try:
         with manager.get_user_data_context(mode) as (effective_dir, cleanup):
             absolute_dir = os.path.abspath(effective_dir) if effective_dir else None
-            settings.chromium_runtime_user_data_mode = mode
-            settings.chromium_runtime_effective_user_data_dir = absolute_dir
-            yield absolute_dir, cleanup
+            with request_context(
+                chromium_runtime_user_data_mode=mode,
+                chromium_runtime_effective_user_data_dir=absolute_dir,
+            ):
+                yield absolute_dir, cleanup
     finally:
-        settings.chromium_runtime_user_data_mode = previous_mode
-        settings.chromium_runtime_effective_user_data_dir = previous_effective
         if callable(cleanup):
             cleanup()
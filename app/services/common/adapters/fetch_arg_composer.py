@@ -3,6 +3,8 @@
 import logging
 from typing import Any, Dict, Iterable, Optional
 from app.services.common.adapters.fetch_params import FetchParams
+from app.services.common.browser.fingerprint_pool import take_fingerprint
+from app.services.common.browser.geoip_cache import get_geoip_cache
 from app.services.common.types import FetchCapabilities
 from app.services.crawler.proxy.redact import redact_proxy as _redact_proxy
 
@@ -55,10 +57,11 @@ class FetchArgComposer:
         else:
             logger.debug("No proxy used for this request")
 
-        if getattr(caps, "supports_geoip", False):
-            fetch_kwargs["geoip"] = True
-
         cls._apply_user_data(fetch_kwargs, caps, additional_args or {})
+        cls._apply_fingerprint(fetch_kwargs, caps, additional_args or {}, proxy, settings)
+
+        if getattr(caps, "supports_geoip", False):
+            cls._apply_geoip(fetch_kwargs, caps, proxy, settings)
         cls._apply_headers(fetch_kwargs, caps, extra_headers)
 
         if cls._supports(caps, "page_action") and page_action is not None:
@@ -111,6 +114,64 @@ class FetchArgComposer:
         except Exception:
             fetch_kwargs["additional_args"] = dict(additional_args)
 
+    @classmethod
+    def _apply_fingerprint(
+        cls,
+        fetch_kwargs: FetchParams,
+        caps: FetchCapabilities,
+        additional_args: Dict[str, Any],
+        proxy: Optional[str],
+        settings: Any,
+    ) -> None:
+        """Attach a pre-generated Camoufox fingerprint when the fingerprint pool is enabled.
+
+        The fingerprint is pinned to the profile slot when user data is used,
+        otherwise to the proxy, so either presents a consistent identity.
+        """
+        if not cls._supports(caps, "additional_args") or "fingerprint" in additional_args:
+            return
+        pin = additional_args.get("_fingerprint_pin")
+        if not isinstance(pin, str):
+            pin = f"proxy:{proxy}" if proxy else None
+        try:
+            fingerprint = take_fingerprint("camoufox", settings, pin)
+        except Exception as exc:
+            logger.warning(f"Fingerprint pool unavailable: {exc}")
+            return
+        if fingerprint is not None:
+            launch_args = dict(fetch_kwargs.get("additional_args") or {})
+            launch_args["fingerprint"] = fingerprint
+            fetch_kwargs["additional_args"] = launch_args
+
+    @classmethod
+    def _apply_geoip(
+        cls,
+        fetch_kwargs: FetchParams,
+        caps: FetchCapabilities,
+        proxy: Optional[str],
+        settings: Any,
+    ) -> None:
+        """Pass cached geo settings for the egress, or let Camoufox resolve them (geoip=True)."""
+        cache = get_geoip_cache(settings) if cls._supports(caps, "additional_args") else None
+        resolution = cache.get(proxy) if cache is not None else None
+        if resolution is None:
+            fetch_kwargs["geoip"] = True
+            return
+
+        geo_config, geo_prefs = resolution.launch_config()
+        launch_args = dict(fetch_kwargs.get("additional_args") or {})
+        config = dict(launch_args.get("config") or {})
+        for key, value in geo_config.items():
+            config.setdefault(key, value)
+        launch_args["config"] = config
+        if geo_prefs:
+            prefs = dict(launch_args.get("firefox_user_prefs") or {})
+            for key, value in geo_prefs.items():
+                prefs.setdefault(key, value)
+            launch_args["firefox_user_prefs"] = prefs
+        fetch_kwargs["additional_args"] = launch_args
+        logger.debug(f"Using cached GeoIP settings for {_redact_proxy(proxy) or 'direct'} egress")
+
     @classmethod
     def _apply_headers(
         cls,
@@ -1,9 +1,13 @@
+import contextvars
 import inspect
 import logging
 import threading
 from typing import Any, Dict, Optional, Union
+from app.core.cancellation import RequestCancelled, check_cancelled
 from app.services.common.interfaces import IFetchClient
 from app.services.common.adapters.fetch_params import FetchParams
+from app.services.common.browser.display_pool import lease_display
+from app.services.common.browser.memory_governor import admit_browser_launch
 from app.services.common.types import FetchCapabilities
 import asyncio
 import sys
@@ -18,17 +22,33 @@ logger = logging.getLogger(__name__)
 class ScraplingFetcherAdapter(IFetchClient):
     """Adapter for Scrapling's StealthyFetcher that bridges to OOP interfaces."""
 
+    # Signature introspection is shared by every adapter, keyed by the fetch callable it inspected
+    _capability_cache: Dict[Any, FetchCapabilities] = {}
+    _capability_lock = threading.Lock()
+
     def __init__(self):
-        self._capabilities: Optional[FetchCapabilities] = None
         self._user_data_cleanup = None
 
     def detect_capabilities(self) -> FetchCapabilities:
         """Detect fetch capabilities by introspecting StealthyFetcher.fetch signature."""
-        if self._capabilities is not None:
-            return self._capabilities
         try:
-            StealthyFetcher = self._get_stealthy_fetcher()
-            _sig = inspect.signature(StealthyFetcher.fetch)
+            fetch = self._get_stealthy_fetcher().fetch
+        except Exception:
+            fetch = None
+        try:
+            cached = self._capability_cache.get(fetch)
+        except TypeError:  # unhashable fetch callable; introspect every time
+            return self._introspect_capabilities(fetch)
+        if cached is not None:
+            return cached
+        capabilities = self._introspect_capabilities(fetch)
+        with self._capability_lock:
+            return self._capability_cache.setdefault(fetch, capabilities)
+
+    @staticmethod
+    def _introspect_capabilities(fetch: Any) -> FetchCapabilities:
+        try:
+            _sig = inspect.signature(fetch)
             _fetch_params = set(_sig.parameters.keys())
             _has_varkw = any(p.kind == inspect.Parameter.VAR_KEYWORD for p in _sig.parameters.values())
         except Exception:
@@ -37,7 +57,7 @@ class ScraplingFetcherAdapter(IFetchClient):
 
         def _ok(name: str) -> bool:
             return (name in _fetch_params) or _has_varkw
-        self._capabilities = FetchCapabilities(
+        return FetchCapabilities(
             supports_proxy=_ok("proxy"),
             supports_network_idle=_ok("network_idle"),
             supports_timeout=_ok("timeout"),
@@ -51,13 +71,12 @@ class ScraplingFetcherAdapter(IFetchClient):
             supports_user_data=_ok("user_data"),
             supports_custom_config=_ok("custom_config"),
         )
-        return self._capabilities
 
     def fetch(self, url: str, args: Union[FetchParams, Dict[str, Any], None]) -> Any:
         """Fetch the given URL using StealthyFetcher with thread safety."""
         logger.debug(f"Launching browser for URL: {url}")
-        StealthyFetcher = self._get_stealthy_fetcher()
-        StealthyFetcher.adaptive = True
+        # Nobody is waiting for the result of a cancelled request
+        check_cancelled()
         params = args if isinstance(args, FetchParams) else FetchParams(args or {})
         return self._run_with_event_loop(url, params)
 
@@ -90,9 +109,10 @@ class ScraplingFetcherAdapter(IFetchClient):
                     except Exception:
                         pass
                 holder["result"] = self._fetch_with_retry(url, params)
-            except Exception as e:
+            except (Exception, RequestCancelled) as e:
                 holder["exc"] = e
-        t = threading.Thread(target=_runner, daemon=True)
+        # Carry the caller's request context (runtime user-data overrides) into the thread
+        t = threading.Thread(target=contextvars.copy_context().run, args=(_runner,), daemon=True)
         t.start()
         t.join()
         if "exc" in holder:
@@ -116,7 +136,18 @@ class ScraplingFetcherAdapter(IFetchClient):
 
     def _execute_fetch(self, url: str, params: FetchParams) -> Any:
         StealthyFetcher = self._get_stealthy_fetcher()
-        return StealthyFetcher.fetch(url, **params.as_kwargs())
+        # Every StealthyFetcher.fetch launches a browser; wait for memory first
+        admit_browser_launch()
+        kwargs = params.as_kwargs()
+        if self.detect_capabilities().supports_custom_config:
+            # Per-request parser config; setting StealthyFetcher.adaptive would affect every caller
+            kwargs["custom_config"] = {"adaptive": True, **(kwargs.get("custom_config") or {})}
+        with lease_display(headful=kwargs.get("headless") is False) as display:
+            if display is not None:
+                additional_args = dict(kwargs.get("additional_args") or {})
+                additional_args["virtual_display"] = display
+                kwargs["additional_args"] = additional_args
+            return StealthyFetcher.fetch(url, **kwargs)
 
     @staticmethod
     def _is_geoip_error(exc: Exception) -> bool:
@@ -0,0 +1,360 @@
+"""Out-of-process Chromium fleet that survives API worker restarts.
+
+Browsers launched inside a uvicorn worker die with it, so every deploy or
+reload throws away warm browsers. The fleet supervisor runs as its own process::
+
+    python -m app.services.common.browser.browser_fleet
+
+It keeps ``browser_fleet_size`` Chromium processes running with a DevTools
+(CDP) endpoint, restarts those that exit, and publishes their websocket
+endpoints in ``<browser_fleet_dir>/endpoints.json`` together with a heartbeat.
+API workers read that file and attach to a fleet browser with
+``connect_over_cdp`` (or Scrapling's ``cdp_url``) instead of launching their
+own, creating a fresh context per fetch. When the file is missing, stale or the
+endpoint refuses the connection, they fall back to launching locally.
+
+Only profile-less Chromium fetches use the fleet: persistent user-data
+directories are per process, and Camoufox has no CDP endpoint that Scrapling's
+StealthyFetcher can attach to. Endpoints listen on 127.0.0.1 only.
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import logging
+import os
+import shutil
+import signal
+import subprocess
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+from app.core.metrics import get_counter
+from app.services.common.browser.json_cache import file_identity, json_file_cache
+
+logger = logging.getLogger(__name__)
+
+ENDPOINTS_FILENAME = "endpoints.json"
+FORMAT_VERSION = 1
+# Seconds between supervisor health checks and heartbeats
+HEARTBEAT_SECONDS = 5.0
+# Endpoint files whose heartbeat is older than this many intervals are ignored
+_STALE_HEARTBEATS = 3
+# How long a new browser may take to publish its DevTools endpoint
+_START_TIMEOUT_SECONDS = 30.0
+_MAX_RESTART_BACKOFF_SECONDS = 60.0
+_DEFAULT_ARGS = (
+    "--no-first-run",
+    "--no-default-browser-check",
+    "--disable-dev-shm-usage",
+    "--disable-background-networking",
+    "--mute-audio",
+)
+
+_fleet_connects = get_counter("browser_fleet_connects_total", "Fetches served by an out-of-process fleet browser")
+_fleet_fallbacks = get_counter("browser_fleet_fallbacks_total", "Fleet connections that failed over to a local launch")
+
+
+# -- Client side (API workers) ---------------------------------------------------
+
+
+def _fleet_dir(settings) -> Optional[str]:
+    value = getattr(settings, "browser_fleet_dir", None)
+    return value if isinstance(value, str) and value else None
+
+
+def read_fleet_endpoints(fleet_dir: str, now: Optional[float] = None) -> List[Dict[str, Any]]:
+    """Return the browsers published by a live supervisor, or [] when none is running."""
+    path = Path(fleet_dir) / ENDPOINTS_FILENAME
+    identity = file_identity(path)
+    if identity is None:
+        return []
+    found, data = json_file_cache.get(path, identity)
+    if not found:
+        try:
+            with open(path, "r", encoding="utf-8") as handle:
+                data = json.load(handle)
+        except (OSError, ValueError):
+            return []
+        json_file_cache.put(path, identity, data)
+    if not isinstance(data, dict) or data.get("version") != FORMAT_VERSION:
+        return []
+    heartbeat = data.get("heartbeat")
+    interval = data.get("interval", HEARTBEAT_SECONDS)
+    now = time.time() if now is None else now
+    if not isinstance(heartbeat, (int, float)) or now - heartbeat > _STALE_HEARTBEATS * interval:
+        return []
+    browsers = data.get("browsers")
+    return [entry for entry in browsers if isinstance(entry, dict) and entry.get("ws")] if browsers else []
+
+
+_round_robin = itertools.count()
+
+
+def fleet_endpoint(settings=None, *, headless: bool = True) -> Optional[str]:
+    """Return a CDP websocket URL of a fleet browser matching ``headless``, or None."""
+    if settings is None:
+        from app.core.config import get_settings
+
+        settings = get_settings()
+    fleet_dir = _fleet_dir(settings)
+    if fleet_dir is None:
+        return None
+    browsers = [entry for entry in read_fleet_endpoints(fleet_dir) if bool(entry.get("headless")) == headless]
+    if not browsers:
+        return None
+    return browsers[next(_round_robin) % len(browsers)]["ws"]
+
+
+def connect_or_launch_chromium(
+    playwright: Any, *, headless: bool = True, args: Sequence[str] = (), **launch_kwargs: Any
+):
+    """Attach to a fleet browser when one is published, otherwise launch Chromium locally.
+
+    Launch arguments only apply to local launches; fleet browsers run with the
+    supervisor's arguments.
+    """
+    endpoint = fleet_endpoint(headless=headless)
+    if endpoint is not None:
+        try:
+            browser = playwright.chromium.connect_over_cdp(endpoint)
+            _fleet_connects.inc()
+            return browser
+        except Exception as exc:
+            _fleet_fallbacks.inc()
+            logger.warning(f"Fleet browser at {endpoint} unavailable, launching locally: {exc}")
+    return playwright.chromium.launch(headless=headless, args=list(args), **launch_kwargs)
+
+
+# -- Supervisor side -------------------------------------------------------------
+
+
+@dataclass
+class FleetBrowser:
+    """One supervised Chromium process."""
+
+    slot: int
+    user_data_dir: Path
+    process: Optional[subprocess.Popen] = None
+    ws: Optional[str] = None
+    started_at: float = 0.0
+    failures: int = 0
+    next_start: float = 0.0
+    restarts: int = 0
+
+    def alive(self) -> bool:
+        return self.process is not None and self.process.poll() is None
+
+
+class FleetSupervisor:
+    """Keep a fixed number of Chromium processes running and publish their endpoints."""
+
+    def __init__(
+        self,
+        fleet_dir: str,
+        size: int,
+        *,
+        executable: str,
+        headless: bool = True,
+        extra_args: Sequence[str] = (),
+        interval: float = HEARTBEAT_SECONDS,
+        start_timeout: float = _START_TIMEOUT_SECONDS,
+    ) -> None:
+        self.fleet_dir = Path(fleet_dir)
+        self.size = max(1, int(size))
+        self.executable = executable
+        self.headless = headless
+        self.extra_args = list(extra_args)
+        self.interval = interval
+        self.start_timeout = start_timeout
+        self.browsers = [
+            FleetBrowser(slot, self.fleet_dir / "profiles" / f"browser-{slot}") for slot in range(self.size)
+        ]
+        self._stop = threading.Event()
+
+    @property
+    def endpoints_path(self) -> Path:
+        return self.fleet_dir / ENDPOINTS_FILENAME
+
+    def command(self, browser: FleetBrowser) -> List[str]:
+        command = [
+            self.executable,
+            "--remote-debugging-port=0",
+            "--remote-debugging-address=127.0.0.1",
+            f"--user-data-dir={browser.user_data_dir}",
+            *_DEFAULT_ARGS,
+            *self.extra_args,
+        ]
+        if self.headless:
+            command.append("--headless=new")
+        command.append("about:blank")
+        return command
+
+    def start_browser(self, browser: FleetBrowser) -> None:
+        """Start ``browser`` on a fresh profile and wait for its DevTools endpoint."""
+        shutil.rmtree(browser.user_data_dir, ignore_errors=True)
+        browser.user_data_dir.mkdir(parents=True, exist_ok=True)
+        browser.process = subprocess.Popen(
+            self.command(browser),
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
+        )
+        port_file = browser.user_data_dir / "DevToolsActivePort"
+        deadline = time.monotonic() + self.start_timeout
+        while time.monotonic() < deadline and browser.alive():
+            try:
+                port, ws_path = port_file.read_text(encoding="utf-8").split("\n")[:2]
+                browser.ws = f"ws://127.0.0.1:{int(port)}{ws_path.strip()}"
+                browser.started_at = time.time()
+                logger.info(f"Fleet browser {browser.slot} listening on port {int(port)}")
+                return
+            except (OSError, ValueError):
+                time.sleep(0.1)
+        self.stop_browser(browser)
+        raise RuntimeError(f"Fleet browser {browser.slot} did not publish a DevTools endpoint")
+
+    def stop_browser(self, browser: FleetBrowser, timeout: float = 10.0) -> None:
+        process, browser.process, browser.ws = browser.process, None, None
+        if process is None or process.poll() is not None:
+            return
+        process.terminate()
+        try:
+            process.wait(timeout)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait(timeout)
+
+    def check(self, now: Optional[float] = None) -> None:
+        """Restart exited browsers (with backoff) and publish the current endpoints."""
+        now = time.monotonic() if now is None else now
+        for browser in self.browsers:
+            if browser.alive():
+                continue
+            if browser.process is not None:
+                logger.warning(f"Fleet browser {browser.slot} exited with {browser.process.returncode}")
+                browser.process, browser.ws = None, None
+                browser.restarts += 1
+            if now < browser.next_start:
+                continue
+            try:
+                self.start_browser(browser)
+                browser.failures = 0
+            except Exception as exc:
+                browser.failures += 1
+                browser.next_start = now + min(_MAX_RESTART_BACKOFF_SECONDS, 2.0 ** browser.failures)
+                logger.error(f"Could not start fleet browser {browser.slot}: {exc}")
+        self.publish()
+
+    def publish(self) -> None:
+        """Atomically write the endpoints file with a fresh heartbeat."""
+        data = {
+            "version": FORMAT_VERSION,
+            "pid": os.getpid(),
+            "heartbeat": time.time(),
+            "interval": self.interval,
+            "browsers": [
+                {
+                    "slot": browser.slot,
+                    "ws": browser.ws,
+                    "pid": browser.process.pid,
+                    "headless": self.headless,
+                    "started_at": browser.started_at,
+                    "restarts": browser.restarts,
+                }
+                for browser in self.browsers
+                if browser.alive() and browser.ws
+            ],
+        }
+        self.fleet_dir.mkdir(parents=True, exist_ok=True)
+        temp_path = self.endpoints_path.with_name(f"{ENDPOINTS_FILENAME}.{os.getpid()}.tmp")
+        with open(temp_path, "w", encoding="utf-8") as handle:
+            json.dump(data, handle)
+        os.replace(temp_path, self.endpoints_path)
+
+    def run(self) -> None:
+        """Supervise until :meth:`stop` is called (or SIGTERM/SIGINT in :func:`main`)."""
+        try:
+            while not self._stop.is_set():
+                self.check()
+                self._stop.wait(self.interval)
+        finally:
+            self.shutdown()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def shutdown(self) -> None:
+        """Withdraw the endpoints and stop every browser."""
+        try:
+            self.endpoints_path.unlink()
+        except OSError:
+            pass
+        for browser in self.browsers:
+            self.stop_browser(browser)
+
+
+def _chromium_executable() -> str:
+    from playwright.sync_api import sync_playwright
+
+    with sync_playwright() as playwright:
+        return playwright.chromium.executable_path
+
+
+def supervisor_from_settings(
+    settings, *, size: Optional[int] = None, fleet_dir: Optional[str] = None
+) -> FleetSupervisor:
+    """Build the supervisor from ``settings``; ``size`` and ``fleet_dir`` override them (CLI flags)."""
+    fleet_dir = fleet_dir or _fleet_dir(settings)
+    if fleet_dir is None:
+        raise ValueError("browser_fleet_dir is not set")
+    if size is None:
+        size = getattr(settings, "browser_fleet_size", 0)
+    if isinstance(size, bool) or not isinstance(size, int) or size <= 0:
+        raise ValueError("browser_fleet_size must be a positive integer")
+    executable = getattr(settings, "browser_fleet_chromium_executable", None)
+    return FleetSupervisor(
+        fleet_dir,
+        size,
+        executable=executable if isinstance(executable, str) and executable else _chromium_executable(),
+        headless=getattr(settings, "browser_fleet_headless", True) is not False,
+    )
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Run the out-of-process Chromium fleet.")
+    parser.add_argument("--size", type=int, help="Number of browsers (default: BROWSER_FLEET_SIZE)")
+    parser.add_argument("--dir", help="Fleet state directory (default: BROWSER_FLEET_DIR)")
+    args = parser.parse_args(argv)
+
+    from app.core.config import get_settings
+    from app.core.logging import setup_logger
+
+    setup_logger()
+    supervisor = supervisor_from_settings(get_settings(), size=args.size, fleet_dir=args.dir)
+    for signum in (signal.SIGTERM, signal.SIGINT):
+        signal.signal(signum, lambda *_args: supervisor.stop())
+    logger.info(f"Supervising {supervisor.size} Chromium browsers in {supervisor.fleet_dir}")
+    supervisor.run()
+
+
+__all__ = [
+    "ENDPOINTS_FILENAME",
+    "FleetBrowser",
+    "FleetSupervisor",
+    "connect_or_launch_chromium",
+    "fleet_endpoint",
+    "main",
+    "read_fleet_endpoints",
+    "supervisor_from_settings",
+]
+
+
+if __name__ == "__main__":
+    main()
@@ -3,9 +3,11 @@ import os
 import platform
 import warnings
 from pathlib import Path
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Callable, Dict, Optional, Tuple
 
+from app.core.request_context import runtime_setting
 from app.services.common.browser import user_data as user_data_mod
+from app.services.common.browser.profile_pool import profile_pool_from_settings
 import app.core.config as app_config
 
 logger = logging.getLogger(__name__)
@@ -90,19 +92,34 @@ class CamoufoxArgsBuilder:
                         raise PermissionError(f"User data directory is not writable: {resolved_path}")
                     additional_args["user_data_dir"] = resolved_path
                 else:
-                    # Default to read-mode clone for regular crawl flows
-                    with user_data_mod.user_data_context(
-                        settings.camoufox_user_data_dir, 'read'
-                    ) as (effective_dir, cleanup):
-                        logger.debug(f"Using user data directory: {effective_dir}")
-                        resolved_path = CamoufoxArgsBuilder._resolve_path(effective_dir)
-                        # Ensure directory exists and is writable
-                        Path(resolved_path).mkdir(parents=True, exist_ok=True)
-                        if not os.access(resolved_path, os.W_OK):
-                            raise PermissionError(f"User data directory is not writable: {resolved_path}")
-                        additional_args["user_data_dir"] = resolved_path
-                        # Store cleanup function in additional_args for post-fetch cleanup
-                        additional_args['_user_data_cleanup'] = cleanup
+                    # Default to read-mode clone for regular crawl flows, taken from the
+                    # profile slot pinned by the caller or leased from the profile pool
+                    profile_dir, release_profile = CamoufoxArgsBuilder._resolve_profile_dir(settings)
+                    try:
+                        with user_data_mod.user_data_context(
+                            profile_dir,
+                            'read',
+                            clone_root=getattr(settings, "user_data_clone_root", None),
+                            clone_root_max_bytes=getattr(settings, "user_data_clone_root_max_bytes", 0),
+                        ) as (effective_dir, cleanup):
+                            logger.debug(f"Using user data directory: {effective_dir}")
+                            resolved_path = CamoufoxArgsBuilder._resolve_path(effective_dir)
+                            # Ensure directory exists and is writable
+                            Path(resolved_path).mkdir(parents=True, exist_ok=True)
+                            if not os.access(resolved_path, os.W_OK):
+                                raise PermissionError(f"User data directory is not writable: {resolved_path}")
+                            additional_args["user_data_dir"] = resolved_path
+                            # Store cleanup function in additional_args for post-fetch cleanup
+                            additional_args['_user_data_cleanup'] = CamoufoxArgsBuilder._chain_cleanup(
+                                cleanup, release_profile
+                            )
+                            # Clones of one profile slot keep presenting the same identity
+                            pin_dir = CamoufoxArgsBuilder._resolve_path(profile_dir)
+                            additional_args['_fingerprint_pin'] = f"profile:{pin_dir}"
+                    except Exception:
+                        if release_profile is not None:
+                            release_profile()
+                        raise
 
             except Exception as e:
                 logger.warning(f"Failed to setup user data directory: {e}")
@@ -195,16 +212,50 @@ class CamoufoxArgsBuilder:
             return None
         return None
 
+    @staticmethod
+    def _resolve_profile_dir(settings) -> Tuple[str, Optional[Callable[[], None]]]:
+        """Return the profile base directory for a read clone and an optional lease release."""
+
+        pinned_dir = runtime_setting(settings, "camoufox_runtime_profile_dir")
+        if isinstance(pinned_dir, str) and pinned_dir:
+            return pinned_dir, None
+
+        pool = profile_pool_from_settings(settings, settings.camoufox_user_data_dir)
+        if pool.size <= 1:
+            return settings.camoufox_user_data_dir, None
+
+        lease = pool.acquire()
+        return lease.base_dir, lambda: pool.release(lease)
+
+    @staticmethod
+    def _chain_cleanup(
+        cleanup: Optional[Callable[[], None]],
+        release_profile: Optional[Callable[[], None]],
+    ) -> Optional[Callable[[], None]]:
+        """Combine clone cleanup with releasing the profile lease."""
+
+        if release_profile is None:
+            return cleanup
+
+        def combined() -> None:
+            try:
+                if callable(cleanup):
+                    cleanup()
+            finally:
+                release_profile()
+
+        return combined
+
     @staticmethod
     def _runtime_user_data_overrides(settings) -> Tuple[Optional[str], Optional[str]]:
-        """Extract sanitized runtime user-data overrides from settings."""
+        """Extract sanitized runtime user-data overrides from the request context or settings."""
 
-        mode = getattr(settings, "camoufox_runtime_user_data_mode", None)
+        mode = runtime_setting(settings, "camoufox_runtime_user_data_mode")
         if mode is None:
             mode = getattr(settings, "_camoufox_user_data_mode", None)
         normalized_mode = mode.lower() if isinstance(mode, str) and mode else None
 
-        raw_dir = getattr(settings, "camoufox_runtime_effective_user_data_dir", None)
+        raw_dir = runtime_setting(settings, "camoufox_runtime_effective_user_data_dir")
         if raw_dir is None:
             raw_dir = getattr(settings, "_camoufox_effective_user_data_dir", None)
         if isinstance(raw_dir, (str, os.PathLike)) and raw_dir:
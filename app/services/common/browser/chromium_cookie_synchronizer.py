@@ -2,9 +2,11 @@
 
 from __future__ import annotations
 
+import json
 import logging
+import os
 import time
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 
 from app.services.common.browser.cookies import ChromiumCookieManager
 from app.services.common.browser.paths import ChromiumPathManager
@@ -64,7 +66,7 @@ class ChromiumCookieSynchronizer:
                         }
                         for cookie in cookies
                     ],
-                    "origins": [],
+                    "origins": self._read_origins(),
                 }
                 return storage_state
 
@@ -122,20 +124,23 @@ class ChromiumCookieSynchronizer:
                 )
                 return True
 
-            success = self._cookie_manager.write_cookies_to_db(cookies)
+            delta = self._cookie_manager.sync_cookies_to_db(cookies)
 
             timestamp = time.time()
-            if success:
+            if delta is not None:
                 self._profile_manager.update_metadata(
                     {
                         "last_cookie_import": timestamp,
                         "cookie_import_count": len(cookies),
+                        "cookie_import_changed": len(delta.upserts) + delta.deleted,
                         "cookie_import_status": "success",
                     },
                 )
                 logger.info(
-                    "Successfully imported %s cookies to Chromium master profile",
+                    "Successfully imported %s cookies to Chromium master profile (%s written, %s removed)",
                     len(cookies),
+                    len(delta.upserts),
+                    delta.deleted,
                 )
                 return True
 
@@ -158,3 +163,41 @@ class ChromiumCookieSynchronizer:
             except Exception:  # pragma: no cover - nested failure
                 logger.debug("Unable to update metadata after cookie import failure")
             return False
+
+    def save_storage_state(self, storage_state: Dict[str, Any]) -> bool:
+        """Persist the localStorage origins of a Playwright storage_state next to the master.
+
+        Cookies are always read from the master cookies database, so only the
+        ``origins`` part is stored.
+        """
+
+        storage_state_file = getattr(self._path_manager, "storage_state_file", None)
+        if not self._enabled or storage_state_file is None:
+            return False
+
+        try:
+            storage_state_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = storage_state_file.with_suffix(".json.tmp")
+            tmp_file.write_text(
+                json.dumps({"origins": list(storage_state.get("origins") or [])}),
+                encoding="utf-8",
+            )
+            os.replace(tmp_file, storage_state_file)
+            return True
+        except Exception as exc:  # pragma: no cover - defensive logging
+            logger.warning("Failed to save storage_state origins: %s", exc)
+            return False
+
+    def _read_origins(self) -> List[Any]:
+        """Return localStorage origins saved by the last write session, if any."""
+
+        storage_state_file = getattr(self._path_manager, "storage_state_file", None)
+        if storage_state_file is None or not storage_state_file.exists():
+            return []
+        try:
+            data = json.loads(storage_state_file.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as exc:
+            logger.debug("Ignoring unreadable storage_state file %s: %s", storage_state_file, exc)
+            return []
+        origins = data.get("origins") if isinstance(data, dict) else None
+        return origins if isinstance(origins, list) else []
@@ -3,7 +3,8 @@
 from __future__ import annotations
 
 import logging
-from typing import Optional
+from pathlib import Path
+from typing import List, Optional
 
 from app.services.common.browser.profile_manager import ChromiumProfileManager
 from app.services.common.browser.paths import ChromiumPathManager
@@ -38,14 +39,15 @@ class ChromiumDiskStatistics:
 
         try:
             master_size = get_directory_size(master_dir) if master_dir and master_dir.exists() else 0
-            clones_size = get_directory_size(clones_dir) if clones_dir and clones_dir.exists() else 0
+            clone_roots = [root for root in self._clone_roots(clones_dir) if root.exists()]
+            clones_size = sum(get_directory_size(root) for root in clone_roots)
             total_size = master_size + clones_size
 
-            clone_count = (
-                len([directory for directory in clones_dir.iterdir() if directory.is_dir()])
-                if clones_dir and clones_dir.exists()
-                else 0
+            clone_count = sum(
+                len([directory for directory in root.iterdir() if directory.is_dir()])
+                for root in clone_roots
             )
+            fast_clones_dir = next((root for root in clone_roots if root != clones_dir), None)
 
             metadata = (
                 self._profile_manager.read_metadata() if self._profile_manager else {}
@@ -59,6 +61,7 @@ class ChromiumDiskStatistics:
                 "clone_count": clone_count,
                 "master_dir": str(master_dir) if master_dir else None,
                 "clones_dir": str(clones_dir) if clones_dir else None,
+                "fast_clones_dir": str(fast_clones_dir) if fast_clones_dir else None,
                 "last_cleanup": metadata.get("last_cleanup") if metadata else None,
                 "last_cleanup_count": metadata.get("last_cleanup_count", 0) if metadata else 0,
                 "last_cleanup_size_saved": metadata.get("last_cleanup_size_saved", 0) if metadata else 0,
@@ -67,3 +70,11 @@ class ChromiumDiskStatistics:
         except Exception as exc:  # pragma: no cover - defensive logging
             logger.warning("Failed to get disk usage stats: %s", exc)
             return {"enabled": True, "error": str(exc)}
+
+    def _clone_roots(self, clones_dir: Optional[Path]) -> List[Path]:
+        """Return the on-disk clones directory plus any fast clone root."""
+
+        get_roots = getattr(self._path_manager, "get_clone_roots", None)
+        if callable(get_roots):
+            return list(get_roots())
+        return [clones_dir] if clones_dir is not None else []
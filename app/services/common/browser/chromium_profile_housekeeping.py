@@ -4,8 +4,11 @@ from __future__ import annotations
 
 import logging
 import time
-from typing import Optional
+from pathlib import Path
+from typing import List, Optional
 
+from app.services.common.browser.locks import exclusive_lock
+from app.services.common.browser.profile_compaction import compact_profile_dir
 from app.services.common.browser.profile_manager import ChromiumProfileManager
 from app.services.common.browser.paths import ChromiumPathManager
 from app.services.common.browser.utils import (
@@ -14,7 +17,7 @@ from app.services.common.browser.utils import (
     get_directory_size,
     rmtree_with_retries,
 )
-from app.services.common.browser.types import CleanupResult
+from app.services.common.browser.types import CleanupResult, CompactionResult
 
 logger = logging.getLogger(__name__)
 
@@ -36,8 +39,8 @@ class ChromiumProfileHousekeeping:
     def cleanup_old_clones(self, max_age_hours: int = 24, max_count: int = 50) -> CleanupResult:
         """Remove stale clone directories and report cleanup statistics."""
 
-        clones_dir = getattr(self._path_manager, "clones_dir", None)
-        if not self._enabled or clones_dir is None or not clones_dir.exists():
+        clone_roots = [root for root in self._clone_roots() if root.exists()]
+        if not self._enabled or not clone_roots:
             return {"cleaned": 0, "remaining": 0, "errors": 0}
 
         try:
@@ -47,7 +50,7 @@ class ChromiumProfileHousekeeping:
             error_count = 0
 
             clone_stats = []
-            for clone_path in clones_dir.iterdir():
+            for clone_path in (path for root in clone_roots for path in root.iterdir()):
                 if clone_path.is_dir():
                     try:
                         stat = clone_path.stat()
@@ -81,6 +84,7 @@ class ChromiumProfileHousekeeping:
                     chmod_tree(path, 0o777)
                     best_effort_close_sqlite(path)
                     if rmtree_with_retries(path, max_attempts=12, initial_delay=0.1):
+                        self._release_clone(path, int(clone_stat["size"] * 1024 * 1024))
                         cleaned_count += 1
                         remaining_count -= 1
                         logger.debug(
@@ -128,3 +132,48 @@ class ChromiumProfileHousekeeping:
         except Exception as exc:  # pragma: no cover - defensive logging
             logger.error("Failed to cleanup old clones: %s", exc)
             return {"cleaned": 0, "remaining": 0, "errors": 1}
+
+    def compact_master(self, lock_timeout: float = 5.0) -> Optional[CompactionResult]:
+        """Compact the master profile under the profile lock.
+
+        Returns None when disabled, when there is no master yet, or when a write
+        session holds the lock for longer than ``lock_timeout``.
+        """
+
+        master_dir = getattr(self._path_manager, "master_dir", None)
+        if not self._enabled or master_dir is None or not master_dir.exists():
+            return None
+
+        try:
+            with exclusive_lock(str(self._path_manager.lock_file), timeout=lock_timeout):
+                result = compact_profile_dir(master_dir)
+        except RuntimeError as exc:
+            logger.info("Skipping Chromium master compaction, profile is busy: %s", exc)
+            return None
+
+        if self._profile_manager:
+            self._profile_manager.update_metadata(
+                {
+                    "last_compaction": time.time(),
+                    "last_compaction_size_before": result["size_before_bytes"],
+                    "last_compaction_size_after": result["size_after_bytes"],
+                    "last_compaction_cookies_removed": result["expired_cookies_removed"],
+                },
+            )
+        return result
+
+    def _release_clone(self, clone_path: Path, size_bytes: int) -> None:
+        """Return a removed clone's bytes to the fast clone root budget."""
+
+        clone_storage = getattr(self._path_manager, "clone_storage", None)
+        if clone_storage is not None:
+            clone_storage.release(clone_path, size_bytes)
+
+    def _clone_roots(self) -> List[Path]:
+        """Return the on-disk clones directory plus any fast clone root."""
+
+        get_roots = getattr(self._path_manager, "get_clone_roots", None)
+        if callable(get_roots):
+            return list(get_roots())
+        clones_dir = getattr(self._path_manager, "clones_dir", None)
+        return [clones_dir] if clones_dir is not None else []
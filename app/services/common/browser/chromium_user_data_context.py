@@ -6,16 +6,19 @@ import logging
 from contextlib import contextmanager
 from typing import Callable, ContextManager, Optional, Tuple
 
-from app.services.common.browser.locks import exclusive_lock
+from app.services.common.browser.locks import FileLock, exclusive_lock
 from app.services.common.browser.profile_manager import (
     ChromiumProfileManager,
     clone_profile,
     create_temporary_profile,
 )
 from app.services.common.browser.paths import ChromiumPathManager
+from app.services.common.browser.profile_releases import track_release
+from app.services.common.browser.snapshots import MasterSnapshotStore
 from app.services.common.browser.utils import (
     best_effort_close_sqlite,
     chmod_tree,
+    get_directory_size_bytes,
     rmtree_with_retries,
 )
 
@@ -37,6 +40,35 @@ class ChromiumUserDataContextManager:
         self._enabled = enabled
         self._path_manager = path_manager
         self._profile_manager = profile_manager
+        self._snapshot_store: Optional[MasterSnapshotStore] = None
+        self._write_lock: Optional[FileLock] = None
+        if enabled and getattr(path_manager, "enabled", False):
+            self._snapshot_store = MasterSnapshotStore(
+                path_manager.master_dir,
+                path_manager.snapshots_dir,
+            )
+
+    @property
+    def snapshot_store(self) -> Optional[MasterSnapshotStore]:
+        """Return the master snapshot store, if user data management is enabled."""
+
+        return self._snapshot_store
+
+    def publish_snapshot(self) -> bool:
+        """Publish the master profile as a new immutable snapshot generation."""
+
+        if self._snapshot_store is None or not self._path_manager.master_dir.exists():
+            return False
+        if self._write_lock is not None:
+            # The write session holds the lock and publishes when it ends
+            logger.debug("Chromium write session in progress, deferring snapshot publish")
+            return False
+
+        with exclusive_lock(str(self._path_manager.lock_file), timeout=30.0) as acquired:
+            if not acquired:
+                logger.warning("Could not acquire Chromium profile lock to publish snapshot")
+                return False
+            return self._snapshot_store.publish() is not None
 
     @contextmanager
     def get_user_data_context(self, mode: str) -> ContextManager[Tuple[str, CleanupFn]]:
@@ -47,6 +79,7 @@ class ChromiumUserDataContextManager:
                 "Chromium user data management disabled, using temporary profile",
             )
             temp_dir, cleanup_func = create_temporary_profile()
+            cleanup_func = track_release(cleanup_func, f"Chromium temporary profile {temp_dir}")
             try:
                 yield temp_dir, cleanup_func
             finally:
@@ -74,6 +107,8 @@ class ChromiumUserDataContextManager:
                 effective_dir, cleanup_func = self._write_mode_context()
             else:
                 effective_dir, cleanup_func = self._read_mode_context()
+            # Released at shutdown if a cancelled request never leaves the context
+            cleanup_func = track_release(cleanup_func, f"Chromium {mode} profile {effective_dir}")
 
             yield effective_dir, cleanup_func
         except Exception:
@@ -97,15 +132,30 @@ class ChromiumUserDataContextManager:
 
         self._path_manager.ensure_directories_exist()
 
-        with exclusive_lock(str(self._path_manager.lock_file), timeout=30.0) as acquired:
-            if not acquired:
-                raise RuntimeError(
-                    "Failed to acquire Chromium profile lock for write mode",
-                )
-
+        # Held for the whole session so compaction and other writers never touch
+        # the master under a running browser
+        lock = FileLock(str(self._path_manager.lock_file), timeout=30.0)
+        if not lock.acquire():
+            raise RuntimeError(
+                "Failed to acquire Chromium profile lock for write mode",
+            )
+        try:
             self._profile_manager.ensure_metadata()
+        except Exception:
+            lock.release()
+            raise
+        self._write_lock = lock
+
+        def cleanup_func() -> None:
+            # Readers clone the published snapshot, so make this session's changes
+            # visible; publish while still holding the lock for a consistent copy
+            try:
+                if self._snapshot_store is not None and self._path_manager.master_dir.exists():
+                    self._snapshot_store.publish()
+            finally:
+                self._write_lock = None
+                lock.release()
 
-        cleanup_func: CleanupFn = lambda: None
         return str(self._path_manager.master_dir), cleanup_func
 
     def _read_mode_context(self) -> Tuple[str, CleanupFn]:
@@ -144,4 +194,31 @@ class ChromiumUserDataContextManager:
 
             return str(clone_dir), cleanup
 
-        return clone_profile(self._path_manager.master_dir, clone_dir)
+        with self._snapshot_source() as source_dir:
+            clone_storage = getattr(self._path_manager, "clone_storage", None)
+            if clone_storage is None or not clone_storage.fast_enabled:
+                return clone_profile(source_dir, clone_dir)
+
+            # Hold the fast-root reservation until the copy has landed so concurrent
+            # readers see its size when deciding where their own clone goes.
+            estimated_bytes = get_directory_size_bytes(source_dir)
+            with clone_storage.reserve(estimated_bytes) as reserved_dir:
+                clone_path, remove_clone = clone_profile(source_dir, reserved_dir)
+
+            def cleanup() -> None:
+                try:
+                    remove_clone()
+                finally:
+                    clone_storage.release(reserved_dir)
+
+            return clone_path, cleanup
+
+    @contextmanager
+    def _snapshot_source(self):
+        """Yield the latest published snapshot, or the live master when none exists."""
+
+        if self._snapshot_store is None:
+            yield self._path_manager.master_dir
+            return
+        with self._snapshot_store.reader() as generation_dir:
+            yield generation_dir or self._path_manager.master_dir
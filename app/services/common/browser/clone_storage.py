@@ -0,0 +1,188 @@
+"""Placement of ephemeral profile clones on a fast (tmpfs/RAM-disk) root."""
+
+from __future__ import annotations
+
+import logging
+import os
+import shutil
+import threading
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+from app.services.common.browser.utils import get_directory_size_bytes
+
+logger = logging.getLogger(__name__)
+
+
+class CloneStorage:
+    """Choose where new profile clones live.
+
+    Clones are placed below ``fast_root/<namespace>`` (typically ``/dev/shm``)
+    while the fast root stays within ``max_bytes``; otherwise they fall back to
+    the on-disk ``clones`` directory next to the master profile.
+
+    Usage is tracked per fast root at class level, so every instance pointing
+    at the same root (Chromium and Camoufox managers are created per request)
+    shares one budget within the process. The root is scanned once, when the
+    first instance for it is created; afterwards a running byte counter is
+    updated as clones land (:meth:`reserve`) and are removed (:meth:`release`).
+    """
+
+    _reservations: Dict[Path, Dict[Path, int]] = {}
+    _clones: Dict[Path, Dict[Path, int]] = {}
+    _usage: Dict[Path, int] = {}
+    _lock = threading.Lock()
+
+    def __init__(
+        self,
+        disk_clones_dir: Path,
+        *,
+        fast_root: Optional[str | os.PathLike] = None,
+        max_bytes: int = 0,
+        namespace: str = "",
+    ) -> None:
+        """Initialize clone storage.
+
+        Args:
+            disk_clones_dir: On-disk clones directory (always available)
+            fast_root: Optional tmpfs/RAM-disk root for clones. ``None`` disables it.
+            max_bytes: Byte budget for everything stored below ``fast_root``
+            namespace: Sub-directory separating engines sharing the same fast root
+        """
+        self.disk_clones_dir = Path(disk_clones_dir)
+        self.fast_root = Path(fast_root) if isinstance(fast_root, (str, os.PathLike)) and str(fast_root) else None
+        try:
+            self.max_bytes = max(0, int(max_bytes or 0))
+        except (TypeError, ValueError):
+            self.max_bytes = 0
+        self.namespace = namespace
+        if self.fast_enabled:
+            self._scan_usage()
+
+    @property
+    def fast_enabled(self) -> bool:
+        """Return True when a fast clone root with a positive budget is configured."""
+        return self.fast_root is not None and self.max_bytes > 0
+
+    @property
+    def fast_clones_dir(self) -> Optional[Path]:
+        """Return the namespaced clones directory on the fast root, if enabled."""
+        if not self.fast_enabled:
+            return None
+        return self.fast_root / self.namespace if self.namespace else self.fast_root
+
+    def clone_roots(self) -> List[Path]:
+        """Return every directory that may contain clones (disk first)."""
+        roots = [self.disk_clones_dir]
+        fast_dir = self.fast_clones_dir
+        if fast_dir is not None and fast_dir != self.disk_clones_dir:
+            roots.append(fast_dir)
+        return roots
+
+    def fast_usage_bytes(self) -> int:
+        """Return bytes used on the fast root plus in-flight reservations."""
+        if not self.fast_enabled:
+            return 0
+        with self._lock:
+            return self._usage.get(self.fast_root, 0) + sum(self._reservations.get(self.fast_root, {}).values())
+
+    def allocate(self, estimated_bytes: int = 0) -> Path:
+        """Return a unique clone path, preferring the fast root when it fits.
+
+        No budget is held for the returned path; use :meth:`reserve` when the
+        clone is populated concurrently with other clones.
+        """
+        with self.reserve(estimated_bytes) as clone_dir:
+            return clone_dir
+
+    @contextmanager
+    def reserve(self, estimated_bytes: int = 0) -> Iterator[Path]:
+        """Allocate a clone path and hold its budget reservation while it is populated.
+
+        The reservation covers the window between choosing the fast root and the
+        copy landing on it, so concurrent clones cannot jointly overshoot the budget.
+        Once the block exits cleanly the clone counts as used until :meth:`release`.
+        """
+        estimate = max(0, int(estimated_bytes or 0))
+        clone_dir = self.disk_clones_dir / str(uuid.uuid4())
+        reserved = False
+
+        fast_dir = self._fast_dir_with_room(estimate)
+        if fast_dir is not None:
+            with self._lock:
+                pending = self._reservations.setdefault(self.fast_root, {})
+                projected = self._usage.get(self.fast_root, 0) + sum(pending.values()) + estimate
+                if projected <= self.max_bytes:
+                    clone_dir = fast_dir / str(uuid.uuid4())
+                    pending[clone_dir] = estimate
+                    reserved = True
+                else:
+                    logger.debug(
+                        "Fast clone root %s over budget (%s > %s bytes); cloning to disk",
+                        self.fast_root,
+                        projected,
+                        self.max_bytes,
+                    )
+        landed = False
+        try:
+            yield clone_dir
+            landed = True
+        finally:
+            if reserved:
+                with self._lock:
+                    self._reservations.get(self.fast_root, {}).pop(clone_dir, None)
+                    if landed:
+                        self._clones.setdefault(self.fast_root, {})[clone_dir] = estimate
+                        self._usage[self.fast_root] = self._usage.get(self.fast_root, 0) + estimate
+
+    def release(self, clone_dir: Path, size_bytes: int = 0) -> None:
+        """Return the budget of a removed clone to its fast root.
+
+        Clones placed by :meth:`reserve` free their reserved estimate; clones that
+        predate the startup scan free ``size_bytes``. Paths outside the fast root
+        are ignored, so callers may release every clone they remove.
+        """
+        if not self.fast_enabled:
+            return
+        clone_dir = Path(clone_dir)
+        if self.fast_root not in clone_dir.parents:
+            return
+        with self._lock:
+            freed = self._clones.get(self.fast_root, {}).pop(clone_dir, None)
+            if freed is None:
+                freed = max(0, int(size_bytes or 0))
+            self._usage[self.fast_root] = max(0, self._usage.get(self.fast_root, 0) - freed)
+
+    def _scan_usage(self) -> None:
+        with self._lock:
+            if self.fast_root in self._usage:
+                return
+        # Full walk, so only once per fast root and outside the lock
+        scanned = get_directory_size_bytes(self.fast_root) if self.fast_root.exists() else 0
+        with self._lock:
+            self._usage.setdefault(self.fast_root, scanned)
+
+    def _fast_dir_with_room(self, estimated_bytes: int) -> Optional[Path]:
+        fast_dir = self.fast_clones_dir
+        if fast_dir is None:
+            return None
+        try:
+            fast_dir.mkdir(parents=True, exist_ok=True)
+            free_bytes = shutil.disk_usage(fast_dir).free
+        except Exception as exc:
+            logger.warning("Fast clone root %s unavailable, cloning to disk: %s", self.fast_root, exc)
+            return None
+        if free_bytes < estimated_bytes:
+            logger.debug(
+                "Fast clone root %s has %s bytes free (< %s); cloning to disk",
+                self.fast_root,
+                free_bytes,
+                estimated_bytes,
+            )
+            return None
+        return fast_dir
+
+
+__all__ = ["CloneStorage"]
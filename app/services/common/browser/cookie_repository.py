@@ -3,19 +3,39 @@
 from __future__ import annotations
 
 import logging
+import os
 import sqlite3
+import threading
 import uuid
 from pathlib import Path
-from typing import List, Optional, Sequence
+from typing import Dict, List, Optional, Sequence, Tuple
 
 from app.services.common.browser.sqlite_utils import (
+    DatabaseSignature,
     SQLiteExecutionError,
     copy_database_with_retries,
+    database_signature,
+    execute_readonly_with_retries,
     execute_with_retries,
     initialize_database,
     replace_database_atomic,
 )
 
+# Read-only opens fail fast when Chromium holds the DB in exclusive locking mode;
+# the copy-based read is the fallback then, so don't spend long retrying.
+_READONLY_ATTEMPTS = 2
+
+# Parsed rows per cookies DB, reused while the file signature is unchanged
+_rows_cache: Dict[str, Tuple[DatabaseSignature, List[sqlite3.Row]]] = {}
+_rows_cache_lock = threading.Lock()
+
+
+def clear_cookie_rows_cache() -> None:
+    """Drop every cached cookie row list (for tests and benchmarks)."""
+
+    with _rows_cache_lock:
+        _rows_cache.clear()
+
 
 def _safe_unlink(path: Path) -> None:
     """Remove the temporary SQLite file with backwards-compatible semantics."""
@@ -113,11 +133,43 @@ class ChromiumCookieRepository:
             _safe_unlink(temp_new)
 
     def fetch_all(self, *, logger: Optional[logging.Logger] = None) -> List[sqlite3.Row]:
-        """Fetch all rows from the cookies table."""
+        """Fetch all rows from the cookies table.
+
+        Rows are cached per database file and reused until its inode, mtime or
+        size changes. Misses read the live file through a read-only URI and only
+        fall back to copying it when that open is refused.
+        """
 
         if not self.cookies_db_path.exists():
             return []
 
+        cache_key = os.path.abspath(self.cookies_db_path)
+        signature = database_signature(self.cookies_db_path)
+        with _rows_cache_lock:
+            cached = _rows_cache.get(cache_key)
+        if cached is not None and cached[0] == signature:
+            return list(cached[1])
+
+        try:
+            rows = execute_readonly_with_retries(
+                self.cookies_db_path,
+                lambda connection: list(connection.execute(self._select_all_sql())),
+                max_attempts=_READONLY_ATTEMPTS,
+                logger=logger,
+                row_factory=sqlite3.Row,
+            )
+        except SQLiteExecutionError as exc:
+            if logger:
+                logger.debug("Read-only cookies read failed, falling back to a copy: %s", exc)
+            rows = self._fetch_all_from_copy(logger=logger)
+
+        with _rows_cache_lock:
+            _rows_cache[cache_key] = (signature, rows)
+        return list(rows)
+
+    def _fetch_all_from_copy(self, *, logger: Optional[logging.Logger] = None) -> List[sqlite3.Row]:
+        """Read all rows from a private copy of the database."""
+
         temp_db = self.cookies_db_path.parent / f"temp_cookies_{uuid.uuid4().hex}.db"
         try:
             copied = copy_database_with_retries(
@@ -179,6 +231,60 @@ class ChromiumCookieRepository:
         finally:
             _safe_unlink(temp_db)
 
+    def apply_changes(
+        self,
+        upserts: Sequence[Sequence[object]],
+        deletes: Sequence[Tuple[str, str, str]],
+        *,
+        logger: Optional[logging.Logger] = None,
+    ) -> None:
+        """Apply a cookie delta to the live database in a single transaction.
+
+        Every key in ``deletes`` and every ``(host_key, name, path)`` being
+        upserted is removed first, so an upsert fully replaces older rows for
+        the same cookie.
+        """
+
+        if not upserts and not deletes:
+            return
+        if not self.cookies_db_path.exists():
+            initialize_database(self.cookies_db_path, create_cookies_table)
+
+        execute_with_retries(
+            self.cookies_db_path,
+            lambda connection: self._apply_changes(connection, upserts, deletes),
+            max_attempts=self.max_sql_attempts,
+            logger=logger,
+        )
+
+    @staticmethod
+    def _apply_changes(
+        connection: sqlite3.Connection,
+        upserts: Sequence[Sequence[object]],
+        deletes: Sequence[Tuple[str, str, str]],
+    ) -> None:
+        keys = list(deletes) + [(row[1], row[2], row[4]) for row in upserts]
+        try:
+            connection.execute("BEGIN IMMEDIATE")
+            connection.executemany(
+                "DELETE FROM cookies WHERE host_key = ? AND name = ? AND path = ?",
+                keys,
+            )
+            connection.executemany(
+                """
+                INSERT INTO cookies (
+                    creation_utc, host_key, name, value, path, expires_utc,
+                    is_secure, is_httponly, samesite, last_access_utc,
+                    has_expires, is_persistent
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                upserts,
+            )
+            connection.commit()
+        except Exception:
+            connection.rollback()
+            raise
+
     @staticmethod
     def _write_rows(
         connection: sqlite3.Connection,
@@ -208,5 +314,6 @@ class ChromiumCookieRepository:
 
 __all__ = [
     "ChromiumCookieRepository",
+    "clear_cookie_rows_cache",
     "create_cookies_table",
 ]
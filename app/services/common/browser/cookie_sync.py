@@ -0,0 +1,144 @@
+"""Delta computation for syncing cookie jars into a Chromium cookies database.
+
+Cookies are identified by ``(host_key, name, path)`` the same way Chromium
+identifies them. Only rows that are new, changed or expired end up in the
+resulting :class:`CookieDelta`, so applying it costs time proportional to the
+change rather than to the size of the jar.
+"""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+from app.services.common.browser.storage_state import normalize_cookie_expiry
+from app.services.common.browser.types import CookieData, convert_samesite_to_db
+
+CookieKey = Tuple[str, str, str]
+
+# Columns compared to decide whether an existing row needs rewriting
+_COMPARED_COLUMNS = ("value", "expires_utc", "is_secure", "is_httponly", "samesite", "has_expires", "is_persistent")
+
+
+@dataclass
+class CookieDelta:
+    """Rows to write and keys to delete to bring a cookies DB up to date."""
+
+    upserts: List[Tuple[object, ...]] = field(default_factory=list)
+    deletes: List[CookieKey] = field(default_factory=list)
+    inserted: int = 0
+    updated: int = 0
+    unchanged: int = 0
+
+    @property
+    def deleted(self) -> int:
+        return len(self.deletes)
+
+    @property
+    def is_empty(self) -> bool:
+        return not self.upserts and not self.deletes
+
+
+def cookie_key(cookie: Mapping[str, Any]) -> CookieKey:
+    """Return the identity of a Playwright-style cookie dict."""
+    return (cookie.get("domain", ""), cookie.get("name", ""), cookie.get("path", "/") or "/")
+
+
+def row_key(row: Mapping[str, Any]) -> CookieKey:
+    """Return the identity of a cookies table row."""
+    return (row["host_key"], row["name"], row["path"])
+
+
+def is_expired(expires: Optional[float], now: float) -> bool:
+    """Return True when ``expires`` (Unix seconds or Chromium micros) lies in the past."""
+    normalized = normalize_cookie_expiry(expires)
+    return normalized != -1 and normalized <= now
+
+
+def compute_cookie_delta(
+    existing_rows: Iterable[Mapping[str, Any]],
+    cookies: Sequence[CookieData],
+    *,
+    now: Optional[float] = None,
+) -> CookieDelta:
+    """Diff ``cookies`` against ``existing_rows``.
+
+    Incoming cookies are authoritative for their keys: those that are new or
+    differ from the stored row are upserted as given, keeping the original
+    ``creation_utc`` of rows being updated. Stored rows that have expired and
+    are not part of the import are deleted.
+    """
+    now = time.time() if now is None else now
+    now_micros = int(now * 1_000_000)
+    existing: Dict[CookieKey, Mapping[str, Any]] = {}
+    for row in existing_rows:
+        # Rows arrive newest first; older duplicates are collapsed on the next upsert
+        existing.setdefault(row_key(row), row)
+    delta = CookieDelta()
+    deletes = set()
+
+    for key, row in existing.items():
+        if row["has_expires"] and is_expired(row["expires_utc"], now):
+            deletes.add(key)
+
+    seen = set()
+    for cookie in cookies:
+        key = cookie_key(cookie)
+        if key in seen:
+            continue  # first occurrence wins, as in a browser jar
+        seen.add(key)
+
+        expires = cookie.get("expires", -1) or -1
+        candidate = {
+            "value": cookie.get("value", ""),
+            "expires_utc": expires,
+            "is_secure": 1 if cookie.get("secure", False) else 0,
+            "is_httponly": 1 if cookie.get("httpOnly", False) else 0,
+            "samesite": convert_samesite_to_db(cookie.get("sameSite", "None")),
+            "has_expires": 1 if expires != -1 else 0,
+            "is_persistent": 1 if cookie.get("persistent", True) else 0,
+        }
+
+        current = existing.get(key)
+        if current is not None and key not in deletes:
+            if all(current[column] == candidate[column] for column in _COMPARED_COLUMNS):
+                delta.unchanged += 1
+                continue
+            creation_utc = current["creation_utc"]
+            delta.updated += 1
+        else:
+            creation_utc = now_micros
+            now_micros += 1  # keep creation timestamps unique within the batch
+            delta.inserted += 1
+        deletes.discard(key)
+
+        delta.upserts.append(
+            (
+                creation_utc,
+                key[0],
+                key[1],
+                candidate["value"],
+                key[2],
+                candidate["expires_utc"],
+                candidate["is_secure"],
+                candidate["is_httponly"],
+                candidate["samesite"],
+                int(now * 1_000_000),
+                candidate["has_expires"],
+                candidate["is_persistent"],
+            )
+        )
+
+    delta.deletes = sorted(deletes)
+    return delta
+
+
+__all__ = [
+    "CookieDelta",
+    "CookieKey",
+    "compute_cookie_delta",
+    "cookie_key",
+    "is_expired",
+    "row_key",
+]
@@ -8,7 +8,9 @@ import time
 from pathlib import Path
 from typing import List, Optional, Sequence
 
+from app.core.metrics import get_histogram
 from app.services.common.browser.cookie_repository import ChromiumCookieRepository
+from app.services.common.browser.cookie_sync import CookieDelta, compute_cookie_delta
 from app.services.common.browser.sqlite_utils import SQLiteExecutionError
 from app.services.common.browser.types import (
     CookieData,
@@ -19,6 +21,11 @@ from app.services.common.browser.types import (
 
 logger = logging.getLogger(__name__)
 
+_COOKIE_SYNC_SECONDS = get_histogram(
+    "cookie_sync_seconds",
+    "Time spent diffing and applying a cookie import to a cookies DB",
+)
+
 
 class ChromiumCookieManager:
     """Manages Chromium cookie database operations with robust Windows lock handling."""
@@ -131,3 +138,33 @@ class ChromiumCookieManager:
         except Exception as exc:  # pragma: no cover - defensive guard
             logger.warning("Failed to write cookies: %s", exc)
             return False
+
+    def sync_cookies_to_db(self, cookies: CookieList) -> Optional[CookieDelta]:
+        """Apply only the new, changed and expired cookies to the database.
+
+        Returns the applied delta, or None when the sync failed.
+        """
+        if not self.ensure_cookies_database():
+            return None
+
+        started = time.monotonic()
+        try:
+            delta = compute_cookie_delta(self.repository.fetch_all(logger=logger), cookies)
+            if not delta.is_empty:
+                self.repository.apply_changes(delta.upserts, delta.deletes, logger=logger)
+            logger.debug(
+                "Cookie sync: %s inserted, %s updated, %s deleted, %s unchanged",
+                delta.inserted,
+                delta.updated,
+                delta.deleted,
+                delta.unchanged,
+            )
+            return delta
+        except SQLiteExecutionError as exc:
+            logger.warning("Failed to sync cookies after retries: %s", exc)
+            return None
+        except Exception as exc:  # pragma: no cover - defensive guard
+            logger.warning("Failed to sync cookies: %s", exc)
+            return None
+        finally:
+            _COOKIE_SYNC_SECONDS.observe(time.monotonic() - started)
@@ -0,0 +1,353 @@
+"""Pool of Xvfb virtual displays for headful browsers.
+
+Headful launches (``force_headful=True``) need an X display. Starting an Xvfb
+server per launch costs hundreds of milliseconds, and a single shared display
+(``camoufox_virtual_display``) makes every headful browser draw into the same
+screen. :class:`DisplayPool` keeps up to ``xvfb_pool_size`` Xvfb servers
+running and leases one display per headful browser, so concurrent headful
+sessions get their own screen without paying the start-up cost again.
+
+Displays are started lazily (or all at once by :meth:`DisplayPool.start`),
+restarted when their server died, and stopped on shutdown, leased or not. Display numbers
+already taken by another X server on the host are skipped.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import shutil
+import subprocess
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Set
+
+from app.core.metrics import get_counter, get_gauge, get_histogram
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SCREEN = "1920x1080x24"
+X11_SOCKET_DIR = "/tmp/.X11-unix"
+X11_LOCK_DIR = "/tmp"
+# How long a fresh Xvfb may take to create its socket
+_START_TIMEOUT_SECONDS = 10.0
+# Display numbers probed beyond the pool size before giving up
+_MAX_PROBED_DISPLAYS = 100
+
+
+class DisplayPoolError(RuntimeError):
+    """Raised when no virtual display could be leased."""
+
+
+class XvfbDisplay:
+    """One running Xvfb server."""
+
+    def __init__(self, number: int, process: subprocess.Popen) -> None:
+        self.number = number
+        self.process = process
+
+    @property
+    def name(self) -> str:
+        """Value for the ``DISPLAY`` environment variable."""
+        return f":{self.number}"
+
+    def alive(self) -> bool:
+        return self.process.poll() is None
+
+    def stop(self, timeout: float = 5.0) -> None:
+        if not self.alive():
+            return
+        self.process.terminate()
+        try:
+            self.process.wait(timeout)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+            self.process.wait(timeout)
+
+
+class DisplayPool:
+    """Thread-safe leasing of a bounded set of Xvfb displays."""
+
+    def __init__(
+        self,
+        size: int,
+        *,
+        binary: str = "Xvfb",
+        base_display: int = 99,
+        screen: str = DEFAULT_SCREEN,
+        lease_timeout_seconds: float = 60.0,
+        start_timeout_seconds: float = _START_TIMEOUT_SECONDS,
+        socket_dir: str = X11_SOCKET_DIR,
+        lock_dir: str = X11_LOCK_DIR,
+    ) -> None:
+        """Initialize the pool; no server is started yet.
+
+        Args:
+            size: Maximum number of displays, i.e. concurrent headful browsers
+            binary: Xvfb executable
+            base_display: First display number to try
+            screen: Xvfb screen geometry (``WIDTHxHEIGHTxDEPTH``)
+            lease_timeout_seconds: How long :meth:`acquire` waits for a free display
+            start_timeout_seconds: How long a new server may take to become ready
+        """
+        self.size = max(1, int(size))
+        self.binary = binary
+        self.base_display = max(0, int(base_display))
+        self.screen = screen
+        self.lease_timeout_seconds = max(0.0, float(lease_timeout_seconds))
+        self.start_timeout_seconds = start_timeout_seconds
+        self.socket_dir = socket_dir
+        self.lock_dir = lock_dir
+        self._cond = threading.Condition()
+        self._idle: List[XvfbDisplay] = []
+        self._leased: Dict[str, XvfbDisplay] = {}
+        self._busy = 0  # leased plus being started
+        self._numbers: Set[int] = set()
+        self._closed = False
+        self._leased_gauge = get_gauge("display_pool_leased", "Virtual displays leased to headful browsers")
+        self._displays_gauge = get_gauge("display_pool_displays", "Running Xvfb servers")
+        self._starts = get_counter("display_pool_starts_total", "Xvfb servers started")
+        self._wait = get_histogram("display_lease_wait_seconds", "Time spent waiting for a virtual display")
+
+    def acquire(self, timeout: Optional[float] = None) -> str:
+        """Lease a display and return its ``DISPLAY`` value.
+
+        Raises:
+            DisplayPoolError: If no display became free within ``timeout`` or Xvfb failed to start
+        """
+        timeout = self.lease_timeout_seconds if timeout is None else max(0.0, timeout)
+        started = time.monotonic()
+        deadline = started + timeout
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise DisplayPoolError("Display pool is shut down")
+                if self._idle or len(self._idle) + self._busy < self.size:
+                    display = self._idle.pop() if self._idle else None
+                    self._busy += 1
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise DisplayPoolError(f"No virtual display became free within {timeout:.0f}s")
+                self._cond.wait(remaining)
+
+        try:
+            if display is not None and not display.alive():
+                logger.warning(f"Xvfb on {display.name} exited; starting a replacement")
+                self._discard(display)
+                display = None
+            if display is None:
+                display = self._spawn()
+        except Exception:
+            with self._cond:
+                self._busy -= 1
+                self._cond.notify()
+            raise
+
+        with self._cond:
+            self._leased[display.name] = display
+            self._publish()
+        self._wait.observe(time.monotonic() - started)
+        return display.name
+
+    def release(self, name: str, *, healthy: bool = True) -> None:
+        """Return a leased display; unhealthy displays are stopped instead of reused."""
+        with self._cond:
+            display = self._leased.pop(name, None)
+            if display is None:
+                return
+            self._busy -= 1
+            keep = healthy and not self._closed and display.alive()
+            if keep:
+                self._idle.append(display)
+            self._cond.notify()
+        if not keep:
+            self._discard(display)
+        with self._cond:
+            self._publish()
+
+    @contextmanager
+    def lease(self, timeout: Optional[float] = None) -> Iterator[str]:
+        """Context manager around :meth:`acquire` and :meth:`release`."""
+        name = self.acquire(timeout)
+        try:
+            yield name
+        finally:
+            self.release(name)
+
+    def start(self) -> None:
+        """Start every display up front so the first headful launches do not wait for Xvfb."""
+        names = []
+        try:
+            for _ in range(self.size):
+                names.append(self.acquire(timeout=0))
+        except DisplayPoolError as exc:
+            logger.warning(f"Could not pre-start virtual displays: {exc}")
+        for name in names:
+            self.release(name)
+
+    def stop(self) -> None:
+        """Stop every server, leased ones included (shutdown); later releases only free their slot."""
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            leased = list(self._leased.values())
+            self._cond.notify_all()
+        for display in idle:
+            self._discard(display)
+        for display in leased:
+            logger.debug(f"Stopping Xvfb on {display.name}, still leased at shutdown")
+            try:
+                display.stop()
+            except Exception as exc:
+                logger.debug(f"Error stopping Xvfb on {display.name}: {exc}")
+        with self._cond:
+            self._publish()
+
+    def stats(self) -> Dict[str, int]:
+        with self._cond:
+            return {"size": self.size, "idle": len(self._idle), "leased": len(self._leased)}
+
+    def _spawn(self) -> XvfbDisplay:
+        number = self._reserve_number()
+        command = [self.binary, f":{number}", "-screen", "0", self.screen, "-nolisten", "tcp"]
+        try:
+            process = subprocess.Popen(
+                command, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+            )
+        except OSError as exc:
+            self._release_number(number)
+            raise DisplayPoolError(f"Could not start {self.binary}: {exc}") from exc
+
+        display = XvfbDisplay(number, process)
+        socket_path = os.path.join(self.socket_dir, f"X{number}")
+        deadline = time.monotonic() + self.start_timeout_seconds
+        while not os.path.exists(socket_path):
+            if not display.alive() or time.monotonic() >= deadline:
+                self._discard(display)
+                raise DisplayPoolError(f"Xvfb did not become ready on {display.name}")
+            time.sleep(0.05)
+        self._starts.inc()
+        logger.debug(f"Started Xvfb on {display.name}")
+        return display
+
+    def _discard(self, display: XvfbDisplay) -> None:
+        try:
+            display.stop()
+        except Exception as exc:
+            logger.debug(f"Error stopping Xvfb on {display.name}: {exc}")
+        self._release_number(display.number)
+
+    def _reserve_number(self) -> int:
+        with self._cond:
+            for number in range(self.base_display, self.base_display + self.size + _MAX_PROBED_DISPLAYS):
+                if number in self._numbers:
+                    continue
+                # Another X server (ours from a previous run, or the host's) owns it
+                if os.path.exists(os.path.join(self.lock_dir, f".X{number}-lock")):
+                    continue
+                if os.path.exists(os.path.join(self.socket_dir, f"X{number}")):
+                    continue
+                self._numbers.add(number)
+                return number
+        raise DisplayPoolError(f"No free X display number from :{self.base_display}")
+
+    def _release_number(self, number: int) -> None:
+        with self._cond:
+            self._numbers.discard(number)
+
+    def _publish(self) -> None:
+        self._leased_gauge.set(len(self._leased))
+        self._displays_gauge.set(len(self._leased) + len(self._idle))
+
+
+_pool: Optional[DisplayPool] = None
+_pool_lock = threading.Lock()
+_missing_binary_logged = False
+
+
+def _int_setting(settings, name: str, default: int) -> int:
+    value = getattr(settings, name, default)
+    if isinstance(value, bool) or not isinstance(value, int):
+        return default
+    return value
+
+
+def get_display_pool(settings=None) -> Optional[DisplayPool]:
+    """Return the process-wide pool, or None when disabled or Xvfb is not installed."""
+    global _pool, _missing_binary_logged
+    if settings is None:
+        from app.core.config import get_settings
+
+        settings = get_settings()
+    size = _int_setting(settings, "xvfb_pool_size", 0)
+    if size <= 0:
+        return None
+    with _pool_lock:
+        if _pool is not None:
+            return _pool
+        binary = shutil.which("Xvfb")
+        if binary is None:
+            if not _missing_binary_logged:
+                logger.warning("xvfb_pool_size is set but Xvfb is not installed; headful browsers use $DISPLAY")
+                _missing_binary_logged = True
+            return None
+        screen = getattr(settings, "xvfb_screen", None)
+        _pool = DisplayPool(
+            size,
+            binary=binary,
+            base_display=_int_setting(settings, "xvfb_base_display", 99),
+            screen=screen if isinstance(screen, str) and screen else DEFAULT_SCREEN,
+            lease_timeout_seconds=_int_setting(settings, "xvfb_lease_timeout_seconds", 60),
+        )
+        return _pool
+
+
+@contextmanager
+def lease_display(headful: bool, settings=None) -> Iterator[Optional[str]]:
+    """Lease a pooled display for a headful browser; yields None when no pool applies."""
+    pool = get_display_pool(settings) if headful else None
+    if pool is None:
+        yield None
+        return
+    with pool.lease() as name:
+        yield name
+
+
+def start_display_pool(settings) -> Optional[DisplayPool]:
+    """Pre-start the configured displays in the background."""
+    pool = get_display_pool(settings)
+    if pool is not None:
+        threading.Thread(target=pool.start, name="display-pool-start", daemon=True).start()
+    return pool
+
+
+def stop_display_pool() -> None:
+    """Stop every Xvfb server of the process-wide pool."""
+    with _pool_lock:
+        pool = _pool
+    if pool is not None:
+        pool.stop()
+
+
+def reset_display_pool() -> None:
+    """Stop and forget the process-wide pool (for tests)."""
+    global _pool, _missing_binary_logged
+    with _pool_lock:
+        pool, _pool = _pool, None
+        _missing_binary_logged = False
+    if pool is not None:
+        pool.stop()
+
+
+__all__ = [
+    "DisplayPool",
+    "DisplayPoolError",
+    "XvfbDisplay",
+    "get_display_pool",
+    "lease_display",
+    "reset_display_pool",
+    "start_display_pool",
+    "stop_display_pool",
+]
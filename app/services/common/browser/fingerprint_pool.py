@@ -0,0 +1,409 @@
+"""Pre-generated browser fingerprints shared across launches.
+
+Fingerprint generation (browserforge for Chromium, fpgen for Camoufox) is CPU
+heavy. A :class:`FingerprintPool` keeps a persisted stock of validated
+fingerprints that a background thread tops up, so launches only pop one off the
+pool. Fingerprints can be pinned to a key (a profile slot or a proxy) so the
+same identity is presented every time that key is used.
+"""
+
+from __future__ import annotations
+
+import copy
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from app.core.metrics import get_counter, get_histogram
+
+logger = logging.getLogger(__name__)
+
+Fingerprint = Dict[str, Any]
+FingerprintGenerator = Callable[[], Optional[Fingerprint]]
+FingerprintValidator = Callable[[Fingerprint], bool]
+
+ENGINES = ("camoufox", "chromium")
+# Pins kept per pool; the least recently used pin is dropped beyond this
+DEFAULT_MAX_PINS = 1024
+_FILE_VERSION = 1
+
+
+def is_valid_fingerprint(fingerprint: Any) -> bool:
+    """Return True for a non-empty dict that survives a JSON round trip unchanged."""
+    if not isinstance(fingerprint, dict) or not fingerprint:
+        return False
+    try:
+        return json.loads(json.dumps(fingerprint)) == fingerprint
+    except (TypeError, ValueError):
+        return False
+
+
+def is_valid_camoufox_fingerprint(fingerprint: Any) -> bool:
+    """Return True for a serializable fpgen fingerprint with a Firefox user agent."""
+    if not is_valid_fingerprint(fingerprint):
+        return False
+    navigator = fingerprint.get("navigator")
+    user_agent = navigator.get("userAgent") if isinstance(navigator, dict) else None
+    return isinstance(user_agent, str) and "Firefox" in user_agent
+
+
+def is_valid_chromium_fingerprint(fingerprint: Any) -> bool:
+    """Return True for a serializable fingerprint with a user agent."""
+    return is_valid_fingerprint(fingerprint) and isinstance(fingerprint.get("userAgent"), str)
+
+
+class FingerprintPool:
+    """Persisted stock of pre-generated fingerprints with optional pinning."""
+
+    def __init__(
+        self,
+        name: str,
+        generator: FingerprintGenerator,
+        *,
+        target_size: int,
+        store_path: Optional[Path] = None,
+        spec: Optional[Dict[str, Any]] = None,
+        validator: FingerprintValidator = is_valid_fingerprint,
+        max_pins: int = DEFAULT_MAX_PINS,
+    ) -> None:
+        """Initialize the pool and load any persisted state.
+
+        Args:
+            name: Pool name used in logs and metric names
+            generator: Returns a fresh fingerprint (or None on failure)
+            target_size: Number of unpinned fingerprints kept in stock
+            store_path: JSON file the pool is persisted to; None keeps it in memory
+            spec: Generation parameters; persisted stock generated with a different
+                spec is discarded on load
+            validator: Rejects fingerprints that must not be handed out
+            max_pins: Maximum number of pinned fingerprints kept
+        """
+        self.name = name
+        self.target_size = max(0, int(target_size))
+        self.store_path = Path(store_path) if store_path is not None else None
+        self.spec = dict(spec or {})
+        self.max_pins = max(1, int(max_pins))
+        self._generator = generator
+        self._validator = validator
+        self._lock = threading.Lock()
+        self._available: List[Fingerprint] = []
+        self._pins: "OrderedDict[str, Fingerprint]" = OrderedDict()
+        self._dirty = False
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._hits = get_counter(f"fingerprint_pool_{name}_hits_total", "Fingerprints served from the pool")
+        self._misses = get_counter(
+            f"fingerprint_pool_{name}_misses_total", "Fingerprints generated on the request path"
+        )
+        self._generation = get_histogram(
+            f"fingerprint_pool_{name}_generation_seconds", "Time to generate one fingerprint"
+        )
+        self._load()
+
+    @property
+    def size(self) -> int:
+        """Number of unpinned fingerprints in stock."""
+        with self._lock:
+            return len(self._available)
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def pinned(self, pin: str) -> Optional[Fingerprint]:
+        """Return a copy of the fingerprint pinned to ``pin``, if any."""
+        with self._lock:
+            fingerprint = self._pins.get(pin)
+            if fingerprint is None:
+                return None
+            self._pins.move_to_end(pin)
+            return copy.deepcopy(fingerprint)
+
+    def take(self, pin: Optional[str] = None) -> Optional[Fingerprint]:
+        """Return a fingerprint, pinning it to ``pin`` when given.
+
+        A pinned key always gets the same fingerprint back. Otherwise one is
+        popped from stock; an empty pool falls back to generating inline.
+        """
+        with self._lock:
+            if pin is not None and pin in self._pins:
+                self._pins.move_to_end(pin)
+                self._hits.inc()
+                return copy.deepcopy(self._pins[pin])
+            fingerprint = self._available.pop() if self._available else None
+
+        if fingerprint is not None:
+            self._hits.inc()
+        else:
+            self._misses.inc()
+            fingerprint = self._generate()
+            if fingerprint is None:
+                return None
+
+        with self._lock:
+            if pin is not None:
+                # Another caller may have pinned the key meanwhile; keep theirs
+                existing = self._pins.get(pin)
+                if existing is not None:
+                    self._available.append(fingerprint)
+                    fingerprint = existing
+                else:
+                    self._pins[pin] = fingerprint
+                    while len(self._pins) > self.max_pins:
+                        self._pins.popitem(last=False)
+            self._dirty = True
+        self._after_take()
+        return copy.deepcopy(fingerprint)
+
+    def unpin(self, pin: str) -> None:
+        """Drop the fingerprint pinned to ``pin`` so the key gets a new identity."""
+        with self._lock:
+            if self._pins.pop(pin, None) is not None:
+                self._dirty = True
+        self._after_take()
+
+    def fill(self, limit: Optional[int] = None) -> int:
+        """Generate fingerprints until the pool holds ``target_size``; return how many were added."""
+        added = 0
+        while not self._stopping.is_set() and (limit is None or added < limit):
+            with self._lock:
+                if len(self._available) >= self.target_size:
+                    break
+            fingerprint = self._generate()
+            if fingerprint is None:
+                break  # the generator is failing; retry on the next wake-up
+            with self._lock:
+                self._available.append(fingerprint)
+                self._dirty = True
+            added += 1
+        return added
+
+    def flush(self) -> None:
+        """Persist the pool if it changed since the last write."""
+        if self.store_path is None:
+            return
+        with self._lock:
+            if not self._dirty:
+                return
+            payload = {
+                "version": _FILE_VERSION,
+                "spec": self.spec,
+                "available": list(self._available),
+                "pins": dict(self._pins),
+            }
+            self._dirty = False
+        try:
+            self.store_path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = self.store_path.with_suffix(self.store_path.suffix + ".tmp")
+            with open(temp_path, "w", encoding="utf-8") as handle:
+                json.dump(payload, handle)
+            os.replace(temp_path, self.store_path)
+        except OSError as exc:
+            logger.warning("Failed to persist fingerprint pool %s: %s", self.name, exc)
+            with self._lock:
+                self._dirty = True
+
+    def start(self) -> None:
+        """Start the background thread that keeps the pool topped up."""
+        if self.running or self.target_size <= 0:
+            return
+        self._stopping.clear()
+        self._wakeup.set()
+        self._thread = threading.Thread(target=self._run, name=f"fingerprint-pool-{self.name}", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = 5.0) -> None:
+        """Stop the background thread and persist outstanding changes."""
+        thread = self._thread
+        self._stopping.set()
+        self._wakeup.set()
+        if thread is not None:
+            thread.join(timeout)
+        self._thread = None
+        self.flush()
+
+    def _run(self) -> None:
+        while not self._stopping.is_set():
+            self._wakeup.wait()
+            self._wakeup.clear()
+            if self._stopping.is_set():
+                break
+            try:
+                added = self.fill()
+                if added:
+                    logger.debug("Fingerprint pool %s refilled with %s fingerprint(s)", self.name, added)
+            except Exception as exc:  # pragma: no cover - keep the filler alive
+                logger.warning("Fingerprint pool %s refill failed: %s", self.name, exc)
+            self.flush()
+
+    def _after_take(self) -> None:
+        if self.running:
+            self._wakeup.set()  # the filler refills and persists off the request path
+        else:
+            self.flush()
+
+    def _generate(self) -> Optional[Fingerprint]:
+        started = time.perf_counter()
+        try:
+            fingerprint = self._generator()
+        except Exception as exc:
+            logger.warning("Fingerprint generation for pool %s failed: %s", self.name, exc)
+            return None
+        finally:
+            self._generation.observe(time.perf_counter() - started)
+        if not self._validator(fingerprint):
+            logger.warning("Discarding invalid fingerprint generated for pool %s", self.name)
+            return None
+        return fingerprint
+
+    def _load(self) -> None:
+        if self.store_path is None or not self.store_path.exists():
+            return
+        try:
+            with open(self.store_path, "r", encoding="utf-8") as handle:
+                payload = json.load(handle)
+        except (OSError, ValueError) as exc:
+            logger.warning("Ignoring unreadable fingerprint pool %s: %s", self.store_path, exc)
+            return
+        if not isinstance(payload, dict) or payload.get("version") != _FILE_VERSION:
+            return
+        pins = payload.get("pins")
+        if isinstance(pins, dict):
+            # Pinned identities outlive spec changes: the keys already presented them
+            for pin, fingerprint in pins.items():
+                if self._validator(fingerprint):
+                    self._pins[str(pin)] = fingerprint
+        if payload.get("spec") == self.spec and isinstance(payload.get("available"), list):
+            self._available = [fp for fp in payload["available"] if self._validator(fp)]
+
+
+def _int_setting(settings, name: str, default: int) -> int:
+    value = getattr(settings, name, default)
+    if isinstance(value, bool) or not isinstance(value, int):
+        return default
+    return value
+
+
+def _camoufox_window(settings) -> Optional[Tuple[int, int]]:
+    from app.services.common.browser.camoufox import CamoufoxArgsBuilder
+
+    window = getattr(settings, "camoufox_window", None)
+    return CamoufoxArgsBuilder._parse_window_size(window) if isinstance(window, str) else None
+
+
+def _build_pool(engine: str, settings, size: int, pool_dir: Optional[str]) -> FingerprintPool:
+    store_path = Path(pool_dir) / f"{engine}.json" if pool_dir else None
+    if engine == "camoufox":
+        window = _camoufox_window(settings)
+
+        def generate_camoufox() -> Optional[Fingerprint]:
+            from camoufox.fingerprints import generate_fingerprint
+
+            return generate_fingerprint(window=window)
+
+        return FingerprintPool(
+            engine,
+            generate_camoufox,
+            target_size=size,
+            store_path=store_path,
+            spec={"generator": "camoufox", "window": list(window) if window else None},
+            validator=is_valid_camoufox_fingerprint,
+        )
+
+    def generate_chromium() -> Optional[Fingerprint]:
+        from app.services.common.browser.profile_manager import generate_browserforge_fingerprint
+
+        fingerprint, _source = generate_browserforge_fingerprint()
+        return fingerprint
+
+    return FingerprintPool(
+        engine,
+        generate_chromium,
+        target_size=size,
+        store_path=store_path,
+        spec={"generator": "browserforge"},
+        validator=is_valid_chromium_fingerprint,
+    )
+
+
+_pools: Dict[str, FingerprintPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_fingerprint_pool(engine: str, settings=None) -> Optional[FingerprintPool]:
+    """Return the process-wide pool for ``engine``, or None when pooling is disabled."""
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown fingerprint pool engine: {engine!r}")
+    if settings is None:
+        from app.core.config import get_settings
+
+        settings = get_settings()
+    size = _int_setting(settings, "fingerprint_pool_size", 0)
+    if size <= 0:
+        return None
+    pool_dir = getattr(settings, "fingerprint_pool_dir", None)
+    pool_dir = pool_dir if isinstance(pool_dir, str) and pool_dir else None
+    with _pools_lock:
+        pool = _pools.get(engine)
+        if pool is None:
+            pool = _build_pool(engine, settings, size, pool_dir)
+            _pools[engine] = pool
+        return pool
+
+
+def take_fingerprint(engine: str, settings=None, pin: Optional[str] = None) -> Optional[Fingerprint]:
+    """Take a pooled fingerprint for ``engine``; None when pooling is disabled or generation fails."""
+    pool = get_fingerprint_pool(engine, settings)
+    if pool is None:
+        return None
+    return pool.take(pin)
+
+
+def start_fingerprint_pools(settings) -> List[FingerprintPool]:
+    """Start background refilling for every enabled engine."""
+    started = []
+    for engine in ENGINES:
+        pool = get_fingerprint_pool(engine, settings)
+        if pool is not None:
+            pool.start()
+            started.append(pool)
+    return started
+
+
+def stop_fingerprint_pools() -> None:
+    """Stop background refilling and persist every pool."""
+    with _pools_lock:
+        pools = list(_pools.values())
+    for pool in pools:
+        pool.stop()
+
+
+def reset_fingerprint_pools() -> None:
+    """Stop and forget every pool (for tests)."""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.stop(timeout=1.0)
+
+
+__all__ = [
+    "DEFAULT_MAX_PINS",
+    "ENGINES",
+    "Fingerprint",
+    "FingerprintPool",
+    "get_fingerprint_pool",
+    "is_valid_camoufox_fingerprint",
+    "is_valid_chromium_fingerprint",
+    "is_valid_fingerprint",
+    "reset_fingerprint_pools",
+    "start_fingerprint_pools",
+    "stop_fingerprint_pools",
+    "take_fingerprint",
+]
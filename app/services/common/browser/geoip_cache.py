@@ -0,0 +1,154 @@
+"""Per-egress cache of Camoufox GeoIP resolutions.
+
+With ``geoip=True`` Camoufox looks up the public IP through the proxy and then
+queries its GeoLite database on every launch. The result only depends on the
+egress (a proxy, or the direct connection), so it is resolved once per egress,
+kept for a TTL and handed to Camoufox as explicit ``config`` values instead.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from app.core.metrics import get_counter
+from app.services.crawler.proxy.redact import redact_proxy
+
+logger = logging.getLogger(__name__)
+
+DIRECT_EGRESS = "direct"
+# Failed resolutions are retried after this many seconds rather than the full TTL
+DEFAULT_FAILURE_TTL_SECONDS = 60.0
+
+
+@dataclass(frozen=True)
+class GeoIPResolution:
+    """Egress IP and the Camoufox config keys derived from it."""
+
+    ip: str
+    config: Dict[str, Any] = field(default_factory=dict)
+
+    def launch_config(self) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """Return ``(config, firefox_user_prefs)`` equivalent to Camoufox's own geoip handling."""
+        config = dict(self.config)
+        prefs: Dict[str, Any] = {}
+        if ":" in self.ip:
+            config["webrtc:ipv6"] = self.ip
+        else:
+            config["webrtc:ipv4"] = self.ip
+            prefs["network.dns.disableIPv6"] = True
+        return config, prefs
+
+
+GeoIPResolver = Callable[[Optional[str]], GeoIPResolution]
+
+
+def resolve_geoip(proxy: Optional[str]) -> GeoIPResolution:
+    """Resolve the egress IP of ``proxy`` (or the direct connection) through Camoufox."""
+    from camoufox.geolocation import get_geolocation
+    from camoufox.ip import public_ip
+
+    ip = public_ip(proxy) if proxy else public_ip()
+    return GeoIPResolution(ip=ip, config=get_geolocation(ip).as_config())
+
+
+class GeoIPCache:
+    """Thread-safe TTL cache of :class:`GeoIPResolution` keyed by egress."""
+
+    def __init__(
+        self,
+        ttl_seconds: float,
+        resolver: GeoIPResolver = resolve_geoip,
+        failure_ttl_seconds: float = DEFAULT_FAILURE_TTL_SECONDS,
+    ) -> None:
+        self.ttl_seconds = max(0.0, float(ttl_seconds))
+        self.failure_ttl_seconds = max(0.0, float(failure_ttl_seconds))
+        self._resolver = resolver
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Tuple[float, Optional[GeoIPResolution]]] = {}
+        self._key_locks: Dict[str, threading.Lock] = {}
+        self._hits = get_counter("geoip_cache_hits_total", "GeoIP resolutions served from cache")
+        self._misses = get_counter("geoip_cache_misses_total", "GeoIP resolutions performed")
+
+    def get(self, proxy: Optional[str]) -> Optional[GeoIPResolution]:
+        """Return the resolution for ``proxy``; None when it cannot be resolved."""
+        key = proxy or DIRECT_EGRESS
+        cached = self._lookup(key)
+        if cached is not None:
+            return cached[1]
+
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        # One resolution per egress; concurrent launches wait for it instead of racing
+        with key_lock:
+            cached = self._lookup(key)
+            if cached is not None:
+                return cached[1]
+            self._misses.inc()
+            try:
+                resolution: Optional[GeoIPResolution] = self._resolver(proxy)
+                ttl = self.ttl_seconds
+            except Exception as exc:
+                logger.warning(f"GeoIP resolution failed for {redact_proxy(proxy) or DIRECT_EGRESS}: {exc}")
+                resolution = None
+                ttl = self.failure_ttl_seconds
+            with self._lock:
+                self._entries[key] = (time.monotonic() + ttl, resolution)
+            return resolution
+
+    def invalidate(self, proxy: Optional[str]) -> None:
+        """Forget the resolution for ``proxy``."""
+        with self._lock:
+            self._entries.pop(proxy or DIRECT_EGRESS, None)
+
+    def clear(self) -> None:
+        """Forget every resolution."""
+        with self._lock:
+            self._entries.clear()
+
+    def _lookup(self, key: str) -> Optional[Tuple[float, Optional[GeoIPResolution]]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._entries[key]
+                return None
+        self._hits.inc()
+        return entry
+
+
+_cache: Optional[GeoIPCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_geoip_cache(settings) -> Optional[GeoIPCache]:
+    """Return the process-wide cache, or None when ``geoip_cache_ttl_seconds`` is not positive."""
+    global _cache
+    ttl = getattr(settings, "geoip_cache_ttl_seconds", 0)
+    if isinstance(ttl, bool) or not isinstance(ttl, (int, float)) or ttl <= 0:
+        return None
+    with _cache_lock:
+        if _cache is None or _cache.ttl_seconds != float(ttl):
+            _cache = GeoIPCache(ttl)
+        return _cache
+
+
+def reset_geoip_cache() -> None:
+    """Drop the process-wide cache (for tests)."""
+    global _cache
+    with _cache_lock:
+        _cache = None
+
+
+__all__ = [
+    "DIRECT_EGRESS",
+    "GeoIPCache",
+    "GeoIPResolution",
+    "get_geoip_cache",
+    "reset_geoip_cache",
+    "resolve_geoip",
+]
@@ -0,0 +1,73 @@
+"""Process-wide cache of parsed JSON files keyed by file identity.
+
+An entry is valid while the file's ``(inode, mtime_ns, size)`` is unchanged, so
+writes from other processes invalidate it without coordination. Writers in this
+process can store the value they just wrote (write-through) using the identity
+of the temp file they are about to rename into place; ``os.replace`` preserves
+inode, mtime and size.
+"""
+
+from __future__ import annotations
+
+import copy
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+FileIdentity = Tuple[int, int, int]
+
+
+def file_identity(path: Path) -> Optional[FileIdentity]:
+    """Return ``(inode, mtime_ns, size)`` for ``path``, or None when it cannot be stat'ed."""
+    try:
+        stat = os.stat(path)
+    except (OSError, TypeError, ValueError):
+        return None
+    return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+
+def _key(path: Path) -> str:
+    return os.path.abspath(str(path))
+
+
+class JsonFileCache:
+    """Thread-safe map of path -> (identity, parsed value)."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Tuple[FileIdentity, Any]] = {}
+
+    def get(self, path: Path, identity: Optional[FileIdentity]) -> Tuple[bool, Any]:
+        """Return ``(hit, value)``; the value is a deep copy the caller may mutate."""
+        if identity is None:
+            return False, None
+        with self._lock:
+            entry = self._entries.get(_key(path))
+        if entry is None or entry[0] != identity:
+            return False, None
+        return True, copy.deepcopy(entry[1])
+
+    def put(self, path: Path, identity: Optional[FileIdentity], value: Any) -> None:
+        """Remember ``value`` as the content of ``path`` at ``identity``."""
+        if identity is None:
+            self.invalidate(path)
+            return
+        with self._lock:
+            self._entries[_key(path)] = (identity, copy.deepcopy(value))
+
+    def invalidate(self, path: Path) -> None:
+        """Forget the entry for ``path``."""
+        with self._lock:
+            self._entries.pop(_key(path), None)
+
+    def clear(self) -> None:
+        """Forget every entry."""
+        with self._lock:
+            self._entries.clear()
+
+
+json_file_cache = JsonFileCache()
+
+
+__all__ = ["FileIdentity", "JsonFileCache", "file_identity", "json_file_cache"]
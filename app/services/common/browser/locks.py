@@ -1,11 +1,22 @@
-"""Cross-platform file locking utilities for Chromium user data."""
+"""Cross-platform file locking utilities for Chromium user data.
 
+Locks are fair within a process: waiters for the same lock file queue FIFO in
+memory (threads park on an event, coroutines on a future) and only the head of
+the queue contends for the cross-process ``flock``. Wait and hold durations are
+recorded as histograms in :mod:`app.core.metrics`.
+"""
+
+import asyncio
 import logging
 import os
 import random
+import threading
 import time
-from contextlib import contextmanager
-from typing import Optional
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from typing import Deque, Dict, Optional
+
+from app.core.metrics import get_counter, get_histogram
 
 # fcntl is not available on Windows, so we need to handle this gracefully
 try:
@@ -16,6 +27,136 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+_LOCK_WAIT_SECONDS = get_histogram(
+    "user_data_lock_wait_seconds",
+    "Time spent waiting for a user-data profile lock",
+)
+_LOCK_HOLD_SECONDS = get_histogram(
+    "user_data_lock_hold_seconds",
+    "Time a user-data profile lock was held",
+)
+_LOCK_TIMEOUTS = get_counter(
+    "user_data_lock_timeouts_total",
+    "User-data profile lock acquisitions that timed out",
+)
+
+_FLOCK_POLL_INITIAL = 0.01
+_FLOCK_POLL_MAX = 0.1
+
+
+class _Waiter:
+    """A queued thread or coroutine waiting for its turn on a :class:`FairLockQueue`."""
+
+    __slots__ = ("granted", "event", "loop", "future")
+
+    def __init__(self, loop: Optional[asyncio.AbstractEventLoop] = None) -> None:
+        self.granted = False
+        self.loop = loop
+        self.event = threading.Event() if loop is None else None
+        self.future = loop.create_future() if loop is not None else None
+
+    def grant(self) -> None:
+        self.granted = True
+        if self.event is not None:
+            self.event.set()
+        else:
+            self.loop.call_soon_threadsafe(self._resolve)
+
+    def _resolve(self) -> None:
+        if not self.future.done():
+            self.future.set_result(True)
+
+
+class FairLockQueue:
+    """In-process FIFO ticket lock shared by threads and asyncio tasks.
+
+    Ownership is handed directly to the oldest waiter on release, so a hot path
+    that releases and immediately re-acquires cannot jump the queue.
+    """
+
+    def __init__(self) -> None:
+        self._mutex = threading.Lock()
+        self._held = False
+        self._waiters: Deque[_Waiter] = deque()
+
+    @property
+    def queued(self) -> int:
+        """Number of waiters currently parked behind the owner."""
+        return len(self._waiters)
+
+    def _enqueue(self, waiter_factory) -> Optional[_Waiter]:
+        with self._mutex:
+            if not self._held and not self._waiters:
+                self._held = True
+                return None
+            waiter = waiter_factory()
+            self._waiters.append(waiter)
+            return waiter
+
+    def _abandon(self, waiter: _Waiter) -> bool:
+        """Withdraw ``waiter``; return True when ownership was granted in the meantime."""
+        with self._mutex:
+            if waiter.granted:
+                return True
+            try:
+                self._waiters.remove(waiter)
+            except ValueError:
+                pass
+            return False
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        """Block the calling thread until it owns the queue or ``timeout`` elapses."""
+        waiter = self._enqueue(_Waiter)
+        if waiter is None:
+            return True
+        if waiter.event.wait(timeout):
+            return True
+        return self._abandon(waiter)
+
+    async def acquire_async(self, timeout: Optional[float] = None) -> bool:
+        """Await ownership without occupying a thread."""
+        loop = asyncio.get_running_loop()
+        waiter = self._enqueue(lambda: _Waiter(loop))
+        if waiter is None:
+            return True
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter.future), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return self._abandon(waiter)
+        except asyncio.CancelledError:
+            if self._abandon(waiter):
+                self.release()
+            raise
+
+    def release(self) -> None:
+        """Hand ownership to the oldest live waiter, or mark the queue free."""
+        with self._mutex:
+            while self._waiters:
+                waiter = self._waiters.popleft()
+                try:
+                    waiter.grant()
+                    return
+                except RuntimeError:
+                    # The waiter's event loop is gone; skip it
+                    continue
+            self._held = False
+
+
+_queues: Dict[str, FairLockQueue] = {}
+_queues_lock = threading.Lock()
+
+
+def get_fair_lock_queue(lock_file) -> FairLockQueue:
+    """Return the process-wide FIFO queue guarding ``lock_file``."""
+    key = os.path.abspath(str(lock_file))
+    with _queues_lock:
+        queue = _queues.get(key)
+        if queue is None:
+            queue = FairLockQueue()
+            _queues[key] = queue
+        return queue
+
 
 class FileLock:
     """Cross-platform file-based lock with timeout support."""
@@ -30,13 +171,50 @@ class FileLock:
         self.lock_file = lock_file
         self.timeout = timeout
         self.lock_fd: Optional[int] = None
+        self._queue = get_fair_lock_queue(lock_file)
+        self._queued = False
+        self._acquired_at: Optional[float] = None
 
     def acquire(self) -> bool:
         """Acquire the lock with timeout."""
+        started = time.monotonic()
+        if not self._queue.acquire(self.timeout):
+            return self._finish_acquire(False, started)
+        self._queued = True
+
+        remaining = max(0.0, self.timeout - (time.monotonic() - started))
         if not FCNTL_AVAILABLE:
-            return self._windows_acquire()
+            acquired = self._windows_acquire()
         else:
-            return self._unix_acquire()
+            acquired = self._unix_acquire(remaining)
+        return self._finish_acquire(acquired, started)
+
+    async def acquire_async(self) -> bool:
+        """Awaitable :meth:`acquire` that waits on the event loop instead of a thread."""
+        started = time.monotonic()
+        if not await self._queue.acquire_async(self.timeout):
+            return self._finish_acquire(False, started)
+        self._queued = True
+
+        try:
+            if not FCNTL_AVAILABLE:
+                acquired = await asyncio.to_thread(self._windows_acquire)
+            else:
+                acquired = await self._unix_acquire_async(started + self.timeout)
+        except BaseException:
+            self.release()
+            raise
+        return self._finish_acquire(acquired, started)
+
+    def _finish_acquire(self, acquired: bool, started: float) -> bool:
+        waited = time.monotonic() - started
+        _LOCK_WAIT_SECONDS.observe(waited)
+        if acquired:
+            self._acquired_at = time.monotonic()
+            return True
+        _LOCK_TIMEOUTS.inc()
+        self._release_queue()
+        return False
 
     def _windows_acquire(self) -> bool:
         """Acquire lock on Windows using exclusive file creation."""
@@ -68,31 +246,72 @@ class FileLock:
 
         return False
 
-    def _unix_acquire(self) -> bool:
+    def _unix_acquire(self, timeout: Optional[float] = None) -> bool:
         """Acquire lock on Unix/Linux using fcntl."""
+        timeout = self.timeout if timeout is None else timeout
         try:
             self.lock_fd = os.open(self.lock_file, os.O_CREAT | os.O_WRONLY | os.O_TRUNC)
 
-            # Try to acquire exclusive lock with timeout
+            # Only the head of the in-process queue gets here, so polling is
+            # limited to contention with other processes
             start_time = time.time()
+            delay = _FLOCK_POLL_INITIAL
             while True:
                 try:
                     fcntl.flock(self.lock_fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
                     logger.debug(f"Acquired exclusive Unix lock: {self.lock_file}")
                     return True
                 except (IOError, BlockingIOError):
-                    if time.time() - start_time > self.timeout:
+                    if time.time() - start_time > timeout:
                         logger.warning(f"Timeout waiting for lock: {self.lock_file}")
-                        self.release()
+                        self._release_fd()
                         return False
-                    time.sleep(0.1)
+                    time.sleep(delay)
+                    delay = min(_FLOCK_POLL_MAX, delay * 2)
         except Exception as e:
             logger.warning(f"Failed to acquire Unix lock: {e}")
-            self.release()
+            self._release_fd()
+            return False
+
+    async def _unix_acquire_async(self, deadline: float) -> bool:
+        """Poll ``flock`` with non-blocking sleeps until ``deadline`` (monotonic)."""
+        try:
+            self.lock_fd = os.open(self.lock_file, os.O_CREAT | os.O_WRONLY | os.O_TRUNC)
+            delay = _FLOCK_POLL_INITIAL
+            while True:
+                try:
+                    fcntl.flock(self.lock_fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    logger.debug(f"Acquired exclusive Unix lock: {self.lock_file}")
+                    return True
+                except (IOError, BlockingIOError):
+                    if time.monotonic() > deadline:
+                        logger.warning(f"Timeout waiting for lock: {self.lock_file}")
+                        self._release_fd()
+                        return False
+                    await asyncio.sleep(delay)
+                    delay = min(_FLOCK_POLL_MAX, delay * 2)
+        except Exception as e:
+            logger.warning(f"Failed to acquire Unix lock: {e}")
+            self._release_fd()
             return False
 
     def release(self) -> None:
         """Release the lock."""
+        try:
+            self._release_fd()
+        finally:
+            if self._acquired_at is not None:
+                _LOCK_HOLD_SECONDS.observe(time.monotonic() - self._acquired_at)
+                self._acquired_at = None
+            self._release_queue()
+
+    def _release_queue(self) -> None:
+        if self._queued:
+            self._queued = False
+            self._queue.release()
+
+    def _release_fd(self) -> None:
+        """Release the cross-process lock and its descriptor."""
         if self.lock_fd is None:
             return
 
@@ -147,3 +366,22 @@ def exclusive_lock(lock_file: str, timeout: float = 30.0):
         yield True
     finally:
         lock.release()
+
+
+@asynccontextmanager
+async def exclusive_lock_async(lock_file: str, timeout: float = 30.0):
+    """Async counterpart of :func:`exclusive_lock` that never parks a thread while waiting.
+
+    Raises:
+        RuntimeError: If lock cannot be acquired within ``timeout``
+    """
+    lock = FileLock(lock_file, timeout)
+    acquired = await lock.acquire_async()
+
+    if not acquired:
+        raise RuntimeError(f"Failed to acquire lock: {lock_file}")
+
+    try:
+        yield True
+    finally:
+        lock.release()
@@ -0,0 +1,90 @@
+"""Scheduled maintenance of master browser profiles."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Dict, Optional
+
+from app.services.common.browser.profile_pool import profile_pool_from_settings
+from app.services.common.browser.types import CompactionResult
+from app.services.common.browser.user_data import compact_master_profile
+from app.services.common.browser.user_data_chromium import ChromiumUserDataManager
+
+logger = logging.getLogger(__name__)
+
+
+def _setting(settings, name: str, default: float) -> float:
+    try:
+        return float(getattr(settings, name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def run_profile_compaction(settings) -> Dict[str, CompactionResult]:
+    """Compact every Chromium and Camoufox master profile slot once.
+
+    Returns the results keyed by ``"<engine>:<slot dir>"``; busy or missing
+    profiles are skipped and do not appear.
+    """
+    lock_timeout = _setting(settings, "profile_compaction_lock_timeout_seconds", 5.0)
+    results: Dict[str, CompactionResult] = {}
+
+    chromium_base = getattr(settings, "chromium_user_data_dir", None)
+    if isinstance(chromium_base, str) and chromium_base:
+        for slot_dir in profile_pool_from_settings(settings, chromium_base).profile_dirs():
+            result = ChromiumUserDataManager(str(slot_dir)).compact_master(lock_timeout)
+            if result is not None:
+                results[f"chromium:{slot_dir}"] = result
+
+    camoufox_base = getattr(settings, "camoufox_user_data_dir", None)
+    if isinstance(camoufox_base, str) and camoufox_base:
+        for slot_dir in profile_pool_from_settings(settings, camoufox_base).profile_dirs():
+            result = compact_master_profile(str(slot_dir), lock_timeout=lock_timeout)
+            if result is not None:
+                results[f"camoufox:{slot_dir}"] = result
+
+    return results
+
+
+class ProfileCompactionScheduler:
+    """Run :func:`run_profile_compaction` periodically on a worker thread."""
+
+    def __init__(self, settings) -> None:
+        self._settings = settings
+        self.interval_seconds = _setting(settings, "profile_compaction_interval_seconds", 0)
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Schedule the job on the running loop; a non-positive interval disables it."""
+        if self.interval_seconds <= 0 or self.running:
+            return
+        self._task = asyncio.get_running_loop().create_task(self._run(), name="profile-compaction")
+        logger.debug("Profile compaction scheduled every %ss", self.interval_seconds)
+
+    async def stop(self) -> None:
+        """Cancel the job and wait for it to finish."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval_seconds)
+            try:
+                results = await asyncio.to_thread(run_profile_compaction, self._settings)
+                logger.info("Profile compaction finished for %s profile(s)", len(results))
+            except Exception as exc:  # pragma: no cover - keep the schedule alive
+                logger.warning("Profile compaction failed: %s", exc)
+
+
+__all__ = ["ProfileCompactionScheduler", "run_profile_compaction"]
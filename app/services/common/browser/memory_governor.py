@@ -0,0 +1,313 @@
+"""Memory-aware admission for browser launches.
+
+Starting a browser on a host that is already short of memory leads to swapping
+and OOM kills that take every in-flight request down with it. Launch paths call
+:func:`admit_browser_launch` first; the :class:`MemoryGovernor` checks
+
+* ``MemAvailable`` from ``/proc/meminfo`` (capped by the cgroup v2 limit when
+  the service runs in a container),
+* the ``some avg10`` memory stall percentage from ``/proc/pressure/memory``,
+* the summed RSS of browsers launched by this process,
+
+against configurable thresholds. Launches that do not fit wait in a FIFO queue
+until memory frees up and are rejected with :class:`MemoryPressureError` once
+``memory_admission_timeout_seconds`` ran out. Every threshold defaults to 0
+(disabled); on platforms without ``/proc`` the readings are unavailable and
+launches are admitted.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+from app.core.cancellation import cancellable_sleep
+from app.core.metrics import get_counter, get_histogram
+from app.services.common.browser.locks import FairLockQueue
+from app.services.common.browser.watchdog import PROC_ROOT, descendants, read_process_table
+
+logger = logging.getLogger(__name__)
+
+CGROUP_ROOT = "/sys/fs/cgroup"
+# Seconds between re-checks while a launch waits for memory
+DEFAULT_POLL_INTERVAL_SECONDS = 0.5
+# Readings are reused for this long so bursts of launches do not rescan /proc
+_SNAPSHOT_TTL_SECONDS = 0.25
+
+
+class MemoryPressureError(RuntimeError):
+    """Raised when a browser launch is rejected because the host is short of memory."""
+
+
+@dataclass(frozen=True)
+class MemorySnapshot:
+    """Memory readings used for one admission decision; None means unavailable."""
+
+    available_bytes: Optional[int]
+    psi_some_avg10: Optional[float]
+    browser_rss_bytes: Optional[int]
+
+
+def read_mem_available(proc_root: str = PROC_ROOT, cgroup_root: str = CGROUP_ROOT) -> Optional[int]:
+    """Return available memory in bytes, bounded by the cgroup v2 headroom if any."""
+    available: Optional[int] = None
+    try:
+        with open(os.path.join(proc_root, "meminfo"), "r", encoding="ascii") as handle:
+            for line in handle:
+                if line.startswith("MemAvailable:"):
+                    available = int(line.split()[1]) * 1024
+                    break
+    except (OSError, ValueError, IndexError):
+        pass
+
+    try:
+        with open(os.path.join(cgroup_root, "memory.max"), "r", encoding="ascii") as handle:
+            limit = handle.read().strip()
+        with open(os.path.join(cgroup_root, "memory.current"), "r", encoding="ascii") as handle:
+            current = int(handle.read().strip())
+        if limit != "max":
+            headroom = max(0, int(limit) - current)
+            available = headroom if available is None else min(available, headroom)
+    except (OSError, ValueError):
+        pass
+    return available
+
+
+def read_memory_psi(proc_root: str = PROC_ROOT) -> Optional[float]:
+    """Return the ``some avg10`` memory pressure percentage, or None without PSI support."""
+    try:
+        with open(os.path.join(proc_root, "pressure", "memory"), "r", encoding="ascii") as handle:
+            for line in handle:
+                parts = line.split()
+                if parts and parts[0] == "some":
+                    for part in parts[1:]:
+                        name, _, value = part.partition("=")
+                        if name == "avg10":
+                            return float(value)
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def read_browser_rss(proc_root: str = PROC_ROOT, root_pid: Optional[int] = None) -> Optional[int]:
+    """Return the summed RSS of browser processes below ``root_pid`` (this process by default)."""
+    root_pid = os.getpid() if root_pid is None else root_pid
+    table = read_process_table(proc_root)
+    if root_pid not in table:
+        return None
+    tree = descendants(table, root_pid)
+    browser_pids = {info.pid for info in tree if info.is_browser}
+    # Count whole browser trees, including helpers (crash handlers, GPU) below them
+    total = 0
+    for info in tree:
+        ancestor = info
+        while ancestor is not None and ancestor.pid != root_pid:
+            if ancestor.pid in browser_pids:
+                total += info.rss_bytes
+                break
+            ancestor = table.get(ancestor.ppid)
+    return total
+
+
+class MemoryGovernor:
+    """Admit browser launches only while memory thresholds are met."""
+
+    def __init__(
+        self,
+        *,
+        min_available_bytes: int = 0,
+        max_psi_some_avg10: float = 0.0,
+        max_browser_rss_bytes: int = 0,
+        launch_reservation_bytes: int = 0,
+        reservation_seconds: float = 10.0,
+        timeout_seconds: float = 0.0,
+        poll_interval_seconds: float = DEFAULT_POLL_INTERVAL_SECONDS,
+        proc_root: str = PROC_ROOT,
+        cgroup_root: str = CGROUP_ROOT,
+    ) -> None:
+        """Initialize the governor; thresholds of 0 are disabled.
+
+        Args:
+            min_available_bytes: Launches wait while available memory is below this
+            max_psi_some_avg10: Launches wait while memory stall time (percent) is above this
+            max_browser_rss_bytes: Launches wait while browsers of this process use more RSS
+            launch_reservation_bytes: Memory assumed for a just-admitted browser until
+                ``reservation_seconds`` passed, so bursts are not all admitted at once
+            reservation_seconds: How long a launch reservation is counted
+            timeout_seconds: How long a launch may wait before it is rejected
+            poll_interval_seconds: Delay between re-checks while waiting
+        """
+        self.min_available_bytes = max(0, int(min_available_bytes))
+        self.max_psi_some_avg10 = max(0.0, float(max_psi_some_avg10))
+        self.max_browser_rss_bytes = max(0, int(max_browser_rss_bytes))
+        self.launch_reservation_bytes = max(0, int(launch_reservation_bytes))
+        self.reservation_seconds = max(0.0, float(reservation_seconds))
+        self.timeout_seconds = max(0.0, float(timeout_seconds))
+        self.poll_interval_seconds = max(0.01, float(poll_interval_seconds))
+        self.proc_root = proc_root
+        self.cgroup_root = cgroup_root
+        self._queue = FairLockQueue()
+        self._lock = threading.Lock()
+        self._reservations: List[float] = []
+        self._cached: Optional[Tuple[float, MemorySnapshot]] = None
+        self._admitted = get_counter("browser_admissions_total", "Browser launches admitted")
+        self._rejected = get_counter("browser_admission_rejections_total", "Browser launches rejected")
+        self._wait = get_histogram("browser_admission_wait_seconds", "Time browser launches waited for memory")
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.min_available_bytes or self.max_psi_some_avg10 or self.max_browser_rss_bytes)
+
+    @property
+    def queued(self) -> int:
+        """Launches waiting behind the head of the queue."""
+        return self._queue.queued
+
+    def snapshot(self) -> MemorySnapshot:
+        """Return current readings (cached briefly)."""
+        now = time.monotonic()
+        cached = self._cached
+        if cached is not None and now - cached[0] < _SNAPSHOT_TTL_SECONDS:
+            return cached[1]
+        snapshot = MemorySnapshot(
+            available_bytes=read_mem_available(self.proc_root, self.cgroup_root) if self.min_available_bytes else None,
+            psi_some_avg10=read_memory_psi(self.proc_root) if self.max_psi_some_avg10 else None,
+            browser_rss_bytes=read_browser_rss(self.proc_root) if self.max_browser_rss_bytes else None,
+        )
+        self._cached = (now, snapshot)
+        return snapshot
+
+    def pressure_reason(self, snapshot: MemorySnapshot, now: Optional[float] = None) -> Optional[str]:
+        """Return why a launch must wait under ``snapshot``, or None when it may proceed."""
+        reserved = self._reserved_bytes(time.monotonic() if now is None else now)
+        if self.min_available_bytes and snapshot.available_bytes is not None:
+            if snapshot.available_bytes - reserved < self.min_available_bytes:
+                return f"available memory {snapshot.available_bytes - reserved} < {self.min_available_bytes} bytes"
+        if self.max_psi_some_avg10 and snapshot.psi_some_avg10 is not None:
+            if snapshot.psi_some_avg10 > self.max_psi_some_avg10:
+                return f"memory pressure {snapshot.psi_some_avg10:.2f}% > {self.max_psi_some_avg10:.2f}%"
+        if self.max_browser_rss_bytes and snapshot.browser_rss_bytes is not None:
+            if snapshot.browser_rss_bytes + reserved > self.max_browser_rss_bytes:
+                return f"browser RSS {snapshot.browser_rss_bytes + reserved} > {self.max_browser_rss_bytes} bytes"
+        return None
+
+    def admit(self, timeout: Optional[float] = None) -> None:
+        """Block until a browser may be launched.
+
+        Raises:
+            MemoryPressureError: If memory did not free up within ``timeout``
+                (``timeout_seconds`` by default)
+        """
+        if not self.enabled:
+            return
+        timeout = self.timeout_seconds if timeout is None else max(0.0, timeout)
+        started = time.monotonic()
+        deadline = started + timeout
+        if not self._queue.acquire(timeout=timeout):
+            self._reject(f"{self._queue.queued} launches already waiting", started)
+        try:
+            while True:
+                reason = self.pressure_reason(self.snapshot())
+                if reason is None:
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._reject(reason, started)
+                logger.debug(f"Deferring browser launch: {reason}")
+                # A launch queued for a request whose client left is dropped
+                cancellable_sleep(min(self.poll_interval_seconds, remaining))
+                self._cached = None
+            self._reserve(time.monotonic())
+        finally:
+            self._queue.release()
+        self._admitted.inc()
+        self._wait.observe(time.monotonic() - started)
+
+    def _reject(self, reason: str, started: float) -> None:
+        self._rejected.inc()
+        self._wait.observe(time.monotonic() - started)
+        logger.warning(f"Rejecting browser launch: {reason}")
+        raise MemoryPressureError(f"Browser launch rejected under memory pressure: {reason}")
+
+    def _reserve(self, now: float) -> None:
+        if not self.launch_reservation_bytes or not self.reservation_seconds:
+            return
+        with self._lock:
+            self._reservations.append(now + self.reservation_seconds)
+
+    def _reserved_bytes(self, now: float) -> int:
+        with self._lock:
+            self._reservations = [expiry for expiry in self._reservations if expiry > now]
+            return len(self._reservations) * self.launch_reservation_bytes
+
+
+def _number(settings, name: str) -> float:
+    value = getattr(settings, name, 0)
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return 0
+    return value
+
+
+_governor: Optional[MemoryGovernor] = None
+_governor_key: Optional[Tuple[float, ...]] = None
+_governor_lock = threading.Lock()
+
+
+def get_memory_governor(settings=None) -> MemoryGovernor:
+    """Return the process-wide governor configured from ``memory_*`` settings."""
+    global _governor, _governor_key
+    if settings is None:
+        from app.core.config import get_settings
+
+        settings = get_settings()
+    key = tuple(
+        _number(settings, name)
+        for name in (
+            "memory_min_available_bytes",
+            "memory_max_psi_some_avg10",
+            "memory_max_browser_rss_bytes",
+            "memory_launch_reservation_bytes",
+            "memory_admission_timeout_seconds",
+        )
+    )
+    with _governor_lock:
+        if _governor is None or _governor_key != key:
+            _governor = MemoryGovernor(
+                min_available_bytes=int(key[0]),
+                max_psi_some_avg10=key[1],
+                max_browser_rss_bytes=int(key[2]),
+                launch_reservation_bytes=int(key[3]),
+                timeout_seconds=key[4],
+            )
+            _governor_key = key
+        return _governor
+
+
+def admit_browser_launch(settings=None) -> None:
+    """Wait until the host has memory for another browser; see :meth:`MemoryGovernor.admit`."""
+    get_memory_governor(settings).admit()
+
+
+def reset_memory_governor() -> None:
+    """Drop the process-wide governor (for tests)."""
+    global _governor, _governor_key
+    with _governor_lock:
+        _governor = None
+        _governor_key = None
+
+
+__all__ = [
+    "MemoryGovernor",
+    "MemoryPressureError",
+    "MemorySnapshot",
+    "admit_browser_launch",
+    "get_memory_governor",
+    "read_browser_rss",
+    "read_memory_psi",
+    "read_mem_available",
+    "reset_memory_governor",
+]
@@ -1,18 +1,28 @@
 """Chromium user data path management utilities."""
 
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
+
+from app.services.common.browser.clone_storage import CloneStorage
 
 
 class ChromiumPathManager:
     """Manages Chromium user data directory structure and path calculations."""
 
-    def __init__(self, user_data_dir: Optional[str] = None):
+    def __init__(
+        self,
+        user_data_dir: Optional[str] = None,
+        *,
+        clone_root: Optional[str] = None,
+        clone_root_max_bytes: int = 0,
+    ):
         """Initialize the Chromium path manager.
 
         Args:
             user_data_dir: Root directory for Chromium profiles. If None,
                           user data management is disabled.
+            clone_root: Optional tmpfs/RAM-disk root for read-mode clones.
+            clone_root_max_bytes: Byte budget for clones below ``clone_root``.
         """
         self.user_data_dir = user_data_dir
         self.enabled = user_data_dir is not None
@@ -21,9 +31,17 @@ class ChromiumPathManager:
             self.base_path = Path(user_data_dir)
             self.master_dir = self.base_path / 'master'
             self.clones_dir = self.base_path / 'clones'
+            self.snapshots_dir = self.base_path / 'snapshots'
             self.lock_file = self.base_path / 'chromium_profile.lock'
             self.metadata_file = self.master_dir / 'metadata.json'
             self.fingerprint_file = self.master_dir / 'browserforge_fingerprint.json'
+            self.storage_state_file = self.master_dir / 'storage_state.json'
+            self.clone_storage = CloneStorage(
+                self.clones_dir,
+                fast_root=clone_root,
+                max_bytes=clone_root_max_bytes,
+                namespace='chromium',
+            )
 
     def get_master_dir(self) -> Optional[str]:
         """Get the master directory path if enabled."""
@@ -43,6 +61,12 @@ class ChromiumPathManager:
         import uuid
         return self.clones_dir / str(uuid.uuid4())
 
+    def get_clone_roots(self) -> List[Path]:
+        """Get every directory that may hold clones (disk and fast root)."""
+        if not self.enabled:
+            return []
+        return self.clone_storage.clone_roots()
+
     def get_cookies_db_path(self) -> Path:
         """Get path to Chromium cookies database."""
         return self.master_dir / "Default" / "Cookies"
@@ -0,0 +1,196 @@
+"""Compaction of master browser profiles.
+
+Master profiles only grow (history, favicons, caches, expired cookies) and every
+byte is re-copied into every clone. :func:`compact_profile_dir` purges expired
+cookies, VACUUMs the SQLite files and drops cache directories of a Chromium or
+Firefox/Camoufox profile directory. Callers are expected to hold the profile's
+write lock while it runs.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import shutil
+import sqlite3
+import time
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+
+from app.services.common.browser.types import CompactionResult
+from app.services.common.browser.utils import get_directory_size_bytes
+
+logger = logging.getLogger(__name__)
+
+SQLITE_HEADER = b"SQLite format 3\x00"
+_SQLITE_SIDECAR_SUFFIXES = ("-wal", "-shm", "-journal")
+
+# Directory names (or name paths) that browsers rebuild on demand
+CACHE_DIR_PATTERNS: Tuple[Tuple[str, ...], ...] = (
+    # Chromium
+    ("Cache",),
+    ("Code Cache",),
+    ("GPUCache",),
+    ("GrShaderCache",),
+    ("GraphiteDawnCache",),
+    ("ShaderCache",),
+    ("DawnCache",),
+    ("DawnGraphiteCache",),
+    ("DawnWebGPUCache",),
+    ("component_crx_cache",),
+    ("Service Worker", "CacheStorage"),
+    ("Service Worker", "ScriptCache"),
+    # Firefox / Camoufox
+    ("cache2",),
+    ("startupCache",),
+    ("thumbnails",),
+    ("shader-cache",),
+)
+
+# Chromium stores expiry as microseconds since 1601; Unix seconds are used by
+# databases this service writes itself
+_CHROMIUM_EPOCH_OFFSET = 11_644_473_600
+_CHROMIUM_TIMESTAMP_THRESHOLD = 10**13
+# Firefox switched moz_cookies.expiry from seconds to milliseconds
+_FIREFOX_MS_THRESHOLD = 10**11
+
+
+def is_sqlite_file(path: Path) -> bool:
+    """Return True when ``path`` starts with the SQLite file header."""
+    if path.name.endswith(_SQLITE_SIDECAR_SUFFIXES):
+        return False
+    try:
+        with open(path, "rb") as handle:
+            return handle.read(len(SQLITE_HEADER)) == SQLITE_HEADER
+    except OSError:
+        return False
+
+
+def iter_sqlite_files(profile_dir: Path) -> Iterator[Path]:
+    """Yield every SQLite database below ``profile_dir``."""
+    for root, _dirs, files in os.walk(profile_dir):
+        for name in files:
+            path = Path(root) / name
+            if is_sqlite_file(path):
+                yield path
+
+
+def iter_cache_dirs(profile_dir: Path) -> Iterator[Path]:
+    """Yield cache directories below ``profile_dir`` without descending into them."""
+    for root, dirs, _files in os.walk(profile_dir):
+        root_path = Path(root)
+        kept = []
+        for name in dirs:
+            candidate = root_path / name
+            parts = candidate.relative_to(profile_dir).parts
+            if any(parts[-len(pattern):] == pattern for pattern in CACHE_DIR_PATTERNS if len(parts) >= len(pattern)):
+                yield candidate
+            else:
+                kept.append(name)
+        dirs[:] = kept
+
+
+def purge_expired_cookies(connection: sqlite3.Connection, now: Optional[float] = None) -> int:
+    """Delete expired rows from a Chromium ``cookies`` or Firefox ``moz_cookies`` table."""
+    now = time.time() if now is None else now
+    tables = {row[0] for row in connection.execute("SELECT name FROM sqlite_master WHERE type='table'")}
+    removed = 0
+    if "cookies" in tables:
+        chromium_now = int((now + _CHROMIUM_EPOCH_OFFSET) * 1_000_000)
+        cursor = connection.execute(
+            """
+            DELETE FROM cookies
+            WHERE has_expires = 1 AND (
+                (expires_utc > 0 AND expires_utc < :threshold AND expires_utc <= :unix_now)
+                OR (expires_utc >= :threshold AND expires_utc <= :chromium_now)
+            )
+            """,
+            {"threshold": _CHROMIUM_TIMESTAMP_THRESHOLD, "unix_now": now, "chromium_now": chromium_now},
+        )
+        removed += max(cursor.rowcount, 0)
+    if "moz_cookies" in tables:
+        cursor = connection.execute(
+            """
+            DELETE FROM moz_cookies
+            WHERE (expiry > 0 AND expiry < :threshold AND expiry <= :now)
+               OR (expiry >= :threshold AND expiry <= :now_ms)
+            """,
+            {"threshold": _FIREFOX_MS_THRESHOLD, "now": now, "now_ms": int(now * 1000)},
+        )
+        removed += max(cursor.rowcount, 0)
+    connection.commit()
+    return removed
+
+
+def vacuum_database(db_path: Path, *, now: Optional[float] = None) -> int:
+    """Purge expired cookies (if any) and VACUUM ``db_path``; return the rows removed."""
+    connection = sqlite3.connect(db_path, timeout=5.0)
+    try:
+        connection.execute("PRAGMA busy_timeout = 5000")
+        removed = purge_expired_cookies(connection, now)
+        # Fold the WAL back in so VACUUM works on the whole database
+        connection.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        connection.isolation_level = None
+        connection.execute("VACUUM")
+        return removed
+    finally:
+        connection.close()
+
+
+def compact_profile_dir(profile_dir: Path, *, now: Optional[float] = None) -> CompactionResult:
+    """Compact ``profile_dir`` in place and report what was reclaimed."""
+    started = time.monotonic()
+    size_before = get_directory_size_bytes(profile_dir)
+    errors = 0
+
+    cache_dirs: List[Path] = list(iter_cache_dirs(profile_dir))
+    removed_dirs = 0
+    for cache_dir in cache_dirs:
+        try:
+            shutil.rmtree(cache_dir)
+            removed_dirs += 1
+        except OSError as exc:
+            logger.warning("Failed to remove cache directory %s: %s", cache_dir, exc)
+            errors += 1
+
+    vacuumed = 0
+    cookies_removed = 0
+    for db_path in iter_sqlite_files(profile_dir):
+        try:
+            cookies_removed += vacuum_database(db_path, now=now)
+            vacuumed += 1
+        except sqlite3.DatabaseError as exc:
+            logger.warning("Failed to compact SQLite database %s: %s", db_path, exc)
+            errors += 1
+
+    result: CompactionResult = {
+        "size_before_bytes": size_before,
+        "size_after_bytes": get_directory_size_bytes(profile_dir),
+        "expired_cookies_removed": cookies_removed,
+        "databases_vacuumed": vacuumed,
+        "cache_dirs_removed": removed_dirs,
+        "errors": errors,
+        "duration_seconds": time.monotonic() - started,
+    }
+    logger.info(
+        "Compacted profile %s: %s -> %s bytes, %s expired cookies, %s databases, %s cache dirs, %s errors",
+        profile_dir,
+        result["size_before_bytes"],
+        result["size_after_bytes"],
+        cookies_removed,
+        vacuumed,
+        removed_dirs,
+        errors,
+    )
+    return result
+
+
+__all__ = [
+    "CACHE_DIR_PATTERNS",
+    "compact_profile_dir",
+    "is_sqlite_file",
+    "iter_cache_dirs",
+    "iter_sqlite_files",
+    "purge_expired_cookies",
+    "vacuum_database",
+]
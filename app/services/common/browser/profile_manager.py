@@ -7,6 +7,8 @@ import time
 from pathlib import Path
 from typing import Dict, Any, Optional, Tuple, Callable
 
+from app.services.common.browser.fingerprint_pool import take_fingerprint
+from app.services.common.browser.json_cache import file_identity, json_file_cache
 from app.services.common.browser.types import ProfileMetadata
 from app.services.common.browser.utils import copytree_recursive, rmtree_with_retries
 
@@ -20,6 +22,53 @@ except ImportError:
 logger = logging.getLogger(__name__)
 
 
+def fallback_fingerprint() -> Dict[str, Any]:
+    """Return the static fingerprint used when BrowserForge cannot generate one."""
+    return {
+        "userAgent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+                     "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+        "viewport": {"width": 1920, "height": 1080},
+        "screen": {"width": 1920, "height": 1080, "pixelRatio": 1}
+    }
+
+
+def generate_browserforge_fingerprint(
+    fallback: Callable[[], Dict[str, Any]] = fallback_fingerprint,
+) -> Tuple[Dict[str, Any], str]:
+    """Generate a Chromium fingerprint and return it with its source label."""
+    # Resolve BrowserForge generate function robustly
+    gen_func = None
+    source = "fallback"
+
+    try:
+        if hasattr(browserforge, "generate") and callable(getattr(browserforge, "generate")):
+            gen_func = getattr(browserforge, "generate")
+            source = "browserforge.generate"
+        else:
+            try:
+                from importlib import import_module
+                bf_fp = import_module("browserforge.fingerprint")
+                if hasattr(bf_fp, "generate") and callable(getattr(bf_fp, "generate")):
+                    gen_func = getattr(bf_fp, "generate")
+                    source = "browserforge.fingerprint.generate"
+            except Exception:
+                pass
+    except Exception:
+        gen_func = None
+
+    if gen_func is not None:
+        try:
+            fingerprint = gen_func(
+                browser="chrome",
+                os="windows",
+                mobile=False
+            )
+            return fingerprint, source
+        except Exception as e:
+            logger.warning(f"BrowserForge generate failed, using fallback: {e}")
+    return fallback(), "fallback"
+
+
 class ChromiumProfileManager:
     """Manages Chromium profile lifecycle including metadata and BrowserForge integration."""
 
@@ -84,11 +133,13 @@ class ChromiumProfileManager:
                 except Exception:
                     pass
 
-            # Replace original file
+            # Replace original file; the rename keeps the temp file's identity
             import os
+            identity = file_identity(temp_file)
             if self.metadata_file.exists():
                 os.chmod(self.metadata_file, 0o666)
             os.replace(temp_file, self.metadata_file)
+            json_file_cache.put(self.metadata_file, identity, metadata)
 
         except Exception as e:
             # Cleanup temp file on failure
@@ -100,10 +151,19 @@ class ChromiumProfileManager:
             raise e
 
     def read_metadata(self) -> Optional[ProfileMetadata]:
-        """Read metadata from file with retry logic."""
+        """Read metadata from file with retry logic.
+
+        Parsed content is cached per file identity, so repeated reads of an
+        unchanged file skip the JSON I/O.
+        """
         if not self.metadata_file.exists():
             return None
 
+        identity = file_identity(self.metadata_file)
+        hit, cached = json_file_cache.get(self.metadata_file, identity)
+        if hit:
+            return cached
+
         # Read with retry for concurrent access and corrupted files
         max_read_attempts = 5
         delay = 0.01
@@ -114,7 +174,9 @@ class ChromiumProfileManager:
                     content = f.read()
                     if not content.strip():
                         return {}
-                    return json.loads(content)
+                    metadata = json.loads(content)
+                json_file_cache.put(self.metadata_file, identity, metadata)
+                return metadata
             except json.JSONDecodeError as e:
                 logger.warning(f"Corrupted metadata JSON (attempt {attempt}/{max_read_attempts}): {e}")
                 if attempt == max_read_attempts:
@@ -166,40 +228,11 @@ class ChromiumProfileManager:
             # Ensure directory exists
             self.fingerprint_file.parent.mkdir(parents=True, exist_ok=True)
 
-            # Resolve BrowserForge generate function robustly
-            gen_func = None
-            source = "fallback"
-
-            try:
-                if hasattr(browserforge, "generate") and callable(getattr(browserforge, "generate")):
-                    gen_func = getattr(browserforge, "generate")
-                    source = "browserforge.generate"
-                else:
-                    try:
-                        from importlib import import_module
-                        bf_fp = import_module("browserforge.fingerprint")
-                        if hasattr(bf_fp, "generate") and callable(getattr(bf_fp, "generate")):
-                            gen_func = getattr(bf_fp, "generate")
-                            source = "browserforge.fingerprint.generate"
-                    except Exception:
-                        pass
-            except Exception:
-                gen_func = None
-
-            fingerprint: Dict[str, Any]
-            if gen_func is not None:
-                try:
-                    fingerprint = gen_func(
-                        browser="chrome",
-                        os="windows",
-                        mobile=False
-                    )
-                except Exception as e:
-                    logger.warning(f"BrowserForge generate failed, using fallback: {e}")
-                    source = "fallback"
-                    fingerprint = self._get_fallback_fingerprint()
-            else:
-                fingerprint = self._get_fallback_fingerprint()
+            # Prefer a pre-generated fingerprint; the profile file pins it from here on
+            fingerprint = take_fingerprint("chromium")
+            source = "fingerprint_pool"
+            if fingerprint is None:
+                fingerprint, source = generate_browserforge_fingerprint(self._get_fallback_fingerprint)
 
             # Persist fingerprint atomically
             self.write_fingerprint_atomically(fingerprint, source)
@@ -210,12 +243,7 @@ class ChromiumProfileManager:
 
     def _get_fallback_fingerprint(self) -> Dict[str, Any]:
         """Get fallback fingerprint when BrowserForge is unavailable."""
-        return {
-            "userAgent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
-                         "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-            "viewport": {"width": 1920, "height": 1080},
-            "screen": {"width": 1920, "height": 1080, "pixelRatio": 1}
-        }
+        return fallback_fingerprint()
 
     def write_fingerprint_atomically(self, fingerprint: Dict[str, Any], source: str) -> None:
         """Write fingerprint atomically to file system."""
@@ -234,9 +262,11 @@ class ChromiumProfileManager:
                     pass
 
             # Hardened replacement
+            identity = file_identity(temp_file)
             success = atomic_file_replace(temp_file, self.fingerprint_file, max_attempts=35)
 
             if success:
+                json_file_cache.put(self.fingerprint_file, identity, fingerprint)
                 # Update metadata with fingerprint info
                 self.update_metadata({
                     "browserforge_fingerprint_generated": True,
@@ -260,12 +290,19 @@ class ChromiumProfileManager:
         if not BROWSERFORGE_AVAILABLE or not self.fingerprint_file.exists():
             return None
 
+        identity = file_identity(self.fingerprint_file)
+        hit, cached = json_file_cache.get(self.fingerprint_file, identity)
+        if hit:
+            return cached
+
         try:
             with open(self.fingerprint_file, 'r') as f:
-                return json.load(f)
+                fingerprint = json.load(f)
         except Exception as e:
             logger.warning(f"Failed to read BrowserForge fingerprint: {e}")
             return None
+        json_file_cache.put(self.fingerprint_file, identity, fingerprint)
+        return fingerprint
 
 
 def clone_profile(source_dir: Path, target_dir: Path) -> Tuple[str, Callable[[], None]]:
@@ -0,0 +1,268 @@
+"""Pool of master profiles sharded under a single user-data base directory.
+
+Slot 0 is the base directory itself (``<base>/master``), so a pool of size 1
+behaves exactly like the single-master layout. Additional slots live under
+``<base>/pool/profile-<n>/`` and carry their own master, lock file, clones and
+snapshots, which lets write sessions on different slots run in parallel.
+
+Per-slot activity is exported through ``GET /metrics`` as
+``profile_pool_<base dir name>_slot_<n>_{active,healthy,leases_total,failures_total}``.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from app.core.metrics import Counter, Gauge, get_counter, get_gauge
+
+logger = logging.getLogger(__name__)
+
+POOL_DIRNAME = "pool"
+PROFILE_PREFIX = "profile-"
+
+
+@dataclass(frozen=True)
+class ProfileLease:
+    """A profile slot handed out by :class:`ProfilePool`."""
+
+    index: int
+    base_dir: str
+
+
+class ProfilePool:
+    """Thread-safe least-recently-used leasing of master profile slots."""
+
+    def __init__(
+        self,
+        base_dir: str,
+        size: int = 1,
+        *,
+        failure_threshold: int = 2,
+        unhealthy_cooldown_seconds: float = 600.0,
+        sticky_ttl_seconds: float = 1800.0,
+    ) -> None:
+        """Initialize the pool.
+
+        Args:
+            base_dir: Engine user-data base directory (slot 0)
+            size: Number of master profiles in the pool (at least 1)
+            failure_threshold: Consecutive failures before a slot is benched
+            unhealthy_cooldown_seconds: How long a benched slot is skipped
+            sticky_ttl_seconds: Idle time after which a sticky assignment expires
+        """
+        self.base_dir = Path(base_dir)
+        self.size = max(1, int(size or 1))
+        self.failure_threshold = max(1, failure_threshold)
+        self.unhealthy_cooldown_seconds = unhealthy_cooldown_seconds
+        self.sticky_ttl_seconds = sticky_ttl_seconds
+        self._lock = threading.Lock()
+        self._stats: Dict[int, Dict[str, float]] = {
+            index: {
+                "active": 0,
+                "leases": 0,
+                "failures": 0,
+                "consecutive_failures": 0,
+                "last_used": 0.0,
+                "unhealthy_until": 0.0,
+            }
+            for index in range(self.size)
+        }
+        self._sticky: Dict[str, Tuple[int, float]] = {}
+        self._metrics = {index: _SlotMetrics(self.base_dir, index) for index in range(self.size)}
+
+    def profile_dir(self, index: int) -> Path:
+        """Return the base directory of slot ``index``."""
+        if not 0 <= index < self.size:
+            raise ValueError(f"profile index must be between 0 and {self.size - 1}, got {index}")
+        if index == 0:
+            return self.base_dir
+        return self.base_dir / POOL_DIRNAME / f"{PROFILE_PREFIX}{index}"
+
+    def profile_dirs(self) -> List[Path]:
+        """Return the base directories of every slot in index order."""
+        return [self.profile_dir(index) for index in range(self.size)]
+
+    def acquire(self, *, sticky_key: Optional[str] = None, index: Optional[int] = None) -> ProfileLease:
+        """Lease a profile slot.
+
+        An explicit ``index`` always wins. Otherwise a live sticky assignment for
+        ``sticky_key`` is reused while its slot is healthy; else the idle, healthy,
+        least-recently-used slot is chosen. Pair every call with :meth:`release`.
+        """
+        with self._lock:
+            now = time.time()
+            self._expire_sticky(now)
+            if index is not None:
+                self.profile_dir(index)  # validates the index
+                chosen = index
+            else:
+                chosen = self._sticky_slot(sticky_key, now)
+                if chosen is None:
+                    chosen = self._least_recently_used(now)
+            stats = self._stats[chosen]
+            stats["active"] += 1
+            stats["leases"] += 1
+            stats["last_used"] = now
+            if sticky_key:
+                self._sticky[sticky_key] = (chosen, now)
+            self._metrics[chosen].leased(stats, now)
+
+        lease = ProfileLease(index=chosen, base_dir=str(self.profile_dir(chosen)))
+        logger.debug("Leased profile slot %s (%s)", lease.index, lease.base_dir)
+        return lease
+
+    def release(self, lease: ProfileLease, *, success: bool = True) -> None:
+        """Return a slot to the pool and record the outcome of its use."""
+        with self._lock:
+            stats = self._stats.get(lease.index)
+            if stats is None:
+                return
+            now = time.time()
+            stats["active"] = max(0, stats["active"] - 1)
+            stats["last_used"] = now
+            if success:
+                stats["consecutive_failures"] = 0
+            else:
+                stats["failures"] += 1
+                stats["consecutive_failures"] += 1
+                if stats["consecutive_failures"] >= self.failure_threshold:
+                    stats["unhealthy_until"] = now + self.unhealthy_cooldown_seconds
+                    logger.warning(
+                        "Profile slot %s marked unhealthy for %ss after %s consecutive failures",
+                        lease.index,
+                        self.unhealthy_cooldown_seconds,
+                        int(stats["consecutive_failures"]),
+                    )
+            self._metrics[lease.index].released(stats, now, success)
+
+    @contextmanager
+    def lease(self, *, sticky_key: Optional[str] = None, index: Optional[int] = None) -> Iterator[ProfileLease]:
+        """Context-managed :meth:`acquire`/:meth:`release`; exceptions count as failures."""
+        profile = self.acquire(sticky_key=sticky_key, index=index)
+        success = False
+        try:
+            yield profile
+            success = True
+        finally:
+            self.release(profile, success=success)
+
+    def forget(self, sticky_key: str) -> None:
+        """Drop the sticky assignment for ``sticky_key``."""
+        with self._lock:
+            self._sticky.pop(sticky_key, None)
+
+    def get_stats(self) -> List[Dict[str, object]]:
+        """Return per-slot lease and health statistics."""
+        now = time.time()
+        with self._lock:
+            return [
+                {
+                    "index": index,
+                    "base_dir": str(self.profile_dir(index)),
+                    "active": int(stats["active"]),
+                    "leases": int(stats["leases"]),
+                    "failures": int(stats["failures"]),
+                    "healthy": stats["unhealthy_until"] <= now,
+                    "last_used": stats["last_used"] or None,
+                }
+                for index, stats in self._stats.items()
+            ]
+
+    def _sticky_slot(self, sticky_key: Optional[str], now: float) -> Optional[int]:
+        if not sticky_key or sticky_key not in self._sticky:
+            return None
+        index, _ = self._sticky[sticky_key]
+        if self._stats[index]["unhealthy_until"] > now:
+            # Re-shard the flow onto a healthy slot instead of pinning it to a benched one
+            self._sticky.pop(sticky_key, None)
+            return None
+        return index
+
+    def _least_recently_used(self, now: float) -> int:
+        healthy = [index for index, stats in self._stats.items() if stats["unhealthy_until"] <= now]
+        candidates = healthy or list(self._stats)
+        return min(
+            candidates,
+            key=lambda index: (self._stats[index]["active"], self._stats[index]["last_used"], index),
+        )
+
+    def _expire_sticky(self, now: float) -> None:
+        expired = [key for key, (_, touched) in self._sticky.items() if now - touched > self.sticky_ttl_seconds]
+        for key in expired:
+            del self._sticky[key]
+
+
+class _SlotMetrics:
+    """Gauges and counters of one pool slot in the process metrics registry."""
+
+    def __init__(self, base_dir: Path, index: int) -> None:
+        pool = re.sub(r"[^0-9a-zA-Z_]+", "_", base_dir.name).strip("_") or "default"
+        prefix = f"profile_pool_{pool}_slot_{index}"
+        self.active: Gauge = get_gauge(f"{prefix}_active", f"Active leases of profile slot {index} in {base_dir}")
+        self.healthy: Gauge = get_gauge(f"{prefix}_healthy", f"1 while profile slot {index} in {base_dir} is healthy")
+        self.leases: Counter = get_counter(f"{prefix}_leases_total", f"Leases of profile slot {index} in {base_dir}")
+        self.failures: Counter = get_counter(
+            f"{prefix}_failures_total", f"Failed leases of profile slot {index} in {base_dir}"
+        )
+        self.healthy.set(1)
+
+    def leased(self, stats: Dict[str, float], now: float) -> None:
+        self.leases.inc()
+        self._update(stats, now)
+
+    def released(self, stats: Dict[str, float], now: float, success: bool) -> None:
+        if not success:
+            self.failures.inc()
+        self._update(stats, now)
+
+    def _update(self, stats: Dict[str, float], now: float) -> None:
+        self.active.set(stats["active"])
+        self.healthy.set(1 if stats["unhealthy_until"] <= now else 0)
+
+
+_pools: Dict[Tuple[str, int], ProfilePool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_profile_pool(base_dir: str, size: int = 1, **kwargs) -> ProfilePool:
+    """Return the process-wide pool for ``base_dir`` with ``size`` slots."""
+    key = (os.path.abspath(str(base_dir)), max(1, int(size or 1)))
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = ProfilePool(key[0], key[1], **kwargs)
+            _pools[key] = pool
+        return pool
+
+
+def profile_pool_from_settings(settings, base_dir: str) -> ProfilePool:
+    """Return the process-wide pool for ``base_dir`` sized from ``settings``."""
+    try:
+        size = int(getattr(settings, "profile_pool_size", 1) or 1)
+        cooldown = float(getattr(settings, "profile_pool_unhealthy_cooldown_seconds", 600) or 600)
+    except (TypeError, ValueError):
+        size, cooldown = 1, 600.0
+    return get_profile_pool(base_dir, size, unhealthy_cooldown_seconds=cooldown)
+
+
+def reset_profile_pools() -> None:
+    """Forget every process-wide pool (for tests)."""
+    with _pools_lock:
+        _pools.clear()
+
+
+__all__ = [
+    "ProfileLease",
+    "ProfilePool",
+    "get_profile_pool",
+    "profile_pool_from_settings",
+    "reset_profile_pools",
+]
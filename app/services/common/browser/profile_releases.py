@@ -0,0 +1,65 @@
+"""Registry of profile directories handed out but not yet released.
+
+The user-data contexts return a cleanup callable with every read-mode clone,
+temporary profile and write-mode master they hand out; the caller runs it once
+the browser is done. A request cancelled at shutdown may never get there, which
+leaves clones on disk and Camoufox write locks held until the process exits.
+Each handed-out cleanup is therefore registered here and the application runs
+whatever is still pending once in-flight work has been drained.
+"""
+
+from __future__ import annotations
+
+import itertools
+import logging
+import threading
+from typing import Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+CleanupFn = Callable[[], None]
+
+_lock = threading.Lock()
+_pending: Dict[int, Tuple[str, CleanupFn]] = {}
+_ids = itertools.count(1)
+
+
+def track_release(cleanup: Optional[CleanupFn], label: str) -> Optional[CleanupFn]:
+    """Register ``cleanup`` until it runs; return a wrapper that runs it at most once."""
+    if not callable(cleanup):
+        return cleanup
+    with _lock:
+        token = next(_ids)
+        _pending[token] = (label, cleanup)
+
+    def release() -> None:
+        with _lock:
+            entry = _pending.pop(token, None)
+        if entry is not None:
+            entry[1]()
+
+    return release
+
+
+def pending_releases() -> int:
+    """Return how many handed-out profiles have not been released yet."""
+    with _lock:
+        return len(_pending)
+
+
+def release_pending() -> int:
+    """Run every pending cleanup (application shutdown); return how many ran."""
+    with _lock:
+        entries = list(_pending.values())
+        _pending.clear()
+    for label, cleanup in entries:
+        try:
+            cleanup()
+        except Exception as exc:  # pragma: no cover - best-effort cleanup
+            logger.warning("Failed to release %s at shutdown: %s", label, exc)
+    if entries:
+        logger.info("Released %s profile(s) left behind by cancelled requests", len(entries))
+    return len(entries)
+
+
+__all__ = ["pending_releases", "release_pending", "track_release"]
@@ -0,0 +1,229 @@
+"""Immutable, versioned snapshots of a master profile directory.
+
+Write sessions publish a new generation (``snapshots/gen-N``) when they end and
+atomically repoint ``snapshots/CURRENT`` at it. Read-mode clones copy the
+current generation instead of the live master, so they never take the master
+lock and never observe a half-written profile.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Iterator, List, Optional
+
+from app.services.common.browser.utils import (
+    chmod_tree,
+    copytree_recursive,
+    rmtree_with_retries,
+)
+
+logger = logging.getLogger(__name__)
+
+GENERATION_PREFIX = "gen-"
+
+
+class MasterSnapshotStore:
+    """Publish and resolve immutable generations of a master profile."""
+
+    def __init__(
+        self,
+        master_dir: Path,
+        snapshots_dir: Path,
+        *,
+        retire_grace_seconds: float = 300.0,
+        stale_reader_seconds: float = 3600.0,
+        copy_fn: Callable[[Path, Path], None] = copytree_recursive,
+    ) -> None:
+        """Initialize the snapshot store.
+
+        Args:
+            master_dir: Live master profile directory written by write sessions
+            snapshots_dir: Directory holding ``gen-N`` snapshots and the ``CURRENT`` pointer
+            retire_grace_seconds: Minimum age of a superseded generation before it may be removed
+            stale_reader_seconds: Age after which a reader reference is considered abandoned
+            copy_fn: Directory copy routine used when publishing
+        """
+        self.master_dir = Path(master_dir)
+        self.snapshots_dir = Path(snapshots_dir)
+        self.current_file = self.snapshots_dir / "CURRENT"
+        self.readers_dir = self.snapshots_dir / ".readers"
+        self.retired_dir = self.snapshots_dir / ".retired"
+        self.retire_grace_seconds = retire_grace_seconds
+        self.stale_reader_seconds = stale_reader_seconds
+        self._copy_fn = copy_fn
+
+    def current_generation(self) -> Optional[Path]:
+        """Return the directory of the currently published generation, if any."""
+        try:
+            name = self.current_file.read_text(encoding="utf-8").strip()
+        except (FileNotFoundError, OSError):
+            return None
+        if not name.startswith(GENERATION_PREFIX):
+            return None
+        generation_dir = self.snapshots_dir / name
+        return generation_dir if generation_dir.is_dir() else None
+
+    def publish(self) -> Optional[Path]:
+        """Copy the master into a new generation and make it current.
+
+        Callers must hold the master write lock so the copy is consistent.
+
+        Returns:
+            The published generation directory, or None if publishing failed
+        """
+        if not self.master_dir.exists():
+            return None
+
+        self.snapshots_dir.mkdir(parents=True, exist_ok=True)
+        previous = self.current_generation()
+        generation_dir = self.snapshots_dir / f"{GENERATION_PREFIX}{self._next_generation_number()}"
+        staging_dir = self.snapshots_dir / f".staging-{uuid.uuid4()}"
+
+        try:
+            self._copy_fn(self.master_dir, staging_dir)
+            os.replace(staging_dir, generation_dir)
+            self._write_current(generation_dir.name)
+        except Exception as exc:
+            logger.warning("Failed to publish master snapshot from %s: %s", self.master_dir, exc)
+            self._remove_tree(staging_dir)
+            return None
+
+        if previous is not None:
+            self._mark_retired(previous.name)
+        logger.debug("Published master snapshot %s", generation_dir)
+        self.collect_garbage()
+        return generation_dir
+
+    @contextmanager
+    def reader(self) -> Iterator[Optional[Path]]:
+        """Yield the current generation while holding a reader reference to it.
+
+        The reference keeps garbage collection away from the generation while
+        the caller copies it. Yields None when no snapshot has been published.
+        """
+        generation_dir = self.current_generation()
+        if generation_dir is None:
+            yield None
+            return
+
+        ref_file = self.readers_dir / generation_dir.name / f"{os.getpid()}-{uuid.uuid4()}"
+        try:
+            ref_file.parent.mkdir(parents=True, exist_ok=True)
+            ref_file.touch()
+        except OSError as exc:
+            logger.debug("Could not register snapshot reader for %s: %s", generation_dir, exc)
+            ref_file = None
+
+        try:
+            yield generation_dir if generation_dir.is_dir() else None
+        finally:
+            if ref_file is not None:
+                try:
+                    ref_file.unlink()
+                except OSError:
+                    pass
+
+    def collect_garbage(self) -> List[Path]:
+        """Remove superseded generations no reader references anymore.
+
+        Returns:
+            The generation directories that were removed
+        """
+        current = self.current_generation()
+        removed: List[Path] = []
+        for generation_dir in self._generation_dirs():
+            if current is not None and generation_dir.name == current.name:
+                continue
+            if not self._retired_long_enough(generation_dir.name):
+                continue
+            if self._has_active_readers(generation_dir.name):
+                continue
+            if self._remove_tree(generation_dir):
+                removed.append(generation_dir)
+                self._unlink(self.retired_dir / generation_dir.name)
+                self._remove_tree(self.readers_dir / generation_dir.name)
+        return removed
+
+    def _generation_dirs(self) -> List[Path]:
+        if not self.snapshots_dir.exists():
+            return []
+        generations = [
+            path
+            for path in self.snapshots_dir.iterdir()
+            if path.is_dir() and path.name.startswith(GENERATION_PREFIX)
+        ]
+        return sorted(generations, key=lambda path: self._generation_number(path.name))
+
+    def _next_generation_number(self) -> int:
+        numbers = [self._generation_number(path.name) for path in self._generation_dirs()]
+        return max(numbers, default=0) + 1
+
+    @staticmethod
+    def _generation_number(name: str) -> int:
+        try:
+            return int(name[len(GENERATION_PREFIX):])
+        except ValueError:
+            return 0
+
+    def _write_current(self, name: str) -> None:
+        tmp_file = self.snapshots_dir / f".CURRENT.{uuid.uuid4()}"
+        tmp_file.write_text(name, encoding="utf-8")
+        os.replace(tmp_file, self.current_file)
+
+    def _mark_retired(self, name: str) -> None:
+        try:
+            self.retired_dir.mkdir(parents=True, exist_ok=True)
+            (self.retired_dir / name).touch()
+        except OSError as exc:
+            logger.debug("Could not mark snapshot %s as retired: %s", name, exc)
+
+    def _retired_long_enough(self, name: str) -> bool:
+        marker = self.retired_dir / name
+        try:
+            retired_at = marker.stat().st_mtime
+        except OSError:
+            # Generations never marked retired (e.g. after a crash mid-publish) use their own mtime
+            try:
+                retired_at = (self.snapshots_dir / name).stat().st_mtime
+            except OSError:
+                return False
+        return time.time() - retired_at >= self.retire_grace_seconds
+
+    def _has_active_readers(self, name: str) -> bool:
+        refs_dir = self.readers_dir / name
+        if not refs_dir.exists():
+            return False
+        now = time.time()
+        for ref in refs_dir.iterdir():
+            try:
+                if now - ref.stat().st_mtime < self.stale_reader_seconds:
+                    return True
+            except OSError:
+                continue
+        return False
+
+    @staticmethod
+    def _remove_tree(path: Path) -> bool:
+        if not path.exists():
+            return True
+        try:
+            chmod_tree(path, 0o777)
+            return rmtree_with_retries(path, max_attempts=5, initial_delay=0.1)
+        except Exception as exc:  # pragma: no cover - defensive logging
+            logger.warning("Failed to remove snapshot directory %s: %s", path, exc)
+            return False
+
+    @staticmethod
+    def _unlink(path: Path) -> None:
+        try:
+            path.unlink()
+        except OSError:
+            pass
+
+
+__all__ = ["MasterSnapshotStore"]
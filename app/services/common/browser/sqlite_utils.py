@@ -3,16 +3,22 @@
 from __future__ import annotations
 
 import logging
+import os
 import shutil
 import sqlite3
 import time
 from pathlib import Path
-from typing import Callable, Optional, TypeVar
+from typing import Callable, Optional, Tuple, TypeVar
+from urllib.parse import quote
 
 from app.services.common.browser.utils import atomic_file_replace
 
 T = TypeVar("T")
 
+# (inode, mtime_ns, size) of the main file plus its WAL/journal sidecars
+DatabaseSignature = Tuple[Optional[Tuple[int, int, int]], ...]
+_SIDECAR_SUFFIXES = ("-wal", "-journal")
+
 
 class SQLiteExecutionError(RuntimeError):
     """Raised when a SQLite operation fails after all retry attempts."""
@@ -91,6 +97,80 @@ def execute_with_retries(
     raise SQLiteExecutionError("SQLite operation failed without a captured error")
 
 
+def readonly_uri(db_path: Path, *, immutable: bool = False) -> str:
+    """Return a SQLite URI opening ``db_path`` read-only.
+
+    ``immutable=1`` additionally skips locking and change detection entirely and
+    must only be used for files nothing writes to (e.g. published snapshots).
+    """
+    path = str(Path(db_path).resolve()).replace(os.sep, "/")
+    if not path.startswith("/"):
+        path = f"/{path}"  # Windows drive paths: file:/C:/...
+    uri = f"file:{quote(path, safe='/:')}?mode=ro"
+    if immutable:
+        uri += "&immutable=1"
+    return uri
+
+
+def execute_readonly_with_retries(
+    db_path: Path,
+    operation: Callable[[sqlite3.Connection], T],
+    *,
+    max_attempts: int,
+    initial_delay: float = 0.1,
+    immutable: bool = False,
+    logger: Optional[logging.Logger] = None,
+    row_factory: Optional[Callable[[sqlite3.Cursor], sqlite3.Row]] = None,
+) -> T:
+    """Execute a read-only SQLite callable against the live file without copying it."""
+    delay = initial_delay
+    last_error: Optional[BaseException] = None
+
+    for attempt in range(1, max_attempts + 1):
+        connection: Optional[sqlite3.Connection] = None
+        try:
+            connection = sqlite3.connect(readonly_uri(db_path, immutable=immutable), uri=True)
+            connection.execute("PRAGMA busy_timeout = 5000")
+            if row_factory is not None:
+                connection.row_factory = row_factory  # type: ignore[attr-defined]
+            return operation(connection)
+        except sqlite3.OperationalError as exc:
+            last_error = exc
+            if logger:
+                logger.debug(
+                    "Read-only SQLite access failed (attempt %s/%s): %s",
+                    attempt,
+                    max_attempts,
+                    exc,
+                )
+            if attempt >= max_attempts:
+                break
+            time.sleep(delay)
+            delay = min(2.0, delay * 2)
+        except sqlite3.DatabaseError as exc:
+            raise SQLiteExecutionError(str(exc)) from exc
+        finally:
+            if connection is not None:
+                connection.close()
+
+    if last_error is not None:
+        raise SQLiteExecutionError(str(last_error)) from last_error
+    raise SQLiteExecutionError("Read-only SQLite operation failed without a captured error")
+
+
+def database_signature(db_path: Path) -> DatabaseSignature:
+    """Return a cheap change marker for ``db_path`` and its WAL/journal files."""
+    signature = []
+    for path in (Path(db_path), *(Path(f"{db_path}{suffix}") for suffix in _SIDECAR_SUFFIXES)):
+        try:
+            stat = path.stat()
+        except OSError:
+            signature.append(None)
+            continue
+        signature.append((stat.st_ino, stat.st_mtime_ns, stat.st_size))
+    return tuple(signature)
+
+
 def initialize_database(
     db_path: Path,
     initializer: Callable[[sqlite3.Connection], None],
@@ -121,8 +201,12 @@ def replace_database_atomic(
 
 __all__ = [
     "SQLiteExecutionError",
+    "DatabaseSignature",
     "copy_database_with_retries",
+    "database_signature",
+    "execute_readonly_with_retries",
     "execute_with_retries",
     "initialize_database",
+    "readonly_uri",
     "replace_database_atomic",
 ]
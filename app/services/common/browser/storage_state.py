@@ -0,0 +1,152 @@
+"""In-memory Playwright storage_state derived from a Chromium master profile.
+
+Read-only flows can seed an ephemeral browser context with ``storage_state``
+(cookies plus localStorage origins) instead of cloning the whole profile
+directory, which turns session setup from a disk copy into a dictionary lookup.
+"""
+
+from __future__ import annotations
+
+import copy
+import logging
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from app.services.common.browser.types import StorageStateCookies, StorageStateResult
+
+logger = logging.getLogger(__name__)
+
+# Seconds between 1601-01-01 (Chromium's epoch) and 1970-01-01
+_CHROMIUM_EPOCH_OFFSET = 11_644_473_600
+_CHROMIUM_TIMESTAMP_THRESHOLD = 10**13
+
+Signature = Tuple[Optional[Tuple[int, int]], ...]
+
+
+def normalize_cookie_expiry(expires: Optional[float]) -> float:
+    """Return ``expires`` as Unix seconds, converting Chromium microsecond timestamps."""
+    if expires is None or expires in (-1, 0):
+        return -1
+    if expires > _CHROMIUM_TIMESTAMP_THRESHOLD:
+        return expires / 1_000_000 - _CHROMIUM_EPOCH_OFFSET
+    return expires
+
+
+class StorageStateCache:
+    """Cache a master profile's storage_state and refresh it when the master changes."""
+
+    def __init__(self, user_data_manager, refresh_interval_seconds: float = 30.0) -> None:
+        """Initialize the cache.
+
+        Args:
+            user_data_manager: ``ChromiumUserDataManager`` of the master profile
+            refresh_interval_seconds: Minimum age before the master is checked for changes
+        """
+        self._manager = user_data_manager
+        self.refresh_interval_seconds = max(0.0, float(refresh_interval_seconds))
+        self._lock = threading.Lock()
+        self._state: Optional[StorageStateResult] = None
+        self._signature: Optional[Signature] = None
+        self._checked_at = 0.0
+
+    def get(self) -> Optional[StorageStateResult]:
+        """Return a copy of the current storage_state, or None when the master has none."""
+        with self._lock:
+            now = time.monotonic()
+            if self._state is not None and now - self._checked_at < self.refresh_interval_seconds:
+                return self._snapshot()
+
+            signature = self._source_signature()
+            if self._state is None or signature != self._signature:
+                self._state = self._load()
+                self._signature = signature
+            self._checked_at = now
+            return self._snapshot()
+
+    def invalidate(self) -> None:
+        """Force the next :meth:`get` to reload from the master profile."""
+        with self._lock:
+            self._state = None
+            self._signature = None
+            self._checked_at = 0.0
+
+    def _snapshot(self) -> Optional[StorageStateResult]:
+        if self._state is None:
+            return None
+        state = copy.deepcopy(self._state)
+        state["cookies"] = self._unexpired(state["cookies"])
+        return state
+
+    def _load(self) -> Optional[StorageStateResult]:
+        try:
+            exported = self._manager.export_cookies("storage_state")
+        except Exception as exc:  # pragma: no cover - defensive logging
+            logger.warning("Failed to export storage_state from master profile: %s", exc)
+            return None
+        if not exported:
+            return None
+
+        cookies: List[StorageStateCookies] = []
+        for cookie in exported.get("cookies", []):
+            normalized = dict(cookie)
+            normalized["expires"] = normalize_cookie_expiry(cookie.get("expires"))
+            cookies.append(normalized)
+        logger.debug("Loaded storage_state with %s cookies from master profile", len(cookies))
+        return {"cookies": cookies, "origins": list(exported.get("origins") or [])}
+
+    def _source_signature(self) -> Signature:
+        path_manager = getattr(self._manager, "path_manager", None)
+        sources: List[Optional[Path]] = []
+        if path_manager is not None and getattr(path_manager, "enabled", False):
+            sources = [
+                path_manager.get_cookies_db_path(),
+                getattr(path_manager, "storage_state_file", None),
+            ]
+        signature = []
+        for source in sources:
+            try:
+                stat = source.stat() if source is not None else None
+            except OSError:
+                stat = None
+            signature.append((stat.st_mtime_ns, stat.st_size) if stat else None)
+        return tuple(signature)
+
+    @staticmethod
+    def _unexpired(cookies: List[StorageStateCookies]) -> List[StorageStateCookies]:
+        now = time.time()
+        return [cookie for cookie in cookies if cookie.get("expires", -1) == -1 or cookie["expires"] > now]
+
+
+_caches: Dict[str, StorageStateCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_storage_state_cache(user_data_manager, refresh_interval_seconds: float = 30.0) -> StorageStateCache:
+    """Return the process-wide cache for ``user_data_manager``'s master profile."""
+    key = str(getattr(user_data_manager, "master_dir", None) or id(user_data_manager))
+    with _caches_lock:
+        cache = _caches.get(key)
+        if cache is None:
+            cache = StorageStateCache(user_data_manager, refresh_interval_seconds)
+            _caches[key] = cache
+        else:
+            # Managers are created per request; keep reading through the newest one
+            cache._manager = user_data_manager
+            cache.refresh_interval_seconds = max(0.0, float(refresh_interval_seconds))
+        return cache
+
+
+def reset_storage_state_caches() -> None:
+    """Forget every process-wide storage_state cache (for tests)."""
+    with _caches_lock:
+        _caches.clear()
+
+
+__all__ = [
+    "StorageStateCache",
+    "get_storage_state_cache",
+    "normalize_cookie_expiry",
+    "reset_storage_state_caches",
+]
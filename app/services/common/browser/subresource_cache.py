@@ -0,0 +1,341 @@
+"""Shared on-disk cache for static browser sub-resources.
+
+Profile clones start with a cold HTTP cache, so every visit re-downloads the
+same script bundles, stylesheets, fonts and images. :class:`SubresourceCache`
+is installed as a Playwright route handler and serves those responses from a
+content-addressed directory shared by every browser in the process (and across
+processes pointing at the same directory).
+
+Only ``GET`` requests for static resource types whose responses carry explicit
+freshness (``Cache-Control: max-age`` or ``Expires``) and no cookies are stored.
+The cache is bounded by total size and evicts least recently used entries.
+
+Layout below the root::
+
+    entries/<sha256(url)>.json   status, headers, expiry and body digest
+    objects/<aa>/<sha256(body)>  response bodies, shared by identical content
+
+Playwright serves routed requests without the browser's own HTTP cache, so the
+cache is opt-in (``subresource_cache_dir``).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+from app.core.metrics import get_counter
+
+logger = logging.getLogger(__name__)
+
+# URLs worth intercepting at all; everything else never reaches Python
+STATIC_URL_PATTERN = re.compile(
+    r"^https?://[^?#]+\.(?:js|mjs|css|woff2?|ttf|otf|eot|png|jpe?g|gif|webp|avif|svg|ico)(?:[?#]|$)",
+    re.IGNORECASE,
+)
+CACHEABLE_RESOURCE_TYPES = frozenset({"script", "stylesheet", "font", "image"})
+# Response headers that describe the transfer rather than the content
+_DROPPED_HEADERS = frozenset(
+    {"connection", "content-encoding", "content-length", "keep-alive", "set-cookie", "transfer-encoding"}
+)
+# A single entry may use at most this fraction of the size budget
+_MAX_ENTRY_FRACTION = 0.125
+
+
+def freshness_lifetime(headers: Mapping[str, str], now: Optional[float] = None) -> Optional[float]:
+    """Return how many seconds a response may be reused, or None when it must not be stored."""
+    lowered = {key.lower(): value for key, value in headers.items()}
+    if "set-cookie" in lowered:
+        return None
+    vary = {part.strip().lower() for part in lowered.get("vary", "").split(",") if part.strip()}
+    if vary - {"accept-encoding"}:
+        return None
+
+    directives: Dict[str, Optional[str]] = {}
+    for part in lowered.get("cache-control", "").split(","):
+        name, _, value = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = value.strip('"') or None
+    if {"no-store", "no-cache", "private"} & directives.keys():
+        return None
+    for name in ("s-maxage", "max-age"):
+        if name in directives:
+            try:
+                lifetime = float(directives[name] or "")
+            except ValueError:
+                return None
+            return lifetime if lifetime > 0 else None
+
+    expires = lowered.get("expires")
+    if not expires:
+        return None
+    try:
+        expires_at = parsedate_to_datetime(expires).timestamp()
+    except (TypeError, ValueError):
+        return None
+    lifetime = expires_at - (time.time() if now is None else now)
+    return lifetime if lifetime > 0 else None
+
+
+def _url_key(url: str) -> str:
+    return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+
+class SubresourceCache:
+    """Size-bounded LRU cache of static responses backed by a directory."""
+
+    def __init__(self, root: Path, max_bytes: int) -> None:
+        self.root = Path(root)
+        self.max_bytes = max(0, int(max_bytes))
+        self._entries_dir = self.root / "entries"
+        self._objects_dir = self.root / "objects"
+        self._lock = threading.Lock()
+        # url key -> (size, body digest), least recently used first
+        self._lru: "OrderedDict[str, Tuple[int, str]]" = OrderedDict()
+        self._refs: Dict[str, int] = {}
+        self._total_bytes = 0
+        self._hits = get_counter("subresource_cache_hits_total", "Sub-resources served from the shared cache")
+        self._misses = get_counter("subresource_cache_misses_total", "Cacheable sub-resources fetched from the network")
+        self._bytes_served = get_counter("subresource_cache_bytes_served_total", "Bytes served from the shared cache")
+        self._evictions = get_counter("subresource_cache_evictions_total", "Entries evicted from the shared cache")
+        self._load()
+
+    @property
+    def total_bytes(self) -> int:
+        return self._total_bytes
+
+    def __len__(self) -> int:
+        return len(self._lru)
+
+    def lookup(self, url: str, now: Optional[float] = None) -> Optional[Tuple[int, Dict[str, str], bytes]]:
+        """Return ``(status, headers, body)`` for a fresh entry, or None."""
+        key = _url_key(url)
+        with self._lock:
+            if key not in self._lru:
+                return None
+        entry_path = self._entries_dir / f"{key}.json"
+        try:
+            with open(entry_path, "r", encoding="utf-8") as handle:
+                entry = json.load(handle)
+            if entry.get("url") != url or entry["expires"] <= (time.time() if now is None else now):
+                return None
+            body = self._object_path(entry["digest"]).read_bytes()
+        except (OSError, ValueError, KeyError, TypeError):
+            self._forget(key)  # evicted by another process or corrupt
+            return None
+        with self._lock:
+            if key in self._lru:
+                self._lru.move_to_end(key)
+        try:
+            os.utime(entry_path)  # keeps LRU order across restarts
+        except OSError:
+            pass
+        return int(entry["status"]), dict(entry["headers"]), body
+
+    def store(
+        self, url: str, status: int, headers: Mapping[str, str], body: bytes, now: Optional[float] = None
+    ) -> bool:
+        """Store a response if it is cacheable; return whether it was stored."""
+        now = time.time() if now is None else now
+        lifetime = freshness_lifetime(headers, now)
+        if status != 200 or lifetime is None or len(body) > self.max_bytes * _MAX_ENTRY_FRACTION:
+            return False
+
+        digest = hashlib.sha256(body).hexdigest()
+        key = _url_key(url)
+        entry = {
+            "url": url,
+            "status": status,
+            "headers": {k: v for k, v in headers.items() if k.lower() not in _DROPPED_HEADERS},
+            "digest": digest,
+            "size": len(body),
+            "expires": now + lifetime,
+        }
+        try:
+            object_path = self._object_path(digest)
+            if not object_path.exists():
+                self._write_atomically(object_path, body)
+            self._write_atomically(self._entries_dir / f"{key}.json", json.dumps(entry).encode("utf-8"))
+        except OSError as exc:
+            logger.debug(f"Could not store sub-resource {url}: {exc}")
+            return False
+
+        with self._lock:
+            previous = self._remove_locked(key)
+            self._add_locked(key, len(body), digest)
+            stale_digest = previous[0] if previous and previous[0] not in self._refs else None
+            evicted = self._evict_locked()
+        if stale_digest is not None:
+            try:
+                self._object_path(stale_digest).unlink()
+            except OSError:
+                pass
+        for evicted_key, evicted_digest, orphaned in evicted:
+            self._delete_files(evicted_key, evicted_digest if orphaned else None)
+        return True
+
+    def handle_route(self, route: Any) -> None:
+        """Playwright route handler: serve from the cache or fetch and fill it."""
+        request = route.request
+        if request.method != "GET" or request.resource_type not in CACHEABLE_RESOURCE_TYPES:
+            route.fallback()
+            return
+
+        url = request.url
+        cached = self.lookup(url)
+        if cached is not None:
+            status, headers, body = cached
+            self._hits.inc()
+            self._bytes_served.inc(len(body))
+            route.fulfill(status=status, headers=headers, body=body)
+            return
+
+        self._misses.inc()
+        try:
+            response = route.fetch()
+            body = response.body()
+        except Exception as exc:
+            logger.debug(f"Sub-resource fetch failed for {url}: {exc}")
+            route.fallback()
+            return
+        self.store(url, response.status, response.headers, body)
+        route.fulfill(response=response, body=body)
+
+    def install(self, target: Any) -> None:
+        """Route static requests of a Playwright page or browser context through the cache."""
+        target.route(STATIC_URL_PATTERN, self.handle_route)
+
+    def clear(self) -> None:
+        """Delete every entry and object."""
+        with self._lock:
+            keys = [(key, digest) for key, (_size, digest) in self._lru.items()]
+            self._lru.clear()
+            self._refs.clear()
+            self._total_bytes = 0
+        for key, digest in keys:
+            self._delete_files(key, digest)
+
+    def _object_path(self, digest: str) -> Path:
+        return self._objects_dir / digest[:2] / digest
+
+    @staticmethod
+    def _write_atomically(path: Path, data: bytes) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(temp_path, "wb") as handle:
+            handle.write(data)
+        os.replace(temp_path, path)
+
+    def _add_locked(self, key: str, size: int, digest: str) -> None:
+        self._lru[key] = (size, digest)
+        self._refs[digest] = self._refs.get(digest, 0) + 1
+        self._total_bytes += size
+
+    def _remove_locked(self, key: str) -> Optional[Tuple[str, bool]]:
+        """Drop ``key`` from the index; return its digest and whether the body is now unreferenced."""
+        existing = self._lru.pop(key, None)
+        if existing is None:
+            return None
+        size, digest = existing
+        self._total_bytes -= size
+        refs = self._refs.get(digest, 1) - 1
+        if refs <= 0:
+            self._refs.pop(digest, None)
+        else:
+            self._refs[digest] = refs
+        return digest, refs <= 0
+
+    def _evict_locked(self):
+        evicted = []
+        while self._total_bytes > self.max_bytes and self._lru:
+            key = next(iter(self._lru))
+            digest, orphaned = self._remove_locked(key)
+            evicted.append((key, digest, orphaned))
+            self._evictions.inc()
+        return evicted
+
+    def _forget(self, key: str) -> None:
+        with self._lock:
+            removed = self._remove_locked(key)
+        if removed is not None:
+            digest, orphaned = removed
+            self._delete_files(key, digest if orphaned else None)
+
+    def _delete_files(self, key: str, digest: Optional[str]) -> None:
+        paths = [self._entries_dir / f"{key}.json"]
+        if digest is not None:
+            paths.append(self._object_path(digest))
+        for path in paths:
+            try:
+                path.unlink()
+            except OSError:
+                pass
+
+    def _load(self) -> None:
+        """Rebuild the index from disk, oldest access first."""
+        if not self._entries_dir.is_dir():
+            return
+        found = []
+        for entry_path in self._entries_dir.glob("*.json"):
+            try:
+                with open(entry_path, "r", encoding="utf-8") as handle:
+                    entry = json.load(handle)
+                found.append((entry_path.stat().st_mtime, entry_path.stem, int(entry["size"]), entry["digest"]))
+            except (OSError, ValueError, KeyError, TypeError):
+                continue
+        with self._lock:
+            for _mtime, key, size, digest in sorted(found):
+                self._add_locked(key, size, digest)
+            evicted = self._evict_locked()
+        for key, digest, orphaned in evicted:
+            self._delete_files(key, digest if orphaned else None)
+
+
+_caches: Dict[Tuple[str, int], SubresourceCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_subresource_cache(settings=None) -> Optional[SubresourceCache]:
+    """Return the process-wide cache for the configured directory, or None when disabled."""
+    if settings is None:
+        from app.core.config import get_settings
+
+        settings = get_settings()
+    root = getattr(settings, "subresource_cache_dir", None)
+    max_bytes = getattr(settings, "subresource_cache_max_bytes", 0)
+    if not isinstance(root, str) or not root or isinstance(max_bytes, bool) or not isinstance(max_bytes, int):
+        return None
+    if max_bytes <= 0:
+        return None
+    key = (os.path.abspath(root), max_bytes)
+    with _caches_lock:
+        cache = _caches.get(key)
+        if cache is None:
+            cache = SubresourceCache(Path(key[0]), max_bytes)
+            _caches[key] = cache
+        return cache
+
+
+def reset_subresource_caches() -> None:
+    """Forget process-wide caches without touching their directories (for tests)."""
+    with _caches_lock:
+        _caches.clear()
+
+
+__all__ = [
+    "CACHEABLE_RESOURCE_TYPES",
+    "STATIC_URL_PATTERN",
+    "SubresourceCache",
+    "freshness_lifetime",
+    "get_subresource_cache",
+    "reset_subresource_caches",
+]
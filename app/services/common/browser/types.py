@@ -68,6 +68,10 @@ class ProfileMetadata(TypedDict, total=False):
     last_cleanup_count: Optional[int]
     last_cleanup_size_saved: Optional[float]
     remaining_clones: Optional[int]
+    last_compaction: Optional[float]
+    last_compaction_size_before: Optional[int]
+    last_compaction_size_after: Optional[int]
+    last_compaction_cookies_removed: Optional[int]
 
 
 class DiskUsageStats(TypedDict, total=False):
@@ -80,6 +84,7 @@ class DiskUsageStats(TypedDict, total=False):
     clone_count: int
     master_dir: str
     clones_dir: str
+    fast_clones_dir: Optional[str]
     last_cleanup: Optional[float]
     last_cleanup_count: int
     last_cleanup_size_saved: float
@@ -95,6 +100,18 @@ class CleanupResult(TypedDict):
     size_saved_mb: Optional[float]
 
 
+class CompactionResult(TypedDict):
+    """Schema for master-profile compaction results."""
+
+    size_before_bytes: int
+    size_after_bytes: int
+    expired_cookies_removed: int
+    databases_vacuumed: int
+    cache_dirs_removed: int
+    errors: int
+    duration_seconds: float
+
+
 class BrowserForgeFingerprint(TypedDict, total=False):
     """Schema for BrowserForge fingerprint data."""
 
@@ -1,3 +1,4 @@
+import json
 import os
 import shutil
 import uuid
@@ -5,23 +6,33 @@ import logging
 import time
 from contextlib import contextmanager
 from pathlib import Path
-from typing import Callable, ContextManager, Tuple
-
-# fcntl is not available on Windows, so we need to handle this gracefully
-try:
-    import fcntl
-    FCNTL_AVAILABLE = True
-except ImportError:
-    FCNTL_AVAILABLE = False
+from typing import Callable, ContextManager, Optional, Tuple
+
+from app.services.common.browser.clone_storage import CloneStorage
+from app.services.common.browser.locks import FCNTL_AVAILABLE, FileLock
+from app.services.common.browser.profile_compaction import compact_profile_dir
+from app.services.common.browser.profile_releases import track_release
+from app.services.common.browser.snapshots import MasterSnapshotStore
+from app.services.common.browser.types import CompactionResult
+from app.services.common.browser.utils import get_directory_size_bytes
+
 logger = logging.getLogger(__name__)
 
 
 @contextmanager
-def user_data_context(base_dir: str, mode: str) -> ContextManager[Tuple[str, Callable[[], None]]]:
+def user_data_context(
+    base_dir: str,
+    mode: str,
+    *,
+    clone_root: Optional[str] = None,
+    clone_root_max_bytes: int = 0,
+) -> ContextManager[Tuple[str, Callable[[], None]]]:
     """Context manager for managing user data directories with exclusive locking.
     Args:
         base_dir: Root directory for user data
         mode: Either 'read' or 'write'
+        clone_root: Optional tmpfs/RAM-disk root for read-mode clones
+        clone_root_max_bytes: Byte budget for clones below ``clone_root``
     Yields:
         Tuple of (effective_directory_path, cleanup_function)
     Raises:
@@ -35,7 +46,15 @@ def user_data_context(base_dir: str, mode: str) -> ContextManager[Tuple[str, Cal
         if mode == 'write':
             effective_dir, cleanup_func = _write_mode_context(base_path)
         else:  # mode == 'read'
-            effective_dir, cleanup_func = _read_mode_context(base_path)
+            clone_storage = CloneStorage(
+                base_path / 'clones',
+                fast_root=clone_root,
+                max_bytes=clone_root_max_bytes,
+                namespace='camoufox',
+            )
+            effective_dir, cleanup_func = _read_mode_context(base_path, clone_storage)
+        # Released at shutdown if the caller never gets to run it
+        cleanup_func = track_release(cleanup_func, f"Camoufox {mode} profile {effective_dir}")
         yield effective_dir, cleanup_func
     except Exception as e:
         logger.error(f"Error in user_data_context mode={mode}: {e}")
@@ -49,60 +68,90 @@ def _write_mode_context(base_path: Path) -> Tuple[str, Callable[[], None]]:
     # Ensure master directory exists
     master_dir.mkdir(parents=True, exist_ok=True)
     # Acquire exclusive lock
-    lock_fd = None
+    lock = None
     if not FCNTL_AVAILABLE:
         logger.warning("fcntl not available on this platform, using exclusive fallback")
         # Use a simpler approach for systems without fcntl (like Windows)
         lock_file.touch()
     else:
-        try:
-            lock_fd = os.open(lock_file, os.O_CREAT | os.O_WRONLY | os.O_TRUNC)
-            # Try to acquire exclusive lock with timeout
-            timeout = 30  # 30 seconds timeout
-            start_time = time.time()
-            while True:
-                try:
-                    fcntl.flock(lock_fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
-                    break  # Lock acquired
-                except (IOError, BlockingIOError):
-                    if time.time() - start_time > timeout:
-                        raise RuntimeError("Timeout waiting for exclusive user-data lock")
-                    time.sleep(0.1)
-            logger.debug(f"Acquired exclusive lock for write mode on {master_dir}")
-        except Exception as e:
-            if lock_fd is not None:
-                try:
-                    os.close(lock_fd)
-                except Exception:
-                    pass
-            raise RuntimeError(f"Failed to acquire lock for write mode: {e}")
+        # FIFO within the process, flock across processes
+        lock = FileLock(str(lock_file), timeout=30.0)
+        if not lock.acquire():
+            raise RuntimeError(
+                "Failed to acquire lock for write mode: Timeout waiting for exclusive user-data lock"
+            )
+        logger.debug(f"Acquired exclusive lock for write mode on {master_dir}")
     # Cleanup function: release lock and cleanup lock file
 
     def cleanup():
         try:
-            if FCNTL_AVAILABLE and lock_fd is not None:
-                # Unix/Linux: release fcntl lock
-                try:
-                    fcntl.flock(lock_fd, fcntl.LOCK_UN)
-                    os.close(lock_fd)
-                except Exception as e:
-                    logger.warning(f"Failed to release fcntl lock: {e}")
-            else:
-                # Windows: cleanup lock file
-                try:
-                    if lock_file.exists():
-                        lock_file.unlink()
-                except Exception as e:
-                    logger.warning(f"Failed to remove lock file: {e}")
-            logger.debug(f"Released exclusive lock for write mode on {master_dir}")
-        except Exception as e:
-            logger.warning(f"Failed to cleanup lock: {e}")
+            # Publish while still holding the lock so the snapshot is a consistent copy
+            _snapshot_store(base_path).publish()
+        finally:
+            try:
+                if lock is not None:
+                    lock.release()
+                else:
+                    # Windows: cleanup lock file
+                    try:
+                        if lock_file.exists():
+                            lock_file.unlink()
+                    except Exception as e:
+                        logger.warning(f"Failed to remove lock file: {e}")
+                logger.debug(f"Released exclusive lock for write mode on {master_dir}")
+            except Exception as e:
+                logger.warning(f"Failed to cleanup lock: {e}")
     return str(master_dir), cleanup
 
 
-def _read_mode_context(base_path: Path) -> Tuple[str, Callable[[], None]]:
+def compact_master_profile(base_dir: str, *, lock_timeout: float = 5.0) -> Optional[CompactionResult]:
+    """Compact ``base_dir/master`` under the write lock and publish a fresh snapshot.
+
+    The result is recorded in ``base_dir/compaction.json`` (outside the master,
+    so it is never cloned). Returns None when there is no master or the lock is busy.
+    """
+    base_path = Path(base_dir)
+    master_dir = base_path / 'master'
+    if not master_dir.exists():
+        return None
+    lock = FileLock(str(base_path / 'master.lock'), timeout=lock_timeout)
+    if not lock.acquire():
+        logger.info(f"Skipping Camoufox master compaction, profile is busy: {master_dir}")
+        return None
+    try:
+        result = compact_profile_dir(master_dir)
+        _snapshot_store(base_path).publish()
+    finally:
+        lock.release()
+    try:
+        record = dict(result, compacted_at=time.time())
+        tmp_file = base_path / 'compaction.json.tmp'
+        tmp_file.write_text(json.dumps(record, indent=2), encoding='utf-8')
+        os.replace(tmp_file, base_path / 'compaction.json')
+    except OSError as e:
+        logger.warning(f"Failed to record compaction result for {master_dir}: {e}")
+    return result
+
+
+def publish_master_snapshot(base_dir: str) -> Optional[Path]:
+    """Publish ``base_dir/master`` as a new snapshot generation for readers.
+
+    For write sessions that hold ``base_dir/master.lock`` themselves; returns
+    the generation directory, or None when there is nothing to publish.
+    """
+    return _snapshot_store(Path(base_dir)).publish()
+
+
+def _read_mode_context(
+    base_path: Path,
+    clone_storage: Optional[CloneStorage] = None,
+) -> Tuple[str, Callable[[], None]]:
     """Read mode context: clones master directory to temporary location."""
     master_dir = base_path / 'master'
+    # Clone the latest published snapshot when available; it is immutable, so no lock is needed
+    with _snapshot_store(base_path).reader() as generation_dir:
+        if generation_dir is not None:
+            return _clone_source(generation_dir, base_path, clone_storage)
     clone_dir = base_path / 'clones' / str(uuid.uuid4())
     # Ensure master directory exists
     if not master_dir.exists():
@@ -117,7 +166,36 @@ def _read_mode_context(base_path: Path) -> Tuple[str, Callable[[], None]]:
             except Exception as e:
                 logger.warning(f"Failed to cleanup clone directory: {e}")
         return str(clone_dir), cleanup
-    # Clone from master
+    return _clone_source(master_dir, base_path, clone_storage)
+
+
+def _snapshot_store(base_path: Path) -> MasterSnapshotStore:
+    """Snapshot store publishing immutable generations of ``base_path/master``."""
+    return MasterSnapshotStore(base_path / 'master', base_path / 'snapshots', copy_fn=_copytree_recursive)
+
+
+def _clone_source(
+    source_dir: Path,
+    base_path: Path,
+    clone_storage: Optional[CloneStorage],
+) -> Tuple[str, Callable[[], None]]:
+    """Clone ``source_dir`` onto the fast clone root when it fits, else below ``clones/``."""
+    if clone_storage is not None and clone_storage.fast_enabled:
+        # Keep the fast-root reservation until the copy has landed
+        with clone_storage.reserve(get_directory_size_bytes(source_dir)) as clone_dir:
+            clone_path, remove_clone = _clone_master(source_dir, clone_dir)
+
+        def cleanup():
+            try:
+                remove_clone()
+            finally:
+                clone_storage.release(clone_dir)
+        return clone_path, cleanup
+    return _clone_master(source_dir, base_path / 'clones' / str(uuid.uuid4()))
+
+
+def _clone_master(master_dir: Path, clone_dir: Path) -> Tuple[str, Callable[[], None]]:
+    """Copy ``master_dir`` into ``clone_dir`` and return a cleanup function."""
     try:
         clone_dir.mkdir(parents=True, exist_ok=True)
         _copytree_recursive(master_dir, clone_dir)
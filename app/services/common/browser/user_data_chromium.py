@@ -19,18 +19,28 @@ from app.services.common.browser.chromium_user_data_context import (
 from app.services.common.browser.cookies import ChromiumCookieManager
 from app.services.common.browser.paths import ChromiumPathManager
 from app.services.common.browser.profile_manager import ChromiumProfileManager
-from app.services.common.browser.types import CleanupResult, DiskUsageStats
+from app.services.common.browser.types import CleanupResult, CompactionResult, DiskUsageStats
 
 
 class ChromiumUserDataManager:
     """Orchestrates Chromium user data operations via dedicated helpers."""
 
-    def __init__(self, user_data_dir: Optional[str] = None) -> None:
+    def __init__(
+        self,
+        user_data_dir: Optional[str] = None,
+        *,
+        clone_root: Optional[str] = None,
+        clone_root_max_bytes: int = 0,
+    ) -> None:
         self.user_data_dir = user_data_dir
         self.enabled = user_data_dir is not None
         self._base_path = Path(user_data_dir) if user_data_dir else None
 
-        self.path_manager = ChromiumPathManager(user_data_dir)
+        self.path_manager = ChromiumPathManager(
+            user_data_dir,
+            clone_root=clone_root,
+            clone_root_max_bytes=clone_root_max_bytes,
+        )
         self.profile_manager: Optional[ChromiumProfileManager] = None
         self.cookie_manager: Optional[ChromiumCookieManager] = None
 
@@ -100,7 +110,15 @@ class ChromiumUserDataManager:
     def import_cookies(self, cookie_data: Dict[str, Any]) -> bool:
         """Import cookies to the master profile."""
 
-        return self._cookie_synchronizer.import_cookies(cookie_data)
+        imported = self._cookie_synchronizer.import_cookies(cookie_data)
+        if imported:
+            self._context_manager.publish_snapshot()
+        return imported
+
+    def save_storage_state(self, storage_state: Dict[str, Any]) -> bool:
+        """Persist localStorage origins captured from a master profile session."""
+
+        return self._cookie_synchronizer.save_storage_state(storage_state)
 
     def update_metadata(self, updates: Dict[str, Any]) -> None:
         """Update metadata file with new information."""
@@ -138,6 +156,14 @@ class ChromiumUserDataManager:
 
         return self._housekeeping.cleanup_old_clones(max_age_hours, max_count)
 
+    def compact_master(self, lock_timeout: float = 5.0) -> Optional[CompactionResult]:
+        """Shrink the master profile and publish the result for new clones."""
+
+        result = self._housekeeping.compact_master(lock_timeout)
+        if result is not None:
+            self._context_manager.publish_snapshot()
+        return result
+
     def get_disk_usage_stats(self) -> DiskUsageStats:
         """Get disk usage statistics for the user data directories."""
 
@@ -133,6 +133,29 @@ def rmtree_with_retries(
     return False
 
 
+def get_directory_size_bytes(path: Path) -> int:
+    """Get directory size in bytes.
+
+    Args:
+        path: Directory to measure
+
+    Returns:
+        Total size of regular files below ``path``; 0 when it cannot be measured
+    """
+    total_bytes = 0
+    try:
+        for item in path.rglob("*"):
+            try:
+                if item.is_file():
+                    total_bytes += item.stat().st_size
+            except OSError:
+                # Files may disappear while clones are being removed concurrently
+                continue
+    except Exception:
+        return total_bytes
+    return total_bytes
+
+
 def get_directory_size(path: Path) -> float:
     """Get directory size in megabytes.
 
@@ -0,0 +1,394 @@
+"""Watchdog for browser processes launched by this service.
+
+Browsers are started by Playwright driver processes from worker threads and are
+normally torn down by ``close()``/``__del__``. When that fails (a crashed
+driver, an abandoned fetcher) the browser keeps running, detached from any
+request. :class:`BrowserWatchdog` periodically reads the Linux process table
+from ``/proc``, tracks every browser in this process's tree and terminates:
+
+* orphans: tracked browsers that are no longer descendants of this process or
+  that were reparented to it after their Playwright driver went away;
+* browsers whose process tree RSS exceeds ``browser_max_rss_bytes``;
+* browsers older than ``browser_max_age_seconds``;
+* browsers that started more than ``browser_max_pages`` renderer/content
+  processes (Chromium and Firefox run roughly one per page or site).
+
+Termination sends SIGTERM to the browser and escalates to SIGKILL for the
+whole tree after a grace period. On platforms without ``/proc`` the watchdog
+stays disabled.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import signal
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from app.core.metrics import get_counter, get_gauge
+
+logger = logging.getLogger(__name__)
+
+PROC_ROOT = "/proc"
+BROWSER_EXECUTABLES = frozenset(
+    {
+        "chrome",
+        "chromium",
+        "chromium-browser",
+        "chrome-headless-shell",
+        "headless_shell",
+        "firefox",
+        "firefox-bin",
+        "camoufox",
+        "camoufox-bin",
+    }
+)
+# Seconds between SIGTERM and SIGKILL
+DEFAULT_GRACE_SECONDS = 5.0
+
+ProcessKey = Tuple[int, int]  # (pid, start time in clock ticks); pids alone get reused
+
+
+@dataclass(frozen=True)
+class ProcessInfo:
+    """Subset of ``/proc/<pid>/stat`` and ``cmdline`` used by the watchdog."""
+
+    pid: int
+    ppid: int
+    state: str
+    start_ticks: int
+    rss_bytes: int
+    cmdline: Tuple[str, ...]
+
+    @property
+    def key(self) -> ProcessKey:
+        return (self.pid, self.start_ticks)
+
+    @property
+    def executable(self) -> str:
+        return os.path.basename(self.cmdline[0]) if self.cmdline else ""
+
+    @property
+    def is_browser(self) -> bool:
+        return self.executable in BROWSER_EXECUTABLES
+
+    @property
+    def is_content_process(self) -> bool:
+        """Chromium renderers and Firefox content processes."""
+        return "--type=renderer" in self.cmdline or "-contentproc" in self.cmdline
+
+
+def _page_size() -> int:
+    try:
+        return os.sysconf("SC_PAGE_SIZE")
+    except (AttributeError, ValueError, OSError):  # pragma: no cover - non-POSIX
+        return 4096
+
+
+def read_process(pid: int, proc_root: str = PROC_ROOT) -> Optional[ProcessInfo]:
+    """Return the process entry for ``pid``, or None when it vanished or is unreadable."""
+    base = os.path.join(proc_root, str(pid))
+    try:
+        with open(os.path.join(base, "stat"), "rb") as handle:
+            stat = handle.read().decode("utf-8", "replace")
+        with open(os.path.join(base, "cmdline"), "rb") as handle:
+            raw_cmdline = handle.read()
+    except OSError:
+        return None
+    # comm may contain spaces and parentheses; fields resume after the last ")"
+    fields = stat[stat.rfind(")") + 2:].split()
+    try:
+        return ProcessInfo(
+            pid=pid,
+            ppid=int(fields[1]),
+            state=fields[0],
+            start_ticks=int(fields[19]),
+            rss_bytes=int(fields[21]) * _page_size(),
+            cmdline=tuple(part.decode("utf-8", "replace") for part in raw_cmdline.split(b"\0") if part),
+        )
+    except (IndexError, ValueError):
+        return None
+
+
+def read_process_table(proc_root: str = PROC_ROOT) -> Dict[int, ProcessInfo]:
+    """Return every readable process keyed by pid."""
+    table: Dict[int, ProcessInfo] = {}
+    try:
+        names = os.listdir(proc_root)
+    except OSError:
+        return table
+    for name in names:
+        if name.isdigit():
+            info = read_process(int(name), proc_root)
+            if info is not None:
+                table[info.pid] = info
+    return table
+
+
+def descendants(table: Dict[int, ProcessInfo], root_pid: int) -> List[ProcessInfo]:
+    """Return every process below ``root_pid`` in ``table``."""
+    children: Dict[int, List[ProcessInfo]] = {}
+    for info in table.values():
+        children.setdefault(info.ppid, []).append(info)
+    found: List[ProcessInfo] = []
+    stack = [root_pid]
+    while stack:
+        for child in children.get(stack.pop(), ()):
+            found.append(child)
+            stack.append(child.pid)
+    return found
+
+
+@dataclass
+class TrackedBrowser:
+    """A browser root process and what the watchdog knows about it."""
+
+    key: ProcessKey
+    executable: str
+    first_seen: float
+    content_processes: Set[ProcessKey] = field(default_factory=set)
+    rss_bytes: int = 0
+    process_count: int = 1
+    terminated_at: Optional[float] = None
+    reason: Optional[str] = None
+
+    @property
+    def pid(self) -> int:
+        return self.key[0]
+
+
+@dataclass
+class WatchdogReport:
+    """Outcome of one :meth:`BrowserWatchdog.scan`."""
+
+    browsers: int = 0
+    processes: int = 0
+    rss_bytes: int = 0
+    terminated: List[Tuple[int, str]] = field(default_factory=list)
+    killed: List[int] = field(default_factory=list)
+    reaped: List[int] = field(default_factory=list)
+
+
+class BrowserWatchdog:
+    """Track, recycle and reap browser process trees of this process."""
+
+    def __init__(
+        self,
+        *,
+        max_rss_bytes: int = 0,
+        max_age_seconds: float = 0,
+        max_pages: int = 0,
+        grace_seconds: float = DEFAULT_GRACE_SECONDS,
+        proc_root: str = PROC_ROOT,
+        root_pid: Optional[int] = None,
+    ) -> None:
+        """Initialize the watchdog; a limit of 0 disables it."""
+        self.max_rss_bytes = max(0, int(max_rss_bytes))
+        self.max_age_seconds = max(0.0, float(max_age_seconds))
+        self.max_pages = max(0, int(max_pages))
+        self.grace_seconds = max(0.0, float(grace_seconds))
+        self.proc_root = proc_root
+        self.root_pid = os.getpid() if root_pid is None else root_pid
+        self._tracked: Dict[ProcessKey, TrackedBrowser] = {}
+        # Trees to SIGKILL once the grace period of a SIGTERM ran out
+        self._pending_kill: Dict[ProcessKey, Set[ProcessKey]] = {}
+        self._terminations = get_counter(
+            "browser_watchdog_terminations_total", "Browsers terminated by the watchdog"
+        )
+        self._orphans = get_counter("browser_watchdog_orphans_total", "Orphaned browsers terminated")
+        self._browsers_gauge = get_gauge("browser_watchdog_browsers", "Live browsers launched by this process")
+        self._processes_gauge = get_gauge(
+            "browser_watchdog_processes", "Live processes in browser trees of this process"
+        )
+        self._rss_gauge = get_gauge("browser_watchdog_rss_bytes", "Summed RSS of browser process trees")
+
+    @property
+    def available(self) -> bool:
+        return os.path.isdir(os.path.join(self.proc_root, str(self.root_pid)))
+
+    def browsers(self) -> List[TrackedBrowser]:
+        """Return the browsers tracked by the last scan."""
+        return list(self._tracked.values())
+
+    def scan(self, now: Optional[float] = None) -> WatchdogReport:
+        """Refresh the process table and enforce every limit once."""
+        now = time.monotonic() if now is None else now
+        report = WatchdogReport()
+        table = read_process_table(self.proc_root)
+        ours = {info.key for info in descendants(table, self.root_pid)}
+
+        # New browser roots: browsers in our tree whose parent is not a browser
+        for key in ours:
+            info = table[key[0]]
+            parent = table.get(info.ppid)
+            if info.is_browser and not (parent is not None and parent.is_browser) and key not in self._tracked:
+                self._tracked[key] = TrackedBrowser(key=key, executable=info.executable, first_seen=now)
+
+        for key, tracked in list(self._tracked.items()):
+            info = table.get(key[0])
+            if info is None or info.key != key or info.state == "Z":
+                if info is not None and info.key == key:
+                    self._reap(info, report)
+                self._tracked.pop(key, None)
+                continue
+
+            tree = [info] + descendants(table, info.pid)
+            tracked.rss_bytes = sum(member.rss_bytes for member in tree if member.state != "Z")
+            tracked.process_count = len(tree)
+            tracked.content_processes.update(member.key for member in tree if member.is_content_process)
+            report.browsers += 1
+            report.processes += tracked.process_count
+            report.rss_bytes += tracked.rss_bytes
+
+            if tracked.terminated_at is not None:
+                continue
+            # Playwright drivers launch browsers, never this process itself, so a
+            # browser parented directly to us was reparented after its driver died
+            in_tree = key in ours and info.ppid != self.root_pid
+            reason = self._violation(tracked, in_tree, now)
+            if reason is not None:
+                self._terminate(tracked, tree, reason, now, report)
+
+        self._escalate(table, now, report)
+        for info in table.values():
+            # Reparented browser zombies (our subreaper/pid 1 role in containers)
+            if info.ppid == self.root_pid and info.state == "Z" and info.is_browser and info.pid not in report.reaped:
+                self._reap(info, report)
+
+        self._browsers_gauge.set(report.browsers)
+        self._processes_gauge.set(report.processes)
+        self._rss_gauge.set(report.rss_bytes)
+        return report
+
+    def _violation(self, tracked: TrackedBrowser, in_tree: bool, now: float) -> Optional[str]:
+        if not in_tree:
+            return "orphaned"
+        if self.max_rss_bytes and tracked.rss_bytes > self.max_rss_bytes:
+            return f"rss {tracked.rss_bytes} > {self.max_rss_bytes} bytes"
+        if self.max_age_seconds and now - tracked.first_seen > self.max_age_seconds:
+            return f"age > {self.max_age_seconds:.0f}s"
+        if self.max_pages and len(tracked.content_processes) > self.max_pages:
+            return f"pages {len(tracked.content_processes)} > {self.max_pages}"
+        return None
+
+    def _terminate(
+        self,
+        tracked: TrackedBrowser,
+        tree: Iterable[ProcessInfo],
+        reason: str,
+        now: float,
+        report: WatchdogReport,
+    ) -> None:
+        logger.warning(f"Terminating {tracked.executable} browser pid {tracked.pid}: {reason}")
+        tracked.terminated_at = now
+        tracked.reason = reason
+        self._terminations.inc()
+        if reason == "orphaned":
+            self._orphans.inc()
+        self._pending_kill[tracked.key] = {member.key for member in tree}
+        self._signal(tracked.pid, signal.SIGTERM)
+        report.terminated.append((tracked.pid, reason))
+
+    def _escalate(self, table: Dict[int, ProcessInfo], now: float, report: WatchdogReport) -> None:
+        for key, members in list(self._pending_kill.items()):
+            tracked = self._tracked.get(key)
+            if tracked is not None and now - (tracked.terminated_at or now) < self.grace_seconds:
+                continue
+            # Kill whatever is left of the tree, including children that outlived the browser
+            for member_key in members:
+                info = table.get(member_key[0])
+                if info is not None and info.key == member_key and info.state != "Z":
+                    self._signal(info.pid, getattr(signal, "SIGKILL", signal.SIGTERM))
+                    report.killed.append(info.pid)
+            del self._pending_kill[key]
+
+    @staticmethod
+    def _signal(pid: int, signum: int) -> None:
+        try:
+            os.kill(pid, signum)
+        except (ProcessLookupError, PermissionError):
+            pass
+
+    def _reap(self, info: ProcessInfo, report: WatchdogReport) -> None:
+        """Collect the exit status of a zombie browser that was reparented to this process."""
+        if info.ppid != self.root_pid or info.state != "Z" or not hasattr(os, "WNOHANG"):
+            return
+        try:
+            pid, _status = os.waitpid(info.pid, os.WNOHANG)
+        except ChildProcessError:
+            return
+        if pid:
+            report.reaped.append(pid)
+
+
+def watchdog_from_settings(settings) -> BrowserWatchdog:
+    """Build a watchdog from ``browser_max_*`` settings."""
+
+    def setting(name: str) -> int:
+        value = getattr(settings, name, 0)
+        return value if isinstance(value, int) and not isinstance(value, bool) else 0
+
+    return BrowserWatchdog(
+        max_rss_bytes=setting("browser_max_rss_bytes"),
+        max_age_seconds=setting("browser_max_age_seconds"),
+        max_pages=setting("browser_max_pages"),
+    )
+
+
+class BrowserWatchdogScheduler:
+    """Run :meth:`BrowserWatchdog.scan` periodically on a worker thread."""
+
+    def __init__(self, settings) -> None:
+        interval = getattr(settings, "browser_watchdog_interval_seconds", 0)
+        self.interval_seconds = float(interval) if isinstance(interval, (int, float)) else 0.0
+        self.watchdog = watchdog_from_settings(settings)
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Schedule the watchdog on the running loop; disabled without ``/proc`` or a positive interval."""
+        if self.interval_seconds <= 0 or self.running:
+            return
+        if not self.watchdog.available:
+            logger.debug("Browser watchdog disabled: no process table at %s", self.watchdog.proc_root)
+            return
+        self._task = asyncio.get_running_loop().create_task(self._run(), name="browser-watchdog")
+
+    async def stop(self) -> None:
+        """Cancel the watchdog and wait for it to finish."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.to_thread(self.watchdog.scan)
+            except Exception as exc:  # pragma: no cover - keep the watchdog alive
+                logger.warning("Browser watchdog scan failed: %s", exc)
+            await asyncio.sleep(self.interval_seconds)
+
+
+__all__ = [
+    "BROWSER_EXECUTABLES",
+    "BrowserWatchdog",
+    "BrowserWatchdogScheduler",
+    "ProcessInfo",
+    "TrackedBrowser",
+    "WatchdogReport",
+    "descendants",
+    "read_process",
+    "read_process_table",
+    "watchdog_from_settings",
+]
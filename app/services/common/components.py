@@ -0,0 +1,134 @@
+"""Process-wide container for the crawl engine's component graph.
+
+The fetch adapter, options resolver, argument composer, Camoufox builder,
+attempt planner and iframe extractor keep no per-request state, so one set is
+built per settings generation (the object returned by ``get_settings()``,
+replaced whenever its cache is cleared) and shared by every engine. The
+default engine, and named engines of crawlers with their own executor, are
+cached the same way.
+"""
+
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional
+
+from app.services.browser.options.resolver import OptionsResolver
+from app.services.common.adapters.fetch_arg_composer import FetchArgComposer
+from app.services.common.adapters.scrapling_fetcher import ScraplingFetcherAdapter
+from app.services.common.browser.camoufox import CamoufoxArgsBuilder
+from app.services.crawler.proxy.plan import AttemptPlanner
+from app.services.crawler.utils.iframe_extractor import IframeExtractor
+
+if TYPE_CHECKING:  # pragma: no cover - import for type checkers only
+    from app.services.common.engine import CrawlerEngine
+
+
+@dataclass(frozen=True)
+class EngineComponents:
+    """Stateless collaborators shared by the executors and engines of one settings generation."""
+
+    fetch_client: ScraplingFetcherAdapter
+    options_resolver: OptionsResolver
+    arg_composer: FetchArgComposer
+    camoufox_builder: CamoufoxArgsBuilder
+    attempt_planner: AttemptPlanner
+    iframe_extractor: IframeExtractor
+
+    @classmethod
+    def build(cls) -> "EngineComponents":
+        fetch_client = ScraplingFetcherAdapter()
+        return cls(
+            fetch_client=fetch_client,
+            options_resolver=OptionsResolver(),
+            arg_composer=FetchArgComposer(),
+            camoufox_builder=CamoufoxArgsBuilder(),
+            attempt_planner=AttemptPlanner(),
+            iframe_extractor=IframeExtractor(fetch_client),
+        )
+
+
+class ComponentContainer:
+    """Builds components and engines once per settings generation."""
+
+    def __init__(self) -> None:
+        self._lock = threading.RLock()
+        self._settings: Any = None
+        self._components: Optional[EngineComponents] = None
+        self._engines: Dict[str, "CrawlerEngine"] = {}
+
+    def _use(self, settings: Any) -> None:
+        if settings is not self._settings:
+            self._settings = settings
+            self._components = None
+            self._engines = {}
+
+    def components(self, settings: Any) -> EngineComponents:
+        with self._lock:
+            self._use(settings)
+            if self._components is None:
+                self._components = EngineComponents.build()
+            return self._components
+
+    def engine(
+        self,
+        settings: Any,
+        name: str = "default",
+        factory: Optional[Callable[[Any], "CrawlerEngine"]] = None,
+    ) -> "CrawlerEngine":
+        """Return the engine cached under ``name``, building it with ``factory(settings)`` once.
+
+        Without a factory the engine comes from ``CrawlerEngine.from_settings``.
+        """
+        with self._lock:
+            self._use(settings)
+            engine = self._engines.get(name)
+            if engine is None:
+                if factory is None:
+                    from app.services.common.engine import CrawlerEngine
+
+                    factory = CrawlerEngine.from_settings
+                engine = self._engines[name] = factory(settings)
+            return engine
+
+
+_container = ComponentContainer()
+
+
+def _resolve_settings(settings: Any) -> Any:
+    if settings is None:
+        import app.core.config as app_config
+
+        settings = app_config.get_settings()
+    return settings
+
+
+def get_engine_components(settings=None) -> EngineComponents:
+    """Return the shared components for ``settings`` (default: the current settings)."""
+    return _container.components(_resolve_settings(settings))
+
+
+def get_shared_engine(
+    settings=None,
+    *,
+    name: str = "default",
+    factory: Optional[Callable[[Any], "CrawlerEngine"]] = None,
+) -> "CrawlerEngine":
+    """Return the process-wide engine ``name`` for ``settings`` (default: the current settings)."""
+    return _container.engine(_resolve_settings(settings), name, factory)
+
+
+def reset_component_container() -> None:
+    """Drop the cached components and engine (for tests)."""
+    global _container
+    _container = ComponentContainer()
+
+
+__all__ = [
+    "ComponentContainer",
+    "EngineComponents",
+    "get_engine_components",
+    "get_shared_engine",
+    "reset_component_container",
+]
@@ -0,0 +1,251 @@
+"""Graceful drain of in-flight requests at shutdown.
+
+On SIGTERM the service stops admitting work: new requests (other than the
+health probes) get 503 with ``Retry-After`` and ``GET /ready`` reports
+``draining``. Requests already running get ``drain_timeout_seconds`` to finish;
+whatever is still running then is cancelled and answered with 503 so clients
+retry against another instance. Cancelled requests may leave browser jobs
+running on worker threads; once browsers are closed those jobs get
+``drain_cancel_grace_seconds`` to release their profiles, after which the
+remaining clones and write locks are released on their behalf.
+
+The uvicorn signal handler is chained, not replaced: uvicorn still stops
+accepting connections and runs the lifespan shutdown once every request task
+has finished, which the drain deadline bounds.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import signal
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional, Set
+
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.metrics import get_counter
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DRAIN_TIMEOUT_SECONDS = 30.0
+DEFAULT_CANCEL_GRACE_SECONDS = 5.0
+# Probes keep answering while draining so orchestrators can observe it
+EXEMPT_PATHS = frozenset({"/health", "/ready", "/metrics"})
+DRAIN_SIGNALS = (signal.SIGINT, signal.SIGTERM)
+
+
+class DrainingError(RuntimeError):
+    """Raised when work is submitted after the drain began."""
+
+
+def _seconds(settings, name: str, default: float) -> float:
+    value = getattr(settings, name, default)
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or value < 0:
+        return default
+    return float(value)
+
+
+class DrainController:
+    """Track in-flight request tasks and drain them against a deadline."""
+
+    def __init__(self, settings=None) -> None:
+        self.timeout_seconds = _seconds(settings, "drain_timeout_seconds", DEFAULT_DRAIN_TIMEOUT_SECONDS)
+        self.cancel_grace_seconds = _seconds(
+            settings, "drain_cancel_grace_seconds", DEFAULT_CANCEL_GRACE_SECONDS
+        )
+        self.started_at: Optional[float] = None
+        self._tasks: Set[asyncio.Task] = set()
+        self._cancelled: Set[asyncio.Task] = set()
+        self._drain_task: Optional[asyncio.Task] = None
+
+    @property
+    def draining(self) -> bool:
+        return self.started_at is not None
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._tasks)
+
+    @contextmanager
+    def admit(self) -> Iterator[None]:
+        """Count the current task as in flight; raise :class:`DrainingError` once draining."""
+        if self.draining:
+            get_counter("drain_rejected_total", "Requests rejected while draining").inc()
+            raise DrainingError("Service is shutting down")
+        task = asyncio.current_task()
+        if task is None:
+            yield
+            return
+        self._tasks.add(task)
+        try:
+            yield
+        finally:
+            self._tasks.discard(task)
+
+    def was_cancelled(self, task: Optional[asyncio.Task] = None) -> bool:
+        """Return True when ``task`` (default: the current task) was cancelled by the drain."""
+        return (task or asyncio.current_task()) in self._cancelled
+
+    def begin(self) -> None:
+        """Stop admitting requests and cancel the in-flight ones left at the deadline."""
+        if self.draining:
+            return
+        self.started_at = time.monotonic()
+        logger.info(
+            "Draining %s in-flight request(s) (deadline %.1fs)", self.in_flight, self.timeout_seconds
+        )
+        self._drain_task = asyncio.get_running_loop().create_task(self._drain(), name="drain")
+
+    async def drain(self) -> None:
+        """Begin draining if not yet begun and wait until no request is in flight."""
+        self.begin()
+        if self._drain_task is not None:
+            await self._drain_task
+
+    async def _drain(self) -> None:
+        pending = set(self._tasks)
+        if pending:
+            _, pending = await asyncio.wait(pending, timeout=self.timeout_seconds)
+        if pending:
+            logger.warning("Cancelling %s request(s) still running at the drain deadline", len(pending))
+            get_counter("drain_cancelled_total", "Requests cancelled at the drain deadline").inc(len(pending))
+            self._cancelled.update(pending)
+            for task in pending:
+                task.cancel()
+            await asyncio.wait(pending, timeout=self.cancel_grace_seconds)
+        logger.info("Drain finished in %.2fs", time.monotonic() - (self.started_at or time.monotonic()))
+
+    def report(self) -> Dict[str, Any]:
+        return {"status": "draining", "in_flight": self.in_flight}
+
+
+class DrainMiddleware:
+    """Admit HTTP requests through the process-wide :class:`DrainController`.
+
+    A plain ASGI middleware rather than an ``@app.middleware`` function: those
+    run the rest of the stack on a separate task, which a cancelled request
+    would leave running.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope.get("path") in EXEMPT_PATHS:
+            await self.app(scope, receive, send)
+            return
+        controller = get_drain_controller()
+        response_started = False
+
+        async def tracking_send(message: Message) -> None:
+            nonlocal response_started
+            response_started = response_started or message["type"] == "http.response.start"
+            await send(message)
+
+        try:
+            with controller.admit():
+                await self.app(scope, receive, tracking_send)
+        except DrainingError as exc:
+            await _shutting_down_response(str(exc))(scope, receive, send)
+        except asyncio.CancelledError:
+            if response_started or not controller.was_cancelled():
+                raise
+            await _shutting_down_response("Request cancelled by shutdown")(scope, receive, send)
+
+
+def _shutting_down_response(detail: str) -> JSONResponse:
+    # Clients retry against another instance; the connection is not reused
+    return JSONResponse(
+        status_code=503,
+        content={"detail": detail},
+        headers={"Retry-After": "1", "Connection": "close"},
+    )
+
+
+async def wait_for_profile_releases(timeout: float) -> int:
+    """Give jobs of cancelled requests ``timeout`` seconds to release their profiles; return how many remain."""
+    from app.services.common.browser.profile_releases import pending_releases
+
+    deadline = time.monotonic() + timeout
+    while pending_releases() and time.monotonic() < deadline:
+        await asyncio.sleep(0.1)
+    return pending_releases()
+
+
+_controller: Optional[DrainController] = None
+_controller_lock = threading.Lock()
+_signals_installed = False
+
+
+def start_drain_controller(settings) -> DrainController:
+    """Create the process-wide drain controller (application startup) and hook the shutdown signals."""
+    global _controller
+    with _controller_lock:
+        _controller = DrainController(settings)
+    _install_signal_handlers()
+    return _controller
+
+
+def get_drain_controller() -> DrainController:
+    """Return the process-wide drain controller, created with defaults when the app has not started one."""
+    global _controller
+    with _controller_lock:
+        if _controller is None:
+            _controller = DrainController()
+        return _controller
+
+
+def _begin_drain() -> None:
+    get_drain_controller().begin()
+
+
+def _install_signal_handlers() -> None:
+    """Begin draining on SIGINT/SIGTERM, then hand the signal on to the server's own handler."""
+    global _signals_installed
+    if _signals_installed or threading.current_thread() is not threading.main_thread():
+        return
+    loop = asyncio.get_running_loop()
+    for signum in DRAIN_SIGNALS:
+        previous = signal.getsignal(signum)
+        if not callable(previous):
+            # No server handler to hand the signal on to; keep the default behaviour
+            continue
+
+        def handler(received, frame, previous=previous) -> None:
+            if not loop.is_closed():
+                loop.call_soon_threadsafe(_begin_drain)
+            previous(received, frame)
+
+        signal.signal(signum, handler)
+    _signals_installed = True
+
+
+def drain_report() -> Optional[Dict[str, Any]]:
+    """Readiness override while draining; None otherwise."""
+    if _controller is None or not _controller.draining:
+        return None
+    return _controller.report()
+
+
+def reset_drain() -> None:
+    """Forget the process-wide drain controller (end of shutdown, tests)."""
+    global _controller
+    with _controller_lock:
+        _controller = None
+
+
+__all__ = [
+    "DrainController",
+    "DrainMiddleware",
+    "DrainingError",
+    "EXEMPT_PATHS",
+    "drain_report",
+    "get_drain_controller",
+    "reset_drain",
+    "start_drain_controller",
+    "wait_for_profile_releases",
+]
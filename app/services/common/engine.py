@@ -9,6 +9,8 @@ from app.services.common.browser.camoufox import CamoufoxArgsBuilder
 from app.services.crawler.executors.single_executor import SingleAttemptExecutor
 from app.services.crawler.executors.retry_executor import RetryingExecutor
 from app.services.crawler.executors.backoff import BackoffPolicy
+from app.services.crawler.executors.process_executor import ProcessPoolCrawlExecutor, process_pool_enabled
+from app.services.common.components import get_engine_components
 from app.services.crawler.proxy.plan import AttemptPlanner
 from app.services.crawler.proxy.health import get_health_tracker
 
@@ -39,25 +41,35 @@ class CrawlerEngine(ICrawlerEngine):
         """Factory method to create engine with default components from settings."""
         if settings is None:
             settings = app_config.get_settings()
+        # Executors and engine share the process-wide components of this settings generation
+        components = get_engine_components(settings)
+        shared = dict(
+            fetch_client=components.fetch_client,
+            options_resolver=components.options_resolver,
+            arg_composer=components.arg_composer,
+            camoufox_builder=components.camoufox_builder,
+            iframe_extractor=components.iframe_extractor,
+        )
         # Decide executor strategy based on max_retries
         if settings.max_retries <= 1:
-            executor = SingleAttemptExecutor()
+            executor = SingleAttemptExecutor(**shared)
         else:
             backoff_policy = BackoffPolicy.from_settings(settings)
             retry_executor = RetryingExecutor(
+                **shared,
                 backoff_policy=backoff_policy,
+                attempt_planner=components.attempt_planner,
                 health_tracker=get_health_tracker()
             )
             executor = retry_executor
-        # Create other default components
-        fetch_client = ScraplingFetcherAdapter()
-        options_resolver = OptionsResolver()
-        camoufox_builder = CamoufoxArgsBuilder()
+        if process_pool_enabled(settings):
+            executor = ProcessPoolCrawlExecutor(executor)
         return cls(
             executor=executor,
-            fetch_client=fetch_client,
-            options_resolver=options_resolver,
-            camoufox_builder=camoufox_builder
+            fetch_client=components.fetch_client,
+            options_resolver=components.options_resolver,
+            camoufox_builder=components.camoufox_builder,
+            attempt_planner=components.attempt_planner,
         )
 
     def run(self, request: CrawlRequest, page_action: Optional[PageAction] = None) -> CrawlResponse:
@@ -70,6 +82,12 @@ class CrawlerEngine(ICrawlerEngine):
 
     def _create_executor(self, settings) -> IExecutor:
         """Create appropriate executor based on settings."""
+        executor = self._create_local_executor(settings)
+        if process_pool_enabled(settings):
+            return ProcessPoolCrawlExecutor(executor)
+        return executor
+
+    def _create_local_executor(self, settings) -> IExecutor:
         if settings.max_retries <= 1:
             return SingleAttemptExecutor(
                 fetch_client=self.fetch_client,
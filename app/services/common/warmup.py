@@ -0,0 +1,297 @@
+"""Start-up warm-up of browser runtimes, pools and caches.
+
+Without it the first requests after a deploy pay for the Camoufox install
+check, the fetcher imports and capability introspection, the first profile
+clone and the first browser launch. The steps named in ``warmup_components``
+run one after another on worker threads once the application has started;
+``GET /ready`` answers 503 until they have all finished. Each step's duration
+is logged, exported as the ``warmup_<step>_seconds`` gauge and included in the
+readiness report.
+
+A failed or timed-out step is reported but does not keep the service from
+turning ready: the work it would have primed is simply paid by a request.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Mapping, Optional
+
+from app.core.metrics import get_gauge
+
+logger = logging.getLogger(__name__)
+
+# A step returns False when there was nothing to warm (feature disabled, no profile yet)
+WarmupStep = Callable[[Any], Optional[bool]]
+
+DEFAULT_STEP_TIMEOUT_SECONDS = 120.0
+
+
+def _warm_camoufox(settings) -> None:
+    from app.services.common.browser.camoufox import CamoufoxArgsBuilder
+
+    CamoufoxArgsBuilder._ensure_camoufox_ready()
+
+
+def _warm_capabilities(settings) -> None:
+    from app.services.browser.executors import chromium_browse_executor
+    from app.services.common.components import get_engine_components
+
+    get_engine_components(settings).fetch_client.detect_capabilities()
+    chromium_browse_executor._load_fetchers()
+
+
+def _warm_engine(settings) -> None:
+    from app.services.common.components import get_shared_engine
+
+    get_shared_engine(settings)
+
+
+def _profile_slots(settings, name: str) -> List[Path]:
+    from app.services.common.browser.profile_pool import profile_pool_from_settings
+
+    base_dir = getattr(settings, name, None)
+    if not isinstance(base_dir, str) or not base_dir:
+        return []
+    slots = profile_pool_from_settings(settings, base_dir).profile_dirs()
+    return [slot for slot in slots if (slot / "master").is_dir()]
+
+
+def _warm_clones(settings) -> bool:
+    """Take and drop one read-mode clone of every master profile (page cache, clone roots, snapshots)."""
+    from app.services.common.browser import user_data as user_data_mod
+    from app.services.common.browser.user_data_chromium import ChromiumUserDataManager
+
+    clone_root = getattr(settings, "user_data_clone_root", None)
+    clone_root_max_bytes = getattr(settings, "user_data_clone_root_max_bytes", 0)
+    chromium_slots = _profile_slots(settings, "chromium_user_data_dir")
+    camoufox_slots = _profile_slots(settings, "camoufox_user_data_dir")
+    for slot in chromium_slots:
+        manager = ChromiumUserDataManager(
+            str(slot), clone_root=clone_root, clone_root_max_bytes=clone_root_max_bytes
+        )
+        # The Chromium context removes its clone on exit
+        with manager.get_user_data_context("read"):
+            pass
+    for slot in camoufox_slots:
+        with user_data_mod.user_data_context(
+            str(slot), "read", clone_root=clone_root, clone_root_max_bytes=clone_root_max_bytes
+        ) as (_effective_dir, cleanup):
+            cleanup()
+    return bool(chromium_slots or camoufox_slots)
+
+
+def _warm_browser(settings) -> None:
+    """Launch (or attach to) one headless Chromium and open a page."""
+    from playwright.sync_api import sync_playwright
+
+    from app.services.common.browser.browser_fleet import connect_or_launch_chromium
+
+    with sync_playwright() as playwright:
+        browser = connect_or_launch_chromium(playwright, headless=True)
+        try:
+            browser.new_page().close()
+        finally:
+            browser.close()
+
+
+def _warm_fingerprints(settings) -> bool:
+    from app.services.common.browser.fingerprint_pool import ENGINES, get_fingerprint_pool
+
+    pools = [pool for pool in (get_fingerprint_pool(engine, settings) for engine in ENGINES) if pool is not None]
+    for pool in pools:
+        pool.fill()
+    return bool(pools)
+
+
+def _warm_geoip(settings) -> bool:
+    from app.services.common.browser.geoip_cache import get_geoip_cache
+
+    cache = get_geoip_cache(settings)
+    if cache is None or getattr(settings, "camoufox_geoip", True) is False:
+        return False
+    cache.get(None)
+    return True
+
+
+def _warm_process_pool(settings) -> bool:
+    from app.services.crawler.executors.process_executor import get_crawl_process_pool
+
+    pool = get_crawl_process_pool(settings)
+    if pool is None:
+        return False
+    workers = pool.warm()
+    logger.debug("Warmed %s crawl worker process(es)", workers)
+    return True
+
+
+WARMUP_STEPS: Dict[str, WarmupStep] = {
+    "camoufox": _warm_camoufox,
+    "capabilities": _warm_capabilities,
+    "engine": _warm_engine,
+    "clones": _warm_clones,
+    "browser": _warm_browser,
+    "fingerprints": _warm_fingerprints,
+    "geoip": _warm_geoip,
+    "process_pool": _warm_process_pool,
+}
+
+
+def configured_steps(settings, available: Mapping[str, WarmupStep] = WARMUP_STEPS) -> List[str]:
+    """Return the step names listed in ``warmup_components``, in the order given ("all" = every step)."""
+    raw = getattr(settings, "warmup_components", "")
+    if not isinstance(raw, str):
+        return []
+    names: List[str] = []
+    for name in (part.strip().lower() for part in raw.split(",")):
+        if not name:
+            continue
+        if name == "all":
+            candidates = list(available)
+        elif name in available:
+            candidates = [name]
+        else:
+            logger.warning("Ignoring unknown warm-up step %r", name)
+            continue
+        names.extend(candidate for candidate in candidates if candidate not in names)
+    return names
+
+
+@dataclass(frozen=True)
+class WarmupResult:
+    """Outcome of one warm-up step: ``ok``, ``skipped``, ``failed`` or ``timeout``."""
+
+    status: str
+    seconds: float
+    error: Optional[str] = None
+
+    def as_dict(self) -> Dict[str, Any]:
+        payload: Dict[str, Any] = {"status": self.status, "seconds": round(self.seconds, 3)}
+        if self.error is not None:
+            payload["error"] = self.error
+        return payload
+
+
+class WarmupRunner:
+    """Run the configured warm-up steps on the event loop's default executor."""
+
+    def __init__(self, settings, steps: Mapping[str, WarmupStep] = WARMUP_STEPS) -> None:
+        self._settings = settings
+        self._steps = steps
+        self.names = configured_steps(settings, steps)
+        timeout = getattr(settings, "warmup_step_timeout_seconds", DEFAULT_STEP_TIMEOUT_SECONDS)
+        if isinstance(timeout, bool) or not isinstance(timeout, (int, float)) or timeout <= 0:
+            timeout = DEFAULT_STEP_TIMEOUT_SECONDS
+        self.timeout_seconds = float(timeout)
+        self.results: Dict[str, WarmupResult] = {}
+        self.seconds: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def ready(self) -> bool:
+        return all(name in self.results for name in self.names)
+
+    def start(self) -> None:
+        """Schedule the steps on the running loop; nothing to do when no step is configured."""
+        if not self.names or self._task is not None:
+            return
+        self._task = asyncio.get_running_loop().create_task(self.run(), name="warmup")
+
+    async def stop(self) -> None:
+        """Cancel an unfinished warm-up; a step already running on a thread finishes in the background."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def run(self) -> Dict[str, WarmupResult]:
+        started = time.monotonic()
+        for name in self.names:
+            self.results[name] = await self._run_step(name)
+        self.seconds = time.monotonic() - started
+        logger.info(
+            "Warm-up finished in %.2fs: %s",
+            self.seconds,
+            ", ".join(f"{name}={result.status} {result.seconds:.2f}s" for name, result in self.results.items()),
+        )
+        return self.results
+
+    async def _run_step(self, name: str) -> WarmupResult:
+        started = time.monotonic()
+        error: Optional[str] = None
+        try:
+            warmed = await asyncio.wait_for(
+                asyncio.to_thread(self._steps[name], self._settings), self.timeout_seconds
+            )
+            status = "skipped" if warmed is False else "ok"
+        except asyncio.TimeoutError:
+            status, error = "timeout", f"did not finish within {self.timeout_seconds:g}s"
+        except Exception as exc:
+            status, error = "failed", f"{type(exc).__name__}: {exc}"
+        seconds = time.monotonic() - started
+        get_gauge(f"warmup_{name}_seconds", f"Duration of the {name} warm-up step").set(seconds)
+        if error is not None:
+            logger.warning("Warm-up step %s %s after %.2fs: %s", name, status, seconds, error)
+        else:
+            logger.debug("Warm-up step %s %s in %.2fs", name, status, seconds)
+        return WarmupResult(status=status, seconds=seconds, error=error)
+
+    def report(self) -> Dict[str, Any]:
+        steps: Dict[str, Any] = {
+            name: self.results[name].as_dict() if name in self.results else {"status": "pending"}
+            for name in self.names
+        }
+        payload: Dict[str, Any] = {"status": "ready" if self.ready else "warming", "warmup": steps}
+        if self.seconds is not None:
+            payload["warmup_seconds"] = round(self.seconds, 3)
+        return payload
+
+
+_runner: Optional[WarmupRunner] = None
+
+
+def start_warmup(settings) -> WarmupRunner:
+    """Start the process-wide warm-up on the running loop."""
+    global _runner
+    _runner = WarmupRunner(settings)
+    _runner.start()
+    return _runner
+
+
+async def stop_warmup() -> None:
+    """Cancel an unfinished warm-up (application shutdown)."""
+    if _runner is not None:
+        await _runner.stop()
+
+
+def readiness_report() -> Dict[str, Any]:
+    """Readiness of this process; ready when no warm-up was started."""
+    if _runner is None:
+        return {"status": "ready", "warmup": {}}
+    return _runner.report()
+
+
+def reset_warmup() -> None:
+    """Forget the process-wide warm-up (for tests)."""
+    global _runner
+    _runner = None
+
+
+__all__ = [
+    "WARMUP_STEPS",
+    "WarmupResult",
+    "WarmupRunner",
+    "configured_steps",
+    "readiness_report",
+    "reset_warmup",
+    "start_warmup",
+    "stop_warmup",
+]
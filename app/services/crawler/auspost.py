@@ -3,6 +3,7 @@ import logging
 from app.schemas.auspost import AuspostCrawlRequest, AuspostCrawlResponse
 from app.schemas.crawl import CrawlRequest, CrawlResponse
 
+from app.services.common.components import get_engine_components, get_shared_engine
 from app.services.common.engine import CrawlerEngine
 from .actions.auspost import AuspostTrackAction
 from .executors.auspost_no_proxy import SingleAttemptNoProxy
@@ -10,12 +11,30 @@ from .executors.auspost_no_proxy import SingleAttemptNoProxy
 logger = logging.getLogger(__name__)
 
 
+def _build_auspost_engine(settings) -> CrawlerEngine:
+    components = get_engine_components(settings)
+    executor = SingleAttemptNoProxy(
+        fetch_client=components.fetch_client,
+        options_resolver=components.options_resolver,
+        arg_composer=components.arg_composer,
+        camoufox_builder=components.camoufox_builder,
+        iframe_extractor=components.iframe_extractor,
+    )
+    return CrawlerEngine(
+        executor=executor,
+        fetch_client=components.fetch_client,
+        options_resolver=components.options_resolver,
+        camoufox_builder=components.camoufox_builder,
+        attempt_planner=components.attempt_planner,
+    )
+
+
 class AuspostCrawler:
     """AusPost-specific crawler that uses the CrawlerEngine with page actions."""
 
     def __init__(self, engine: CrawlerEngine = None):
         # For AusPost, use a single-attempt, no-proxy executor to improve stability with DataDome
-        self.engine = engine or CrawlerEngine(executor=SingleAttemptNoProxy())
+        self.engine = engine or get_shared_engine(name="auspost", factory=_build_auspost_engine)
 
     def run(self, request: AuspostCrawlRequest) -> AuspostCrawlResponse:
         """Run an AusPost crawl request."""
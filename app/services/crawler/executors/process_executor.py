@@ -0,0 +1,404 @@
+"""Run crawl requests in a pool of worker processes.
+
+Browser driving through the sync Playwright bridge, HTML handling and iframe
+splicing all run in threads of the API process and contend on its GIL. When
+``crawl_process_workers`` is set, :class:`ProcessPoolCrawlExecutor` ships each
+request to a worker process as a picklable :class:`CrawlJob`. Every worker
+builds its own :class:`CrawlerEngine` once, so it also owns its browser,
+fingerprint and session pools, and sends back a :class:`CrawlOutcome`.
+
+Requests or page actions that cannot be pickled run on the wrapped in-process
+executor, as does everything when the pool is disabled.
+
+Pages of at least ``crawl_process_shm_threshold_bytes`` are not pickled back
+through the pool's pipe: the worker writes the UTF-8 HTML into a
+``multiprocessing.shared_memory`` segment and only its name and length travel
+in the outcome. The API process decodes the text straight from the mapped
+segment and unlinks it, also when building the response fails. Segments are
+named after their pool, so the pool's shutdown (or restart) sweeps those whose
+outcome was never read, e.g. of abandoned futures.
+"""
+
+from __future__ import annotations
+
+import logging
+import multiprocessing
+import itertools
+import os
+import pickle
+import secrets
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import Any, Optional
+
+from app.core.metrics import get_counter, get_histogram
+from app.schemas.crawl import CrawlRequest, CrawlResponse
+from app.services.common.browser.memory_governor import read_mem_available
+from app.services.common.interfaces import IExecutor, PageAction
+
+logger = logging.getLogger(__name__)
+
+# Memory budgeted per worker when sizing the pool automatically (one browser plus driver)
+DEFAULT_WORKER_MEMORY_BYTES = 1_073_741_824
+
+# Pages at least this large (UTF-8 bytes) come back through shared memory
+DEFAULT_SHM_THRESHOLD_BYTES = 65_536
+
+# Where POSIX shared memory segments are visible as files (Linux)
+SHM_DIR = "/dev/shm"
+
+# True inside pool workers; their engines must not offload again
+_IN_WORKER = False
+_worker_engine: Any = None
+# Name prefix of the shared memory segments this worker's pool owns
+_segment_prefix = ""
+_pool_ids = itertools.count(1)
+
+_jobs = get_counter("crawl_process_jobs_total", "Crawl requests executed in worker processes")
+_fallbacks = get_counter("crawl_process_local_fallbacks_total", "Crawl requests that could not be sent to a worker")
+_restarts = get_counter("crawl_process_pool_restarts_total", "Worker pools replaced after a worker died")
+_shared_bytes = get_counter("crawl_process_shared_bytes_total", "HTML bytes returned through shared memory")
+_job_seconds = get_histogram("crawl_process_job_seconds", "Time spent executing crawl requests in workers")
+
+
+@dataclass(frozen=True)
+class CrawlJob:
+    """A crawl request and its page action, as sent to a worker."""
+
+    request: CrawlRequest
+    page_action: Optional[PageAction] = None
+
+    @classmethod
+    def build(cls, request: Any, page_action: Optional[PageAction] = None) -> Optional["CrawlJob"]:
+        """Return a job for ``request``, or None when it cannot cross a process boundary."""
+        job = cls(request=request, page_action=page_action)
+        try:
+            pickle.dumps(job)
+        except Exception as exc:
+            logger.debug(f"Crawl request is not picklable, running in-process: {exc}")
+            return None
+        return job
+
+
+@dataclass(frozen=True)
+class SharedText:
+    """UTF-8 text a worker left in a shared memory segment."""
+
+    name: str
+    length: int
+
+    @classmethod
+    def publish(cls, text: str, prefix: str = "") -> "SharedText":
+        """Copy ``text`` into a new segment, named ``prefix`` plus a random suffix when given."""
+        data = text.encode("utf-8")
+        name = f"{prefix}{secrets.token_hex(8)}" if prefix else None
+        segment = shared_memory.SharedMemory(name=name, create=True, size=max(1, len(data)))
+        try:
+            segment.buf[:len(data)] = data
+        except BaseException:
+            segment.close()
+            segment.unlink()
+            raise
+        segment.close()
+        return cls(name=segment.name, length=len(data))
+
+    def take(self) -> str:
+        """Decode the text and free the segment; a segment can only be taken once."""
+        segment = shared_memory.SharedMemory(name=self.name)
+        try:
+            view = segment.buf[:self.length]
+            try:
+                return str(view, "utf-8")
+            finally:
+                view.release()
+        finally:
+            segment.close()
+            segment.unlink()
+
+    def discard(self) -> bool:
+        """Free the segment without reading it; False when it was already taken or freed."""
+        try:
+            segment = shared_memory.SharedMemory(name=self.name)
+        except FileNotFoundError:
+            return False
+        segment.close()
+        segment.unlink()
+        return True
+
+
+def sweep_shared_segments(prefix: str) -> int:
+    """Free every shared memory segment whose name starts with ``prefix``; return how many.
+
+    Only where segments are listed under :data:`SHM_DIR`; elsewhere nothing is swept.
+    """
+    try:
+        names = os.listdir(SHM_DIR)
+    except OSError:
+        return 0
+    return sum(SharedText(name=name, length=0).discard() for name in names if name.startswith(prefix))
+
+
+@dataclass(frozen=True)
+class CrawlOutcome:
+    """A worker's response together with where and how long it ran.
+
+    ``html`` is set when the page was moved to shared memory; ``response.html``
+    is None in that case.
+    """
+
+    response: CrawlResponse
+    worker_pid: int
+    seconds: float
+    html: Optional[SharedText] = None
+
+    def to_response(self) -> CrawlResponse:
+        if self.html is None:
+            return self.response
+        return self.response.model_copy(update={"html": self.html.take()})
+
+
+def _init_worker(segment_prefix: str = "") -> None:
+    global _IN_WORKER, _segment_prefix
+    _IN_WORKER = True
+    _segment_prefix = segment_prefix
+    from app.core.logging import setup_logger
+
+    setup_logger()
+
+
+def _get_worker_engine():
+    global _worker_engine
+    if _worker_engine is None:
+        from app.services.common.engine import CrawlerEngine
+
+        _worker_engine = CrawlerEngine.from_settings()
+    return _worker_engine
+
+
+def warm_worker() -> int:
+    """Worker entry point for start-up warm-up: build the engine and return the worker's pid."""
+    _get_worker_engine()
+    return os.getpid()
+
+
+def run_crawl_job(job: CrawlJob) -> CrawlOutcome:
+    """Worker entry point: run ``job`` on this process's engine."""
+    started = time.monotonic()
+    response = _get_worker_engine().run(job.request, job.page_action)
+    seconds = time.monotonic() - started
+    html = getattr(response, "html", None)
+    threshold = _shm_threshold()
+    # len() counts characters, a lower bound of the UTF-8 size
+    if threshold > 0 and isinstance(html, str) and len(html) >= threshold:
+        try:
+            shared = SharedText.publish(html, _segment_prefix)
+        except OSError as exc:
+            logger.warning(f"Could not move crawl result to shared memory, sending it inline: {exc}")
+        else:
+            response = response.model_copy(update={"html": None})
+            return CrawlOutcome(response=response, worker_pid=os.getpid(), seconds=seconds, html=shared)
+    return CrawlOutcome(response=response, worker_pid=os.getpid(), seconds=seconds)
+
+
+def _shm_threshold() -> int:
+    from app.core.config import get_settings
+
+    threshold = getattr(get_settings(), "crawl_process_shm_threshold_bytes", DEFAULT_SHM_THRESHOLD_BYTES)
+    if isinstance(threshold, bool) or not isinstance(threshold, int):
+        return DEFAULT_SHM_THRESHOLD_BYTES
+    return threshold
+
+
+def _cpu_count() -> int:
+    try:
+        return len(os.sched_getaffinity(0))
+    except (AttributeError, OSError):
+        return os.cpu_count() or 1
+
+
+def resolve_worker_count(
+    requested: int,
+    *,
+    cpu_count: Optional[int] = None,
+    mem_available: Optional[int] = None,
+    worker_memory_bytes: int = DEFAULT_WORKER_MEMORY_BYTES,
+) -> int:
+    """Return the pool size for ``crawl_process_workers``.
+
+    A positive value is used as is. A negative value sizes the pool to the
+    usable CPUs, capped by how many ``worker_memory_bytes`` budgets fit in the
+    available memory. At least one worker is started.
+    """
+    if requested > 0:
+        return requested
+    workers = cpu_count if cpu_count is not None else _cpu_count()
+    if mem_available is None:
+        mem_available = read_mem_available()
+    if mem_available is not None and worker_memory_bytes > 0:
+        workers = min(workers, mem_available // worker_memory_bytes)
+    return max(1, int(workers))
+
+
+class CrawlProcessPool:
+    """A spawn-based process pool that is rebuilt when a worker dies."""
+
+    def __init__(self, workers: int) -> None:
+        self.workers = max(1, int(workers))
+        # Short: macOS caps shared memory names at 31 characters
+        self.segment_prefix = f"crawl-{os.getpid()}-{next(_pool_ids)}-"
+        self._lock = threading.Lock()
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # spawn: forking a process that runs Playwright driver threads is unsafe
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                    initargs=(self.segment_prefix,),
+                )
+            return self._executor
+
+    def run(self, job: CrawlJob) -> CrawlResponse:
+        executor = self._get_executor()
+        try:
+            outcome = executor.submit(run_crawl_job, job).result()
+        except BrokenProcessPool:
+            self._discard(executor)
+            raise
+        try:
+            _jobs.inc()
+            _job_seconds.observe(outcome.seconds)
+            if outcome.html is not None:
+                _shared_bytes.inc(outcome.html.length)
+            return outcome.to_response()
+        finally:
+            if outcome.html is not None:
+                outcome.html.discard()
+
+    def warm(self) -> int:
+        """Start the workers and build their engines; return how many distinct workers answered."""
+        executor = self._get_executor()
+        try:
+            futures = [executor.submit(warm_worker) for _ in range(self.workers)]
+            return len({future.result() for future in futures})
+        except BrokenProcessPool:
+            self._discard(executor)
+            raise
+
+    def _discard(self, executor: ProcessPoolExecutor) -> None:
+        with self._lock:
+            if self._executor is not executor:
+                return
+            self._executor = None
+        _restarts.inc()
+        executor.shutdown(wait=False, cancel_futures=True)
+        # The broken pool's jobs all failed, so nobody reads their segments
+        self._sweep()
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+        if wait:
+            # Every job has finished; without waiting, running ones may still read theirs
+            self._sweep()
+
+    def _sweep(self) -> None:
+        swept = sweep_shared_segments(self.segment_prefix)
+        if swept:
+            logger.warning(f"Freed {swept} unread crawl result segment(s) from shared memory")
+
+
+class ProcessPoolCrawlExecutor(IExecutor):
+    """Execute crawls in worker processes, falling back to ``local`` when a job cannot be sent."""
+
+    def __init__(self, local: IExecutor, pool: Optional[CrawlProcessPool] = None) -> None:
+        self.local = local
+        self.pool = pool
+
+    def execute(self, request: CrawlRequest, page_action: Optional[PageAction] = None) -> CrawlResponse:
+        pool = self.pool or get_crawl_process_pool()
+        job = CrawlJob.build(request, page_action) if pool is not None else None
+        if job is None:
+            if pool is not None:
+                _fallbacks.inc()
+            return self.local.execute(request, page_action)
+        try:
+            return pool.run(job)
+        except BrokenProcessPool as exc:
+            logger.warning(f"Crawl worker process died; pool will be restarted: {exc}")
+            return CrawlResponse(
+                status="error",
+                url=request.url,
+                html=None,
+                message="Exception during crawl: crawl worker process exited unexpectedly",
+            )
+
+
+def _requested_workers(settings) -> int:
+    workers = getattr(settings, "crawl_process_workers", 0)
+    if isinstance(workers, bool) or not isinstance(workers, int):
+        return 0
+    return workers
+
+
+def process_pool_enabled(settings) -> bool:
+    """True when crawls should be offloaded; never inside a pool worker."""
+    return not _IN_WORKER and _requested_workers(settings) != 0
+
+
+_pool: Optional[CrawlProcessPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_crawl_process_pool(settings=None) -> Optional[CrawlProcessPool]:
+    """Return the process-wide worker pool, or None when offloading is disabled."""
+    global _pool
+    if settings is None:
+        from app.core.config import get_settings
+
+        settings = get_settings()
+    if not process_pool_enabled(settings):
+        return None
+    with _pool_lock:
+        if _pool is None:
+            memory = getattr(settings, "crawl_process_worker_memory_bytes", DEFAULT_WORKER_MEMORY_BYTES)
+            if isinstance(memory, bool) or not isinstance(memory, int):
+                memory = DEFAULT_WORKER_MEMORY_BYTES
+            workers = resolve_worker_count(_requested_workers(settings), worker_memory_bytes=memory)
+            logger.info(f"Starting {workers} crawl worker process(es)")
+            _pool = CrawlProcessPool(workers)
+        return _pool
+
+
+def shutdown_crawl_process_pool(wait: bool = True) -> None:
+    """Stop the worker processes (application shutdown)."""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=wait)
+
+
+__all__ = [
+    "CrawlJob",
+    "CrawlOutcome",
+    "CrawlProcessPool",
+    "ProcessPoolCrawlExecutor",
+    "SharedText",
+    "get_crawl_process_pool",
+    "process_pool_enabled",
+    "resolve_worker_count",
+    "run_crawl_job",
+    "shutdown_crawl_process_pool",
+    "sweep_shared_segments",
+    "warm_worker",
+]
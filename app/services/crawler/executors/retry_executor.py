@@ -1,10 +1,10 @@
 import asyncio
 import logging
 import sys
-import time
 from dataclasses import dataclass
 from typing import List, Optional
 import app.core.config as app_config
+from app.core.cancellation import cancellable_sleep, check_cancelled
 from app.schemas.crawl import CrawlRequest, CrawlResponse
 from app.services.common.interfaces import IExecutor, PageAction, IBackoffPolicy, IAttemptPlanner, IProxyHealthTracker
 from app.services.common.adapters.scrapling_fetcher import ScraplingFetcherAdapter
@@ -67,7 +67,8 @@ class RetryingExecutor(IExecutor):
                  camoufox_builder: Optional[CamoufoxArgsBuilder] = None,
                  backoff_policy: Optional[IBackoffPolicy] = None,
                  attempt_planner: Optional[IAttemptPlanner] = None,
-                 health_tracker: Optional[IProxyHealthTracker] = None):
+                 health_tracker: Optional[IProxyHealthTracker] = None,
+                 iframe_extractor: Optional[IframeExtractor] = None):
         self.fetch_client = fetch_client or ScraplingFetcherAdapter()
         self.options_resolver = options_resolver or OptionsResolver()
         self.arg_composer = arg_composer or FetchArgComposer()
@@ -75,7 +76,7 @@ class RetryingExecutor(IExecutor):
         self.backoff_policy = backoff_policy or BackoffPolicy.from_settings(app_config.get_settings())
         self.attempt_planner = attempt_planner or AttemptPlanner()
         self.health_tracker = health_tracker or get_health_tracker()
-        self.iframe_extractor = IframeExtractor(fetch_client)
+        self.iframe_extractor = iframe_extractor or IframeExtractor(self.fetch_client)
 
     def execute(self, request: CrawlRequest, page_action: Optional[PageAction] = None) -> CrawlResponse:
         """Execute crawl with retry and proxy strategy."""
@@ -103,6 +104,7 @@ class RetryingExecutor(IExecutor):
             last_used_proxy: Optional[str] = None
             attempt_plan = self.attempt_planner.build_plan(settings, public_proxies)
             while attempt_count < settings.max_retries:
+                check_cancelled()
                 selection = self._select_proxy(
                     attempt_index=attempt_count,
                     settings=settings,
@@ -281,7 +283,7 @@ class RetryingExecutor(IExecutor):
         if attempt_count >= settings.max_retries:
             return False
         delay = self.backoff_policy.delay_for_attempt(attempt_count - 1)
-        time.sleep(delay)
+        cancellable_sleep(delay)
         return True
 
     def _load_public_proxies(self, file_path: Optional[str]) -> List[str]:
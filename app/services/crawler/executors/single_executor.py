@@ -21,12 +21,13 @@ class SingleAttemptExecutor(IExecutor):
     def __init__(self, fetch_client: Optional[ScraplingFetcherAdapter] = None,
                  options_resolver: Optional[OptionsResolver] = None,
                  arg_composer: Optional[FetchArgComposer] = None,
-                 camoufox_builder: Optional[CamoufoxArgsBuilder] = None):
+                 camoufox_builder: Optional[CamoufoxArgsBuilder] = None,
+                 iframe_extractor: Optional[IframeExtractor] = None):
         self.fetch_client = fetch_client or ScraplingFetcherAdapter()
         self.options_resolver = options_resolver or OptionsResolver()
         self.arg_composer = arg_composer or FetchArgComposer()
         self.camoufox_builder = camoufox_builder or CamoufoxArgsBuilder()
-        self.iframe_extractor = IframeExtractor(fetch_client)
+        self.iframe_extractor = iframe_extractor or IframeExtractor(self.fetch_client)
 
     def _select_proxy(self, settings) -> Optional[str]:
         """Return the proxy to use for the single attempt."""
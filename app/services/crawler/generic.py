@@ -1,5 +1,6 @@
 from typing import Optional
 from app.schemas.crawl import CrawlRequest, CrawlResponse
+from app.services.common.components import get_shared_engine
 from app.services.common.engine import CrawlerEngine
 from app.services.common.interfaces import PageAction
 
@@ -8,7 +9,7 @@ class GenericCrawler:
     """Generic crawler that uses the CrawlerEngine."""
 
     def __init__(self, engine: CrawlerEngine = None):
-        self.engine = engine or CrawlerEngine.from_settings(None)
+        self.engine = engine or get_shared_engine()
 
     def run(self, request: CrawlRequest, page_action: Optional[PageAction] = None) -> CrawlResponse:
         """Run a generic crawl request.
@@ -2,6 +2,7 @@ import logging
 import app.core.config as app_config
 from app.schemas.crawl import CrawlRequest
 from app.schemas.toplogistics import TopLogisticsCrawlRequest, TopLogisticsCrawlResponse
+from app.services.common.components import get_shared_engine
 from app.services.common.engine import CrawlerEngine
 from urllib.parse import quote
 
@@ -26,7 +27,7 @@ class TopLogisticsCrawler:
     """TopLogistics-specific crawler that uses the CrawlerEngine."""
 
     def __init__(self, engine: CrawlerEngine = None):
-        self.engine = engine or CrawlerEngine.from_settings(app_config.get_settings())
+        self.engine = engine or get_shared_engine(app_config.get_settings())
 
     def run(self, request: TopLogisticsCrawlRequest) -> TopLogisticsCrawlResponse:
         """Run a TopLogistics crawl request."""
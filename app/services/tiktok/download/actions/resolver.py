@@ -8,9 +8,14 @@ from app.services.browser.actions.base import BasePageAction
 from app.services.browser.actions.humanize import type_like_human, human_pause
 from app.core.config import get_settings
 
-# Get TikVid base URL from configuration
-settings = get_settings()
-TIKVID_BASE = settings.tikvid_base
+# Base URL override; None looks up the configured ``tikvid_base`` on each use,
+# so importing this module does not load the settings
+TIKVID_BASE: Optional[str] = None
+
+
+def tikvid_base() -> str:
+    """Return the TikVid base URL (the module override, else the configured one)."""
+    return TIKVID_BASE or get_settings().tikvid_base
 
 
 def _format_exception(exc: BaseException) -> str:
@@ -60,8 +65,9 @@ class TikVidResolveAction(BasePageAction):
         # Ensure the browser is on TikVid; Camoufox navigation failures are rare
         # but we guard against them to make debugging easier for future users.
         try:
-            if TIKVID_BASE not in getattr(page, "url", ""):
-                page.goto(TIKVID_BASE, wait_until="domcontentloaded", timeout=60000)
+            base_url = tikvid_base()
+            if base_url not in getattr(page, "url", ""):
+                page.goto(base_url, wait_until="domcontentloaded", timeout=60000)
                 navigation_time = time.time() - start_time
                 logger.debug(f"TikVid navigation completed in {navigation_time:.2f}s")
         except Exception as exc:
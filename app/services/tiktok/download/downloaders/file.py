@@ -16,9 +16,8 @@ except Exception:  # pragma: no cover - httpx is provided by test dependencies
 
 logger = logging.getLogger(__name__)
 
-# Download configuration
-settings = get_settings()
-REQUEST_TIMEOUT_SECONDS = settings.request_timeout_seconds
+# Download timeout override; None reads ``request_timeout_seconds`` from the settings on use
+REQUEST_TIMEOUT_SECONDS: Optional[float] = None
 USER_AGENT = (
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
     "(KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36"
@@ -35,7 +34,7 @@ class VideoFileDownloader:
         Args:
             timeout: Request timeout in seconds, defaults to REQUEST_TIMEOUT_SECONDS
         """
-        self.timeout = timeout or REQUEST_TIMEOUT_SECONDS
+        self.timeout = timeout or REQUEST_TIMEOUT_SECONDS or get_settings().request_timeout_seconds
         self.logger = logging.getLogger(__name__)
 
     async def get_file_info(self, url: str, referer: Optional[str] = None) -> dict:
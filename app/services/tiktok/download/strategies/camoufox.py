@@ -7,19 +7,15 @@ import re
 from types import SimpleNamespace
 from typing import Any, Dict, Optional
 
-from app.core.config import get_settings
+from app.core.cancellation import check_cancelled
 from app.services.common.adapters.scrapling_fetcher import ScraplingFetcherAdapter
 from app.services.common.adapters.fetch_arg_composer import FetchArgComposer
 from app.services.common.browser.camoufox import CamoufoxArgsBuilder
-from app.services.tiktok.download.actions.resolver import TikVidResolveAction
+from app.services.tiktok.download.actions.resolver import TikVidResolveAction, tikvid_base
 from app.services.tiktok.download.strategies.base import TikTokDownloadStrategy
 
 logger = logging.getLogger(__name__)
 
-# TikVid serves regional variants; default to Vietnamese because it currently
-# avoids the heavy advertisement overlays seen on the English page.
-settings = get_settings()
-TIKVID_BASE = settings.tikvid_base
 USER_AGENT = (
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
     "(KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36"
@@ -62,6 +58,7 @@ class CamoufoxDownloadStrategy(TikTokDownloadStrategy):
         """
         last_exc: Optional[Exception] = None
         for attempt in range(1, 4):
+            check_cancelled()
             components = self._build_camoufox_fetch_kwargs(tiktok_url, quality_hint)
             adapter: ScraplingFetcherAdapter = components["adapter"]
             fetch_kwargs: Dict[str, Any] = components["fetch_kwargs"]
@@ -69,7 +66,7 @@ class CamoufoxDownloadStrategy(TikTokDownloadStrategy):
             cleanup = components["cleanup"]
 
             try:
-                page_result = adapter.fetch(TIKVID_BASE, fetch_kwargs)
+                page_result = adapter.fetch(tikvid_base(), fetch_kwargs)
             except Exception as exc:
                 last_exc = exc
                 logger.warning(f"Camoufox attempt {attempt} failed: {_format_exception(exc)}")
@@ -171,6 +168,6 @@ class CamoufoxDownloadStrategy(TikTokDownloadStrategy):
                 return True
             if "mime_type=video_mp4" in lowered or "video_mp4" in lowered:
                 return True
-            return not lowered.startswith(TIKVID_BASE.lower())
+            return not lowered.startswith(tikvid_base().lower())
 
         return [link for link in links if link and _looks_like_media(link)]
@@ -15,28 +15,12 @@ if sys.platform == "win32":
     except Exception:
         pass
 
-# Import fetchers for Chromium support
-try:
-    from scrapling.fetchers import DynamicFetcher
-except ImportError:
-    print(
-        "Error: DynamicFetcher not available. Please install scrapling with: pip install scrapling"
-    )
-    sys.exit(1)
-
-try:
-    from app.services.browser.fetchers.persistent_chromium import (
-        PersistentChromiumFetcher,
-    )
-except ImportError:
-    PersistentChromiumFetcher = None
-    print(
-        "Warning: PersistentChromiumFetcher not available, falling back to DynamicFetcher"
-    )
-
-from app.core.config import get_settings
+from app.core.cancellation import check_cancelled
+from app.services.common.browser.browser_fleet import fleet_endpoint
+from app.services.common.browser.memory_governor import admit_browser_launch
+from app.services.common.browser.profile_pool import profile_pool_from_settings
 from app.services.common.browser.user_data_chromium import ChromiumUserDataManager
-from app.services.tiktok.download.actions.resolver import TikVidResolveAction
+from app.services.tiktok.download.actions.resolver import TikVidResolveAction, tikvid_base
 from app.services.tiktok.download.strategies.base import TikTokDownloadStrategy
 from app.services.tiktok.download.strategies.chromium_args import (
     apply_headless_modifiers,
@@ -51,15 +35,44 @@ from app.services.tiktok.download.strategies.fetcher_support import (
 
 logger = logging.getLogger(__name__)
 
-# Get configuration values
-settings = get_settings()
-TIKVID_BASE = settings.tikvid_base
 USER_AGENT = (
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
     "(KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36"
 )
 
 
+# Fetcher classes are imported on first use so that importing the download
+# service does not load scrapling and Playwright; tests may set them directly.
+DynamicFetcher = None
+PersistentChromiumFetcher = None
+_persistent_fetcher_probed = False
+
+
+def _load_fetchers() -> None:
+    """Import the Chromium fetchers that have not been resolved yet."""
+    global DynamicFetcher, PersistentChromiumFetcher, _persistent_fetcher_probed
+
+    if DynamicFetcher is None:
+        try:
+            from scrapling.fetchers import DynamicFetcher as dynamic_fetcher
+        except ImportError as exc:
+            raise RuntimeError(
+                "DynamicFetcher not available. Please install scrapling with: pip install scrapling"
+            ) from exc
+        DynamicFetcher = dynamic_fetcher
+
+    if PersistentChromiumFetcher is None and not _persistent_fetcher_probed:
+        _persistent_fetcher_probed = True
+        try:
+            from app.services.browser.fetchers.persistent_chromium import (
+                PersistentChromiumFetcher as persistent_fetcher,
+            )
+        except ImportError:
+            logger.warning("PersistentChromiumFetcher not available, falling back to DynamicFetcher")
+        else:
+            PersistentChromiumFetcher = persistent_fetcher
+
+
 def _format_exception(exc: BaseException) -> str:
     """Render exceptions so that Windows consoles do not crash on Unicode."""
     try:
@@ -79,11 +92,24 @@ class ChromiumDownloadStrategy(TikTokDownloadStrategy):
         self.settings = settings
         self.logger = logging.getLogger(__name__)
         # Initialize Chromium user data manager
-        self.user_data_manager = ChromiumUserDataManager(
-            user_data_dir=getattr(settings, "chromium_user_data_dir", None)
-        )
+        user_data_dir = getattr(settings, "chromium_user_data_dir", None)
+        self.user_data_manager = self._create_user_data_manager(user_data_dir)
         self.user_data_context_provider = ChromiumUserDataContextProvider(
-            self.user_data_manager
+            self.user_data_manager,
+            profile_pool=(
+                profile_pool_from_settings(settings, user_data_dir)
+                if isinstance(user_data_dir, str) and user_data_dir
+                else None
+            ),
+            manager_factory=self._create_user_data_manager,
+        )
+
+    def _create_user_data_manager(self, user_data_dir: Optional[str]) -> ChromiumUserDataManager:
+        """Create a Chromium user data manager for one profile slot."""
+        return ChromiumUserDataManager(
+            user_data_dir=user_data_dir,
+            clone_root=getattr(self.settings, "user_data_clone_root", None),
+            clone_root_max_bytes=getattr(self.settings, "user_data_clone_root_max_bytes", 0),
         )
 
     def resolve_video_url(
@@ -104,11 +130,15 @@ class ChromiumDownloadStrategy(TikTokDownloadStrategy):
             Direct MP4 URL for the video
 
         Raises:
-            RuntimeError: If resolution fails after retries
+            RuntimeError: If resolution fails after retries or scrapling is not installed
+            MemoryPressureError: If the host stayed short of memory for a browser launch
         """
         last_exc: Optional[Exception] = None
 
         for attempt in range(1, 4):
+            check_cancelled()
+            # Not retried: retrying immediately would only queue again behind the same pressure
+            admit_browser_launch(self.settings)
             components = self._build_chromium_fetch_kwargs(
                 tiktok_url, quality_hint, force_headful
             )
@@ -122,14 +152,19 @@ class ChromiumDownloadStrategy(TikTokDownloadStrategy):
                 if fetcher_class == PersistentChromiumFetcher:
                     # Use persistent fetcher with user data directory
                     effective_user_data_dir = components.get("effective_user_data_dir")
-                    fetcher = fetcher_class(user_data_dir=effective_user_data_dir)
+                    storage_state = components.get("storage_state")
+                    if storage_state is not None:
+                        # Ephemeral contexts can share one long-lived browser across attempts and calls
+                        fetcher = fetcher_class(user_data_dir=None, storage_state=storage_state, keep_alive=True)
+                    else:
+                        fetcher = fetcher_class(user_data_dir=effective_user_data_dir)
                 else:
                     # Use DynamicFetcher for ephemeral sessions
                     fetcher = fetcher_class()
 
                 try:
                     # Let the fetcher handle async/sync conflicts internally
-                    page_result = fetcher.fetch(TIKVID_BASE, **fetch_kwargs)
+                    page_result = fetcher.fetch(tikvid_base(), **fetch_kwargs)
 
                     direct_url = None
                     if resolve_action.result_links:
@@ -208,12 +243,19 @@ class ChromiumDownloadStrategy(TikTokDownloadStrategy):
             quality_hint: Optional quality preference (HD, SD, etc.)
             force_headful: Whether to force headful mode (True=headful, False=allow headless with parity)
         """
+        _load_fetchers()
         resolve_action = TikVidResolveAction(tiktok_url, quality_hint)
 
-        # Acquire user data context using dedicated provider
-        user_data_context = self.user_data_context_provider.acquire_read_context()
-        effective_user_data_dir = user_data_context.effective_dir
-        user_data_cleanup = user_data_context.cleanup
+        # Carry the logged-in session either as a cached storage_state (no disk
+        # clone) or as a read-mode profile clone from the dedicated provider
+        storage_state = self._acquire_storage_state()
+        if storage_state is not None:
+            effective_user_data_dir = None
+            user_data_cleanup = None
+        else:
+            user_data_context = self.user_data_context_provider.acquire_read_context()
+            effective_user_data_dir = user_data_context.effective_dir
+            user_data_cleanup = user_data_context.cleanup
 
         # Determine headless mode based on force_headful flag
         # When force_headful=False, enable headless mode with full parity features
@@ -284,15 +326,41 @@ class ChromiumDownloadStrategy(TikTokDownloadStrategy):
                 additional_args["user_data_dir"] = effective_user_data_dir
                 fetch_kwargs["additional_args"] = additional_args
 
+        # Profile-less DynamicFetcher sessions can run on the out-of-process browser fleet
+        if fetcher_class == DynamicFetcher and not effective_user_data_dir:
+            endpoint = fleet_endpoint(self.settings, headless=headless_mode)
+            if endpoint and fetch_method_supports_argument(DynamicFetcher, "cdp_url"):
+                fetch_kwargs["cdp_url"] = endpoint
+
+        # Seed DynamicFetcher's ephemeral context with the cached session cookies
+        if storage_state is not None and fetcher_class == DynamicFetcher:
+            if fetch_method_supports_argument(DynamicFetcher, "cookies"):
+                fetch_kwargs["cookies"] = storage_state["cookies"]
+
         return {
             "fetcher": fetcher_class,
             "fetch_kwargs": fetch_kwargs,
             "resolve_action": resolve_action,
             "effective_user_data_dir": effective_user_data_dir,
             "user_data_cleanup": user_data_cleanup,
+            "storage_state": storage_state,
             "headers": {"User-Agent": USER_AGENT},
         }
 
+    def _acquire_storage_state(self) -> Optional[Dict[str, Any]]:
+        """Return the cached master storage_state when storage_state mode is enabled."""
+        mode = getattr(self.settings, "chromium_user_data_mode", "clone")
+        if not isinstance(mode, str) or mode.lower() != "storage_state":
+            return None
+        try:
+            refresh_seconds = float(getattr(self.settings, "storage_state_refresh_seconds", 30))
+        except (TypeError, ValueError):
+            refresh_seconds = 30.0
+        storage_state = self.user_data_context_provider.acquire_storage_state(refresh_seconds)
+        if storage_state is None:
+            logger.debug("No storage_state available; falling back to a profile clone")
+        return storage_state
+
     def _filter_media_links(self, links: list) -> list:
         """Filter download links to find actual media files."""
 
@@ -302,6 +370,6 @@ class ChromiumDownloadStrategy(TikTokDownloadStrategy):
                 return True
             if "mime_type=video_mp4" in lowered or "video_mp4" in lowered:
                 return True
-            return not lowered.startswith(TIKVID_BASE.lower())
+            return not lowered.startswith(tikvid_base().lower())
 
         return [link for link in links if link and _looks_like_media(link)]
@@ -5,8 +5,10 @@ from __future__ import annotations
 import logging
 import os
 from dataclasses import dataclass
-from typing import Callable, Optional
+from typing import Any, Callable, Dict, Optional
 
+from app.services.common.browser.profile_pool import ProfileLease, ProfilePool
+from app.services.common.browser.storage_state import get_storage_state_cache
 from app.services.common.browser.user_data_chromium import ChromiumUserDataManager
 
 logger = logging.getLogger(__name__)
@@ -23,8 +25,17 @@ class ChromiumUserDataContext:
 class ChromiumUserDataContextProvider:
     """Acquire user data contexts while encapsulating Chromium manager details."""
 
-    def __init__(self, manager: ChromiumUserDataManager):
+    def __init__(
+        self,
+        manager: ChromiumUserDataManager,
+        *,
+        profile_pool: Optional[ProfilePool] = None,
+        manager_factory: Optional[Callable[[str], ChromiumUserDataManager]] = None,
+    ):
         self._manager = manager
+        self._profile_pool = profile_pool
+        self._manager_factory = manager_factory
+        self._pool_managers: Dict[int, ChromiumUserDataManager] = {}
 
     def acquire_read_context(self) -> ChromiumUserDataContext:
         """Return a sanitized read-mode Chromium user data context."""
@@ -32,8 +43,48 @@ class ChromiumUserDataContextProvider:
             logger.debug("Chromium user data manager disabled; no context acquired")
             return ChromiumUserDataContext(effective_dir=None, cleanup=None)
 
+        if self._profile_pool is None or self._profile_pool.size <= 1 or self._manager_factory is None:
+            return self._acquire_from(self._manager)
+
+        lease = self._profile_pool.acquire()
+        context = self._acquire_from(self._pool_manager(lease))
+
+        def _cleanup() -> None:
+            try:
+                if callable(context.cleanup):
+                    context.cleanup()
+            finally:
+                self._profile_pool.release(lease, success=context.effective_dir is not None)
+
+        return ChromiumUserDataContext(effective_dir=context.effective_dir, cleanup=_cleanup)
+
+    def acquire_storage_state(self, refresh_interval_seconds: float = 30.0) -> Optional[Dict[str, Any]]:
+        """Return a cached storage_state of a master profile, or None when unavailable.
+
+        Unlike :meth:`acquire_read_context` nothing is copied to disk, and a
+        pool lease is only held while the cached state is looked up.
+        """
+        if not self._manager.is_enabled():
+            return None
+
+        if self._profile_pool is None or self._profile_pool.size <= 1 or self._manager_factory is None:
+            return get_storage_state_cache(self._manager, refresh_interval_seconds).get()
+
+        with self._profile_pool.lease() as lease:
+            manager = self._pool_manager(lease)
+            return get_storage_state_cache(manager, refresh_interval_seconds).get()
+
+    def _pool_manager(self, lease: ProfileLease) -> ChromiumUserDataManager:
+        manager = self._pool_managers.get(lease.index)
+        if manager is None:
+            manager = self._manager_factory(lease.base_dir)
+            self._pool_managers[lease.index] = manager
+        return manager
+
+    def _acquire_from(self, manager: ChromiumUserDataManager) -> ChromiumUserDataContext:
+        """Enter a read-mode context on ``manager``, falling back to an ephemeral profile."""
         try:
-            context = self._manager.get_user_data_context("read")
+            context = manager.get_user_data_context("read")
         except Exception as exc:  # pragma: no cover - defensive logging
             logger.warning(
                 "Failed to create Chromium user data context; falling back to ephemeral profile: %s",
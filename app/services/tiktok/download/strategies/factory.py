@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 import logging
-from typing import Any
+from typing import Any, Optional
 
 from app.core.config import get_settings
 from app.services.tiktok.download.strategies.base import TikTokDownloadStrategy
@@ -12,9 +12,8 @@ from app.services.tiktok.download.strategies.chromium import ChromiumDownloadStr
 
 logger = logging.getLogger(__name__)
 
-# Environment variable for strategy selection
-settings = get_settings()
-TIKTOK_DOWNLOAD_STRATEGY = settings.tiktok_download_strategy.lower()
+# Strategy override; None reads ``tiktok_download_strategy`` from the settings on use
+TIKTOK_DOWNLOAD_STRATEGY: Optional[str] = None
 
 
 class TikTokDownloadStrategyFactory:
@@ -34,7 +33,7 @@ class TikTokDownloadStrategyFactory:
         Raises:
             ValueError: If the strategy name is not supported
         """
-        strategy_name = TIKTOK_DOWNLOAD_STRATEGY.lower()
+        strategy_name = (TIKTOK_DOWNLOAD_STRATEGY or get_settings().tiktok_download_strategy).lower()
 
         logger.info(f"Creating TikTok download strategy: {strategy_name}")
 
@@ -6,6 +6,7 @@ import logging
 import time
 from typing import Any, Iterable
 
+from app.core.cancellation import check_cancelled
 from app.services.browser.actions.humanize import human_pause
 
 from .ui_controls import wait_for_network_idle
@@ -54,6 +55,7 @@ class SearchResultsMonitor:
         self._logger.debug("Scanning for search result elements...")
         deadline = time.time() + self._result_scan_timeout
         while time.time() < deadline:
+            check_cancelled()
             for selector in self._result_selectors:
                 try:
                     result_element = page.query_selector(selector)
@@ -6,6 +6,7 @@ import logging
 import time
 from typing import Any, Optional
 
+from app.core.cancellation import check_cancelled
 from app.services.browser.actions.humanize import human_pause
 
 
@@ -53,6 +54,7 @@ class SearchResultsScroller:
         attempts = 0
 
         while attempts < self._scroll_max_attempts:
+            check_cancelled()
             attempts += 1
             try:
                 page.mouse.wheel(0, 800)
@@ -106,6 +108,7 @@ class SearchResultsScroller:
         self._logger.debug("Scrolling down to load more content (timed fallback)...")
         start_time = time.time()
         while time.time() - start_time < 10:
+            check_cancelled()
             try:
                 page.mouse.wheel(0, 500)
                 time.sleep(1)
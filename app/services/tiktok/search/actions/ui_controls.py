@@ -13,10 +13,14 @@ from app.services.browser.actions.humanize import (
     type_like_human,
 )
 
-try:
-    from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
-except ImportError:  # pragma: no cover - Playwright might be unavailable in tests
-    PlaywrightTimeoutError = TimeoutError  # type: ignore[misc, assignment]
+
+def _playwright_timeout_error() -> type:
+    """Return Playwright's TimeoutError, imported on first use to keep module import cheap."""
+    try:
+        from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+    except ImportError:  # pragma: no cover - Playwright might be unavailable in tests
+        return TimeoutError
+    return PlaywrightTimeoutError
 
 
 DEFAULT_SEARCH_INPUT_SELECTORS: Tuple[str, ...] = (
@@ -167,7 +171,7 @@ class SearchUIController:
                 click_like_human(search_bar)
                 return True
             except Exception as exc:
-                if isinstance(exc, PlaywrightTimeoutError):
+                if isinstance(exc, _playwright_timeout_error()):
                     self._logger.debug(
                         "Search button selector %s not visible: %s", selector, exc
                     )
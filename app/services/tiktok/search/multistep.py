@@ -3,11 +3,14 @@
 from __future__ import annotations
 
 import asyncio
+import contextvars
 import inspect
 from contextlib import nullcontext
 from functools import partial
 from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Set, Tuple, Union
 
+from app.core.request_context import request_context
+from app.services.common.browser.profile_pool import profile_pool_from_settings
 from app.services.common.browser.user_data import user_data_context
 from app.services.common.engine import CrawlerEngine
 from app.services.tiktok.search.abstract import AbstractTikTokSearchService
@@ -228,43 +231,54 @@ class TikTokMultiStepSearchService(AbstractTikTokSearchService):
             result = None
             loop = asyncio.get_running_loop()
 
-            previous_mute = bool(
-                getattr(settings, "camoufox_runtime_force_mute_audio", False)
-            )
-            settings.camoufox_runtime_force_mute_audio = True
-
             cleanup = None
-            previous_mode = getattr(settings, "camoufox_runtime_user_data_mode", None)
-            previous_effective_dir = getattr(
-                settings, "camoufox_runtime_effective_user_data_dir", None
-            )
+
+            # Shard the whole flow onto one profile slot so every step shares its identity
+            profile_pool = profile_pool_from_settings(settings, user_data_dir) if has_user_data else None
+            profile_lease = profile_pool.acquire() if profile_pool and profile_pool.size > 1 else None
+            if profile_lease is not None:
+                user_data_dir = profile_lease.base_dir
 
             context_manager = (
-                user_data_context(user_data_dir, "read") if has_user_data else nullcontext((None, None))
+                user_data_context(
+                    user_data_dir,
+                    "read",
+                    clone_root=getattr(settings, "user_data_clone_root", None),
+                    clone_root_max_bytes=getattr(settings, "user_data_clone_root_max_bytes", 0),
+                )
+                if has_user_data
+                else nullcontext((None, None))
             )
 
             try:
-                with context_manager as (effective_dir, cleanup):
-                    if effective_dir:
-                        settings.camoufox_runtime_user_data_mode = "read"
-                        settings.camoufox_runtime_effective_user_data_dir = effective_dir
-
-                    try:
-                        engine_task = loop.run_in_executor(
-                            None, partial(engine.run, crawl_request, search_action)
+                with request_context(
+                    camoufox_runtime_force_mute_audio=True,
+                    camoufox_runtime_profile_dir=profile_lease.base_dir if profile_lease is not None else None,
+                ), context_manager as (effective_dir, cleanup):
+                    overrides = (
+                        {
+                            "camoufox_runtime_user_data_mode": "read",
+                            "camoufox_runtime_effective_user_data_dir": effective_dir,
+                        }
+                        if effective_dir
+                        else {}
+                    )
+                    with request_context(**overrides):
+                        # run_in_executor does not carry context variables over by itself
+                        run_in_context = partial(
+                            contextvars.copy_context().run, engine.run, crawl_request, search_action
                         )
-                        result = await asyncio.wait_for(engine_task, timeout=180)
-                    except asyncio.TimeoutError:
-                        self.logger.warning("Browser search timed out after 3 minutes")
-                        return ""
+                        try:
+                            engine_task = loop.run_in_executor(None, run_in_context)
+                            result = await asyncio.wait_for(engine_task, timeout=180)
+                        except asyncio.TimeoutError:
+                            self.logger.warning("Browser search timed out after 3 minutes")
+                            return ""
             finally:
-                settings.camoufox_runtime_user_data_mode = previous_mode
-                settings.camoufox_runtime_effective_user_data_dir = (
-                    previous_effective_dir
-                )
                 if callable(cleanup):
                     cleanup()
-                settings.camoufox_runtime_force_mute_audio = previous_mute
+                if profile_lease is not None:
+                    profile_pool.release(profile_lease, success=bool(result))
 
             if result and getattr(result, "html", None):
                 return result.html or ""
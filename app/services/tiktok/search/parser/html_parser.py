@@ -6,13 +6,14 @@ from __future__ import annotations
 import json
 import logging
 import re
-from typing import Any, Callable, Dict, List
-
-from bs4 import BeautifulSoup
+from typing import TYPE_CHECKING, Any, Callable, Dict, List
 
 from .json_parser import _from_sigi_state
 from .utils import parse_like_count
 
+if TYPE_CHECKING:  # pragma: no cover - bs4 is imported when a page is parsed
+    from bs4 import BeautifulSoup
+
 logger = logging.getLogger(__name__)
 
 
@@ -303,10 +304,14 @@ class TikTokHtmlParser:
         return []
 
     def extract_from_dom(self, html_content: str) -> List[Dict[str, Any]]:
+        from bs4 import BeautifulSoup
+
         soup = BeautifulSoup(html_content or "", 'html.parser')
         return _extract_from_video_containers(soup)
 
     def extract_from_meta(self, html_content: str) -> List[Dict[str, Any]]:
+        from bs4 import BeautifulSoup
+
         soup = BeautifulSoup(html_content or "", 'html.parser')
         return _extract_from_meta_tags(soup)
 
@@ -7,6 +7,7 @@ from datetime import datetime, timedelta
 from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
 
 from app.schemas.tiktok.session import TikTokLoginState, TikTokSessionConfig
+from app.services.common.browser.profile_pool import ProfileLease
 from app.services.tiktok.tiktok_executor import TiktokExecutor
 
 
@@ -21,6 +22,7 @@ class SessionRecord:
     user_data_dir: Optional[str]
     created_at: datetime = field(default_factory=datetime.now)
     last_activity: datetime = field(default_factory=datetime.now)
+    profile_lease: Optional[ProfileLease] = None
 
     def touch(self) -> None:
         """Refresh the last-activity timestamp for the session."""
@@ -6,16 +6,21 @@ from __future__ import annotations
 
 import logging
 import uuid
+from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, AsyncIterator, Dict, Optional
 
 from app.core.config import get_settings
+from app.core.request_context import request_context
 from app.schemas.tiktok.session import (
     TikTokLoginState,
     TikTokSessionConfig,
     TikTokSessionRequest,
     TikTokSessionResponse,
 )
+from app.services.common.browser.locks import exclusive_lock_async
+from app.services.common.browser.profile_pool import ProfileLease, profile_pool_from_settings
+from app.services.common.browser.user_data import publish_master_snapshot
 from app.services.tiktok.session.registry import SessionRecord, SessionRegistry
 from app.services.tiktok.tiktok_executor import TiktokExecutor
 from app.services.tiktok.utils.login_detection import LoginDetector
@@ -43,66 +48,80 @@ class TiktokService:
         del request  # Payload currently unused but kept for parity with signature
         session_id = str(uuid.uuid4())
         executor: Optional[TiktokExecutor] = None
-        previous_mute = bool(
-            getattr(self.settings, "camoufox_runtime_force_mute_audio", False)
-        )
+        profile_lease = self._acquire_profile(session_id) if user_data_dir is None else None
+        keep_lease = False
 
-        try:
-            config = await self._load_tiktok_config(user_data_dir)
-            self.settings.camoufox_runtime_force_mute_audio = True
-            executor = TiktokExecutor(config)
-            await executor.start_session()
-
-            login_state = await self._detect_login_state(executor, config, config.login_detection_timeout)
-            if login_state == TikTokLoginState.LOGGED_OUT:
-                await self._safe_cleanup_executor(executor)
-                return self._error_response(
-                    message="Not logged in to TikTok",
-                    code="NOT_LOGGED_IN",
-                    details={
-                        "details": "User is not logged in to TikTok",
-                        "method": "dom_api_combo",
-                        "timeout": config.login_detection_timeout,
-                    },
-                )
+        with request_context(
+            camoufox_runtime_force_mute_audio=True,
+            camoufox_runtime_profile_dir=profile_lease.base_dir if profile_lease is not None else None,
+        ):
+            try:
+                if profile_lease is not None:
+                    user_data_dir = profile_lease.base_dir
+                config = await self._load_tiktok_config(user_data_dir)
+                executor = TiktokExecutor(config)
+                async with self._master_write(config) as write_dir:
+                    write_overrides = (
+                        {"camoufox_runtime_user_data_mode": "write", "camoufox_runtime_effective_user_data_dir": write_dir}
+                        if write_dir
+                        else {}
+                    )
+                    with request_context(**write_overrides):
+                        await executor.start_session()
 
-            if login_state == TikTokLoginState.UNCERTAIN and not executor.browser:
-                await self._safe_cleanup_executor(executor)
-                return self._error_response(
-                    message="Not logged in to TikTok",
-                    code="NOT_LOGGED_IN",
-                    details={
-                        "details": "Unable to determine login state - no browser available",
-                        "method": "browser_unavailable",
-                        "timeout": config.login_detection_timeout,
-                    },
-                )
+                login_state = await self._detect_login_state(executor, config, config.login_detection_timeout)
+                if login_state == TikTokLoginState.LOGGED_OUT:
+                    await self._safe_cleanup_executor(executor)
+                    return self._error_response(
+                        message="Not logged in to TikTok",
+                        code="NOT_LOGGED_IN",
+                        details={
+                            "details": "User is not logged in to TikTok",
+                            "method": "dom_api_combo",
+                            "timeout": config.login_detection_timeout,
+                        },
+                    )
 
-            if immediate_cleanup:
-                await self._safe_cleanup_executor(executor)
-            else:
-                record = SessionRecord(
-                    id=session_id,
-                    executor=executor,
-                    config=config,
-                    login_state=login_state,
-                    user_data_dir=executor.user_data_dir,
-                )
-                self.sessions.register(record)
+                if login_state == TikTokLoginState.UNCERTAIN and not executor.browser:
+                    await self._safe_cleanup_executor(executor)
+                    return self._error_response(
+                        message="Not logged in to TikTok",
+                        code="NOT_LOGGED_IN",
+                        details={
+                            "details": "Unable to determine login state - no browser available",
+                            "method": "browser_unavailable",
+                            "timeout": config.login_detection_timeout,
+                        },
+                    )
 
-            return TikTokSessionResponse(status="success", message="TikTok session established successfully")
-        except Exception as exc:  # pragma: no cover - defensive logging
-            self.logger.error("[TiktokService] Failed to create session: %s", exc, exc_info=True)
-            if executor is not None:
-                await self._safe_cleanup_executor(executor)
-            self.sessions.remove(session_id)
-            return self._error_response(
-                message="Failed to create TikTok session",
-                code="SESSION_CREATION_FAILED",
-                details={"method": "internal_error", "details": str(exc)},
-            )
-        finally:
-            self.settings.camoufox_runtime_force_mute_audio = previous_mute
+                if immediate_cleanup:
+                    await self._safe_cleanup_executor(executor)
+                else:
+                    record = SessionRecord(
+                        id=session_id,
+                        executor=executor,
+                        config=config,
+                        login_state=login_state,
+                        user_data_dir=executor.user_data_dir,
+                        profile_lease=profile_lease,
+                    )
+                    self.sessions.register(record)
+                    keep_lease = True
+
+                return TikTokSessionResponse(status="success", message="TikTok session established successfully")
+            except Exception as exc:  # pragma: no cover - defensive logging
+                self.logger.error("[TiktokService] Failed to create session: %s", exc, exc_info=True)
+                if executor is not None:
+                    await self._safe_cleanup_executor(executor)
+                self.sessions.remove(session_id)
+                return self._error_response(
+                    message="Failed to create TikTok session",
+                    code="SESSION_CREATION_FAILED",
+                    details={"method": "internal_error", "details": str(exc)},
+                )
+            finally:
+                if profile_lease is not None and not keep_lease:
+                    self._release_profile(profile_lease, session_id)
 
     async def has_active_session(self) -> bool:
         """Return True when at least one logged-in session is available."""
@@ -136,6 +155,7 @@ class TiktokService:
             self.logger.warning("[TiktokService] Session %s not found in active sessions", session_id)
             return False
         await self._safe_cleanup_executor(record.executor)
+        self._release_profile(record.profile_lease, session_id)
         self.logger.debug("[TiktokService] Successfully closed session: %s", session_id)
         return True
 
@@ -245,6 +265,35 @@ class TiktokService:
             headless=headless,
         )
 
+    @asynccontextmanager
+    async def _master_write(self, config: TikTokSessionConfig) -> AsyncIterator[Optional[str]]:
+        """Lock the profile master while a write-mode session launches on it.
+
+        The browser only writes the master while ``start_session`` fetches (the
+        fetch closes it), so the lock is held for that launch and the snapshot
+        publish, not for the session's lifetime. It is awaited on the event loop,
+        so a session queued behind a browse session does not park a worker thread.
+        Yields the master directory, or None when write mode is off.
+        """
+        if not config.write_mode_enabled:
+            yield None
+            return
+        master_dir = Path(config.user_data_master_dir)
+        base_dir = master_dir.parent
+        async with exclusive_lock_async(str(base_dir / "master.lock"), timeout=config.acquire_lock_timeout):
+            master_dir.mkdir(parents=True, exist_ok=True)
+            try:
+                yield str(master_dir)
+            finally:
+                self._publish_master(str(base_dir))
+
+    def _publish_master(self, base_dir: str) -> None:
+        """Make a write session's changes visible to read-mode clones."""
+        try:
+            publish_master_snapshot(base_dir)
+        except Exception as exc:  # pragma: no cover - defensive logging
+            self.logger.warning("[TiktokService] Failed to publish master snapshot for %s: %s", base_dir, exc)
+
     async def _detect_login_state(
         self,
         executor: TiktokExecutor,
@@ -263,6 +312,26 @@ class TiktokService:
         if record is None:
             return
         await self._safe_cleanup_executor(record.executor)
+        self._release_profile(record.profile_lease, session_id)
+
+    def _acquire_profile(self, session_id: str) -> Optional[ProfileLease]:
+        """Lease a Camoufox profile slot for the lifetime of a session when pooling is enabled."""
+        base_dir = getattr(self.settings, "camoufox_user_data_dir", None)
+        if not isinstance(base_dir, str) or not base_dir:
+            return None
+        pool = profile_pool_from_settings(self.settings, base_dir)
+        if pool.size <= 1:
+            return None
+        return pool.acquire(sticky_key=session_id)
+
+    def _release_profile(self, lease: Optional[ProfileLease], session_id: str) -> None:
+        """Return a session's profile slot to the pool and drop its sticky assignment."""
+        base_dir = getattr(self.settings, "camoufox_user_data_dir", None)
+        if lease is None or not base_dir:
+            return
+        pool = profile_pool_from_settings(self.settings, base_dir)
+        pool.forget(session_id)
+        pool.release(lease)
 
     async def _safe_cleanup_executor(self, executor: TiktokExecutor) -> None:
         """Best-effort cleanup for executors, with defensive logging."""
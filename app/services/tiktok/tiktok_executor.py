@@ -3,6 +3,7 @@ TikTok-specific browsing executor using ScraplingFetcherAdapter like BrowseExecu
 """
 import sys
 import asyncio
+import inspect
 from typing import Optional, Dict, Any
 from app.services.common.executor import AbstractBrowsingExecutor
 from app.schemas.tiktok.session import TikTokSessionConfig
@@ -95,6 +96,18 @@ class TiktokExecutor(AbstractBrowsingExecutor):
     async def cleanup(self) -> None:
         """Cleanup browser resources and user data context"""
         try:
+            # Close the browser first: the user data cleanup removes the profile clone it runs on
+            if self.browser:
+                try:
+                    # A StealthyFetcher result has no close method; the fetch closed its browser
+                    close = getattr(self.browser, "close", None)
+                    if callable(close):
+                        result = close()
+                        if inspect.isawaitable(result):
+                            await result
+                except Exception as e:
+                    print(f"Failed to cleanup browser: {e}")
+                self.browser = None
             # Clean up user data context if it exists (from CamoufoxArgsBuilder)
             if self._user_data_cleanup:
                 try:
@@ -102,15 +115,6 @@ class TiktokExecutor(AbstractBrowsingExecutor):
                 except Exception as e:
                     print(f"Failed to cleanup user data context: {e}")
                 self._user_data_cleanup = None
-            # Clean up browser resources
-            if self.browser:
-                try:
-                    # For StealthyFetcher result, we might not have a close method
-                    # The cleanup is handled by the fetch operation itself
-                    pass
-                except Exception as e:
-                    print(f"Failed to cleanup browser: {e}")
-                self.browser = None
         except Exception as e:
             print(f"Error during cleanup: {e}")
 
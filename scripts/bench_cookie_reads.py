@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+"""Compare Chromium cookie DB read strategies.
+
+Usage:
+    python scripts/bench_cookie_reads.py [--cookies 2000] [--rounds 50]
+
+Reports the mean latency of:
+  copy      - copy the DB to a temp file, then query it (the previous approach)
+  readonly  - query the live file through a ``file:...?mode=ro`` URI
+  cached    - ChromiumCookieRepository.fetch_all with an unchanged DB
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+from typing import Callable
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir)))
+
+from app.services.common.browser.cookie_repository import (  # noqa: E402
+    ChromiumCookieRepository,
+    clear_cookie_rows_cache,
+    create_cookies_table,
+)
+from app.services.common.browser.sqlite_utils import (  # noqa: E402
+    copy_database_with_retries,
+    execute_readonly_with_retries,
+    execute_with_retries,
+    initialize_database,
+)
+
+SELECT_ALL = ChromiumCookieRepository._select_all_sql()
+
+
+def _populate(db_path: Path, count: int) -> None:
+    initialize_database(db_path, create_cookies_table)
+    now = int(time.time() * 1_000_000)
+    rows = [
+        (now + i, f".site{i % 50}.example", f"cookie{i}", "v" * 64, "/", now + 10**12, 1, 1, 1, now, 1, 1)
+        for i in range(count)
+    ]
+    with sqlite3.connect(db_path) as connection:
+        ChromiumCookieRepository._write_rows(connection, rows)
+
+
+def _read_copy(db_path: Path) -> int:
+    temp_db = db_path.parent / f"temp_cookies_{uuid.uuid4().hex}.db"
+    try:
+        copy_database_with_retries(db_path, temp_db, max_attempts=1)
+        return len(execute_with_retries(temp_db, lambda c: c.execute(SELECT_ALL).fetchall(), max_attempts=1))
+    finally:
+        temp_db.unlink(missing_ok=True)
+
+
+def _read_readonly(db_path: Path) -> int:
+    return len(execute_readonly_with_retries(db_path, lambda c: c.execute(SELECT_ALL).fetchall(), max_attempts=1))
+
+
+def _timed(label: str, fn: Callable[[], int], rounds: int) -> None:
+    fn()  # warm up the page cache
+    started = time.perf_counter()
+    for _ in range(rounds):
+        rows = fn()
+    elapsed_ms = (time.perf_counter() - started) * 1000 / rounds
+    print(f"{label:<10} {elapsed_ms:8.3f} ms/read  ({rows} rows)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cookies", type=int, default=2000, help="number of cookie rows to generate")
+    parser.add_argument("--rounds", type=int, default=50, help="reads per strategy")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        db_path = Path(temp_dir) / "Cookies"
+        _populate(db_path, args.cookies)
+        print(f"Cookies DB: {db_path.stat().st_size / 1024:.0f} KiB, {args.cookies} rows")
+
+        repository = ChromiumCookieRepository(db_path, max_copy_attempts=1, max_sql_attempts=1, max_atomic_attempts=1)
+        clear_cookie_rows_cache()
+
+        _timed("copy", lambda: _read_copy(db_path), args.rounds)
+        _timed("readonly", lambda: _read_readonly(db_path), args.rounds)
+        _timed("cached", lambda: len(repository.fetch_all()), args.rounds)
+
+
+if __name__ == "__main__":
+    main()
@@ -15,3 +15,28 @@ def test_health_allows_any_origin(client):
     assert response.status_code == 200
     assert response.json() == {"status": "ok"}
     assert response.headers["Access-Control-Allow-Origin"] == "*"
+
+
+def test_ready_without_warmup(client):
+    response = client.get("/ready")
+
+    assert response.status_code == 200
+    assert response.json()["status"] == "ready"
+
+
+def test_draining_rejects_work_but_keeps_probes(client):
+    from app.services.common.drain import get_drain_controller, reset_drain
+
+    get_drain_controller().started_at = 0.0
+    try:
+        ready = client.get("/ready")
+        rejected = client.get("/")
+        health = client.get("/health")
+    finally:
+        reset_drain()
+
+    assert ready.status_code == 503
+    assert ready.json() == {"status": "draining", "in_flight": 0}
+    assert rejected.status_code == 503
+    assert rejected.headers["Retry-After"] == "1"
+    assert health.status_code == 200
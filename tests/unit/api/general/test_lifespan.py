@@ -0,0 +1,57 @@
+import shutil
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+import app.api.tiktok as tiktok_api
+from app.main import create_app
+from app.schemas.tiktok.session import TikTokLoginState, TikTokSessionConfig
+from app.services.common.browser.profile_releases import pending_releases, track_release
+from app.services.tiktok.session.registry import SessionRecord, SessionRegistry
+from app.services.tiktok.session.service import TiktokService
+from app.services.tiktok.tiktok_executor import TiktokExecutor
+
+pytestmark = [pytest.mark.unit]
+
+
+def test_shutdown_closes_tiktok_sessions_before_releasing_their_clones(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    clone_dir = tmp_path / "clones" / "session-clone"
+    clone_dir.mkdir(parents=True)
+    events = []
+
+    class Browser:
+        def close(self) -> None:
+            events.append(("browser closed", clone_dir.exists()))
+
+    def remove_clone() -> None:
+        events.append(("clone removed", clone_dir.exists()))
+        shutil.rmtree(clone_dir)
+
+    config = TikTokSessionConfig(
+        user_data_master_dir=str(tmp_path / "master"),
+        user_data_clones_dir=str(tmp_path / "clones"),
+    )
+    executor = TiktokExecutor(config)
+    executor.browser = Browser()
+    executor._user_data_cleanup = track_release(remove_clone, f"TikTok session clone {clone_dir}")
+    service = TiktokService(session_registry=SessionRegistry())
+    service.sessions.register(
+        SessionRecord(
+            id="open-session",
+            executor=executor,
+            config=config,
+            login_state=TikTokLoginState.LOGGED_IN,
+            user_data_dir=str(clone_dir),
+        )
+    )
+    monkeypatch.setattr(tiktok_api, "tiktok_service", service)
+
+    with TestClient(create_app()):
+        pass
+
+    assert events == [("browser closed", True), ("clone removed", True)]
+    assert len(service.sessions) == 0
+    assert pending_releases() == 0
@@ -0,0 +1,58 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app.core.cancellation import (
+    CancellationToken,
+    RequestCancelled,
+    cancellable_sleep,
+    cancellation_scope,
+    check_cancelled,
+    current_cancellation,
+)
+from app.services.browser.fetchers.chromium_sessions import _Job
+
+pytestmark = [pytest.mark.unit]
+
+
+def test_checks_are_no_ops_outside_a_request():
+    assert current_cancellation() is None
+    check_cancelled()
+    cancellable_sleep(0)
+
+
+def test_cancelled_token_raises_past_except_exception():
+    with cancellation_scope() as token:
+        check_cancelled()
+        token.cancel("client disconnected")
+        token.cancel("request cancelled")
+        with pytest.raises(RequestCancelled, match="client disconnected"):
+            try:
+                check_cancelled()
+            except Exception:  # pragma: no cover - must not swallow the cancellation
+                pytest.fail("RequestCancelled was caught as an Exception")
+    assert current_cancellation() is None
+
+
+def test_sleep_wakes_up_when_cancelled_from_another_thread():
+    token = CancellationToken()
+    threading.Timer(0.05, token.cancel).start()
+    started = time.monotonic()
+
+    with cancellation_scope(token), pytest.raises(RequestCancelled):
+        cancellable_sleep(5)
+    assert time.monotonic() - started < 2
+
+
+@pytest.mark.asyncio
+async def test_token_follows_requests_into_worker_and_session_threads():
+    with cancellation_scope() as token:
+        assert await asyncio.to_thread(current_cancellation) is token
+        job = _Job(lambda target, first_use: current_cancellation())
+
+    runner = threading.Thread(target=job.execute, args=(None, True))
+    runner.start()
+    runner.join()
+    assert job.result is token
@@ -0,0 +1,72 @@
+"""Startup budget for importing the application (``python -X importtime``).
+
+Worker boot time is dominated by module imports, so browser stacks and parsers
+must stay out of ``app.main``'s import graph and are loaded on first use.
+That check always runs. Wall-clock import time depends on the machine and on
+parallel/coverage runs, so the time budget only runs when
+``APP_IMPORT_BUDGET_SECONDS`` is set (e.g. ``APP_IMPORT_BUDGET_SECONDS=3``).
+"""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict
+
+import pytest
+
+pytestmark = [pytest.mark.unit]
+
+REPO_ROOT = Path(__file__).resolve().parents[3]
+BUDGET_ENV = "APP_IMPORT_BUDGET_SECONDS"
+LAZY_MODULES = ("scrapling.fetchers", "playwright", "camoufox", "bs4", "browserforge.fingerprints")
+
+
+def _import_times(module: str) -> Dict[str, int]:
+    """Return the cumulative import time in microseconds of every module loaded by ``import module``."""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+    )
+    assert completed.returncode == 0, completed.stderr[-2000:]
+    times: Dict[str, int] = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|", 2)
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+def test_app_main_does_not_import_browser_stacks():
+    # A fresh interpreter: this one has the browser stacks loaded by other tests.
+    # No timeout, the check is about what gets imported, not how fast.
+    probe = (
+        "import json, sys\n"
+        "import app.main\n"
+        "print(json.dumps(sorted(sys.modules)))\n"
+    )
+    completed = subprocess.run([sys.executable, "-c", probe], cwd=REPO_ROOT, capture_output=True, text=True)
+    assert completed.returncode == 0, completed.stderr[-2000:]
+
+    loaded = json.loads(completed.stdout.strip().splitlines()[-1])
+    eager = [
+        name for name in loaded
+        if any(name == lazy or name.startswith(lazy + ".") for lazy in LAZY_MODULES)
+    ]
+    assert not eager, f"imported eagerly by app.main: {eager[:10]}"
+
+
+@pytest.mark.slow
+@pytest.mark.skipif(BUDGET_ENV not in os.environ, reason=f"set {BUDGET_ENV} to check the import time budget")
+def test_app_main_imports_within_budget():
+    budget = float(os.environ[BUDGET_ENV])
+    times = _import_times("app.main")
+
+    seconds = times["app.main"] / 1_000_000
+    slowest = sorted(times.items(), key=lambda item: item[1], reverse=True)[1:11]
+    assert seconds <= budget, f"import app.main took {seconds:.2f}s (budget {budget:.2f}s); slowest: {slowest}"
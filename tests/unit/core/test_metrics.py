@@ -0,0 +1,40 @@
+import pytest
+
+from app.core.metrics import get_counter, get_gauge, get_histogram, reset_metrics, snapshot_metrics
+
+
+@pytest.fixture(autouse=True)
+def _reset():
+    reset_metrics()
+    yield
+    reset_metrics()
+
+
+def test_histogram_buckets_are_cumulative() -> None:
+    histogram = get_histogram("test_latency_seconds", buckets=(0.1, 1.0))
+
+    for value in (0.05, 0.5, 0.5, 5.0):
+        histogram.observe(value)
+
+    snapshot = snapshot_metrics()["test_latency_seconds"]
+    assert snapshot["count"] == 4
+    assert snapshot["sum"] == pytest.approx(6.05)
+    assert snapshot["buckets"] == {"0.1": 1, "1.0": 3, "+Inf": 4}
+
+
+def test_registry_returns_same_metric_and_rejects_type_clash() -> None:
+    counter = get_counter("test_events_total")
+    counter.inc()
+    get_counter("test_events_total").inc(2)
+
+    assert counter.value == 3
+    with pytest.raises(TypeError):
+        get_histogram("test_events_total")
+
+
+def test_gauge_reports_latest_value() -> None:
+    gauge = get_gauge("test_processes")
+    gauge.set(3)
+    gauge.set(2)
+
+    assert snapshot_metrics()["test_processes"] == {"type": "gauge", "description": "", "value": 2.0}
@@ -0,0 +1,47 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from app.core.request_context import current_request_context, request_context, runtime_setting
+from app.services.common.browser.camoufox import CamoufoxArgsBuilder
+
+pytestmark = [pytest.mark.unit]
+
+
+def test_overrides_nest_and_unwind():
+    with request_context(camoufox_runtime_force_mute_audio=True):
+        with request_context(camoufox_runtime_user_data_mode="read") as context:
+            assert context.camoufox_runtime_force_mute_audio is True
+            assert context.camoufox_runtime_user_data_mode == "read"
+        assert current_request_context().camoufox_runtime_user_data_mode is None
+    assert current_request_context().camoufox_runtime_force_mute_audio is None
+
+    with pytest.raises(TypeError, match="camoufox_user_data_dir"):
+        with request_context(camoufox_user_data_dir="/tmp"):
+            pass
+
+
+def test_runtime_setting_prefers_the_context_over_settings():
+    settings = SimpleNamespace(camoufox_runtime_user_data_mode="write")
+    assert runtime_setting(settings, "camoufox_runtime_user_data_mode") == "write"
+    assert runtime_setting(SimpleNamespace(), "camoufox_runtime_profile_dir") is None
+
+    with request_context(camoufox_runtime_user_data_mode="read", camoufox_runtime_effective_user_data_dir="/clone"):
+        assert runtime_setting(settings, "camoufox_runtime_user_data_mode") == "read"
+        assert CamoufoxArgsBuilder._runtime_user_data_overrides(settings) == ("read", "/clone")
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_do_not_share_overrides():
+    seen = {}
+
+    async def session(name: str) -> None:
+        with request_context(camoufox_runtime_profile_dir=f"/profiles/{name}"):
+            await asyncio.sleep(0.01)
+            seen[name] = await asyncio.to_thread(
+                lambda: current_request_context().camoufox_runtime_profile_dir
+            )
+
+    await asyncio.gather(session("a"), session("b"))
+    assert seen == {"a": "/profiles/a", "b": "/profiles/b"}
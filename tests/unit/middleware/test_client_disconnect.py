@@ -0,0 +1,87 @@
+import asyncio
+
+import pytest
+
+from app.core.cancellation import cancellable_sleep, current_cancellation
+from app.middleware.client_disconnect import ClientDisconnectMiddleware
+
+pytestmark = [pytest.mark.unit]
+
+
+class FakeConnection:
+    """ASGI receive/send pair; the client hangs up after ``disconnect_after`` seconds."""
+
+    def __init__(self, body: bytes = b"", disconnect_after: float = 10.0) -> None:
+        self.pending = [{"type": "http.request", "body": body, "more_body": False}]
+        self.disconnect_after = disconnect_after
+        self.sent = []
+
+    async def receive(self):
+        if self.pending:
+            return self.pending.pop(0)
+        await asyncio.sleep(self.disconnect_after)
+        return {"type": "http.disconnect"}
+
+    async def send(self, message):
+        self.sent.append(message)
+
+
+SCOPE = {"type": "http", "method": "POST", "path": "/tiktok/search", "headers": []}
+
+
+@pytest.mark.asyncio
+async def test_disconnect_cancels_browser_work_on_worker_threads():
+    seen = {}
+
+    async def app(scope, receive, send):
+        seen["body"] = (await receive())["body"]
+        seen["token"] = current_cancellation()
+        # Browser work runs on a thread and is only stopped by the token
+        await asyncio.to_thread(cancellable_sleep, 5)
+
+    connection = FakeConnection(b'{"query": "cats"}', disconnect_after=0.05)
+    await asyncio.wait_for(ClientDisconnectMiddleware(app)(SCOPE, connection.receive, connection.send), 2)
+
+    assert seen["body"] == b'{"query": "cats"}'
+    assert seen["token"].cancelled and seen["token"].reason == "client disconnected"
+    assert connection.sent == []
+
+
+@pytest.mark.asyncio
+async def test_disconnect_after_the_response_started_is_not_a_cancellation():
+    seen = {}
+
+    async def app(scope, receive, send):
+        seen["token"] = current_cancellation()
+        await receive()
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await asyncio.sleep(0.1)
+        await send({"type": "http.response.body", "body": b"ok"})
+        seen["receive"] = await receive()
+
+    connection = FakeConnection(disconnect_after=0.01)
+    await ClientDisconnectMiddleware(app)(SCOPE, connection.receive, connection.send)
+
+    assert not seen["token"].cancelled
+    assert seen["receive"] == {"type": "http.disconnect"}
+    assert [message["type"] for message in connection.sent] == ["http.response.start", "http.response.body"]
+
+
+@pytest.mark.asyncio
+async def test_cancelled_request_task_cancels_its_token():
+    seen = {}
+    started = asyncio.Event()
+
+    async def app(scope, receive, send):
+        seen["token"] = current_cancellation()
+        started.set()
+        await asyncio.sleep(10)
+
+    connection = FakeConnection()
+    task = asyncio.create_task(ClientDisconnectMiddleware(app)(SCOPE, connection.receive, connection.send))
+    await started.wait()
+    task.cancel()
+
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert seen["token"].reason == "request cancelled"
@@ -1,6 +1,7 @@
 from app.services.browser.executors.browse_executor import BrowseExecutor
 from app.services.browser.browse import BrowseCrawler
 from app.schemas.browse import BrowseRequest
+from app.core.request_context import current_request_context
 from contextlib import contextmanager
 from types import SimpleNamespace
 from unittest.mock import MagicMock, patch
@@ -60,7 +61,7 @@ def test_browse_executor_never_retries():
 
 
 def test_browse_crawler_sets_mute_flag(monkeypatch, tmp_path):
-    """BrowseCrawler should mute Camoufox via settings for user-facing sessions."""
+    """BrowseCrawler should mute Camoufox via the request context for user-facing sessions."""
 
     settings = SimpleNamespace(
         camoufox_user_data_dir=str(tmp_path),
@@ -91,7 +92,7 @@ def test_browse_crawler_sets_mute_flag(monkeypatch, tmp_path):
     flag_states = []
 
     def run_side_effect(_crawl_request, _page_action):
-        flag_states.append(settings.camoufox_runtime_force_mute_audio)
+        flag_states.append(current_request_context().camoufox_runtime_force_mute_audio)
 
     engine.run.side_effect = run_side_effect
 
@@ -100,6 +101,7 @@ def test_browse_crawler_sets_mute_flag(monkeypatch, tmp_path):
 
     assert response.status == 'success'
     assert flag_states == [True]
+    assert current_request_context().camoufox_runtime_force_mute_audio is None
     assert settings.camoufox_runtime_force_mute_audio is False
 
 
@@ -0,0 +1,151 @@
+import threading
+import time
+from types import SimpleNamespace
+from typing import Any, Dict, List
+
+import pytest
+
+from app.services.browser.fetchers import chromium_sessions
+from app.services.browser.fetchers.chromium_sessions import (
+    ChromiumSessionPool,
+    get_chromium_session_pool,
+    reset_chromium_sessions,
+)
+
+
+class FakeTarget:
+    def __init__(self) -> None:
+        self.closed = False
+        self.thread = None
+        self.listeners: Dict[str, Any] = {}
+
+    def on(self, event: str, callback) -> None:
+        self.listeners[event] = callback
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class FakeDriver:
+    def __init__(self) -> None:
+        self.launches: List[Dict[str, Any]] = []
+        self.targets: List[FakeTarget] = []
+        self.exited = 0
+
+    def __call__(self):
+        return self
+
+    def __enter__(self):
+        return SimpleNamespace(
+            chromium=SimpleNamespace(
+                launch=self._launch,
+                launch_persistent_context=lambda **kwargs: self._launch(persistent=True, **kwargs),
+            )
+        )
+
+    def __exit__(self, *exc) -> None:
+        self.exited += 1
+
+    def _launch(self, **kwargs) -> FakeTarget:
+        self.launches.append(kwargs)
+        target = FakeTarget()
+        target.thread = threading.current_thread()
+        self.targets.append(target)
+        return target
+
+
+@pytest.fixture(autouse=True)
+def _reset_sessions():
+    reset_chromium_sessions()
+    yield
+    reset_chromium_sessions()
+
+
+def test_fetches_reuse_one_browser_on_its_own_thread() -> None:
+    driver = FakeDriver()
+    pool = ChromiumSessionPool(idle_seconds=30, driver_factory=driver)
+    try:
+        def job(target, first):
+            return target, first, threading.current_thread()
+
+        calls = [pool.run(job, launch_options={"headless": True}) for _ in range(3)]
+        assert len(driver.launches) == 1
+        assert [first for _target, first, _thread in calls] == [True, False, False]
+        assert {thread for _target, _first, thread in calls} == {driver.targets[0].thread}
+        assert driver.targets[0].thread is not threading.current_thread()
+
+        pool.run(lambda target, first: None, launch_options={"headless": False})
+        pool.run(lambda target, first: None, user_data_dir="/profiles/a", launch_options={"headless": True})
+        assert len(driver.launches) == 3
+        assert driver.launches[2] == {"persistent": True, "user_data_dir": "/profiles/a", "headless": True}
+        assert len(pool) == 3
+    finally:
+        pool.close()
+    assert all(target.closed for target in driver.targets)
+    assert len(pool) == 0
+
+
+def test_job_errors_reach_the_caller_and_keep_the_session() -> None:
+    driver = FakeDriver()
+    pool = ChromiumSessionPool(idle_seconds=30, driver_factory=driver)
+
+    def fail(target, first):
+        raise ValueError("navigation failed")
+
+    try:
+        with pytest.raises(ValueError, match="navigation failed"):
+            pool.run(fail)
+        pool.run(lambda target, first: None)
+        assert len(driver.launches) == 1
+    finally:
+        pool.close()
+
+
+def test_idle_sessions_close() -> None:
+    driver = FakeDriver()
+    pool = ChromiumSessionPool(idle_seconds=0.1, driver_factory=driver)
+    pool.run(lambda target, first: None)
+
+    deadline = time.monotonic() + 5
+    while len(pool) and time.monotonic() < deadline:
+        time.sleep(0.02)
+    assert len(pool) == 0
+    assert driver.targets[0].closed
+
+    pool.run(lambda target, first: None)
+    assert len(driver.launches) == 2
+    pool.close()
+
+
+def test_lost_browser_is_relaunched() -> None:
+    driver = FakeDriver()
+    pool = ChromiumSessionPool(idle_seconds=30, driver_factory=driver)
+    try:
+        pool.run(lambda target, first: target.listeners["disconnected"]())
+        pool.run(lambda target, first: None)
+        assert len(driver.launches) == 2
+    finally:
+        pool.close()
+
+
+def test_launch_failure_is_raised_and_not_cached() -> None:
+    class BrokenDriver(FakeDriver):
+        def _launch(self, **kwargs):
+            raise RuntimeError("no chromium")
+
+    pool = ChromiumSessionPool(idle_seconds=30, driver_factory=BrokenDriver())
+    with pytest.raises(RuntimeError, match="no chromium"):
+        pool.run(lambda target, first: None)
+    assert len(pool) == 0
+
+
+def test_get_chromium_session_pool_is_opt_in(monkeypatch) -> None:
+    assert get_chromium_session_pool(SimpleNamespace(chromium_keepalive_idle_seconds=0)) is None
+    settings = SimpleNamespace(chromium_keepalive_idle_seconds=60)
+    pool = get_chromium_session_pool(settings)
+    assert pool is get_chromium_session_pool(settings)
+    assert pool.idle_seconds == 60
+
+    monkeypatch.setattr(chromium_sessions, "sync_playwright", None)
+    reset_chromium_sessions()
+    assert get_chromium_session_pool(settings) is None
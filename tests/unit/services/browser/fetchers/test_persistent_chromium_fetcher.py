@@ -285,3 +285,37 @@ def test_cleanup_methods_close_resources() -> None:
     result = persistent_chromium.PageResult(page=fake_page, html_content="<html></html>")
     result.__del__()
     fake_page.close.assert_called_once_with()
+
+
+def test_keep_alive_fetch_runs_on_shared_session(monkeypatch: pytest.MonkeyPatch) -> None:
+    fake_page = FakePage(html="<html>kept</html>")
+    fake_context = FakeContext(page=fake_page)
+    fake_browser = FakeBrowser(context=fake_context)
+    runs: list[Dict[str, Any]] = []
+
+    class FakeSessionPool:
+        def run(self, fn, *, user_data_dir=None, launch_options=None):
+            runs.append({"user_data_dir": user_data_dir, "launch_options": launch_options})
+            return fn(fake_browser, len(runs) == 1)
+
+    monkeypatch.setattr(persistent_chromium, "get_chromium_session_pool", lambda: FakeSessionPool())
+    monkeypatch.setattr(persistent_chromium, "sync_playwright", Mock(side_effect=AssertionError("no launch")))
+
+    fetcher = persistent_chromium.PersistentChromiumFetcher(
+        storage_state={"cookies": [], "origins": []}, keep_alive=True
+    )
+    result = fetcher.fetch(
+        "https://example.com/kept", headless=False, browser_args=["--flag"], useragent="ScraplingBot/3.0"
+    )
+
+    assert runs == [{"user_data_dir": None, "launch_options": {"headless": False, "args": ["--flag"]}}]
+    assert fake_browser.new_context_kwargs == {
+        "user_agent": "ScraplingBot/3.0",
+        "storage_state": {"cookies": [], "origins": []},
+    }
+    assert result.html_content == "<html>kept</html>"
+    assert result.url == "https://example.com/kept"
+    assert result.page is None
+    assert fake_page.closed is True
+    assert fake_context.closed is True
+    assert fetcher.context is None
@@ -7,6 +7,7 @@ import pytest
 from unittest.mock import Mock
 
 from app.services.common.browser import user_data as user_data_module
+from app.services.common.browser.locks import FileLock
 from app.services.common.browser.user_data import user_data_context
 from app.schemas.crawl import CrawlRequest
 from app.services.common.browser.camoufox import CamoufoxArgsBuilder
@@ -90,6 +91,20 @@ class TestUserDataContext:
         assert not lock_file.exists()
         assert "fcntl not available on this platform, using exclusive fallback" in caplog.text
 
+    def test_write_cleanup_releases_lock_when_publish_fails(self, temp_base_dir, monkeypatch):
+        """A failing snapshot publish must not leave the write lock held."""
+        failing_store = Mock()
+        failing_store.publish.side_effect = OSError("snapshots dir not writable")
+        monkeypatch.setattr(user_data_module, "_snapshot_store", lambda base_path: failing_store)
+
+        with user_data_context(temp_base_dir, "write") as (_, cleanup):
+            with pytest.raises(OSError, match="not writable"):
+                cleanup()
+
+        waiter = FileLock(os.path.join(temp_base_dir, "master.lock"), timeout=0.1)
+        assert waiter.acquire() is True
+        waiter.release()
+
     def test_read_mode_with_no_master(self, temp_base_dir, caplog):
         """Test that read mode creates empty clone when no master exists."""
         clone_path = None
@@ -3,6 +3,7 @@ from __future__ import annotations
 import os
 from contextlib import contextmanager
 
+from app.core.request_context import current_request_context
 from app.services.browser.utils.runtime_contexts import (
     CamoufoxRuntimeContext,
     ChromiumRuntimeContext,
@@ -25,7 +26,7 @@ class DummySettings:
         self.chromium_runtime_effective_user_data_dir = "/existing/chromium"
 
 
-def test_camoufox_runtime_context_toggles_settings_and_cleans_up():
+def test_camoufox_runtime_context_sets_request_context_and_cleans_up():
     cleanup = DummyCleanup()
 
     @contextmanager
@@ -42,10 +43,15 @@ def test_camoufox_runtime_context_toggles_settings_and_cleans_up():
     ):
         assert effective_dir == "/effective"
         assert provided_cleanup is cleanup
-        assert settings.camoufox_runtime_force_mute_audio is True
-        assert settings.camoufox_runtime_user_data_mode == "write"
-        assert settings.camoufox_runtime_effective_user_data_dir == "/effective"
-
+        context = current_request_context()
+        assert context.camoufox_runtime_force_mute_audio is True
+        assert context.camoufox_runtime_user_data_mode == "write"
+        assert context.camoufox_runtime_effective_user_data_dir == "/effective"
+        # The shared settings object is left alone
+        assert settings.camoufox_runtime_force_mute_audio is False
+
+    assert current_request_context().camoufox_runtime_force_mute_audio is None
+    assert current_request_context().camoufox_runtime_user_data_mode is None
     assert settings.camoufox_runtime_force_mute_audio is False
     assert settings.camoufox_runtime_user_data_mode == "read"
     assert settings.camoufox_runtime_effective_user_data_dir == "/existing/camoufox"
@@ -71,9 +77,12 @@ def test_chromium_runtime_context_sets_absolute_path_and_restores():
         expected_suffix = os.path.join("relative", "path")
         assert effective_dir.endswith(expected_suffix)
         assert provided_cleanup is cleanup
-        assert settings.chromium_runtime_user_data_mode == "write"
-        assert settings.chromium_runtime_effective_user_data_dir.endswith(expected_suffix)
+        context = current_request_context()
+        assert context.chromium_runtime_user_data_mode == "write"
+        assert context.chromium_runtime_effective_user_data_dir.endswith(expected_suffix)
+        assert settings.chromium_runtime_user_data_mode == "read"
 
+    assert current_request_context().chromium_runtime_effective_user_data_dir is None
     assert settings.chromium_runtime_user_data_mode == "read"
     assert settings.chromium_runtime_effective_user_data_dir == "/existing/chromium"
     assert cleanup.called is True
@@ -0,0 +1,126 @@
+import json
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+import pytest
+
+from app.services.common.browser import browser_fleet
+from app.services.common.browser.browser_fleet import (
+    ENDPOINTS_FILENAME,
+    FleetSupervisor,
+    connect_or_launch_chromium,
+    fleet_endpoint,
+    read_fleet_endpoints,
+)
+
+# Writes DevToolsActivePort into the --user-data-dir it was given, like Chromium
+FAKE_CHROMIUM = """#!/bin/sh
+for arg in "$@"; do
+  case "$arg" in --user-data-dir=*) dir="${arg#--user-data-dir=}" ;; esac
+done
+printf '9222\\n/devtools/browser/%s\\n' "$$" > "$dir/DevToolsActivePort"
+trap 'exit 0' TERM
+while true; do sleep 0.05; done
+"""
+
+
+@pytest.fixture
+def fake_chromium(tmp_path: Path) -> str:
+    path = tmp_path / "chrome"
+    path.write_text(FAKE_CHROMIUM)
+    path.chmod(0o755)
+    return str(path)
+
+
+def write_endpoints(fleet_dir: Path, heartbeat: float, browsers) -> None:
+    fleet_dir.mkdir(parents=True, exist_ok=True)
+    data = {"version": 1, "heartbeat": heartbeat, "interval": 5, "browsers": browsers}
+    (fleet_dir / ENDPOINTS_FILENAME).write_text(json.dumps(data))
+
+
+def test_supervisor_publishes_and_restarts_browsers(tmp_path: Path, fake_chromium: str) -> None:
+    fleet_dir = tmp_path / "fleet"
+    supervisor = FleetSupervisor(str(fleet_dir), 2, executable=fake_chromium, start_timeout=5)
+    try:
+        supervisor.check(now=0)
+        browsers = read_fleet_endpoints(str(fleet_dir))
+        assert [entry["slot"] for entry in browsers] == [0, 1]
+        assert browsers[0]["ws"] == f"ws://127.0.0.1:9222/devtools/browser/{supervisor.browsers[0].process.pid}"
+        assert "--headless=new" in supervisor.command(supervisor.browsers[0])
+
+        crashed = supervisor.browsers[1].process
+        crashed.kill()
+        crashed.wait()
+        supervisor.check(now=1)
+        assert supervisor.browsers[1].alive()
+        assert supervisor.browsers[1].process.pid != crashed.pid
+        assert read_fleet_endpoints(str(fleet_dir))[1]["restarts"] == 1
+    finally:
+        supervisor.shutdown()
+    assert not (fleet_dir / ENDPOINTS_FILENAME).exists()
+    assert not any(browser.alive() for browser in supervisor.browsers)
+
+
+def test_failed_start_backs_off(tmp_path: Path) -> None:
+    supervisor = FleetSupervisor(str(tmp_path / "fleet"), 1, executable="/bin/false", start_timeout=1)
+    supervisor.check(now=100)
+    browser = supervisor.browsers[0]
+    assert browser.failures == 1
+    assert browser.next_start == 102
+    assert read_fleet_endpoints(str(tmp_path / "fleet")) == []
+
+
+def test_stale_or_missing_endpoint_files_are_ignored(tmp_path: Path) -> None:
+    assert read_fleet_endpoints(str(tmp_path)) == []
+    browsers = [{"slot": 0, "ws": "ws://127.0.0.1:1/devtools/browser/a", "headless": True}]
+    write_endpoints(tmp_path, heartbeat=1000, browsers=browsers)
+    assert read_fleet_endpoints(str(tmp_path), now=1010) == browsers
+    assert read_fleet_endpoints(str(tmp_path), now=1016) == []
+
+
+def test_fleet_endpoint_round_robins_matching_browsers(tmp_path: Path) -> None:
+    write_endpoints(
+        tmp_path,
+        heartbeat=time.time(),
+        browsers=[
+            {"slot": 0, "ws": "ws://a", "headless": True},
+            {"slot": 1, "ws": "ws://b", "headless": True},
+        ],
+    )
+    settings = SimpleNamespace(browser_fleet_dir=str(tmp_path))
+    assert {fleet_endpoint(settings), fleet_endpoint(settings)} == {"ws://a", "ws://b"}
+    assert fleet_endpoint(settings, headless=False) is None
+    assert fleet_endpoint(SimpleNamespace(browser_fleet_dir=None)) is None
+
+
+def test_connect_or_launch_falls_back_to_local_launch(monkeypatch) -> None:
+    playwright = SimpleNamespace(chromium=Mock())
+    monkeypatch.setattr(browser_fleet, "fleet_endpoint", lambda headless: "ws://fleet")
+
+    assert connect_or_launch_chromium(playwright, headless=True) is playwright.chromium.connect_over_cdp.return_value
+    playwright.chromium.launch.assert_not_called()
+
+    playwright.chromium.connect_over_cdp.side_effect = RuntimeError("refused")
+    connect_or_launch_chromium(playwright, headless=True, args=["--flag"])
+    playwright.chromium.launch.assert_called_once_with(headless=True, args=["--flag"])
+
+    monkeypatch.setattr(browser_fleet, "fleet_endpoint", lambda headless: None)
+    playwright.chromium.connect_over_cdp.reset_mock()
+    connect_or_launch_chromium(playwright, headless=False)
+    playwright.chromium.connect_over_cdp.assert_not_called()
+
+
+def test_main_applies_cli_overrides_to_any_settings_object(tmp_path: Path, monkeypatch) -> None:
+    # The fallback settings are a plain object without pydantic's model_copy
+    settings = SimpleNamespace(browser_fleet_size=1, browser_fleet_dir=None, browser_fleet_chromium_executable="chrome")
+    monkeypatch.setattr("app.core.config.get_settings", lambda: settings)
+    monkeypatch.setattr("app.core.logging.setup_logger", lambda: None)
+    monkeypatch.setattr(browser_fleet.signal, "signal", lambda *args: None)
+    supervisors = []
+    monkeypatch.setattr(browser_fleet.FleetSupervisor, "run", lambda self: supervisors.append(self))
+
+    browser_fleet.main(["--size", "3", "--dir", str(tmp_path)])
+
+    assert [(supervisor.size, str(supervisor.fleet_dir)) for supervisor in supervisors] == [(3, str(tmp_path))]
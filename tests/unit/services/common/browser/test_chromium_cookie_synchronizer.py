@@ -7,6 +7,7 @@ import pytest
 from app.services.common.browser.chromium_cookie_synchronizer import (
     ChromiumCookieSynchronizer,
 )
+from app.services.common.browser.cookie_sync import CookieDelta
 from app.services.common.browser.paths import ChromiumPathManager
 
 
@@ -49,6 +50,12 @@ class DummyCookieManager:
         self.written_cookies = cookies
         return self.write_result
 
+    def sync_cookies_to_db(self, cookies):
+        self.written_cookies = cookies
+        if not self.write_result:
+            return None
+        return CookieDelta(upserts=[tuple(cookie.values()) for cookie in cookies], inserted=len(cookies))
+
 
 @pytest.fixture()
 def path_manager(tmp_path: Path) -> ChromiumPathManager:
@@ -1,4 +1,3 @@
-from contextlib import contextmanager
 from pathlib import Path
 from typing import Callable, Dict, Tuple
 
@@ -60,14 +59,21 @@ def test_disabled_uses_temporary_profile(monkeypatch: pytest.MonkeyPatch, path_m
 def test_write_mode_ensures_metadata(monkeypatch: pytest.MonkeyPatch, path_manager: ChromiumPathManager) -> None:
     profile_manager = DummyProfileManager()
 
-    @contextmanager
-    def fake_lock(_lock_file: str, timeout: float = 30.0):
-        _ = timeout
-        yield True
+    class FakeLock:
+        released = 0
+
+        def __init__(self, _lock_file: str, timeout: float = 30.0) -> None:
+            _ = timeout
+
+        def acquire(self) -> bool:
+            return True
+
+        def release(self) -> None:
+            FakeLock.released += 1
 
     monkeypatch.setattr(
-        "app.services.common.browser.chromium_user_data_context.exclusive_lock",
-        fake_lock,
+        "app.services.common.browser.chromium_user_data_context.FileLock",
+        FakeLock,
     )
 
     manager = ChromiumUserDataContextManager(
@@ -79,8 +85,10 @@ def test_write_mode_ensures_metadata(monkeypatch: pytest.MonkeyPatch, path_manag
     with manager.get_user_data_context("write") as (profile_path, cleanup):
         assert profile_path == str(path_manager.master_dir)
         assert callable(cleanup)
+        assert FakeLock.released == 0
 
     assert profile_manager.ensure_calls == 1
+    assert FakeLock.released == 1
 
 
 def test_read_mode_clones_profile(monkeypatch: pytest.MonkeyPatch, path_manager: ChromiumPathManager) -> None:
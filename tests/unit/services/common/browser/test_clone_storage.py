@@ -0,0 +1,135 @@
+from pathlib import Path
+
+import pytest
+
+from app.services.common.browser.clone_storage import CloneStorage
+from app.services.common.browser.paths import ChromiumPathManager
+from app.services.common.browser.user_data import user_data_context
+
+
+@pytest.fixture(autouse=True)
+def _reset_reservations():
+    for state in (CloneStorage._reservations, CloneStorage._clones, CloneStorage._usage):
+        state.clear()
+    yield
+    for state in (CloneStorage._reservations, CloneStorage._clones, CloneStorage._usage):
+        state.clear()
+
+
+def test_disabled_fast_root_uses_disk(tmp_path: Path) -> None:
+    storage = CloneStorage(tmp_path / "clones")
+
+    assert storage.fast_enabled is False
+    assert storage.allocate(1024).parent == tmp_path / "clones"
+    assert storage.clone_roots() == [tmp_path / "clones"]
+
+
+def test_zero_budget_disables_fast_root(tmp_path: Path) -> None:
+    storage = CloneStorage(tmp_path / "clones", fast_root=str(tmp_path / "shm"), max_bytes=0)
+
+    assert storage.fast_enabled is False
+    assert storage.allocate().parent == tmp_path / "clones"
+
+
+def test_clone_within_budget_goes_to_fast_root(tmp_path: Path) -> None:
+    storage = CloneStorage(
+        tmp_path / "clones",
+        fast_root=str(tmp_path / "shm"),
+        max_bytes=10_000,
+        namespace="chromium",
+    )
+
+    with storage.reserve(1_000) as clone_dir:
+        assert clone_dir.parent == tmp_path / "shm" / "chromium"
+        assert storage.fast_usage_bytes() == 1_000
+
+    # The landed clone keeps its budget until it is released
+    assert storage.fast_usage_bytes() == 1_000
+    storage.release(clone_dir)
+    assert storage.fast_usage_bytes() == 0
+    assert storage.clone_roots() == [tmp_path / "clones", tmp_path / "shm" / "chromium"]
+
+
+def test_clone_over_budget_falls_back_to_disk(tmp_path: Path) -> None:
+    fast_root = tmp_path / "shm"
+    (fast_root / "camoufox" / "existing").mkdir(parents=True)
+    (fast_root / "camoufox" / "existing" / "blob").write_bytes(b"x" * 800)
+    storage = CloneStorage(tmp_path / "clones", fast_root=str(fast_root), max_bytes=1_000)
+
+    with storage.reserve(300) as clone_dir:
+        assert clone_dir.parent == tmp_path / "clones"
+
+
+def test_fast_root_is_scanned_once_then_counted(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    fast_root = tmp_path / "shm"
+    (fast_root / "chromium" / "stale").mkdir(parents=True)
+    (fast_root / "chromium" / "stale" / "blob").write_bytes(b"x" * 400)
+    storage = CloneStorage(tmp_path / "clones", fast_root=str(fast_root), max_bytes=1_000, namespace="chromium")
+
+    def no_rescan(_path: Path) -> int:
+        raise AssertionError("reserve must not rescan the fast root")
+
+    monkeypatch.setattr("app.services.common.browser.clone_storage.get_directory_size_bytes", no_rescan)
+    with storage.reserve(500) as first_dir:
+        assert first_dir.parent == fast_root / "chromium"
+    with storage.reserve(500) as second_dir:
+        assert second_dir.parent == tmp_path / "clones"
+
+    storage.release(fast_root / "chromium" / "stale", 400)
+    storage.release(second_dir)  # on disk, ignored
+    assert storage.fast_usage_bytes() == 500
+    with storage.reserve(500) as third_dir:
+        assert third_dir.parent == fast_root / "chromium"
+
+
+def test_failed_clone_does_not_hold_budget(tmp_path: Path) -> None:
+    storage = CloneStorage(tmp_path / "clones", fast_root=str(tmp_path / "shm"), max_bytes=1_000)
+
+    with pytest.raises(RuntimeError):
+        with storage.reserve(600):
+            raise RuntimeError("copy failed")
+
+    assert storage.fast_usage_bytes() == 0
+
+
+def test_pending_reservations_count_against_budget(tmp_path: Path) -> None:
+    shared_root = str(tmp_path / "shm")
+    first = CloneStorage(tmp_path / "a" / "clones", fast_root=shared_root, max_bytes=1_000, namespace="chromium")
+    second = CloneStorage(tmp_path / "b" / "clones", fast_root=shared_root, max_bytes=1_000, namespace="camoufox")
+
+    with first.reserve(700) as first_dir:
+        with second.reserve(700) as second_dir:
+            assert first_dir.parent == tmp_path / "shm" / "chromium"
+            assert second_dir.parent == tmp_path / "b" / "clones"
+
+
+def test_chromium_path_manager_exposes_fast_root(tmp_path: Path) -> None:
+    manager = ChromiumPathManager(
+        str(tmp_path / "profiles"),
+        clone_root=str(tmp_path / "shm"),
+        clone_root_max_bytes=4096,
+    )
+
+    assert manager.get_clone_roots() == [manager.clones_dir, tmp_path / "shm" / "chromium"]
+    assert ChromiumPathManager(None).get_clone_roots() == []
+
+
+def test_camoufox_read_context_clones_to_fast_root(tmp_path: Path) -> None:
+    base_dir = tmp_path / "camoufox"
+    (base_dir / "master").mkdir(parents=True)
+    (base_dir / "master" / "prefs.js").write_text("user_pref('a', 1);")
+
+    with user_data_context(
+        str(base_dir),
+        "read",
+        clone_root=str(tmp_path / "shm"),
+        clone_root_max_bytes=1_000_000,
+    ) as (effective_dir, cleanup):
+        clone_path = Path(effective_dir)
+        assert clone_path.parent == tmp_path / "shm" / "camoufox"
+        assert (clone_path / "prefs.js").read_text() == "user_pref('a', 1);"
+        assert CloneStorage._usage[tmp_path / "shm"] > 0
+        cleanup()
+
+    assert not clone_path.exists()
+    assert CloneStorage._usage[tmp_path / "shm"] == 0
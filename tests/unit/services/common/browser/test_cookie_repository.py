@@ -2,7 +2,18 @@ from pathlib import Path
 
 import sqlite3
 
-from app.services.common.browser.cookie_repository import ChromiumCookieRepository
+import pytest
+
+from app.services.common.browser import cookie_repository
+from app.services.common.browser.cookie_repository import ChromiumCookieRepository, clear_cookie_rows_cache
+from app.services.common.browser.sqlite_utils import SQLiteExecutionError
+
+
+@pytest.fixture(autouse=True)
+def _clear_rows_cache():
+    clear_cookie_rows_cache()
+    yield
+    clear_cookie_rows_cache()
 
 
 def _make_repository(db_path: Path) -> ChromiumCookieRepository:
@@ -65,3 +76,59 @@ def test_write_rows_and_fetch_all(tmp_path: Path) -> None:
     assert len(fetched) == 1
     assert fetched[0]["name"] == "session"
     assert fetched[0]["host_key"] == ".example.com"
+
+
+def _cookie_row(creation: int, name: str):
+    return (creation, ".example.com", name, "v", "/", creation + 100, 1, 1, 1, creation, 1, 1)
+
+
+def test_fetch_all_reads_live_file_without_copy(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    db_path = tmp_path / "Cookies"
+    repository = _make_repository(db_path)
+    repository.write_rows([_cookie_row(1, "a")])
+
+    def _no_copy(*_args, **_kwargs):
+        raise AssertionError("read-only path must not copy the database")
+
+    monkeypatch.setattr(cookie_repository, "copy_database_with_retries", _no_copy)
+
+    assert [row["name"] for row in repository.fetch_all()] == ["a"]
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["Cookies"]
+
+
+def test_fetch_all_is_cached_until_database_changes(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    db_path = tmp_path / "Cookies"
+    repository = _make_repository(db_path)
+    repository.write_rows([_cookie_row(1, "a")])
+
+    calls = {"count": 0}
+    original = cookie_repository.execute_readonly_with_retries
+
+    def _counting(*args, **kwargs):
+        calls["count"] += 1
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(cookie_repository, "execute_readonly_with_retries", _counting)
+
+    repository.fetch_all()
+    repository.fetch_all()
+    assert calls["count"] == 1
+
+    repository.write_rows([_cookie_row(2, "b")])
+    assert sorted(row["name"] for row in repository.fetch_all()) == ["a", "b"]
+    assert calls["count"] == 2
+
+
+def test_fetch_all_falls_back_to_copy_when_readonly_open_fails(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    db_path = tmp_path / "Cookies"
+    repository = _make_repository(db_path)
+    repository.write_rows([_cookie_row(1, "a")])
+
+    def _locked(*_args, **_kwargs):
+        raise SQLiteExecutionError("database is locked")
+
+    monkeypatch.setattr(cookie_repository, "execute_readonly_with_retries", _locked)
+
+    assert [row["name"] for row in repository.fetch_all()] == ["a"]
@@ -0,0 +1,91 @@
+from app.services.common.browser.cookie_sync import compute_cookie_delta, is_expired
+
+NOW = 1_800_000_000.0
+
+
+def _row(name, value="v", expires=NOW + 3600, creation=1, host=".example.com"):
+    return {
+        "creation_utc": creation,
+        "host_key": host,
+        "name": name,
+        "value": value,
+        "path": "/",
+        "expires_utc": expires,
+        "is_secure": 1,
+        "is_httponly": 0,
+        "samesite": 1,
+        "last_access_utc": creation,
+        "has_expires": 1 if expires != -1 else 0,
+        "is_persistent": 1,
+    }
+
+
+def _cookie(name, value="v", expires=NOW + 3600, domain=".example.com"):
+    return {
+        "name": name,
+        "value": value,
+        "domain": domain,
+        "path": "/",
+        "expires": expires,
+        "secure": True,
+        "httpOnly": False,
+        "sameSite": "Lax",
+    }
+
+
+def test_unchanged_cookies_produce_empty_delta() -> None:
+    delta = compute_cookie_delta([_row("a")], [_cookie("a")], now=NOW)
+
+    assert delta.is_empty
+    assert delta.unchanged == 1
+
+
+def test_changed_cookie_keeps_creation_time() -> None:
+    delta = compute_cookie_delta([_row("a", creation=42)], [_cookie("a", value="new")], now=NOW)
+
+    assert delta.updated == 1
+    assert delta.deletes == []
+    (row,) = delta.upserts
+    assert row[0] == 42
+    assert row[2:4] == ("a", "new")
+
+
+def test_new_cookies_get_unique_creation_times() -> None:
+    delta = compute_cookie_delta([], [_cookie("a"), _cookie("b"), _cookie("a", value="dup")], now=NOW)
+
+    assert delta.inserted == 2
+    creation_times = [row[0] for row in delta.upserts]
+    assert len(set(creation_times)) == 2
+    assert [row[3] for row in delta.upserts] == ["v", "v"]
+
+
+def test_expired_rows_not_in_import_are_deleted() -> None:
+    existing = [_row("stale", expires=NOW - 1), _row("kept"), _row("session", expires=-1)]
+
+    delta = compute_cookie_delta(existing, [_cookie("kept")], now=NOW)
+
+    assert delta.upserts == []
+    assert delta.deletes == [(".example.com", "stale", "/")]
+
+
+def test_incoming_cookies_are_written_as_given_even_if_expired() -> None:
+    delta = compute_cookie_delta([_row("a")], [_cookie("a", expires=NOW - 10)], now=NOW)
+
+    assert delta.updated == 1
+    assert delta.deletes == []
+    assert delta.upserts[0][5] == NOW - 10
+
+
+def test_refreshed_cookie_replaces_expired_row() -> None:
+    delta = compute_cookie_delta([_row("a", expires=NOW - 1)], [_cookie("a")], now=NOW)
+
+    assert delta.deletes == []
+    assert delta.inserted == 1
+
+
+def test_is_expired_understands_chromium_timestamps() -> None:
+    chromium_past = int((NOW - 60 + 11_644_473_600) * 1_000_000)
+
+    assert is_expired(chromium_past, NOW)
+    assert not is_expired(-1, NOW)
+    assert not is_expired(NOW + 1, NOW)
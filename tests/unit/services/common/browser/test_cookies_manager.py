@@ -1,4 +1,5 @@
 import sqlite3
+import time
 from pathlib import Path
 
 import pytest
@@ -56,3 +57,26 @@ def test_read_cookies_handles_missing_database(cookie_manager: ChromiumCookieMan
 
     cookies = cookie_manager.read_cookies_from_db()
     assert cookies == []
+
+
+def test_sync_applies_only_changes(cookie_manager: ChromiumCookieManager) -> None:
+    future = int(time.time()) + 3600
+    base = {"domain": ".example.com", "path": "/", "expires": future, "sameSite": "Lax"}
+    cookies = [dict(base, name="a", value="1"), dict(base, name="b", value="2")]
+
+    first = cookie_manager.sync_cookies_to_db(cookies)
+    assert (first.inserted, first.updated, first.unchanged) == (2, 0, 0)
+
+    second = cookie_manager.sync_cookies_to_db(
+        [dict(base, name="a", value="1"), dict(base, name="b", value="changed"), dict(base, name="c", value="3")]
+    )
+    assert (second.inserted, second.updated, second.unchanged) == (1, 1, 1)
+
+    # Expire "a" behind the sync's back; the next sync purges it
+    with sqlite3.connect(cookie_manager.cookies_db_path) as connection:
+        connection.execute("UPDATE cookies SET expires_utc = ? WHERE name = 'a'", (int(time.time()) - 10,))
+    third = cookie_manager.sync_cookies_to_db([dict(base, name="c", value="3")])
+    assert (third.deleted, third.unchanged) == (1, 1)
+
+    stored = {cookie["name"]: cookie["value"] for cookie in cookie_manager.read_cookies_from_db()}
+    assert stored == {"b": "changed", "c": "3"}
@@ -0,0 +1,143 @@
+import threading
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from app.services.common.browser import display_pool as display_pool_module
+from app.services.common.browser.display_pool import (
+    DisplayPool,
+    DisplayPoolError,
+    get_display_pool,
+    lease_display,
+    reset_display_pool,
+)
+
+FAKE_XVFB = """#!/bin/sh
+display="${1#:}"
+touch "$FAKE_X11_DIR/X$display"
+trap 'rm -f "$FAKE_X11_DIR/X$display"; exit 0' TERM
+while true; do sleep 0.05; done
+"""
+
+
+@pytest.fixture(autouse=True)
+def _reset_pool():
+    reset_display_pool()
+    yield
+    reset_display_pool()
+
+
+@pytest.fixture
+def xvfb(tmp_path: Path, monkeypatch):
+    socket_dir = tmp_path / "x11"
+    socket_dir.mkdir()
+    binary = tmp_path / "Xvfb"
+    binary.write_text(FAKE_XVFB)
+    binary.chmod(0o755)
+    monkeypatch.setenv("FAKE_X11_DIR", str(socket_dir))
+    return SimpleNamespace(binary=str(binary), socket_dir=str(socket_dir), lock_dir=str(tmp_path))
+
+
+def make_pool(xvfb, size=2, **kwargs) -> DisplayPool:
+    return DisplayPool(
+        size, binary=xvfb.binary, socket_dir=xvfb.socket_dir, lock_dir=xvfb.lock_dir, base_display=50, **kwargs
+    )
+
+
+def test_displays_are_started_once_and_reused(xvfb) -> None:
+    pool = make_pool(xvfb)
+    try:
+        with pool.lease() as first:
+            assert first == ":50"
+            with pool.lease() as second:
+                assert second == ":51"
+        with pool.lease() as again:
+            assert again in {":50", ":51"}
+        assert pool.stats() == {"size": 2, "idle": 2, "leased": 0}
+    finally:
+        pool.stop()
+    assert pool.stats()["idle"] == 0
+
+
+def test_taken_display_numbers_are_skipped(xvfb) -> None:
+    (Path(xvfb.lock_dir) / ".X50-lock").write_text("123")
+    pool = make_pool(xvfb, size=1)
+    try:
+        with pool.lease() as name:
+            assert name == ":51"
+    finally:
+        pool.stop()
+
+
+def test_acquire_waits_for_a_release_then_times_out(xvfb) -> None:
+    pool = make_pool(xvfb, size=1)
+    leased = []
+    try:
+        leased.append(pool.acquire())
+        with pytest.raises(DisplayPoolError):
+            pool.acquire(timeout=0.05)
+
+        name = leased.pop()
+        threading.Timer(0.1, pool.release, args=(name,)).start()
+        leased.append(pool.acquire(timeout=5))
+        assert leased == [name]
+    finally:
+        for name in leased:
+            pool.release(name)
+        pool.stop()
+
+
+def test_stop_terminates_leased_displays(xvfb) -> None:
+    pool = make_pool(xvfb, size=1)
+    name = pool.acquire()
+    display = pool._leased[name]
+
+    pool.stop()
+
+    assert not display.alive()
+    pool.release(name)
+    assert pool.stats() == {"size": 1, "idle": 0, "leased": 0}
+
+
+def test_dead_server_is_replaced(xvfb) -> None:
+    pool = make_pool(xvfb, size=1)
+    try:
+        with pool.lease():
+            pass
+        pool._idle[0].stop()
+        with pool.lease() as name:
+            assert pool._leased[name].alive()
+    finally:
+        pool.stop()
+
+
+def test_failed_start_frees_the_slot(tmp_path: Path) -> None:
+    pool = DisplayPool(1, binary=str(tmp_path / "missing"), socket_dir=str(tmp_path), lock_dir=str(tmp_path))
+    with pytest.raises(DisplayPoolError):
+        pool.acquire(timeout=0)
+    with pytest.raises(DisplayPoolError):
+        pool.acquire(timeout=0)  # would time out instead if the slot had leaked
+
+
+def test_lease_display_only_applies_to_headful_with_a_pool(xvfb, monkeypatch) -> None:
+    settings = SimpleNamespace(xvfb_pool_size=0)
+    with lease_display(headful=True, settings=settings) as display:
+        assert display is None
+
+    monkeypatch.setattr(display_pool_module.shutil, "which", lambda name: None)
+    with lease_display(headful=True, settings=SimpleNamespace(xvfb_pool_size=2)) as display:
+        assert display is None
+
+    monkeypatch.setattr(display_pool_module.shutil, "which", lambda name: xvfb.binary)
+    monkeypatch.setattr(
+        display_pool_module,
+        "DisplayPool",
+        lambda size, **kwargs: DisplayPool(size, socket_dir=xvfb.socket_dir, lock_dir=xvfb.lock_dir, **kwargs),
+    )
+    settings = SimpleNamespace(xvfb_pool_size=1, xvfb_base_display=60)
+    with lease_display(headful=False, settings=settings) as display:
+        assert display is None
+    with lease_display(headful=True, settings=settings) as display:
+        assert display == ":60"
+    assert get_display_pool(settings).stats()["leased"] == 0
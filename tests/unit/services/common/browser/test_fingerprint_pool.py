@@ -0,0 +1,149 @@
+import itertools
+import json
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from app.services.common.adapters.fetch_arg_composer import FetchArgComposer
+from app.services.common.browser import fingerprint_pool as pool_module
+from app.services.common.browser.fingerprint_pool import (
+    FingerprintPool,
+    get_fingerprint_pool,
+    is_valid_camoufox_fingerprint,
+    reset_fingerprint_pools,
+)
+from app.services.common.types import FetchCapabilities
+
+
+@pytest.fixture(autouse=True)
+def _reset_pools():
+    reset_fingerprint_pools()
+    yield
+    reset_fingerprint_pools()
+
+
+def _counting_generator():
+    counter = itertools.count(1)
+    return lambda: {"userAgent": f"ua-{next(counter)}"}
+
+
+def test_take_pops_from_stock_and_falls_back_to_inline_generation(tmp_path: Path) -> None:
+    pool = FingerprintPool("test", _counting_generator(), target_size=2)
+
+    assert pool.fill() == 2
+    assert pool.size == 2
+    taken = {pool.take()["userAgent"], pool.take()["userAgent"]}
+    assert taken == {"ua-1", "ua-2"}
+    assert pool.size == 0
+    assert pool.take() == {"userAgent": "ua-3"}
+
+
+def test_pinned_key_always_gets_the_same_fingerprint() -> None:
+    pool = FingerprintPool("test", _counting_generator(), target_size=3)
+    pool.fill()
+
+    first = pool.take("profile:/a")
+    assert pool.take("profile:/a") == first
+    assert pool.take("profile:/b") != first
+    assert pool.pinned("profile:/a") == first
+
+    pool.unpin("profile:/a")
+    assert pool.pinned("profile:/a") is None
+
+
+def test_pins_are_bounded_lru() -> None:
+    pool = FingerprintPool("test", _counting_generator(), target_size=0, max_pins=2)
+    pool.take("a")
+    pool.take("b")
+    pool.take("a")  # refresh "a"
+    pool.take("c")
+
+    assert pool.pinned("b") is None
+    assert pool.pinned("a") is not None
+    assert pool.pinned("c") is not None
+
+
+def test_pool_state_is_persisted_and_reloaded(tmp_path: Path) -> None:
+    store = tmp_path / "pool.json"
+    pool = FingerprintPool("test", _counting_generator(), target_size=2, store_path=store, spec={"v": 1})
+    pool.fill()
+    pinned = pool.take("proxy:http://p")
+    pool.flush()
+
+    reloaded = FingerprintPool("test", lambda: None, target_size=2, store_path=store, spec={"v": 1})
+    assert reloaded.size == 1
+    assert reloaded.take("proxy:http://p") == pinned
+
+    # A different generation spec discards stock but keeps identities already pinned
+    respec = FingerprintPool("test", lambda: None, target_size=2, store_path=store, spec={"v": 2})
+    assert respec.size == 0
+    assert respec.pinned("proxy:http://p") == pinned
+
+
+def test_invalid_fingerprints_are_discarded() -> None:
+    pool = FingerprintPool("test", lambda: {"userAgent": object()}, target_size=2)
+
+    assert pool.fill() == 0
+    assert pool.take() is None
+    assert is_valid_camoufox_fingerprint({"navigator": {"userAgent": "Mozilla/5.0 Firefox/135.0"}})
+    assert not is_valid_camoufox_fingerprint({"navigator": {"userAgent": "Chrome/120"}})
+
+
+def test_background_thread_refills_after_take(tmp_path: Path) -> None:
+    store = tmp_path / "pool.json"
+    pool = FingerprintPool("test", _counting_generator(), target_size=2, store_path=store)
+    pool.start()
+    try:
+        deadline = time.monotonic() + 2
+        while pool.size < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert pool.size == 2
+        pool.take()
+        deadline = time.monotonic() + 2
+        while pool.size < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert pool.size == 2
+    finally:
+        pool.stop()
+    assert len(json.loads(store.read_text())["available"]) == 2
+
+
+def test_pool_is_disabled_without_a_positive_size() -> None:
+    assert get_fingerprint_pool("camoufox", SimpleNamespace(fingerprint_pool_size=0)) is None
+    assert get_fingerprint_pool("camoufox", SimpleNamespace()) is None
+    with pytest.raises(ValueError):
+        get_fingerprint_pool("webkit", SimpleNamespace(fingerprint_pool_size=1))
+
+
+def test_composer_attaches_fingerprint_pinned_to_profile_then_proxy(monkeypatch, tmp_path: Path) -> None:
+    settings = SimpleNamespace(fingerprint_pool_size=2, fingerprint_pool_dir=str(tmp_path), camoufox_window=None)
+    fingerprint = {"navigator": {"userAgent": "Mozilla/5.0 Firefox/135.0"}, "n": 0}
+    counter = itertools.count(1)
+
+    def fake_build(engine, settings, size, pool_dir):
+        def generate():
+            return dict(fingerprint, n=next(counter))
+        return FingerprintPool(engine, generate, target_size=size, validator=is_valid_camoufox_fingerprint)
+
+    monkeypatch.setattr(pool_module, "_build_pool", fake_build)
+    caps = FetchCapabilities(supports_additional_args=True, supports_proxy=True)
+
+    def compose(additional_args, proxy):
+        return FetchArgComposer.compose(
+            options={}, caps=caps, selected_proxy=proxy, additional_args=additional_args,
+            extra_headers=None, settings=settings,
+        )
+
+    by_profile = compose({"_fingerprint_pin": "profile:/p", "user_data_dir": "/clone"}, "http://proxy")
+    assert by_profile["additional_args"]["user_data_dir"] == "/clone"
+    again = compose({"_fingerprint_pin": "profile:/p"}, "http://other")
+    assert again["additional_args"]["fingerprint"] == by_profile["additional_args"]["fingerprint"]
+
+    by_proxy = compose({}, "http://proxy")
+    assert by_proxy["additional_args"]["fingerprint"] != by_profile["additional_args"]["fingerprint"]
+    assert compose({}, "http://proxy")["additional_args"]["fingerprint"] == by_proxy["additional_args"]["fingerprint"]
+
+    explicit = compose({"fingerprint": {"custom": True}}, None)
+    assert "fingerprint" not in explicit.get("additional_args", {})
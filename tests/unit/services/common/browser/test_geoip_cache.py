@@ -0,0 +1,109 @@
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from app.services.common.adapters.fetch_arg_composer import FetchArgComposer
+from app.services.common.browser.geoip_cache import (
+    GeoIPCache,
+    GeoIPResolution,
+    get_geoip_cache,
+    reset_geoip_cache,
+)
+from app.services.common.types import FetchCapabilities
+
+GEO_CONFIG = {
+    "geolocation:longitude": 151.2,
+    "geolocation:latitude": -33.8,
+    "timezone": "Australia/Sydney",
+    "locale:region": "AU",
+}
+
+
+@pytest.fixture(autouse=True)
+def _reset_cache():
+    reset_geoip_cache()
+    yield
+    reset_geoip_cache()
+
+
+def test_resolutions_are_cached_per_egress() -> None:
+    calls = []
+
+    def resolver(proxy):
+        calls.append(proxy)
+        return GeoIPResolution(ip="203.0.113.7", config=dict(GEO_CONFIG))
+
+    cache = GeoIPCache(60, resolver=resolver)
+
+    assert cache.get("http://a:1") is cache.get("http://a:1")
+    cache.get(None)
+    cache.get(None)
+    assert calls == ["http://a:1", None]
+
+
+def test_entries_expire_and_failures_use_the_failure_ttl() -> None:
+    calls = []
+
+    def resolver(proxy):
+        calls.append(proxy)
+        raise RuntimeError("no route")
+
+    cache = GeoIPCache(3600, resolver=resolver, failure_ttl_seconds=10)
+    with patch("app.services.common.browser.geoip_cache.time.monotonic", return_value=100.0):
+        assert cache.get("http://a:1") is None
+        assert cache.get("http://a:1") is None
+    with patch("app.services.common.browser.geoip_cache.time.monotonic", return_value=111.0):
+        assert cache.get("http://a:1") is None
+    assert len(calls) == 2
+
+
+def test_launch_config_spoofs_webrtc_like_camoufox() -> None:
+    config, prefs = GeoIPResolution(ip="203.0.113.7", config=GEO_CONFIG).launch_config()
+    assert config["webrtc:ipv4"] == "203.0.113.7"
+    assert prefs == {"network.dns.disableIPv6": True}
+
+    config, prefs = GeoIPResolution(ip="2001:db8::1", config=GEO_CONFIG).launch_config()
+    assert config["webrtc:ipv6"] == "2001:db8::1"
+    assert prefs == {}
+
+
+def test_cache_disabled_without_positive_ttl() -> None:
+    assert get_geoip_cache(SimpleNamespace(geoip_cache_ttl_seconds=0)) is None
+    assert get_geoip_cache(SimpleNamespace()) is None
+    cache = get_geoip_cache(SimpleNamespace(geoip_cache_ttl_seconds=30))
+    assert cache is get_geoip_cache(SimpleNamespace(geoip_cache_ttl_seconds=30))
+
+
+def _compose(proxy, settings, additional_args=None):
+    caps = FetchCapabilities(supports_additional_args=True, supports_proxy=True, supports_geoip=True)
+    return FetchArgComposer.compose(
+        options={}, caps=caps, selected_proxy=proxy, additional_args=additional_args or {},
+        extra_headers=None, settings=settings,
+    )
+
+
+def test_composer_passes_cached_geo_config_instead_of_geoip() -> None:
+    settings = SimpleNamespace(geoip_cache_ttl_seconds=60, fingerprint_pool_size=0)
+    resolution = GeoIPResolution(ip="203.0.113.7", config=dict(GEO_CONFIG))
+    with patch.object(GeoIPCache, "get", return_value=resolution) as get:
+        params = _compose(
+            "http://proxy:8080", settings, {"firefox_user_prefs": {"dom.audiochannel.mutedByDefault": True}}
+        )
+
+    get.assert_called_once_with("http://proxy:8080")
+    assert "geoip" not in params
+    launch_args = params["additional_args"]
+    assert launch_args["config"]["timezone"] == "Australia/Sydney"
+    assert launch_args["config"]["webrtc:ipv4"] == "203.0.113.7"
+    assert launch_args["firefox_user_prefs"] == {
+        "dom.audiochannel.mutedByDefault": True,
+        "network.dns.disableIPv6": True,
+    }
+
+
+def test_composer_falls_back_to_geoip_when_unresolved() -> None:
+    settings = SimpleNamespace(geoip_cache_ttl_seconds=60, fingerprint_pool_size=0)
+    with patch.object(GeoIPCache, "get", return_value=None):
+        params = _compose(None, settings)
+    assert params["geoip"] is True
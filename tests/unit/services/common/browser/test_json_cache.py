@@ -0,0 +1,75 @@
+import json
+import os
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from app.services.common.browser import profile_manager as profile_manager_module
+from app.services.common.browser.json_cache import JsonFileCache, file_identity, json_file_cache
+from app.services.common.browser.profile_manager import ChromiumProfileManager
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    json_file_cache.clear()
+    yield
+    json_file_cache.clear()
+
+
+def test_cache_hit_requires_matching_identity(tmp_path: Path) -> None:
+    path = tmp_path / "data.json"
+    path.write_text("{}")
+    cache = JsonFileCache()
+    identity = file_identity(path)
+
+    cache.put(path, identity, {"a": [1]})
+    hit, value = cache.get(path, identity)
+    value["a"].append(2)
+
+    assert hit is True
+    assert cache.get(path, identity) == (True, {"a": [1]})
+    assert cache.get(path, (0, 0, 0)) == (False, None)
+    assert cache.get(path, None) == (False, None)
+    assert file_identity(tmp_path / "missing.json") is None
+
+
+def test_read_metadata_skips_json_io_when_unchanged(tmp_path: Path) -> None:
+    manager = ChromiumProfileManager(tmp_path / "metadata.json", tmp_path / "fingerprint.json")
+    (tmp_path / "metadata.json").write_text(json.dumps({"version": "1.0"}))
+
+    assert manager.read_metadata() == {"version": "1.0"}
+    with patch("builtins.open", side_effect=AssertionError("metadata re-read")):
+        assert manager.read_metadata() == {"version": "1.0"}
+
+
+def test_read_metadata_reloads_after_external_write(tmp_path: Path) -> None:
+    metadata_file = tmp_path / "metadata.json"
+    manager = ChromiumProfileManager(metadata_file, tmp_path / "fingerprint.json")
+    metadata_file.write_text(json.dumps({"version": "1.0"}))
+    manager.read_metadata()
+
+    replacement = tmp_path / "other.json"
+    replacement.write_text(json.dumps({"version": "2.0", "pad": True}))
+    os.replace(replacement, metadata_file)
+
+    assert manager.read_metadata() == {"version": "2.0", "pad": True}
+
+
+def test_update_metadata_writes_through(tmp_path: Path) -> None:
+    manager = ChromiumProfileManager(tmp_path / "metadata.json", tmp_path / "fingerprint.json")
+    manager.update_metadata({"cookie_import_count": 3})
+
+    with patch("builtins.open", side_effect=AssertionError("metadata re-read")):
+        assert manager.read_metadata()["cookie_import_count"] == 3
+
+
+def test_fingerprint_reads_are_cached(tmp_path: Path) -> None:
+    fingerprint_file = tmp_path / "fingerprint.json"
+    manager = ChromiumProfileManager(tmp_path / "metadata.json", fingerprint_file)
+    fingerprint_file.write_text(json.dumps({"userAgent": "ua"}))
+
+    with patch.object(profile_manager_module, "BROWSERFORGE_AVAILABLE", True):
+        assert manager.get_browserforge_fingerprint() == {"userAgent": "ua"}
+        with patch("builtins.open", side_effect=AssertionError("fingerprint re-read")):
+            assert manager.get_browserforge_fingerprint() == {"userAgent": "ua"}
@@ -1,10 +1,20 @@
 """Test FileLock functionality - corrected to match actual API."""
 
+import asyncio
 import os
+import threading
+import time
 import pytest
 from unittest.mock import patch, MagicMock
 
-from app.services.common.browser.locks import FileLock, exclusive_lock, FCNTL_AVAILABLE
+from app.core.metrics import get_histogram
+from app.services.common.browser.locks import (
+    FCNTL_AVAILABLE,
+    FairLockQueue,
+    FileLock,
+    exclusive_lock,
+    exclusive_lock_async,
+)
 
 
 class TestFileLock:
@@ -405,3 +415,74 @@ class TestExclusiveLock:
             call_args = mock_file_lock_class.call_args[0]
             # Should contain the path (either as string or Path object)
             assert any(str(lock_path) in str(arg) for arg in call_args)
+
+
+class TestFairLockQueue:
+    """Test FIFO ordering and async acquisition of user-data locks."""
+
+    @pytest.mark.unit
+    def test_waiters_are_served_in_arrival_order(self):
+        queue = FairLockQueue()
+        assert queue.acquire(timeout=1)
+        order = []
+
+        def worker(name):
+            assert queue.acquire(timeout=5)
+            order.append(name)
+            queue.release()
+
+        threads = []
+        for name in ("a", "b", "c"):
+            thread = threading.Thread(target=worker, args=(name,))
+            thread.start()
+            threads.append(thread)
+            while queue.queued < len(threads):
+                time.sleep(0.001)
+
+        queue.release()
+        for thread in threads:
+            thread.join(timeout=5)
+
+        assert order == ["a", "b", "c"]
+
+    @pytest.mark.unit
+    def test_timed_out_waiter_leaves_queue(self):
+        queue = FairLockQueue()
+        assert queue.acquire()
+
+        assert queue.acquire(timeout=0.01) is False
+        assert queue.queued == 0
+        queue.release()
+        assert queue.acquire(timeout=0.01) is True
+
+    @pytest.mark.unit
+    def test_async_acquire_records_wait_and_hold(self, tmp_path):
+        lock_file = tmp_path / "async.lock"
+        hold = get_histogram("user_data_lock_hold_seconds")
+        before = hold.snapshot()["count"]
+
+        async def scenario():
+            entered = []
+
+            async def holder(name):
+                async with exclusive_lock_async(str(lock_file), timeout=5):
+                    entered.append(name)
+                    await asyncio.sleep(0.01)
+
+            await asyncio.gather(holder("first"), holder("second"))
+            return entered
+
+        assert asyncio.run(scenario()) == ["first", "second"]
+        assert hold.snapshot()["count"] == before + 2
+
+    @pytest.mark.unit
+    def test_async_acquire_times_out(self, tmp_path):
+        lock_file = str(tmp_path / "busy.lock")
+
+        async def scenario():
+            with pytest.raises(RuntimeError, match="Failed to acquire lock"):
+                async with exclusive_lock_async(lock_file, timeout=0.05):
+                    pass
+
+        with exclusive_lock(lock_file):
+            asyncio.run(scenario())
@@ -0,0 +1,141 @@
+import os
+import threading
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.services.common.browser import memory_governor as governor_module
+from app.services.common.browser.memory_governor import (
+    MemoryGovernor,
+    MemoryPressureError,
+    MemorySnapshot,
+    get_memory_governor,
+    read_browser_rss,
+    read_mem_available,
+    read_memory_psi,
+    reset_memory_governor,
+)
+
+PAGE = os.sysconf("SC_PAGE_SIZE")
+MIB = 1024 * 1024
+
+
+@pytest.fixture(autouse=True)
+def _reset_governor():
+    reset_memory_governor()
+    yield
+    reset_memory_governor()
+
+
+def write_meminfo(proc: Path, available_kb: int) -> None:
+    proc.mkdir(parents=True, exist_ok=True)
+    (proc / "meminfo").write_text(f"MemTotal: 8000000 kB\nMemFree: 100 kB\nMemAvailable: {available_kb} kB\n")
+
+
+def write_psi(proc: Path, some_avg10: float) -> None:
+    (proc / "pressure").mkdir(parents=True, exist_ok=True)
+    (proc / "pressure" / "memory").write_text(
+        f"some avg10={some_avg10:.2f} avg60=0.00 avg300=0.00 total=1\n"
+        "full avg10=0.00 avg60=0.00 avg300=0.00 total=0\n"
+    )
+
+
+def write_process(proc: Path, pid, ppid, cmdline, rss_pages) -> None:
+    entry = proc / str(pid)
+    entry.mkdir(parents=True, exist_ok=True)
+    fields = ["S", str(ppid)] + ["0"] * 17 + ["1000", "0", str(rss_pages)]
+    (entry / "stat").write_text(f"{pid} ({os.path.basename(cmdline[0])[:15]}) " + " ".join(fields) + " 0 0\n")
+    (entry / "cmdline").write_bytes(b"\0".join(part.encode() for part in cmdline) + b"\0")
+
+
+def test_read_mem_available_is_capped_by_cgroup_headroom(tmp_path: Path) -> None:
+    proc, cgroup = tmp_path / "proc", tmp_path / "cgroup"
+    write_meminfo(proc, 4096)
+    assert read_mem_available(str(proc), str(cgroup)) == 4096 * 1024
+
+    cgroup.mkdir()
+    (cgroup / "memory.max").write_text(f"{3 * MIB}\n")
+    (cgroup / "memory.current").write_text(f"{2 * MIB}\n")
+    assert read_mem_available(str(proc), str(cgroup)) == MIB
+
+    (cgroup / "memory.max").write_text("max\n")
+    assert read_mem_available(str(proc), str(cgroup)) == 4096 * 1024
+
+
+def test_read_memory_psi(tmp_path: Path) -> None:
+    assert read_memory_psi(str(tmp_path)) is None
+    write_psi(tmp_path, 12.5)
+    assert read_memory_psi(str(tmp_path)) == 12.5
+
+
+def test_read_browser_rss_sums_browser_trees_of_this_process(tmp_path: Path) -> None:
+    write_process(tmp_path, 100, 1, ["python"], rss_pages=1000)
+    write_process(tmp_path, 200, 100, ["node", "cli.js", "run-driver"], rss_pages=500)
+    write_process(tmp_path, 300, 200, ["/ms-playwright/chromium/chrome"], rss_pages=100)
+    write_process(tmp_path, 301, 300, ["/ms-playwright/chromium/chrome_crashpad_handler"], rss_pages=7)
+    write_process(tmp_path, 900, 1, ["/usr/bin/chrome"], rss_pages=10_000)
+
+    assert read_browser_rss(str(tmp_path), root_pid=100) == 107 * PAGE
+    assert read_browser_rss(str(tmp_path), root_pid=12345) is None
+
+
+def test_pressure_reason_checks_each_threshold() -> None:
+    governor = MemoryGovernor(min_available_bytes=100, max_psi_some_avg10=10, max_browser_rss_bytes=1000)
+
+    assert governor.pressure_reason(MemorySnapshot(200, 5.0, 500)) is None
+    assert governor.pressure_reason(MemorySnapshot(50, 5.0, 500)).startswith("available memory")
+    assert governor.pressure_reason(MemorySnapshot(200, 20.0, 500)).startswith("memory pressure")
+    assert governor.pressure_reason(MemorySnapshot(200, 5.0, 1500)).startswith("browser RSS")
+    # Unavailable readings never block
+    assert governor.pressure_reason(MemorySnapshot(None, None, None)) is None
+
+
+def test_admission_reserves_memory_for_recent_launches(tmp_path: Path) -> None:
+    write_meminfo(tmp_path, 2560)  # 2.5 MiB
+    governor = MemoryGovernor(
+        min_available_bytes=MIB,
+        launch_reservation_bytes=MIB,
+        timeout_seconds=0,
+        proc_root=str(tmp_path),
+        cgroup_root=str(tmp_path / "none"),
+    )
+    governor.admit()
+    governor.admit()
+    with pytest.raises(MemoryPressureError):
+        governor.admit()
+
+
+def test_admit_waits_for_pressure_to_clear(tmp_path: Path) -> None:
+    write_psi(tmp_path, 50.0)
+    governor = MemoryGovernor(
+        max_psi_some_avg10=10, timeout_seconds=5, poll_interval_seconds=0.02, proc_root=str(tmp_path)
+    )
+    timer = threading.Timer(0.1, write_psi, args=(tmp_path, 1.0))
+    timer.start()
+    try:
+        governor.admit()
+    finally:
+        timer.cancel()
+
+
+def test_admit_rejects_after_timeout(tmp_path: Path) -> None:
+    write_psi(tmp_path, 50.0)
+    governor = MemoryGovernor(max_psi_some_avg10=10, poll_interval_seconds=0.02, proc_root=str(tmp_path))
+    with pytest.raises(MemoryPressureError, match="memory pressure"):
+        governor.admit(timeout=0.05)
+
+
+def test_disabled_governor_never_reads_proc(monkeypatch) -> None:
+    monkeypatch.setattr(governor_module, "read_mem_available", MagicMock(side_effect=AssertionError))
+    MemoryGovernor().admit()
+
+
+def test_get_memory_governor_follows_settings() -> None:
+    settings = SimpleNamespace(memory_min_available_bytes=10, memory_admission_timeout_seconds=5)
+    governor = get_memory_governor(settings)
+    assert governor is get_memory_governor(settings)
+    assert governor.enabled and governor.timeout_seconds == 5
+
+    assert not get_memory_governor(MagicMock()).enabled
@@ -0,0 +1,143 @@
+import asyncio
+import json
+import sqlite3
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+from app.services.common.browser.cookie_repository import create_cookies_table
+from app.services.common.browser.maintenance import ProfileCompactionScheduler, run_profile_compaction
+from app.services.common.browser.profile_compaction import compact_profile_dir, iter_cache_dirs
+from app.services.common.browser.user_data import compact_master_profile
+from app.services.common.browser.user_data_chromium import ChromiumUserDataManager
+
+NOW = 1_800_000_000.0
+
+
+def _chromium_expiry(unix_seconds: float) -> int:
+    return int((unix_seconds + 11_644_473_600) * 1_000_000)
+
+
+def _make_chromium_cookies(db_path: Path) -> None:
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    with sqlite3.connect(db_path) as connection:
+        create_cookies_table(connection)
+        rows = [
+            (1, ".a.com", "chromium_expired", "v", "/", _chromium_expiry(NOW - 60), 0, 0, 0, 1, 1, 1),
+            (2, ".a.com", "chromium_live", "v", "/", _chromium_expiry(NOW + 60), 0, 0, 0, 1, 1, 1),
+            (3, ".a.com", "unix_expired", "v", "/", int(NOW - 60), 0, 0, 0, 1, 1, 1),
+            (4, ".a.com", "session", "v", "/", 0, 0, 0, 0, 1, 0, 0),
+        ]
+        connection.executemany(
+            "INSERT INTO cookies (creation_utc, host_key, name, value, path, expires_utc, is_secure, "
+            "is_httponly, samesite, last_access_utc, has_expires, is_persistent) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+        connection.execute("CREATE TABLE padding (blob BLOB)")
+        connection.executemany("INSERT INTO padding VALUES (?)", [(b"x" * 4096,) for _ in range(64)])
+        connection.commit()
+        connection.execute("DELETE FROM padding")
+        connection.commit()
+
+
+def test_compact_profile_dir_purges_caches_and_expired_cookies(tmp_path: Path) -> None:
+    profile = tmp_path / "master"
+    cookies_db = profile / "Default" / "Cookies"
+    _make_chromium_cookies(cookies_db)
+    (profile / "Default" / "Cache" / "Cache_Data").mkdir(parents=True)
+    (profile / "Default" / "Cache" / "Cache_Data" / "data_0").write_bytes(b"c" * 1024)
+    (profile / "Default" / "Service Worker" / "CacheStorage").mkdir(parents=True)
+    (profile / "Default" / "Local Storage").mkdir(parents=True)
+    size_before_db = cookies_db.stat().st_size
+
+    result = compact_profile_dir(profile, now=NOW)
+
+    with sqlite3.connect(cookies_db) as connection:
+        names = sorted(row[0] for row in connection.execute("SELECT name FROM cookies"))
+    assert names == ["chromium_live", "session"]
+    assert result["expired_cookies_removed"] == 2
+    assert result["cache_dirs_removed"] == 2
+    assert result["databases_vacuumed"] == 1
+    assert result["errors"] == 0
+    assert result["size_after_bytes"] < result["size_before_bytes"]
+    assert cookies_db.stat().st_size < size_before_db
+    assert (profile / "Default" / "Local Storage").exists()
+    assert (profile / "Default" / "Service Worker").exists()
+    assert not (profile / "Default" / "Cache").exists()
+
+
+def test_iter_cache_dirs_matches_firefox_layout(tmp_path: Path) -> None:
+    (tmp_path / "cache2" / "entries").mkdir(parents=True)
+    (tmp_path / "storage" / "default").mkdir(parents=True)
+
+    assert list(iter_cache_dirs(tmp_path)) == [tmp_path / "cache2"]
+
+
+def test_chromium_compact_master_records_metadata(tmp_path: Path) -> None:
+    manager = ChromiumUserDataManager(str(tmp_path))
+    _make_chromium_cookies(manager.path_manager.get_cookies_db_path())
+
+    result = manager.compact_master()
+
+    metadata = manager.get_metadata()
+    assert result is not None
+    assert metadata["last_compaction_size_after"] == result["size_after_bytes"]
+    assert metadata["last_compaction_size_before"] == result["size_before_bytes"]
+    assert manager._context_manager.snapshot_store.current_generation() is not None
+
+
+def test_chromium_compaction_skips_master_of_a_live_write_session(tmp_path: Path) -> None:
+    manager = ChromiumUserDataManager(str(tmp_path))
+    cache_dir = manager.path_manager.master_dir / "Default" / "Cache"
+    cache_dir.mkdir(parents=True)
+
+    with manager.get_user_data_context("write"):
+        assert manager.compact_master(lock_timeout=0.1) is None
+        assert cache_dir.exists()
+
+    result = manager.compact_master(lock_timeout=0.1)
+    assert result is not None and result["cache_dirs_removed"] == 1
+    assert not cache_dir.exists()
+
+
+def test_camoufox_compaction_records_result_outside_master(tmp_path: Path) -> None:
+    assert compact_master_profile(str(tmp_path)) is None
+
+    (tmp_path / "master" / "startupCache").mkdir(parents=True)
+
+    result = compact_master_profile(str(tmp_path))
+
+    record = json.loads((tmp_path / "compaction.json").read_text())
+    assert result["cache_dirs_removed"] == 1
+    assert record["cache_dirs_removed"] == 1
+    assert record["compacted_at"] <= time.time()
+
+
+def test_run_profile_compaction_covers_both_engines(tmp_path: Path) -> None:
+    (tmp_path / "chromium" / "master").mkdir(parents=True)
+    (tmp_path / "camoufox" / "master").mkdir(parents=True)
+    settings = SimpleNamespace(
+        chromium_user_data_dir=str(tmp_path / "chromium"),
+        camoufox_user_data_dir=str(tmp_path / "camoufox"),
+        profile_pool_size=1,
+    )
+
+    results = run_profile_compaction(settings)
+
+    assert sorted(key.split(":", 1)[0] for key in results) == ["camoufox", "chromium"]
+
+
+def test_scheduler_disabled_with_zero_interval() -> None:
+    async def scenario():
+        scheduler = ProfileCompactionScheduler(SimpleNamespace(profile_compaction_interval_seconds=0))
+        scheduler.start()
+        assert scheduler.running is False
+
+        scheduler = ProfileCompactionScheduler(SimpleNamespace(profile_compaction_interval_seconds=3600))
+        scheduler.start()
+        assert scheduler.running is True
+        await scheduler.stop()
+        assert scheduler.running is False
+
+    asyncio.run(scenario())
@@ -0,0 +1,125 @@
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from app.core.metrics import snapshot_metrics
+from app.services.common.browser.profile_pool import (
+    ProfilePool,
+    get_profile_pool,
+    profile_pool_from_settings,
+    reset_profile_pools,
+)
+
+
+@pytest.fixture(autouse=True)
+def _reset_pools():
+    reset_profile_pools()
+    yield
+    reset_profile_pools()
+
+
+def test_slot_zero_is_base_dir(tmp_path: Path) -> None:
+    pool = ProfilePool(str(tmp_path), size=3)
+
+    assert pool.profile_dirs() == [
+        tmp_path,
+        tmp_path / "pool" / "profile-1",
+        tmp_path / "pool" / "profile-2",
+    ]
+    with pytest.raises(ValueError):
+        pool.profile_dir(3)
+
+
+def test_leases_spread_across_idle_slots(tmp_path: Path) -> None:
+    pool = ProfilePool(str(tmp_path), size=3)
+
+    leases = [pool.acquire() for _ in range(3)]
+
+    assert sorted(lease.index for lease in leases) == [0, 1, 2]
+    assert all(stats["active"] == 1 for stats in pool.get_stats())
+
+
+def test_least_recently_used_slot_is_chosen(tmp_path: Path) -> None:
+    pool = ProfilePool(str(tmp_path), size=2)
+
+    with pool.lease() as first:
+        pass
+    with pool.lease() as second:
+        pass
+    with pool.lease() as third:
+        pass
+
+    assert first.index != second.index
+    assert third.index == first.index
+
+
+def test_sticky_key_reuses_slot(tmp_path: Path) -> None:
+    pool = ProfilePool(str(tmp_path), size=3)
+
+    with pool.lease(sticky_key="flow-1") as first:
+        pass
+    pool.acquire()  # occupy another slot to make LRU pick differently
+    with pool.lease(sticky_key="flow-1") as again:
+        pass
+
+    assert again.index == first.index
+
+    pool.forget("flow-1")
+    with pool.lease(sticky_key="flow-1") as fresh:
+        pass
+    assert fresh.index != first.index
+
+
+def test_failures_bench_unhealthy_slot(tmp_path: Path) -> None:
+    pool = ProfilePool(str(tmp_path), size=2, failure_threshold=2, unhealthy_cooldown_seconds=60)
+
+    lease = pool.acquire(index=0)
+    pool.release(lease, success=False)
+    lease = pool.acquire(index=0)
+    pool.release(lease, success=False)
+
+    stats = {entry["index"]: entry for entry in pool.get_stats()}
+    assert stats[0]["healthy"] is False
+    assert stats[0]["failures"] == 2
+    assert all(pool.acquire().index == 1 for _ in range(3))
+
+
+def test_lease_context_records_exceptions_as_failures(tmp_path: Path) -> None:
+    pool = ProfilePool(str(tmp_path), size=1)
+
+    with pytest.raises(RuntimeError):
+        with pool.lease():
+            raise RuntimeError("boom")
+
+    assert pool.get_stats()[0]["failures"] == 1
+    assert pool.get_stats()[0]["active"] == 0
+
+
+def test_slot_activity_is_exported_as_metrics(tmp_path: Path) -> None:
+    pool = ProfilePool(str(tmp_path / "chromium-profiles"), size=2, failure_threshold=1)
+
+    lease = pool.acquire(index=1)
+    active = snapshot_metrics()["profile_pool_chromium_profiles_slot_1_active"]["value"]
+    pool.release(lease, success=False)
+
+    metrics = {
+        name: entry["value"] for name, entry in snapshot_metrics().items() if name.startswith("profile_pool_")
+    }
+    assert active == 1
+    assert metrics["profile_pool_chromium_profiles_slot_1_active"] == 0
+    assert metrics["profile_pool_chromium_profiles_slot_1_leases_total"] == 1
+    assert metrics["profile_pool_chromium_profiles_slot_1_failures_total"] == 1
+    assert metrics["profile_pool_chromium_profiles_slot_1_healthy"] == 0
+    assert metrics["profile_pool_chromium_profiles_slot_0_healthy"] == 1
+
+
+def test_pools_are_shared_per_base_dir_and_size(tmp_path: Path) -> None:
+    settings = SimpleNamespace(profile_pool_size=2, profile_pool_unhealthy_cooldown_seconds=30)
+
+    pool = profile_pool_from_settings(settings, str(tmp_path))
+
+    assert pool is get_profile_pool(str(tmp_path), 2)
+    assert pool.size == 2
+    assert pool.unhealthy_cooldown_seconds == 30
+    assert profile_pool_from_settings(SimpleNamespace(), str(tmp_path)).size == 1
@@ -0,0 +1,57 @@
+from pathlib import Path
+
+import pytest
+
+from app.services.common.browser import profile_releases
+from app.services.common.browser.profile_releases import pending_releases, release_pending, track_release
+from app.services.common.browser.user_data import user_data_context
+
+pytestmark = [pytest.mark.unit]
+
+
+@pytest.fixture(autouse=True)
+def _clear_pending():
+    profile_releases._pending.clear()
+    yield
+    profile_releases._pending.clear()
+
+
+def test_tracked_cleanup_runs_once_and_unregisters() -> None:
+    calls = []
+    release = track_release(lambda: calls.append("released"), "clone")
+
+    assert pending_releases() == 1
+    release()
+    release()
+    assert calls == ["released"]
+    assert pending_releases() == 0
+    assert release_pending() == 0
+    assert track_release(None, "nothing") is None
+
+
+def test_release_pending_runs_leftovers_and_survives_failures() -> None:
+    calls = []
+
+    def broken() -> None:
+        raise OSError("busy")
+
+    track_release(broken, "broken clone")
+    release = track_release(lambda: calls.append("released"), "clone")
+
+    assert release_pending() == 2
+    assert calls == ["released"]
+    release()
+    assert calls == ["released"]
+
+
+def test_clone_never_cleaned_up_by_its_caller_is_removed(tmp_path: Path) -> None:
+    master = tmp_path / "master"
+    master.mkdir()
+    (master / "prefs.js").write_text("user_pref('a', 1);")
+
+    with user_data_context(str(tmp_path), "read") as (effective_dir, _cleanup):
+        assert Path(effective_dir).is_dir()
+
+    assert pending_releases() == 1
+    assert release_pending() == 1
+    assert not Path(effective_dir).exists()
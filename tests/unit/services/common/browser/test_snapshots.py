@@ -0,0 +1,104 @@
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+from app.services.common.browser.snapshots import MasterSnapshotStore
+from app.services.common.browser.user_data import user_data_context
+
+
+@pytest.fixture()
+def master_dir(tmp_path: Path) -> Path:
+    master = tmp_path / "master"
+    master.mkdir()
+    (master / "prefs.js").write_text("v1")
+    return master
+
+
+def _age(path: Path, seconds: float) -> None:
+    past = time.time() - seconds
+    os.utime(path, (past, past))
+
+
+def test_no_generation_before_first_publish(tmp_path: Path, master_dir: Path) -> None:
+    store = MasterSnapshotStore(master_dir, tmp_path / "snapshots")
+
+    assert store.current_generation() is None
+    with store.reader() as generation_dir:
+        assert generation_dir is None
+
+
+def test_publish_creates_immutable_generation(tmp_path: Path, master_dir: Path) -> None:
+    store = MasterSnapshotStore(master_dir, tmp_path / "snapshots")
+
+    first = store.publish()
+    (master_dir / "prefs.js").write_text("v2")
+
+    assert first is not None
+    assert first.name == "gen-1"
+    assert (first / "prefs.js").read_text() == "v1"
+    assert store.current_generation() == first
+
+    second = store.publish()
+    assert second.name == "gen-2"
+    assert store.current_generation() == second
+    assert (second / "prefs.js").read_text() == "v2"
+
+
+def test_garbage_collection_respects_grace_and_readers(tmp_path: Path, master_dir: Path) -> None:
+    store = MasterSnapshotStore(master_dir, tmp_path / "snapshots", retire_grace_seconds=60)
+    first = store.publish()
+
+    with store.reader() as reading:
+        assert reading == first
+        store.publish()
+        _age(store.retired_dir / first.name, 120)
+        assert store.collect_garbage() == []
+        assert first.exists()
+
+    assert store.collect_garbage() == [first]
+    assert not first.exists()
+    assert store.current_generation().name == "gen-2"
+
+
+def test_recently_retired_generation_is_kept(tmp_path: Path, master_dir: Path) -> None:
+    store = MasterSnapshotStore(master_dir, tmp_path / "snapshots", retire_grace_seconds=60)
+    first = store.publish()
+    store.publish()
+
+    assert first.exists()
+    assert store.collect_garbage() == []
+
+
+def test_stale_reader_references_are_ignored(tmp_path: Path, master_dir: Path) -> None:
+    store = MasterSnapshotStore(
+        master_dir,
+        tmp_path / "snapshots",
+        retire_grace_seconds=0,
+        stale_reader_seconds=10,
+    )
+    first = store.publish()
+    stale_ref = store.readers_dir / first.name / "crashed-reader"
+    stale_ref.parent.mkdir(parents=True)
+    stale_ref.touch()
+    _age(stale_ref, 60)
+
+    store.publish()
+
+    assert not first.exists()
+
+
+def test_camoufox_read_clone_uses_published_snapshot(tmp_path: Path) -> None:
+    base_dir = tmp_path / "camoufox"
+
+    with user_data_context(str(base_dir), "write") as (master, cleanup):
+        (Path(master) / "prefs.js").write_text("published")
+        cleanup()
+
+    # Changes made outside a write session are not visible to readers
+    (base_dir / "master" / "prefs.js").write_text("in-progress")
+
+    with user_data_context(str(base_dir), "read") as (clone, cleanup):
+        assert (Path(clone) / "prefs.js").read_text() == "published"
+        cleanup()
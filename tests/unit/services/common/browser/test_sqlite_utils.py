@@ -110,3 +110,43 @@ def test_execute_with_retries_raises_after_failures(tmp_path: Path) -> None:
         )
 
     assert operation.attempts == 2
+
+
+def test_execute_readonly_with_retries_reads_and_refuses_writes(tmp_path: Path) -> None:
+    db_path = tmp_path / "read only.db"
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("CREATE TABLE example(value TEXT)")
+        conn.execute("INSERT INTO example(value) VALUES ('hello')")
+        conn.commit()
+
+    rows = sqlite_utils.execute_readonly_with_retries(
+        db_path,
+        lambda conn: conn.execute("SELECT value FROM example").fetchall(),
+        max_attempts=1,
+    )
+    assert rows == [("hello",)]
+
+    with pytest.raises(sqlite_utils.SQLiteExecutionError):
+        sqlite_utils.execute_readonly_with_retries(
+            db_path,
+            lambda conn: conn.execute("INSERT INTO example(value) VALUES ('nope')"),
+            max_attempts=1,
+            initial_delay=0,
+        )
+
+
+def test_database_signature_changes_on_write(tmp_path: Path) -> None:
+    db_path = tmp_path / "signature.db"
+    assert sqlite_utils.database_signature(db_path) == (None, None, None)
+
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("CREATE TABLE example(value TEXT)")
+        conn.commit()
+    before = sqlite_utils.database_signature(db_path)
+
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("INSERT INTO example(value) VALUES ('x')")
+        conn.commit()
+
+    assert before[0] is not None
+    assert sqlite_utils.database_signature(db_path) != before
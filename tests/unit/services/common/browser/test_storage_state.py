@@ -0,0 +1,98 @@
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from app.services.common.browser.storage_state import (
+    StorageStateCache,
+    get_storage_state_cache,
+    normalize_cookie_expiry,
+    reset_storage_state_caches,
+)
+
+
+@pytest.fixture(autouse=True)
+def _reset_caches():
+    reset_storage_state_caches()
+    yield
+    reset_storage_state_caches()
+
+
+class _FakeManager:
+    def __init__(self, tmp_path: Path):
+        self.master_dir = tmp_path / "master"
+        self.master_dir.mkdir()
+        cookies_db = self.master_dir / "Cookies"
+        cookies_db.write_bytes(b"v1")
+        self.path_manager = SimpleNamespace(
+            enabled=True,
+            get_cookies_db_path=lambda: cookies_db,
+            storage_state_file=self.master_dir / "storage_state.json",
+        )
+        self.cookies_db = cookies_db
+        self.exports = 0
+        self.cookies = [{"name": "sid", "value": "1", "domain": ".tiktok.com", "path": "/", "expires": -1}]
+
+    def export_cookies(self, format: str = "json"):
+        assert format == "storage_state"
+        self.exports += 1
+        return {"cookies": list(self.cookies), "origins": [{"origin": "https://www.tiktok.com", "localStorage": []}]}
+
+
+def test_normalize_cookie_expiry_converts_chromium_timestamps() -> None:
+    unix_seconds = 1_900_000_000
+    chromium_micros = (unix_seconds + 11_644_473_600) * 1_000_000
+
+    assert normalize_cookie_expiry(chromium_micros) == pytest.approx(unix_seconds)
+    assert normalize_cookie_expiry(unix_seconds) == unix_seconds
+    assert normalize_cookie_expiry(None) == -1
+    assert normalize_cookie_expiry(0) == -1
+
+
+def test_cache_serves_copies_without_reexporting(tmp_path: Path) -> None:
+    manager = _FakeManager(tmp_path)
+    cache = StorageStateCache(manager, refresh_interval_seconds=60)
+
+    first = cache.get()
+    first["cookies"].clear()
+    second = cache.get()
+
+    assert manager.exports == 1
+    assert [cookie["name"] for cookie in second["cookies"]] == ["sid"]
+    assert second["origins"][0]["origin"] == "https://www.tiktok.com"
+
+
+def test_cache_reloads_when_master_changes(tmp_path: Path) -> None:
+    manager = _FakeManager(tmp_path)
+    cache = StorageStateCache(manager, refresh_interval_seconds=0)
+
+    cache.get()
+    cache.get()
+    assert manager.exports == 1
+
+    manager.cookies.append({"name": "tt", "value": "2", "domain": ".tiktok.com", "path": "/", "expires": -1})
+    manager.cookies_db.write_bytes(b"version-2")
+
+    assert [cookie["name"] for cookie in cache.get()["cookies"]] == ["sid", "tt"]
+    assert manager.exports == 2
+
+
+def test_expired_cookies_are_filtered(tmp_path: Path) -> None:
+    manager = _FakeManager(tmp_path)
+    manager.cookies.append(
+        {"name": "old", "value": "x", "domain": ".tiktok.com", "path": "/", "expires": time.time() - 10}
+    )
+
+    state = StorageStateCache(manager).get()
+
+    assert [cookie["name"] for cookie in state["cookies"]] == ["sid"]
+
+
+def test_caches_are_shared_per_master_dir(tmp_path: Path) -> None:
+    manager = _FakeManager(tmp_path)
+
+    cache = get_storage_state_cache(manager)
+
+    assert get_storage_state_cache(manager, 5) is cache
+    assert cache.refresh_interval_seconds == 5
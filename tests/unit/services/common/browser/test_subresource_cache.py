@@ -0,0 +1,137 @@
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from app.services.common.browser.subresource_cache import (
+    STATIC_URL_PATTERN,
+    SubresourceCache,
+    freshness_lifetime,
+    get_subresource_cache,
+    reset_subresource_caches,
+)
+
+CACHEABLE = {"content-type": "application/javascript", "cache-control": "public, max-age=600"}
+
+
+@pytest.fixture(autouse=True)
+def _reset_caches():
+    reset_subresource_caches()
+    yield
+    reset_subresource_caches()
+
+
+class FakeRoute:
+    def __init__(self, url, resource_type="script", method="GET", response=None):
+        self.request = SimpleNamespace(url=url, resource_type=resource_type, method=method)
+        self._response = response
+        self.fetched = 0
+        self.fulfilled = None
+        self.fell_back = False
+
+    def fetch(self):
+        self.fetched += 1
+        return self._response
+
+    def fulfill(self, **kwargs):
+        self.fulfilled = kwargs
+
+    def fallback(self):
+        self.fell_back = True
+
+
+class FakeResponse:
+    def __init__(self, body, headers=None, status=200):
+        self.status = status
+        self.headers = dict(headers or CACHEABLE)
+        self._body = body
+
+    def body(self):
+        return self._body
+
+
+def test_freshness_lifetime_follows_cache_headers() -> None:
+    assert freshness_lifetime({"Cache-Control": "max-age=60"}) == 60
+    assert freshness_lifetime({"cache-control": "public, s-maxage=120, max-age=60"}) == 120
+    assert freshness_lifetime({"cache-control": "max-age=60, private"}) is None
+    assert freshness_lifetime({"cache-control": "no-store"}) is None
+    assert freshness_lifetime({"cache-control": "max-age=60", "set-cookie": "a=b"}) is None
+    assert freshness_lifetime({"cache-control": "max-age=60", "vary": "Accept-Encoding"}) == 60
+    assert freshness_lifetime({"cache-control": "max-age=60", "vary": "Cookie"}) is None
+    assert freshness_lifetime({"expires": "Thu, 01 Jan 2037 00:00:00 GMT"}, now=2_114_380_000) == 800
+    assert freshness_lifetime({}) is None
+
+
+def test_static_url_pattern() -> None:
+    assert STATIC_URL_PATTERN.search("https://cdn.example.com/app.3f2a.js?v=1")
+    assert STATIC_URL_PATTERN.search("https://cdn.example.com/font.woff2")
+    assert not STATIC_URL_PATTERN.search("https://example.com/api/items?format=.js")
+    assert not STATIC_URL_PATTERN.search("https://example.com/page")
+
+
+def test_miss_then_hit_serves_from_disk(tmp_path: Path) -> None:
+    cache = SubresourceCache(tmp_path, max_bytes=1_000_000)
+    url = "https://cdn.example.com/bundle.js"
+
+    miss = FakeRoute(url, response=FakeResponse(b"console.log(1)"))
+    cache.handle_route(miss)
+    assert miss.fetched == 1
+    assert miss.fulfilled["body"] == b"console.log(1)"
+
+    hit = FakeRoute(url)
+    cache.handle_route(hit)
+    assert hit.fetched == 0
+    assert hit.fulfilled == {
+        "status": 200,
+        "headers": CACHEABLE,
+        "body": b"console.log(1)",
+    }
+
+    # A second process (or a restart) sees the same entries
+    assert SubresourceCache(tmp_path, max_bytes=1_000_000).lookup(url)[2] == b"console.log(1)"
+
+
+def test_uncacheable_requests_and_responses_bypass_the_cache(tmp_path: Path) -> None:
+    cache = SubresourceCache(tmp_path, max_bytes=1_000_000)
+
+    document = FakeRoute("https://example.com/app.js", resource_type="document")
+    cache.handle_route(document)
+    assert document.fell_back and document.fetched == 0
+
+    no_store = FakeRoute(
+        "https://example.com/app.js", response=FakeResponse(b"x", {"cache-control": "no-store"})
+    )
+    cache.handle_route(no_store)
+    assert no_store.fulfilled["body"] == b"x"
+    assert len(cache) == 0
+
+
+def test_expired_entries_are_refetched(tmp_path: Path) -> None:
+    cache = SubresourceCache(tmp_path, max_bytes=1_000_000)
+    url = "https://cdn.example.com/style.css"
+    assert cache.store(url, 200, CACHEABLE, b"body", now=1_000)
+
+    assert cache.lookup(url, now=1_500) is not None
+    assert cache.lookup(url, now=1_601) is None
+
+
+def test_lru_eviction_and_shared_bodies(tmp_path: Path) -> None:
+    cache = SubresourceCache(tmp_path, max_bytes=80)
+    cache.store("https://a.example/1.js", 200, CACHEABLE, b"a" * 10)
+    cache.store("https://b.example/1.js", 200, CACHEABLE, b"a" * 10)  # same content, one object
+    assert len(list((tmp_path / "objects").rglob("*"))) == 2  # shard dir + object
+
+    for index in range(6):
+        cache.store(f"https://c.example/{index}.js", 200, CACHEABLE, bytes([index]) * 10)
+    assert cache.lookup("https://a.example/1.js") is not None  # refreshed, so not the oldest
+
+    cache.store("https://d.example/1.js", 200, CACHEABLE, b"d" * 10)
+    assert cache.total_bytes <= 80
+    assert cache.lookup("https://b.example/1.js") is None
+    assert cache.lookup("https://a.example/1.js") is not None
+
+
+def test_get_subresource_cache_is_opt_in(tmp_path: Path) -> None:
+    assert get_subresource_cache(SimpleNamespace(subresource_cache_dir=None, subresource_cache_max_bytes=10)) is None
+    settings = SimpleNamespace(subresource_cache_dir=str(tmp_path), subresource_cache_max_bytes=10)
+    assert get_subresource_cache(settings) is get_subresource_cache(settings)
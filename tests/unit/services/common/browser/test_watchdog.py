@@ -0,0 +1,144 @@
+import os
+import signal
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from app.services.common.browser import watchdog as watchdog_module
+from app.services.common.browser.watchdog import (
+    BrowserWatchdog,
+    descendants,
+    read_process,
+    read_process_table,
+    watchdog_from_settings,
+)
+
+SELF_PID = 100
+PAGE = os.sysconf("SC_PAGE_SIZE")
+
+
+def write_process(proc: Path, pid, ppid, cmdline, rss_pages=10, start=1000, state="S", comm=None):
+    entry = proc / str(pid)
+    entry.mkdir(parents=True, exist_ok=True)
+    comm = comm or os.path.basename(cmdline[0])[:15]
+    # state, ppid, 17 unused fields, starttime, vsize, rss
+    fields = [state, str(ppid)] + ["0"] * 17 + [str(start), "0", str(rss_pages)]
+    (entry / "stat").write_text(f"{pid} ({comm}) " + " ".join(fields) + " 0 0\n")
+    (entry / "cmdline").write_bytes(b"\0".join(part.encode() for part in cmdline) + b"\0")
+
+
+@pytest.fixture
+def proc(tmp_path: Path) -> Path:
+    root = tmp_path / "proc"
+    write_process(root, 1, 0, ["/sbin/init"])
+    write_process(root, SELF_PID, 1, ["python", "-m", "uvicorn"])
+    write_process(root, 200, SELF_PID, ["node", "cli.js", "run-driver"])
+    write_process(root, 300, 200, ["/ms-playwright/chromium/chrome", "--headless"], rss_pages=100)
+    write_process(root, 301, 300, ["/ms-playwright/chromium/chrome", "--type=zygote"], rss_pages=50)
+    write_process(root, 302, 301, ["/ms-playwright/chromium/chrome", "--type=renderer"], rss_pages=50)
+    write_process(root, 900, 1, ["/usr/bin/chrome"])  # someone else's browser
+    return root
+
+
+@pytest.fixture
+def signals(monkeypatch):
+    sent = []
+    monkeypatch.setattr(watchdog_module.os, "kill", lambda pid, signum: sent.append((pid, signum)))
+    return sent
+
+
+def test_read_process_parses_stat_and_cmdline(proc: Path) -> None:
+    write_process(proc, 400, 1, ["/opt/camoufox/camoufox-bin"], comm="Web Content (x)", rss_pages=3, start=77)
+    info = read_process(400, str(proc))
+
+    assert info.ppid == 1
+    assert info.start_ticks == 77
+    assert info.rss_bytes == 3 * PAGE
+    assert info.is_browser
+    assert read_process(12345, str(proc)) is None
+
+
+def test_descendants_walks_the_whole_tree(proc: Path) -> None:
+    table = read_process_table(str(proc))
+    assert {info.pid for info in descendants(table, SELF_PID)} == {200, 300, 301, 302}
+
+
+def test_scan_tracks_browser_roots_and_reports_usage(proc: Path, signals) -> None:
+    watchdog = BrowserWatchdog(proc_root=str(proc), root_pid=SELF_PID)
+    report = watchdog.scan(now=0)
+
+    assert [browser.pid for browser in watchdog.browsers()] == [300]
+    assert report.browsers == 1
+    assert report.processes == 3
+    assert report.rss_bytes == 200 * PAGE
+    assert signals == []
+
+
+def test_orphaned_browser_is_terminated_then_killed(proc: Path, signals) -> None:
+    watchdog = BrowserWatchdog(proc_root=str(proc), root_pid=SELF_PID, grace_seconds=5)
+    watchdog.scan(now=0)
+
+    # The driver died and the browser was reparented to init
+    (proc / "200" / "stat").unlink()
+    write_process(proc, 300, 1, ["/ms-playwright/chromium/chrome", "--headless"])
+    report = watchdog.scan(now=1)
+    assert report.terminated == [(300, "orphaned")]
+    assert signals == [(300, signal.SIGTERM)]
+
+    watchdog.scan(now=3)
+    assert len(signals) == 1  # still within the grace period
+    report = watchdog.scan(now=7)
+    assert sorted(report.killed) == [300, 301, 302]
+    assert (900, signal.SIGKILL) not in signals
+
+
+def test_browser_reparented_to_this_process_is_an_orphan(proc: Path, signals) -> None:
+    write_process(proc, 300, SELF_PID, ["/ms-playwright/chromium/chrome", "--headless"])
+    report = BrowserWatchdog(proc_root=str(proc), root_pid=SELF_PID).scan(now=0)
+    assert report.terminated == [(300, "orphaned")]
+
+
+@pytest.mark.parametrize(
+    "limits, reason",
+    [
+        ({"max_rss_bytes": 150 * PAGE}, "rss"),
+        ({"max_age_seconds": 60}, "age"),
+        ({"max_pages": 0}, None),
+    ],
+)
+def test_limits_recycle_browsers(proc: Path, signals, limits, reason) -> None:
+    watchdog = BrowserWatchdog(proc_root=str(proc), root_pid=SELF_PID, **limits)
+    terminated = watchdog.scan(now=0).terminated + watchdog.scan(now=120).terminated
+
+    if reason is None:
+        assert terminated == []
+    else:
+        assert len(terminated) == 1
+        assert terminated[0][0] == 300
+        assert terminated[0][1].startswith(reason)
+
+
+def test_page_limit_counts_content_processes(proc: Path, signals) -> None:
+    watchdog = BrowserWatchdog(proc_root=str(proc), root_pid=SELF_PID, max_pages=1)
+    assert watchdog.scan(now=0).terminated == []
+
+    write_process(proc, 303, 301, ["/ms-playwright/chromium/chrome", "--type=renderer"], start=2000)
+    assert watchdog.scan(now=1).terminated == [(300, "pages 2 > 1")]
+
+
+def test_zombie_browser_children_are_reaped(proc: Path, signals, monkeypatch) -> None:
+    write_process(proc, 500, SELF_PID, ["/opt/camoufox/camoufox-bin"], state="Z")
+    reaped = []
+    monkeypatch.setattr(watchdog_module.os, "waitpid", lambda pid, flags: reaped.append(pid) or (pid, 0))
+
+    report = BrowserWatchdog(proc_root=str(proc), root_pid=SELF_PID).scan(now=0)
+    assert reaped == [500]
+    assert report.reaped == [500]
+
+
+def test_watchdog_from_settings_ignores_non_integer_limits() -> None:
+    watchdog = watchdog_from_settings(SimpleNamespace(browser_max_rss_bytes=10, browser_max_pages="x"))
+    assert watchdog.max_rss_bytes == 10
+    assert watchdog.max_pages == 0
+    assert watchdog.max_age_seconds == 0
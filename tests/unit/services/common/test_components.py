@@ -0,0 +1,75 @@
+import inspect
+import sys
+import types
+
+import pytest
+
+from app.core.config import Settings
+from app.services.common.adapters.scrapling_fetcher import ScraplingFetcherAdapter
+from app.services.common.components import get_engine_components, get_shared_engine, reset_component_container
+from app.services.crawler.auspost import AuspostCrawler
+from app.services.crawler.dpd import DPDCrawler
+from app.services.crawler.executors.auspost_no_proxy import SingleAttemptNoProxy
+
+pytestmark = [pytest.mark.unit]
+
+
+@pytest.fixture(autouse=True)
+def _reset_container():
+    reset_component_container()
+    yield
+    reset_component_container()
+
+
+def test_components_are_built_once_per_settings_generation():
+    settings = Settings(max_retries=3)
+    components = get_engine_components(settings)
+    assert get_engine_components(settings) is components
+    assert components.iframe_extractor.fetch_client is components.fetch_client
+
+    engine = get_shared_engine(settings)
+    assert get_shared_engine(settings) is engine
+    assert engine.fetch_client is components.fetch_client
+    assert engine.executor.fetch_client is components.fetch_client
+    assert engine.executor.iframe_extractor is components.iframe_extractor
+    assert engine.executor.attempt_planner is components.attempt_planner
+
+    next_generation = Settings(max_retries=3)
+    assert get_engine_components(next_generation) is not components
+    assert get_shared_engine(next_generation) is not engine
+
+
+def test_crawlers_share_engines_across_requests(monkeypatch):
+    settings = Settings(max_retries=1)
+    monkeypatch.setattr("app.core.config.get_settings", lambda: settings)
+
+    assert DPDCrawler().engine is DPDCrawler().engine
+    auspost = AuspostCrawler().engine
+    assert AuspostCrawler().engine is auspost
+    assert isinstance(auspost.executor, SingleAttemptNoProxy)
+    assert auspost.executor.fetch_client is get_engine_components(settings).fetch_client
+
+
+def test_capabilities_are_introspected_once_per_fetch_callable(monkeypatch):
+    calls = []
+    real_signature = inspect.signature
+
+    def counting_signature(obj, *args, **kwargs):
+        calls.append(obj)
+        return real_signature(obj, *args, **kwargs)
+
+    class FakeStealthyFetcher:
+        @staticmethod
+        def fetch(url, proxy=None, custom_config=None):
+            return None
+
+    fake_fetchers = types.SimpleNamespace(StealthyFetcher=FakeStealthyFetcher)
+    monkeypatch.setitem(sys.modules, "scrapling.fetchers", fake_fetchers)
+    monkeypatch.setattr("app.services.common.adapters.scrapling_fetcher.inspect.signature", counting_signature)
+
+    first = ScraplingFetcherAdapter().detect_capabilities()
+    second = ScraplingFetcherAdapter().detect_capabilities()
+
+    assert first is second
+    assert first.supports_proxy and first.supports_custom_config and not first.supports_geoip
+    assert calls == [FakeStealthyFetcher.fetch]
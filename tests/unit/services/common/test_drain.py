@@ -0,0 +1,138 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from app.core.metrics import get_counter
+from app.services.common.browser import profile_releases
+from app.services.common.drain import (
+    DrainController,
+    DrainingError,
+    DrainMiddleware,
+    drain_report,
+    get_drain_controller,
+    reset_drain,
+    start_drain_controller,
+    wait_for_profile_releases,
+)
+
+pytestmark = [pytest.mark.unit]
+
+
+@pytest.fixture(autouse=True)
+def _reset_drain():
+    reset_drain()
+    yield
+    reset_drain()
+
+
+def _settings(timeout=1.0, grace=1.0):
+    return SimpleNamespace(drain_timeout_seconds=timeout, drain_cancel_grace_seconds=grace)
+
+
+def test_settings_fall_back_to_defaults():
+    controller = DrainController(SimpleNamespace(drain_timeout_seconds=-1, drain_cancel_grace_seconds=True))
+
+    assert controller.timeout_seconds == 30.0
+    assert controller.cancel_grace_seconds == 5.0
+    assert DrainController(_settings(timeout=0)).timeout_seconds == 0.0
+
+
+@pytest.mark.asyncio
+async def test_in_flight_requests_finish_before_the_deadline():
+    controller = start_drain_controller(_settings(timeout=5))
+    finished = []
+
+    async def request():
+        with controller.admit():
+            await asyncio.sleep(0.05)
+            finished.append(True)
+
+    task = asyncio.create_task(request())
+    await asyncio.sleep(0)
+    assert controller.in_flight == 1
+
+    await controller.drain()
+
+    assert finished == [True] and task.done() and not task.cancelled()
+    assert drain_report() == {"status": "draining", "in_flight": 0}
+    with pytest.raises(DrainingError):
+        with controller.admit():
+            pass
+
+
+@pytest.mark.asyncio
+async def test_requests_past_the_deadline_are_cancelled():
+    controller = DrainController(_settings(timeout=0.05))
+    cancelled_before = get_counter("drain_cancelled_total").value
+
+    async def request():
+        with controller.admit():
+            await asyncio.sleep(10)
+
+    task = asyncio.create_task(request())
+    await asyncio.sleep(0)
+    await controller.drain()
+
+    assert task.cancelled()
+    assert controller.was_cancelled(task)
+    assert controller.in_flight == 0
+    assert get_counter("drain_cancelled_total").value == cancelled_before + 1
+
+
+async def _call(app, path):
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {"type": "http", "method": "GET", "path": path, "headers": [], "query_string": b""}
+    await app(scope, receive, send)
+    return messages
+
+
+@pytest.mark.asyncio
+async def test_middleware_answers_503_when_draining_or_cancelled():
+    controller = start_drain_controller(_settings(timeout=0.05))
+
+    async def slow_app(scope, receive, send):
+        await asyncio.sleep(10)
+
+    async def ok_app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"ok"})
+
+    in_flight = asyncio.create_task(_call(DrainMiddleware(slow_app), "/crawl"))
+    await asyncio.sleep(0)
+    await controller.drain()
+
+    cancelled = await in_flight
+    assert cancelled[0]["status"] == 503
+    assert (b"retry-after", b"1") in cancelled[0]["headers"]
+    assert b"cancelled by shutdown" in cancelled[1]["body"]
+
+    rejected = await _call(DrainMiddleware(ok_app), "/crawl")
+    assert rejected[0]["status"] == 503
+    assert (await _call(DrainMiddleware(ok_app), "/health"))[0]["status"] == 200
+
+
+@pytest.mark.asyncio
+async def test_wait_for_profile_releases_returns_what_is_left():
+    profile_releases._pending.clear()
+    release = profile_releases.track_release(lambda: None, "clone")
+    asyncio.get_running_loop().call_later(0.05, release)
+
+    assert await wait_for_profile_releases(1.0) == 0
+
+    profile_releases.track_release(lambda: None, "stuck clone")
+    assert await wait_for_profile_releases(0.05) == 1
+    profile_releases._pending.clear()
+
+
+def test_controller_defaults_when_the_app_did_not_start_one():
+    assert drain_report() is None
+    assert get_drain_controller() is get_drain_controller()
+    assert not get_drain_controller().draining
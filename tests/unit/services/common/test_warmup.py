@@ -0,0 +1,102 @@
+import asyncio
+import os
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from app.core.metrics import get_gauge
+from app.services.common import warmup
+from app.services.common.warmup import WarmupRunner, configured_steps, readiness_report, reset_warmup
+from app.services.crawler.executors import process_executor
+
+pytestmark = [pytest.mark.unit]
+
+
+@pytest.fixture(autouse=True)
+def _reset_warmup():
+    reset_warmup()
+    yield
+    reset_warmup()
+
+
+def test_configured_steps_keep_order_and_expand_all():
+    steps = {"camoufox": None, "browser": None, "clones": None}
+
+    assert configured_steps(SimpleNamespace(warmup_components=""), steps) == []
+    assert configured_steps(SimpleNamespace(warmup_components=" Browser, nope,camoufox,browser"), steps) == [
+        "browser",
+        "camoufox",
+    ]
+    assert configured_steps(SimpleNamespace(warmup_components="clones,all"), steps) == ["clones", "camoufox", "browser"]
+    assert configured_steps(SimpleNamespace(warmup_components=None), steps) == []
+    assert configured_steps(SimpleNamespace(warmup_components="all")) == list(warmup.WARMUP_STEPS)
+
+
+@pytest.mark.asyncio
+async def test_runner_reports_each_step_and_turns_ready():
+    release = threading.Event()
+
+    def slow(settings):
+        release.wait(5)
+
+    def broken(settings):
+        raise RuntimeError("camoufox fetch required")
+
+    steps = {"slow": slow, "disabled": lambda settings: False, "broken": broken}
+    runner = WarmupRunner(SimpleNamespace(warmup_components="slow,disabled,broken"), steps)
+    runner.start()
+    await asyncio.sleep(0.05)
+
+    assert runner.report() == {
+        "status": "warming",
+        "warmup": {"slow": {"status": "pending"}, "disabled": {"status": "pending"}, "broken": {"status": "pending"}},
+    }
+
+    release.set()
+    await runner._task
+    report = runner.report()
+    assert report["status"] == "ready"
+    assert [step["status"] for step in report["warmup"].values()] == ["ok", "skipped", "failed"]
+    assert report["warmup"]["broken"]["error"] == "RuntimeError: camoufox fetch required"
+    assert report["warmup_seconds"] >= report["warmup"]["slow"]["seconds"] > 0
+    assert get_gauge("warmup_slow_seconds").value == pytest.approx(runner.results["slow"].seconds)
+
+
+@pytest.mark.asyncio
+async def test_steps_past_the_timeout_do_not_hold_readiness(monkeypatch):
+    monkeypatch.setitem(warmup.WARMUP_STEPS, "browser", lambda settings: time.sleep(1))
+    settings = SimpleNamespace(warmup_components="browser", warmup_step_timeout_seconds=0.05)
+
+    runner = warmup.start_warmup(settings)
+    assert readiness_report()["status"] == "warming"
+    await runner._task
+
+    report = readiness_report()
+    assert report["status"] == "ready"
+    assert report["warmup"]["browser"]["status"] == "timeout"
+
+
+def test_readiness_without_warmup_is_ready():
+    assert readiness_report() == {"status": "ready", "warmup": {}}
+    assert WarmupRunner(SimpleNamespace(warmup_components="")).ready
+
+
+def test_clones_step_clones_existing_masters_only(tmp_path):
+    master = tmp_path / "camoufox" / "master"
+    master.mkdir(parents=True)
+    (master / "prefs.js").write_text("user_pref('a', 1);")
+    settings = SimpleNamespace(camoufox_user_data_dir=str(tmp_path / "camoufox"), chromium_user_data_dir=None)
+
+    assert warmup._warm_clones(settings) is True
+    assert list((tmp_path / "camoufox" / "clones").iterdir()) == []
+    assert warmup._warm_clones(SimpleNamespace(camoufox_user_data_dir=str(tmp_path / "missing"))) is False
+
+
+def test_warm_worker_builds_the_worker_engine(monkeypatch):
+    engine = object()
+    monkeypatch.setattr(process_executor, "_worker_engine", engine)
+
+    assert process_executor.warm_worker() == os.getpid()
+    assert process_executor._get_worker_engine() is engine
@@ -0,0 +1,186 @@
+import os
+import threading
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+from types import SimpleNamespace
+
+import pytest
+
+from app.core.config import Settings
+from app.schemas.crawl import CrawlRequest, CrawlResponse
+from app.services.common.engine import CrawlerEngine
+from app.services.crawler.executors import process_executor
+from app.services.crawler.executors.process_executor import (
+    CrawlJob,
+    CrawlOutcome,
+    CrawlProcessPool,
+    ProcessPoolCrawlExecutor,
+    SharedText,
+    get_crawl_process_pool,
+    resolve_worker_count,
+    run_crawl_job,
+    shutdown_crawl_process_pool,
+    sweep_shared_segments,
+)
+from app.services.crawler.executors.single_executor import SingleAttemptExecutor
+
+pytestmark = [pytest.mark.unit]
+
+GiB = 1 << 30
+
+
+class ClickAction:
+    def apply(self, page):
+        return page
+
+
+class LocalExecutor:
+    def __init__(self):
+        self.calls = []
+
+    def execute(self, request, page_action=None):
+        self.calls.append((request, page_action))
+        return CrawlResponse(status="success", url=request.url, html="local")
+
+
+class FakePool:
+    def __init__(self, error=None):
+        self.jobs = []
+        self.error = error
+
+    def run(self, job):
+        self.jobs.append(job)
+        if self.error:
+            raise self.error
+        return CrawlResponse(status="success", url=job.request.url, html="worker")
+
+
+@pytest.fixture(autouse=True)
+def _reset_pool():
+    shutdown_crawl_process_pool(wait=False)
+    yield
+    shutdown_crawl_process_pool(wait=False)
+
+
+def test_resolve_worker_count_follows_cpus_and_memory():
+    assert resolve_worker_count(3, cpu_count=16, mem_available=GiB) == 3
+    assert resolve_worker_count(-1, cpu_count=8, mem_available=64 * GiB) == 8
+    assert resolve_worker_count(-1, cpu_count=8, mem_available=3 * GiB + 1) == 3
+    assert resolve_worker_count(-1, cpu_count=8, mem_available=GiB // 2) == 1
+    assert resolve_worker_count(-1, cpu_count=4, mem_available=None, worker_memory_bytes=GiB) >= 1
+
+
+def test_jobs_are_sent_to_the_pool():
+    local, pool = LocalExecutor(), FakePool()
+    executor = ProcessPoolCrawlExecutor(local, pool=pool)
+    request = CrawlRequest(url="https://example.com")
+
+    response = executor.execute(request, ClickAction())
+
+    assert response.html == "worker"
+    assert pool.jobs[0].request == request
+    assert isinstance(pool.jobs[0].page_action, ClickAction)
+    assert local.calls == []
+
+
+def test_unpicklable_jobs_run_in_process():
+    local, pool = LocalExecutor(), FakePool()
+    executor = ProcessPoolCrawlExecutor(local, pool=pool)
+    request = CrawlRequest(url="https://example.com")
+    action = SimpleNamespace(apply=lambda page: page, lock=threading.Lock())
+
+    assert CrawlJob.build(request, action) is None
+    assert executor.execute(request, action).html == "local"
+    assert pool.jobs == []
+
+
+def test_dead_worker_reports_an_error_response():
+    executor = ProcessPoolCrawlExecutor(LocalExecutor(), pool=FakePool(error=BrokenProcessPool("killed")))
+
+    response = executor.execute(CrawlRequest(url="https://example.com"))
+
+    assert response.status == "error"
+    assert "worker process exited" in response.message
+
+
+def test_engine_wraps_its_executor_only_when_enabled(monkeypatch):
+    assert isinstance(CrawlerEngine.from_settings(Settings(max_retries=1)).executor, SingleAttemptExecutor)
+
+    engine = CrawlerEngine.from_settings(Settings(max_retries=1, crawl_process_workers=2))
+    assert isinstance(engine.executor, ProcessPoolCrawlExecutor)
+    assert isinstance(engine.executor.local, SingleAttemptExecutor)
+    assert get_crawl_process_pool(Settings(crawl_process_workers=2)).workers == 2
+
+    monkeypatch.setattr(process_executor, "_IN_WORKER", True)
+    engine = CrawlerEngine.from_settings(Settings(max_retries=1, crawl_process_workers=2))
+    assert isinstance(engine.executor, SingleAttemptExecutor)
+    assert get_crawl_process_pool(Settings(crawl_process_workers=2)) is None
+
+
+def test_shared_text_round_trips_once():
+    text = "<html>" + "\u00e9\u6f22" * 50_000 + "</html>"
+    shared = SharedText.publish(text)
+    assert shared.length == len(text.encode("utf-8"))
+
+    assert shared.take() == text
+    with pytest.raises(FileNotFoundError):
+        shared.take()
+
+
+def test_large_pages_leave_workers_through_shared_memory(monkeypatch):
+    class Engine:
+        html = "x" * 100
+
+        def run(self, request, page_action=None):
+            return CrawlResponse(status="success", url=request.url, html=self.html)
+
+    monkeypatch.setattr(process_executor, "_worker_engine", Engine())
+    monkeypatch.setattr(process_executor, "_shm_threshold", lambda: 100)
+    job = CrawlJob.build(CrawlRequest(url="https://example.com"))
+
+    outcome = run_crawl_job(job)
+    assert outcome.response.html is None
+    assert outcome.html.length == 100
+    assert outcome.to_response().html == "x" * 100
+
+    Engine.html = "x" * 99
+    outcome = run_crawl_job(job)
+    assert outcome.html is None
+    assert outcome.to_response().html == "x" * 99
+
+
+def test_segment_is_freed_when_building_the_response_fails(monkeypatch):
+    shared = SharedText.publish("x" * 100)
+    outcome = CrawlOutcome(
+        response=CrawlResponse(status="success", url="https://example.com", html=None),
+        worker_pid=1,
+        seconds=0.1,
+        html=shared,
+    )
+    future = Future()
+    future.set_result(outcome)
+    pool = CrawlProcessPool(1)
+    monkeypatch.setattr(pool, "_get_executor", lambda: SimpleNamespace(submit=lambda *args: future))
+
+    def broken_response(self):
+        raise ValueError("response could not be built")
+
+    monkeypatch.setattr(CrawlOutcome, "to_response", broken_response)
+
+    with pytest.raises(ValueError):
+        pool.run(CrawlJob.build(CrawlRequest(url="https://example.com")))
+
+    assert shared.discard() is False
+
+
+@pytest.mark.skipif(not os.path.isdir(process_executor.SHM_DIR), reason="shared memory is not listed as files")
+def test_pool_shutdown_sweeps_unread_segments():
+    pool = CrawlProcessPool(1)
+    unread = SharedText.publish("abandoned", pool.segment_prefix)
+    other = SharedText.publish("someone else's")
+
+    pool.shutdown()
+
+    assert unread.discard() is False
+    assert sweep_shared_segments(pool.segment_prefix) == 0
+    assert other.take() == "someone else's"
@@ -6,6 +6,7 @@ from unittest.mock import Mock
 
 import pytest
 
+from app.core.cancellation import RequestCancelled, cancellation_scope
 from app.services.tiktok.search.actions.scrolling import SearchResultsScroller
 
 
@@ -43,3 +44,15 @@ def test_count_video_results_returns_max(scroller):
 
     assert scroller._count_video_results(page) == 5
     assert page.eval_on_selector_all.call_count == 3
+
+
+def test_scroll_results_stops_when_the_request_is_cancelled(scroller):
+    page = Mock()
+    scroller._count_video_results = Mock(return_value=0)  # type: ignore[attr-defined]
+
+    with cancellation_scope() as token:
+        token.cancel("client disconnected")
+        with pytest.raises(RequestCancelled):
+            scroller.scroll_results(page, target_videos=10)
+
+    page.mouse.wheel.assert_not_called()
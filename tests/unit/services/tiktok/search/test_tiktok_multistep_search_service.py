@@ -6,6 +6,7 @@ from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
 
+from app.core.request_context import current_request_context
 from app.services.tiktok.search.multistep import (
     TikTokAutoSearchAction,
     TikTokMultiStepSearchService,
@@ -246,7 +247,7 @@ class TestTikTokMultiStepSearchService:
 
     @pytest.mark.asyncio
     async def test_execute_browser_search_mutes_audio(self, search_service, tmp_path, monkeypatch):
-        """_execute_browser_search should mute audio via settings during browser launch."""
+        """_execute_browser_search should mute audio via the request context during browser launch."""
 
         settings = search_service.settings
         settings.camoufox_runtime_force_mute_audio = False
@@ -259,7 +260,7 @@ class TestTikTokMultiStepSearchService:
 
             def run(self, crawl_request, page_action):
                 nonlocal seen_mute_flag
-                seen_mute_flag = settings.camoufox_runtime_force_mute_audio
+                seen_mute_flag = current_request_context().camoufox_runtime_force_mute_audio
                 return SimpleNamespace(html="<html>muted</html>")
 
         class DummyBrowseExecutor:
@@ -290,6 +291,7 @@ class TestTikTokMultiStepSearchService:
 
         assert html == "<html>muted</html>"
         assert seen_mute_flag is True
+        assert current_request_context().camoufox_runtime_force_mute_audio is None
         assert settings.camoufox_runtime_force_mute_audio is False
 
     @pytest.mark.asyncio
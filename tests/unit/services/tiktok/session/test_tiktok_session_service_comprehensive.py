@@ -6,12 +6,14 @@ from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
+from app.core.request_context import runtime_setting
 from app.schemas.tiktok.session import (
     TikTokLoginState,
     TikTokSessionConfig,
     TikTokSessionRequest,
     TikTokSessionResponse,
 )
+from app.services.common.browser.locks import FileLock
 from app.services.tiktok.session.registry import SessionRecord, SessionRegistry
 from app.services.tiktok.session.service import TiktokService
 from app.services.tiktok.tiktok_executor import TiktokExecutor
@@ -663,6 +665,42 @@ class TestTiktokServiceEdgeCases:
         assert result.status == "success"
         assert len(tiktok_service.sessions) == 1
 
+    @patch("app.services.tiktok.session.service.TiktokExecutor")
+    @patch("app.services.tiktok.session.service.LoginDetector")
+    @pytest.mark.asyncio
+    async def test_write_mode_locks_master_only_while_the_session_launches(
+        self, mock_detector_class, mock_executor_class, tiktok_service, mock_settings, tmp_path
+    ):
+        """Write-mode sessions launch on the master under its lock, then publish and release it."""
+        mock_settings.tiktok_write_mode_enabled = True
+        lock_file = str(tmp_path / "master.lock")
+        seen = {}
+
+        async def start_session():
+            seen["mode"] = runtime_setting(None, "camoufox_runtime_user_data_mode")
+            seen["dir"] = runtime_setting(None, "camoufox_runtime_effective_user_data_dir")
+            seen["locked"] = not await FileLock(lock_file, timeout=0.05).acquire_async()
+            (tmp_path / "master" / "cookies.sqlite").write_bytes(b"session")
+
+        mock_executor_instance = AsyncMock(spec=TiktokExecutor)
+        mock_executor_instance.user_data_dir = str(tmp_path / "clones")
+        mock_executor_instance.browser = AsyncMock()
+        mock_executor_instance.start_session.side_effect = start_session
+        mock_executor_class.return_value = mock_executor_instance
+        mock_detector_instance = AsyncMock(spec=LoginDetector)
+        mock_detector_instance.detect_login_state.return_value = TikTokLoginState.LOGGED_IN
+        mock_detector_class.return_value = mock_detector_instance
+
+        result = await tiktok_service.create_session(TikTokSessionRequest(), user_data_dir=str(tmp_path))
+
+        assert result.status == "success"
+        assert len(tiktok_service.sessions) == 1
+        assert seen == {"mode": "write", "dir": str(tmp_path / "master"), "locked": True}
+        assert list((tmp_path / "snapshots").rglob("cookies.sqlite"))
+        waiter = FileLock(lock_file, timeout=0.05)
+        assert await waiter.acquire_async() is True
+        waiter.release()
+
     @patch.dict("os.environ", {"PYTEST_CURRENT_TEST": "tests/integration/test_integration.py"})
     @pytest.mark.asyncio
     async def test_load_tiktok_config_integration_test(self, tiktok_service):